@@ -33,6 +33,7 @@ from ..utils.utility import (
     CpuInfo,
     Dequantize,
     LazyImport,
+    MetricUpdater,
     Statistics,
     dump_elapsed_time,
     singleton,
@@ -581,28 +582,23 @@ class KerasAdaptor(Adaptor):
         keras_model = model.model
         logger.info("Start to evaluate the Keras model.")
         results = []
-        for idx, (inputs, labels) in enumerate(dataloader):
-            # use predict on batch
-            if measurer is not None:
-                measurer.start()
-                predictions = keras_model.predict_on_batch(inputs)
-                measurer.end()
-            else:
-                predictions = keras_model.predict_on_batch(inputs)
-
-            if self.fp32_preds_as_label:
-                self.fp32_results.append(predictions) if fp32_baseline else results.append(predictions)
-
-            if postprocess is not None:
-                predictions, labels = postprocess((predictions, labels))
-            if metrics:
-                for metric in metrics:
-                    if not hasattr(metric, "compare_label") or (
-                        hasattr(metric, "compare_label") and metric.compare_label
-                    ):
-                        metric.update(predictions, labels)
-            if idx + 1 == iteration:
-                break
+        # postprocess and metric updates run on a worker thread while the model predicts the next batches.
+        with MetricUpdater(metrics, postprocess) as updater:
+            for idx, (inputs, labels) in enumerate(dataloader):
+                # use predict on batch
+                if measurer is not None:
+                    measurer.start()
+                    predictions = keras_model.predict_on_batch(inputs)
+                    measurer.end()
+                else:
+                    predictions = keras_model.predict_on_batch(inputs)
+
+                if self.fp32_preds_as_label:
+                    self.fp32_results.append(predictions) if fp32_baseline else results.append(predictions)
+
+                updater.put(predictions, labels)
+                if idx + 1 == iteration:
+                    break
 
         acc = 0 if metrics is None else [metric.result() for metric in metrics]
 
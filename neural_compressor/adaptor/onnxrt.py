@@ -37,7 +37,15 @@ from neural_compressor.adaptor.ox_utils.util import ONNXRT_BACKENDS, PROVIDERS,
 from neural_compressor.adaptor.query import QueryBackendCapability
 from neural_compressor.data.dataloaders.base_dataloader import BaseDataLoader
 from neural_compressor.model.onnx_model import ONNXModel
-from neural_compressor.utils.utility import GLOBAL_STATE, MODE, CpuInfo, LazyImport, Statistics, dump_elapsed_time
+from neural_compressor.utils.utility import (
+    GLOBAL_STATE,
+    MODE,
+    CpuInfo,
+    LazyImport,
+    MetricUpdater,
+    Statistics,
+    dump_elapsed_time,
+)
 
 onnx = LazyImport("onnx")
 ort = LazyImport("onnxruntime")
@@ -807,7 +815,7 @@ class ONNXRUNTIMEAdaptor(Adaptor):
     ):
         """The function is used by tune strategy class for dumping tensor info."""
         from neural_compressor.adaptor.ox_utils.calibration import ONNXRTAugment
-        from neural_compressor.utils.utility import dump_data_to_local
+        from neural_compressor.utils.tensor_store import dump_tensor_store
 
         if not isinstance(model, ONNXModel):
             model = ONNXModel(model)
@@ -823,7 +831,7 @@ class ONNXRUNTIMEAdaptor(Adaptor):
         if save_to_disk:
             if not save_path:
                 save_path = self.work_space
-            dump_data_to_local(tensors, save_path, "inspect_result.pkl")
+            dump_tensor_store(tensors, save_path, "inspect_result")
         return tensors
 
     def set_tensor(self, model, tensor_dict):
@@ -1606,45 +1614,40 @@ class ONNXRUNTIMEAdaptor(Adaptor):
 
         def eval_func(dataloader):
             ort_inputs = {}
-            for idx, (inputs, labels) in enumerate(dataloader):
-                if not isinstance(labels, list):
-                    labels = [labels]
-
-                if len_inputs == 1:
-                    if isinstance(inputs, dict):
-                        for name, input in inputs.items():
-                            ort_inputs.update({name: to_numpy(input)})
+            # postprocess and metric updates run on a worker thread while the session runs the next batches.
+            with MetricUpdater(metrics, postprocess) as updater:
+                for idx, (inputs, labels) in enumerate(dataloader):
+                    if not isinstance(labels, list):
+                        labels = [labels]
+
+                    if len_inputs == 1:
+                        if isinstance(inputs, dict):
+                            for name, input in inputs.items():
+                                ort_inputs.update({name: to_numpy(input)})
+                        else:
+                            ort_inputs.update({inputs_names[0]: to_numpy(inputs)})
                     else:
-                        ort_inputs.update({inputs_names[0]: to_numpy(inputs)})
-                else:
-                    assert len_inputs == len(inputs), "number of input tensors must align with graph inputs"
+                        assert len_inputs == len(inputs), "number of input tensors must align with graph inputs"
+
+                        if isinstance(inputs, dict):
+                            for name, input in inputs.items():
+                                ort_inputs.update({name: to_numpy(input)})
+                        else:
+                            ort_inputs = dict(zip(inputs_names, [to_numpy(i) for i in inputs]))
 
-                    if isinstance(inputs, dict):
-                        for name, input in inputs.items():
-                            ort_inputs.update({name: to_numpy(input)})
+                    if measurer is not None:
+                        measurer.start()
+                        predictions = session.run(None, ort_inputs)
+                        measurer.end()
                     else:
-                        ort_inputs = dict(zip(inputs_names, [to_numpy(i) for i in inputs]))
+                        predictions = session.run(None, ort_inputs)
 
-                if measurer is not None:
-                    measurer.start()
-                    predictions = session.run(None, ort_inputs)
-                    measurer.end()
-                else:
-                    predictions = session.run(None, ort_inputs)
-
-                if self.fp32_preds_as_label:
-                    self.fp32_results.append(predictions) if fp32_baseline else results.append(predictions)
-
-                if postprocess is not None:
-                    predictions, labels = postprocess((predictions, labels))
-                if metrics:
-                    for metric in metrics:
-                        if not hasattr(metric, "compare_label") or (
-                            hasattr(metric, "compare_label") and metric.compare_label
-                        ):
-                            metric.update(predictions, labels)
-                if idx + 1 == iteration:
-                    break
+                    if self.fp32_preds_as_label:
+                        self.fp32_results.append(predictions) if fp32_baseline else results.append(predictions)
+
+                    updater.put(predictions, labels)
+                    if idx + 1 == iteration:
+                        break
 
         if isinstance(dataloader, BaseDataLoader) and not self.benchmark:
             try:
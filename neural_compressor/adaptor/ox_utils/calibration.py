@@ -35,7 +35,7 @@ import onnxruntime
 from onnx import TensorProto, helper, shape_inference
 from packaging.version import Version
 
-from neural_compressor.adaptor.ox_utils.calibrator import CALIBRATOR
+from neural_compressor.adaptor.ox_utils.calibrator import CALIBRATOR, KLCalibrator
 from neural_compressor.adaptor.ox_utils.util import (
     _get_qrange_for_qType,
     calculate_scale_zp,
@@ -76,6 +76,8 @@ class ONNXRTAugment:
             iterations (list, optional): tensor of which iteration will be collected. Defaults to [].
             backend (list, optional): execution provider for onnxruntime. Defaults to ['CPUExecutionProvider'].
             reduce_range (bool, optional): use 7 bit or not. Defaults to False.
+            kwargs: split_model_input_names (list) for layer-wise quantization, and kl_workers (int), the number of
+                threads to search the kl thresholds. kl_workers defaults to 1.
         """
         self.model_wrapper = model_wrapper
         self.model = model_wrapper.model
@@ -94,6 +96,7 @@ class ONNXRTAugment:
         self.dynamically_quantized = False
         self.ort_version = Version(onnxruntime.__version__)
         self.reduce_range = reduce_range
+        self.kl_workers = kwargs.get("kl_workers", 1)
 
         self.layer_wise = True if len(kwargs.get("split_model_input_names", [])) != 0 else False
         if self.layer_wise:
@@ -359,6 +362,7 @@ class ONNXRTAugment:
 
         # for kl and percentile method, collect calibration range after all tensors are collected.
         merged_dict = intermediate_tensor
+        kl_calibrators = {}
         for (output_name, node_name), datas in merged_dict.items():
             if any([data is None for data in datas]):
                 continue
@@ -368,10 +372,22 @@ class ONNXRTAugment:
                 else "minmax"
             )
             calibrator = CALIBRATOR[calib_method]()
+            if isinstance(calibrator, KLCalibrator):
+                # kl thresholds are searched for all tensors at once.
+                calibrator.collect_histogram(datas)
+                kl_calibrators[output_name] = calibrator
+                activation_tensors_calib_range.setdefault(output_name, []).append(None)
+                continue
             calibrator.collect(datas)
             activation_tensors_calib_range.setdefault(output_name, []).append(list(calibrator.calib_range))
             calibrator.clear()
             del calibrator
+        if kl_calibrators:
+            KLCalibrator.compute_kl_ranges(list(kl_calibrators.values()), workers=self.kl_workers)
+            for output_name, calibrator in kl_calibrators.items():
+                calib_ranges = activation_tensors_calib_range[output_name]
+                calib_ranges[calib_ranges.index(None)] = list(calibrator.calib_range)
+                calibrator.clear()
 
         # set for layer-wise quant
         self._dataloder_for_next_split_model = ort_inputs_for_next_split_model
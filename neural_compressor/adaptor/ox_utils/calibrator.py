@@ -22,11 +22,17 @@
 # --------------------------------------------------------------------------
 """Calibrator for onnx models."""
 
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
 CALIBRATOR = {}
 
 
+# the min number of tensors to search the kl thresholds in a thread pool
+KL_POOL_MIN_TENSORS = 16
+
+
 def calib_registry(calib_method):
     """The class decorator used to register all Calibrator subclasses."""
 
@@ -206,79 +212,35 @@ class KLCalibrator(CalibratorBase):
         Returns:
             float: optimal threshold
         """
-        import copy
-
-        from scipy.stats import entropy
+        return get_kl_threshold(histogram, num_quantized_bins)
 
-        hist = histogram[0]
-        hist_edges = histogram[1]
-        num_bins = hist.size
-        zero_bin_index = num_bins // 2
-        num_half_quantized_bin = num_quantized_bins // 2
+    @staticmethod
+    def compute_kl_ranges(calibrators, workers=1):
+        """Compute kl ranges of calibrators whose histograms are collected.
 
-        kl_divergence = np.zeros(zero_bin_index - num_half_quantized_bin + 1)
-        thresholds = [(0, 0) for i in range(kl_divergence.size)]
+        The thresholds are searched in a thread pool if workers > 1 and there are at least KL_POOL_MIN_TENSORS
+        calibrators, since numpy releases the GIL in the batched array operations. A process pool isn't used because
+        it would be forked after the onnxruntime threads are started.
 
-        for i in range(num_half_quantized_bin, zero_bin_index + 1, 1):
-            start_index = zero_bin_index - i
-            end_index = zero_bin_index + i + 1 if (zero_bin_index + i + 1) <= num_bins else num_bins
-
-            thresholds[i - num_half_quantized_bin] = (
-                float(hist_edges[start_index]),
-                float(hist_edges[end_index]),
-            )
+        Args:
+            calibrators (list): KLCalibrator objects with collected histograms.
+            workers (int, optional): number of threads. Defaults to 1, which searches the thresholds serially.
+        """
+        histograms = [calibrator.collector.histogram for calibrator in calibrators]
+        num_quantized_bins = [calibrator.num_quantized_bins for calibrator in calibrators]
+        if workers > 1 and len(calibrators) >= KL_POOL_MIN_TENSORS:
+            with ThreadPoolExecutor(max_workers=min(workers, len(calibrators))) as executor:
+                ranges = list(executor.map(get_kl_threshold, histograms, num_quantized_bins))
+        else:
+            ranges = list(map(get_kl_threshold, histograms, num_quantized_bins))
+        for calibrator, (calib_min, calib_max) in zip(calibrators, ranges):
+            calibrator._calib_min, calibrator._calib_max = calib_min, calib_max
 
-            sliced_distribution = copy.deepcopy(hist[start_index:end_index])
-
-            # reference distribution p
-            p = sliced_distribution.copy()  # a copy of np array
-            left_outliers_count = sum(hist[:start_index])
-            right_outliers_count = sum(hist[end_index:])
-            p[0] += left_outliers_count
-            p[-1] += right_outliers_count
-
-            # nonzeros[i] incidates whether p[i] is non-zero
-            nonzeros = (p != 0).astype(np.int64)
-
-            # quantize p.size bins into quantized bins (default 128 bins)
-            quantized_bins = np.zeros(num_quantized_bins, dtype=np.int64)
-            num_merged_bins = sliced_distribution.size // num_quantized_bins
-
-            # merge bins into quantized bins
-            for index in range(num_quantized_bins):
-                start = index * num_merged_bins
-                end = start + num_merged_bins
-                quantized_bins[index] = sum(sliced_distribution[start:end])
-            quantized_bins[-1] += sum(sliced_distribution[num_quantized_bins * num_merged_bins :])
-
-            # in order to compare p and q, we need to make length of q equals to length of p
-            # expand quantized bins into p.size bins
-            q = np.zeros(p.size, dtype=np.int64)
-            for index in range(num_quantized_bins):
-                start = index * num_merged_bins
-                end = start + num_merged_bins
-
-                norm = sum(nonzeros[start:end])
-                if norm != 0:
-                    q[start:end] = float(quantized_bins[index]) / float(norm)
-
-            p = smooth_distribution(p)
-            q = smooth_distribution(q)
-
-            if isinstance(q, np.ndarray):
-                kl_divergence[i - num_half_quantized_bin] = entropy(p, q)
-            else:
-                kl_divergence[i - num_half_quantized_bin] = float("inf")
-
-        min_kl_divergence_idx = np.argmin(kl_divergence)
-        optimal_threshold = thresholds[min_kl_divergence_idx]
-        min_value = histogram[2]
-        max_value = histogram[3]
-        if optimal_threshold[0] < min_value:
-            optimal_threshold = (min_value, optimal_threshold[1])
-        if optimal_threshold[1] > max_value:
-            optimal_threshold = (optimal_threshold[0], max_value)
-        return optimal_threshold[0], optimal_threshold[1]
+    def collect_histogram(self, datas):
+        """Collect histogram without computing the range, see `compute_kl_ranges`."""
+        if not self.collector:
+            self.collector = HistogramCollector(self.num_bins)
+        self.collector.collect_data(datas)
 
     def clear(self):
         """Clear calibration range."""
@@ -403,3 +365,118 @@ def smooth_distribution(p, eps=0.0001):
     assert (hist <= 0).sum() == 0
 
     return hist
+
+
+def _smooth_distributions(p, valid, eps=0.0001):
+    """Apply smooth_distribution on each row of p, only the entries where valid is True are considered.
+
+    Returns:
+        tuple: smoothed rows and whether each row has any non-zero entry.
+    """
+    is_zeros = ((p == 0) & valid).astype(np.float32)
+    is_nonzeros = ((p != 0) & valid).astype(np.float32)
+    n_zeros = is_zeros.sum(axis=1)
+    n_nonzeros = valid.sum(axis=1) - n_zeros
+    has_nonzeros = n_nonzeros > 0
+    eps1 = eps * n_zeros.astype(np.float64) / np.where(has_nonzeros, n_nonzeros, 1)
+    assert (eps1[has_nonzeros] < 1.0).all(), "n_zeros=%s, n_nonzeros=%s, eps1=%s" % (n_zeros, n_nonzeros, eps1)
+    hist = p.astype(np.float32)
+    hist += np.float32(eps) * is_zeros + (-eps1.astype(np.float32))[:, None] * is_nonzeros
+    return hist, has_nonzeros
+
+
+def _sum_valid(values, valid):
+    """Sum the valid entries of each row, the float32 results are the same as np.sum on each unpadded row.
+
+    np.sum on the padded rows may round differently, so each row is reduced as a segment led by a zero, which is
+    where np.sum starts the reduction.
+    """
+    rows = values.shape[0]
+    segments = np.concatenate([np.zeros((rows, 1), dtype=values.dtype), values], axis=1)
+    segments = segments[np.concatenate([np.ones((rows, 1), dtype=bool), valid], axis=1)]
+    offsets = np.concatenate([[0], np.cumsum(valid.sum(axis=1) + 1)[:-1]])
+    return np.add.reduceat(segments, offsets)
+
+
+def get_kl_threshold(histogram, num_quantized_bins, batch_size=128):
+    """Compute kl threshold, the same as looping over the thresholds but the distributions are built in batch.
+
+    The outlier counts and the merged bins are computed with prefix sums of the histogram instead of slicing.
+
+    Args:
+        histogram (tuple): hist, hist_edges, min, max and threshold
+        num_quantized_bins (int): number of quantized bins.
+        batch_size (int, optional): number of thresholds evaluated at once to bound the memory. Defaults to 128.
+
+    Returns:
+        tuple: optimal threshold
+    """
+    from scipy.special import rel_entr
+
+    hist = histogram[0]
+    hist_edges = histogram[1]
+    num_bins = hist.size
+    zero_bin_index = num_bins // 2
+    num_half_quantized_bin = num_quantized_bins // 2
+    hist_cumsum = np.concatenate([[0], np.cumsum(hist)])
+    total = hist_cumsum[-1]
+
+    half_widths = np.arange(num_half_quantized_bin, zero_bin_index + 1)
+    start_indices = zero_bin_index - half_widths
+    end_indices = np.minimum(zero_bin_index + half_widths + 1, num_bins)
+    kl_divergence = np.zeros(half_widths.size)
+
+    for batch_start in range(0, half_widths.size, batch_size):
+        starts = start_indices[batch_start : batch_start + batch_size]
+        ends = end_indices[batch_start : batch_start + batch_size]
+        lengths = ends - starts
+        max_length = lengths.max()
+        rows = np.arange(starts.size)
+        positions = np.arange(max_length)
+        valid = positions[None, :] < lengths[:, None]
+
+        # reference distribution p, the outliers are added to both ends
+        sliced_distribution = np.where(valid, hist[np.minimum(starts[:, None] + positions, num_bins - 1)], 0)
+        p = sliced_distribution.copy()
+        p[:, 0] += hist_cumsum[starts]
+        p[rows, lengths - 1] += total - hist_cumsum[ends]
+        nonzeros = (p != 0) & valid
+
+        # merge bins into quantized bins, the rest bins are merged into the last one
+        num_merged_bins = lengths // num_quantized_bins
+        bin_bounds = starts[:, None] + num_merged_bins[:, None] * np.arange(num_quantized_bins + 1)
+        quantized_bins = np.diff(hist_cumsum[bin_bounds], axis=1)
+        quantized_bins[:, -1] += hist_cumsum[ends] - hist_cumsum[bin_bounds[:, -1]]
+
+        # expand quantized bins into p.size bins, the bins beyond the merged ones stay 0
+        nonzeros_cumsum = np.concatenate([np.zeros((starts.size, 1), dtype=np.int64), np.cumsum(nonzeros, axis=1)], 1)
+        norm = np.diff(np.take_along_axis(nonzeros_cumsum, bin_bounds - starts[:, None], axis=1), axis=1)
+        quantized_values = np.where(
+            norm != 0, (quantized_bins.astype(np.float64) / np.where(norm != 0, norm, 1)).astype(np.int64), 0
+        )
+        bin_index = positions[None, :] // np.maximum(num_merged_bins, 1)[:, None]
+        q = np.take_along_axis(quantized_values, np.minimum(bin_index, num_quantized_bins - 1), axis=1)
+        q = np.where(valid & (bin_index < num_quantized_bins), q, 0)
+
+        p, _ = _smooth_distributions(p, valid)
+        q, q_has_nonzeros = _smooth_distributions(q, valid)
+        # the same as scipy.stats.entropy
+        p_sums = _sum_valid(p, valid)[:, None]
+        q_sums = _sum_valid(q, valid)[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relative_entropy = rel_entr(p / p_sums, q / q_sums)
+        kl = _sum_valid(relative_entropy, valid)
+        kl_divergence[batch_start : batch_start + starts.size] = np.where(q_has_nonzeros, kl, np.inf)
+
+    min_kl_divergence_idx = np.argmin(kl_divergence)
+    optimal_threshold = (
+        float(hist_edges[start_indices[min_kl_divergence_idx]]),
+        float(hist_edges[end_indices[min_kl_divergence_idx]]),
+    )
+    min_value = histogram[2]
+    max_value = histogram[3]
+    if optimal_threshold[0] < min_value:
+        optimal_threshold = (min_value, optimal_threshold[1])
+    if optimal_threshold[1] > max_value:
+        optimal_threshold = (optimal_threshold[0], max_value)
+    return optimal_threshold[0], optimal_threshold[1]
@@ -135,13 +135,13 @@ class BinaryDirect8BitOperator(Operator):
         ):
             for idx, parent in enumerate(parents):
                 if parent.op_type == "DequantizeLinear":
-                    self.node.input[idx] = parent.input[0]
+                    self.quantizer.model.set_node_input(self.node, idx, parent.input[0])
                     self.quantizer.remove_nodes.append(parent)
             for child in children:
                 if child.op_type == "QuantizeLinear":
                     self.quantizer.remove_nodes.append(child)
                     self.quantizer.model.replace_input_of_all_nodes(child.output[0], node.output[0] + "_quantized")
-            node.output[0] = node.output[0] + "_quantized"
+            self.quantizer.model.set_node_output(node, 0, node.output[0] + "_quantized")
 
 
 @qop_registry(op_types="QLinearAdd, QLinearMul")
@@ -66,13 +66,13 @@ class MaxPoolOperator(Operator):
             [i.op_type != "QuantizeLinear" for i in children]
         ):  # pragma: no cover
             return
-        node.input[0] = parent.input[0]
-        node.output[0] = node.output[0].replace("_QuantizeInput", "_quantized")
+        self.quantizer.model.set_node_input(node, 0, parent.input[0])
+        self.quantizer.model.set_node_output(node, 0, node.output[0].replace("_QuantizeInput", "_quantized"))
         for child in children:
             if child.op_type == "QuantizeLinear":
                 self.quantizer.remove_nodes.append(child)
                 for n in self.quantizer.model.get_children(child):
-                    self.quantizer.model.replace_node_input(n, child.output[0], node.output[0])
+                    self.quantizer.model.replace_input_of_node(n, child.output[0], node.output[0])
 
         self.quantizer.remove_nodes.append(parent)
 
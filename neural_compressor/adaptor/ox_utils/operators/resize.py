@@ -68,14 +68,14 @@ class ResizeOperator(Operator):
         ):
             for parent in parents:
                 if parent.op_type == "DequantizeLinear" and parent.output[0] == node.input[0]:
-                    self.node.input[0] = parent.input[0]
+                    self.quantizer.model.set_node_input(self.node, 0, parent.input[0])
                     self.quantizer.remove_nodes.append(parent)
                     break
             for child in children:
                 if child.op_type == "QuantizeLinear":
                     self.quantizer.remove_nodes.append(child)
                     self.quantizer.model.replace_input_of_all_nodes(child.output[0], node.output[0] + "_quantized")
-            node.output[0] = node.output[0] + "_quantized"
+            self.quantizer.model.set_node_output(node, 0, node.output[0] + "_quantized")
 
 
 @qop_registry(op_types="Resize")
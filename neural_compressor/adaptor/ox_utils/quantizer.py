@@ -230,7 +230,7 @@ class Quantizer:
             self.model.remove_nodes(self.remove_nodes)
             self.model.graph().node.extend(self.new_nodes)
             for node, old_input_name, new_input_name in self.replace_input:
-                self.model.replace_node_input(node, old_input_name, new_input_name)
+                self.model.replace_input_of_node(node, old_input_name, new_input_name)
             self.model.update()
         elif self.mode != "qdq" or not self.dedicated_qdq_pair:
             target_type = ["QuantizeLinear", "DequantizeLinear"]
@@ -262,7 +262,7 @@ class Quantizer:
                 self.model.remove_nodes(self.remove_nodes)
                 self.model.graph().node.extend(self.new_nodes)
                 for node, old_input_name, new_input_name in self.replace_input:
-                    self.model.replace_node_input(node, old_input_name, new_input_name)
+                    self.model.replace_input_of_node(node, old_input_name, new_input_name)
                 self.model.update()
 
         if self.mode == "qdq":
@@ -278,7 +278,7 @@ class Quantizer:
                                         [sibling, sibling.input[inp_idx], self.model.get_children(node)[0].output[0]]
                                     )
             for node, old_input_name, new_input_name in self.replace_input:
-                self.model.replace_node_input(node, old_input_name, new_input_name)
+                self.model.replace_input_of_node(node, old_input_name, new_input_name)
             self.model.update()
 
     def should_cast(self, node):
@@ -305,7 +305,7 @@ class Quantizer:
         self.model.remove_nodes(self.remove_nodes)
 
         for node, old_input_name, new_input_name in self.replace_input:
-            self.model.replace_node_input(node, old_input_name, new_input_name)
+            self.model.replace_input_of_node(node, old_input_name, new_input_name)
         self.model.update()
 
     def should_convert(self, node):
@@ -334,7 +334,7 @@ class Quantizer:
         self.model.graph().node.extend(self.new_nodes)
         self.model.remove_nodes(self.remove_nodes)
         for node, old_input_name, new_input_name in self.replace_input:
-            self.model.replace_node_input(node, old_input_name, new_input_name)
+            self.model.replace_input_of_node(node, old_input_name, new_input_name)
         self.model.update()
 
     def remove_redundant_pairs(self):
@@ -436,7 +436,7 @@ class Quantizer:
                     dfs(visited_op, n, match_pair)
         self.model.remove_nodes(self.remove_nodes)
         for node, old_input_name, new_input_name in self.replace_input:
-            self.model.replace_node_input(node, old_input_name, new_input_name)
+            self.model.replace_input_of_node(node, old_input_name, new_input_name)
         self.model.update()
 
     def cast_inputs(self, node, cfg, indices=None):
@@ -452,7 +452,7 @@ class Quantizer:
                 if do_cast_new_tensor:
                     # add cast initializer and update its name
                     self.model.add_initializer(do_cast_new_tensor)
-                    node.input[idx] = do_cast_new_tensor.name
+                    self.model.set_node_input(node, idx, do_cast_new_tensor.name)
 
                     # if origin initializer is no more used, remove it
                     self.model.update()
@@ -474,7 +474,7 @@ class Quantizer:
                 self.new_nodes.append(
                     onnx.helper.make_node("Cast", [tensor_name], [name], to=dtype_mapping[cfg], name=name)
                 )
-                node.input[idx] = name
+                self.model.set_node_input(node, idx, name)
                 self.new_value_info[name] = ValueInfo(tensor_name, TensorProto.FLOAT, dtype_mapping[cfg])
 
     def cast_outputs(self, node, cfg, indices=None):
@@ -488,7 +488,7 @@ class Quantizer:
                 and self.value_infos[tensor_name].type.tensor_type.elem_type != TensorProto.FLOAT
             ):
                 continue
-            node.output[idx] = tensor_name + "_to_cast_" + str(idx)
+            self.model.set_node_output(node, idx, tensor_name + "_to_cast_" + str(idx))
             name = node.name + "_output_cast" + str(idx)
             self.new_nodes.append(onnx.helper.make_node("Cast", [node.output[idx]], [tensor_name], to=1, name=name))
             self.new_value_info[node.output[idx]] = ValueInfo(tensor_name, dtype_mapping[cfg], TensorProto.FLOAT)
@@ -527,7 +527,7 @@ class Quantizer:
                     "of nodes to be quantized are required.".format(tensor_name)
                 )
 
-            node.output[idx] = tensor_name + "_QuantizeInput"
+            self.model.set_node_output(node, idx, tensor_name + "_QuantizeInput")
             q_input = node.output[idx]
             q_output = tensor_name + "_quantized"
             dq_input = q_output
@@ -570,7 +570,7 @@ class Quantizer:
                 if self.add_qdq_pair_to_weight and self.mode == "qdq":
                     weight = self._get_quantized_weight(initializer, dtype, scheme)
                     self._update_weight(weight)
-                    node.input[idx] = weight.name
+                    self.model.set_node_input(node, idx, weight.name)
                     q_weight_name = weight.name + "_quantized"
                     zp_name = weight.name + "_zero_point"
                     scale_name = weight.name + "_scale"
@@ -594,7 +594,7 @@ class Quantizer:
                 else:
                     weight = self._get_quantized_weight(initializer, dtype, scheme)
                     self._update_weight(weight)
-                    node.input[idx] = weight.name
+                    self.model.set_node_input(node, idx, weight.name)
                     q_weight_name = weight.name + "_quantized"
                     zp_name = weight.name + "_zero_point"
                     scale_name = weight.name + "_scale"
@@ -879,7 +879,7 @@ class Quantizer:
                     [weight_name + "_dequantized"],
                     axis,
                 )
-                node.input[idx] = weight_name
+                self.model.set_node_input(node, idx, weight_name)
                 self.replace_input.append([node, weight_name, dequant_node.output[0]])
                 self.new_nodes.extend([qlinear_node, dequant_node])
             else:
@@ -894,7 +894,7 @@ class Quantizer:
                     axis,
                 )
                 self.new_nodes.append(dequant_node)
-                node.input[idx] = weight_name
+                self.model.set_node_input(node, idx, weight_name)
 
                 # Replace weight_name with output of DequantizeLinear
                 self.replace_input.append([node, weight_name, dequant_node.output[0]])
@@ -196,7 +196,7 @@ class ORTSmoothQuant:
         self.model.model.graph.value_info.extend(self.new_added_value_info)
         self.model.add_initializers(self.new_init_tensors)
         for node, old_input_name, new_input_name in self.replace_input:
-            self.model.replace_node_input(node, old_input_name, new_input_name)
+            self.model.replace_input_of_node(node, old_input_name, new_input_name)
 
         self.model.update()
         if folding:
@@ -207,22 +207,28 @@ class ORTSmoothQuant:
 
     def recover(self):
         """Recover the model weights."""
+        new_weights = {}
         for tensor_name, nodes in self.tensors_to_node.items():
             for node_info in nodes:
                 key = node_info[0] if self.scales_per_op else tensor_name
                 if key not in self.tensor_scales_info:
                     continue
                 input = node_info[1][1]
-                weight = numpy_helper.to_array(
-                    self.model.get_initializer(input),
-                    base_dir=os.path.dirname(self.model.model_path) if self.model.model_path is not None else "",
+                # the weight of the nodes sharing it is scaled again
+                weight = (
+                    new_weights[input]
+                    if input in new_weights
+                    else numpy_helper.to_array(
+                        self.model.get_initializer(input),
+                        base_dir=os.path.dirname(self.model.model_path) if self.model.model_path is not None else "",
+                    )
                 )
                 scale = self.tensor_scales_info[key]
-                new_weight = weight * scale
-                self.model.set_initializer(input, new_weight)
+                new_weights[input] = weight * scale
+        self.model.set_initializers(new_weights)
 
         for node, old_input_name, new_input_name in self.replace_input:
-            self.model.replace_node_input(node, new_input_name, old_input_name)
+            self.model.replace_input_of_node(node, new_input_name, old_input_name)
 
         for value_info in self.new_added_value_info:
             self.model.model.graph.value_info.remove(value_info)
@@ -370,7 +376,7 @@ class ORTSmoothQuant:
                             for child in children:
                                 for idx, inp in enumerate(child.input):
                                     if inp == node.output[0]:
-                                        child.input[idx] = node.input[0]
+                                        self.model.set_node_input(child, idx, node.input[0])
         self.model.remove_nodes(remove_nodes)
 
     def _dump_op_info(self, percentile, op_types, iterations, quantize_config=None):
@@ -672,6 +678,7 @@ class ORTSmoothQuant:
         Args:
             scales (dict): The input scales
         """
+        new_weights = {}
         for idx, (tensor_name, nodes) in enumerate(self.tensors_to_node.items()):
             simple_progress_bar(len(self.tensors_to_node), idx + 1)
             for node_info in nodes:
@@ -680,9 +687,14 @@ class ORTSmoothQuant:
                     continue
                 input = node_info[1][1]
                 node = self.model.input_name_to_nodes[input][0]
-                weight = numpy_helper.to_array(
-                    self.model.get_initializer(input),
-                    base_dir=os.path.dirname(self.model.model_path) if self.model.model_path is not None else "",
+                # the weight of the nodes sharing it is scaled again
+                weight = (
+                    new_weights[input]
+                    if input in new_weights
+                    else numpy_helper.to_array(
+                        self.model.get_initializer(input),
+                        base_dir=os.path.dirname(self.model.model_path) if self.model.model_path is not None else "",
+                    )
                 )
                 if len(weight.shape) == 2:
                     scale = (
@@ -705,6 +717,6 @@ class ORTSmoothQuant:
                 else:
                     assert False, "not support"
                 self.tensor_scales_info[key] = 1.0 / scale
+                new_weights[input] = new_weight
 
-                new_tensor = numpy_helper.from_array(new_weight, input)
-                self.model.get_initializer(input).CopyFrom(new_tensor)
+        self.model.set_initializers(new_weights)
@@ -174,7 +174,7 @@ def _get_qrange_for_qType(qType, reduce_range=False):
 
 def split_shared_bias(model):
     """Split shared tensor."""
-    for input_name, node_list in model.input_name_to_nodes.items():
+    for input_name, node_list in list(model.input_name_to_nodes.items()):
         if len(node_list) > 1 and input_name in [i.name for i in model.model.graph.initializer]:
             for node in node_list[1:]:
                 if node.op_type not in ["Conv", "FusedConv"]:
@@ -189,7 +189,7 @@ def split_shared_bias(model):
                         True,
                     )
                     model.add_initializer(new_input)
-                    node.input[2] = new_input_name
+                    model.set_node_input(node, 2, new_input_name)
     return model
 
 
@@ -399,7 +399,7 @@ def rtn_quantize(
                     raw=True,
                 )
                 model.add_initializer(q_weight_tensor)
-                node.input[1] = q_weight_tensor.name
+                model.set_node_input(node, 1, q_weight_tensor.name)
             if init_share_num == 1:
                 model.remove_initializer(weight_tensor)
 
@@ -514,7 +514,7 @@ def apply_awq_scale(model, weight_config, absorb_pairs, output_dicts, num_bits,
                 raw=True,
             )
             model.add_initializer(new_tensor)
-            node.input[1] = new_tensor.name
+            model.set_node_input(node, 1, new_tensor.name)
 
             if init_share_num == 1:
                 model.remove_initializer(weight_tensor)
@@ -526,12 +526,14 @@ def apply_awq_scale(model, weight_config, absorb_pairs, output_dicts, num_bits,
         if parent.op_type in ["LayerNormalization", "BatchNormalization", "InstanceNormalization"] and len(
             model.input_name_to_nodes[nodes[0].input[0]]
         ) == len(nodes):
+            new_tensors = {}
             for idx in [1, 2]:
                 tensor = numpy_helper.to_array(model.get_initializer(parent.input[idx]), base_dir)
                 dtype = tensor.dtype
                 new_tensor = tensor / np.reshape(best_scale, (1, -1))
-                model.set_initializer(parent.input[idx], new_tensor.astype(dtype), raw=True)
+                new_tensors[parent.input[idx]] = new_tensor.astype(dtype)
                 updated_nodes.append(parent.name)
+            model.set_initializers(new_tensors, raw=True)
             output_dicts[parent.output[0]] = output_dicts[parent.output[0]] / np.reshape(best_scale, (1, -1))
 
         elif (
@@ -539,12 +541,14 @@ def apply_awq_scale(model, weight_config, absorb_pairs, output_dicts, num_bits,
             and not all([model.get_initializer(inp) is None for inp in parent.input])
             and len(model.input_name_to_nodes[nodes[0].input[0]]) == len(nodes)
         ):  # pragma: no cover
+            new_tensors = {}
             for inp in parent.input:
                 if model.get_initializer(inp) is not None:
                     tensor = numpy_helper.to_array(model.get_initializer(inp), base_dir)
                     dtype = tensor.dtype
                     new_tensor = tensor / np.reshape(best_scale, (1, -1))
-                    model.set_initializer(inp, new_tensor.astype(dtype), raw=True)
+                    new_tensors[inp] = new_tensor.astype(dtype)
+            model.set_initializers(new_tensors, raw=True)
             updated_nodes.append(parent.name)
             output_dicts[parent.output[0]] = output_dicts[parent.output[0]] / np.reshape(best_scale, (1, -1))
 
@@ -583,7 +587,7 @@ def apply_awq_scale(model, weight_config, absorb_pairs, output_dicts, num_bits,
     model.add_nodes(new_added_mul_nodes)
     model.add_initializers(new_init_tensors)
     for node, old_input_name, new_input_name in replace_input:
-        model.replace_node_input(node, old_input_name, new_input_name)
+        model.replace_input_of_node(node, old_input_name, new_input_name)
 
     return model, output_dicts
 
@@ -1158,7 +1162,7 @@ def gptq_quantize(
                     raw=True,
                 )
                 model.add_initializer(q_weight_tensor)
-                node.input[1] = q_weight_tensor.name
+                model.set_node_input(node, 1, q_weight_tensor.name)
             if init_share_num == 1:
                 model.remove_initializer(weight_tensor)
 
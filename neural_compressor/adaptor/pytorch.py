@@ -1341,7 +1341,7 @@ class TemplateAdaptor(Adaptor):
         assert self.version.release >= Version("1.8").release, "Inspect_tensor only support torch 1.8 or above!"
         from torch import dequantize
 
-        from neural_compressor.utils.utility import dump_data_to_local
+        from neural_compressor.utils.tensor_store import dump_tensor_store
 
         is_quantized = model.is_quantized
         op_list_ = []
@@ -1519,7 +1519,7 @@ class TemplateAdaptor(Adaptor):
         if save_to_disk:
             if not save_path:
                 save_path = self.workspace_path
-            dump_data_to_local(ret, save_path, "inspect_result.pkl")
+            dump_tensor_store(ret, save_path, "inspect_result")
 
         return ret
 
@@ -33,6 +33,7 @@ from ..utils.utility import (
     CpuInfo,
     Dequantize,
     LazyImport,
+    MetricUpdater,
     Statistics,
     dump_elapsed_time,
     singleton,
@@ -445,71 +446,66 @@ class TensorFlowAdaptor(Adaptor):
 
         def eval_func(dataloader):
             results = []
-            for idx, (inputs, labels) in enumerate(dataloader):
-                # dataloader should keep the order and len of inputs same with input_tensor
-                if len(input_tensor) == 1:
-                    feed_dict = {}
-                    if isinstance(inputs, dict) or isinstance(inputs, OrderedDict) or isinstance(inputs, UserDict):
-                        for name in inputs:
-                            for tensor in input_tensor:
-                                pos = tensor.name.rfind(":")
-                                t_name = tensor.name if pos < 0 else tensor.name[:pos]
-                                if name == t_name:
-                                    feed_dict[tensor] = inputs[name]
-                                    break
+            # postprocess and metric updates run on a worker thread while the session runs the next batches.
+            with MetricUpdater(metrics, postprocess) as updater:
+                for idx, (inputs, labels) in enumerate(dataloader):
+                    # dataloader should keep the order and len of inputs same with input_tensor
+                    if len(input_tensor) == 1:
+                        feed_dict = {}
+                        if isinstance(inputs, dict) or isinstance(inputs, OrderedDict) or isinstance(inputs, UserDict):
+                            for name in inputs:
+                                for tensor in input_tensor:
+                                    pos = tensor.name.rfind(":")
+                                    t_name = tensor.name if pos < 0 else tensor.name[:pos]
+                                    if name == t_name:
+                                        feed_dict[tensor] = inputs[name]
+                                        break
+                        else:
+                            feed_dict = {input_tensor[0]: inputs}  # get raw tensor using index [0]
                     else:
-                        feed_dict = {input_tensor[0]: inputs}  # get raw tensor using index [0]
-                else:
-                    assert len(input_tensor) == len(inputs), "inputs len must equal with input_tensor"
-                    feed_dict = {}
-                    if isinstance(inputs, dict) or isinstance(inputs, OrderedDict) or isinstance(inputs, UserDict):
-                        for name in inputs:
-                            for tensor in input_tensor:
-                                pos = tensor.name.rfind(":")
-                                t_name = tensor.name if pos < 0 else tensor.name[:pos]
-                                if name == t_name:
-                                    feed_dict[tensor] = inputs[name]
-                                    break
+                        assert len(input_tensor) == len(inputs), "inputs len must equal with input_tensor"
+                        feed_dict = {}
+                        if isinstance(inputs, dict) or isinstance(inputs, OrderedDict) or isinstance(inputs, UserDict):
+                            for name in inputs:
+                                for tensor in input_tensor:
+                                    pos = tensor.name.rfind(":")
+                                    t_name = tensor.name if pos < 0 else tensor.name[:pos]
+                                    if name == t_name:
+                                        feed_dict[tensor] = inputs[name]
+                                        break
+                        else:
+                            feed_dict = dict(zip(input_tensor, inputs))
+
+                    if model.iter_op:
+                        predictions = iterator_sess_run(
+                            model.sess, model.iter_op, feed_dict, output_tensor, iteration, measurer
+                        )
+                    elif measurer is not None:
+                        measurer.start()
+                        predictions = model.sess.run(output_tensor, feed_dict)
+                        measurer.end()
                     else:
-                        feed_dict = dict(zip(input_tensor, inputs))
-
-                if model.iter_op:
-                    predictions = iterator_sess_run(
-                        model.sess, model.iter_op, feed_dict, output_tensor, iteration, measurer
-                    )
-                elif measurer is not None:
-                    measurer.start()
-                    predictions = model.sess.run(output_tensor, feed_dict)
-                    measurer.end()
-                else:
-                    predictions = model.sess.run(output_tensor, feed_dict)
-
-                if self.fp32_preds_as_label:
-                    self.fp32_results.append(predictions) if fp32_baseline else results.append(predictions)
-
-                # Inspect node output, just get 1st iteration output tensors for now
-                if idx == 0 and tensorboard:
-                    for index, node_name in enumerate(outputs):
-                        tensor = predictions[index]
-                        if node_name in int8_inspect_node_name:
-                            tensor = Dequantize(predictions[index], q_node_scale[node_name])
-                        self._log_histogram(writer, node_name + output_postfix, tensor.astype(np.float32), idx)
-                    writer.close()
-                if isinstance(predictions, list):
-                    if len(origin_output_tensor_names) == 1:
-                        predictions = predictions[0]
-                    elif len(origin_output_tensor_names) > 1:
-                        predictions = predictions[: len(origin_output_tensor_names)]
-                if postprocess is not None:
-                    predictions, labels = postprocess((predictions, labels))
-                if metrics:
-                    for metric in metrics:
-                        if not hasattr(metric, "compare_label") or (
-                            hasattr(metric, "compare_label") and metric.compare_label
-                        ):
-                            metric.update(predictions, labels)
-                if idx + 1 == iteration:
-                    break
+                        predictions = model.sess.run(output_tensor, feed_dict)
+
+                    if self.fp32_preds_as_label:
+                        self.fp32_results.append(predictions) if fp32_baseline else results.append(predictions)
+
+                    # Inspect node output, just get 1st iteration output tensors for now
+                    if idx == 0 and tensorboard:
+                        for index, node_name in enumerate(outputs):
+                            tensor = predictions[index]
+                            if node_name in int8_inspect_node_name:
+                                tensor = Dequantize(predictions[index], q_node_scale[node_name])
+                            self._log_histogram(writer, node_name + output_postfix, tensor.astype(np.float32), idx)
+                        writer.close()
+                    if isinstance(predictions, list):
+                        if len(origin_output_tensor_names) == 1:
+                            predictions = predictions[0]
+                        elif len(origin_output_tensor_names) > 1:
+                            predictions = predictions[: len(origin_output_tensor_names)]
+                    updater.put(predictions, labels)
+                    if idx + 1 == iteration:
+                        break
             return results
 
         if isinstance(dataloader, BaseDataLoader) and not self.benchmark:
@@ -1344,7 +1340,8 @@ class TensorFlowAdaptor(Adaptor):
 
         from neural_compressor.adaptor.tf_utils.graph_util import GraphAnalyzer
         from neural_compressor.model.tensorflow_model import TensorflowBaseModel
-        from neural_compressor.utils.utility import dump_data_to_local, load_data_from_pkl
+        from neural_compressor.utils.tensor_store import dump_tensor_store
+        from neural_compressor.utils.utility import load_data_from_pkl
 
         from .tf_utils.util import int8_node_name_reverse
 
@@ -1392,7 +1389,7 @@ class TensorFlowAdaptor(Adaptor):
         if save_to_disk:
             if not save_path:
                 save_path = "./nc_workspace/tmp/"
-            dump_data_to_local(inspect_result, save_path, "inspect_result.pkl")
+            dump_tensor_store(inspect_result, save_path, "inspect_result")
             logger.info(f"Dumped the inspect tensor to {save_path}")
         return inspect_result
 
@@ -15,12 +15,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Benchmark is used for evaluating the model performance."""
+
 import json
+import multiprocessing
 import os
 import re
 import signal
 import subprocess
 import sys
+from multiprocessing import connection
 from threading import Thread
 
 import numpy as np
@@ -33,7 +36,7 @@ from .adaptor import FRAMEWORKS
 from .config import BenchmarkConfig, options
 from .data import check_dataloader
 from .model import BaseModel, Model
-from .objective import MultiObjective
+from .objective import MultiObjective, Performance
 from .profiling.parser.parser import ProfilingParser
 from .profiling.profiler.profiler import Profiler
 from .utils import OPTIONS, alias_param, logger
@@ -138,6 +141,52 @@ def get_bounded_threads(core_ids, threads, sockets):
     return res
 
 
+def create_benchmark_func(model, conf, b_dataloader):
+    """Create the function which measures the model with the adaptor of the framework.
+
+    Args:
+        model (object):           The model to be benchmarked.
+        conf (BenchmarkConfig):   The configuration for benchmark.
+        b_dataloader:             The dataloader for frameworks.
+
+    Returns:
+        The benchmark function called with the model and a measurer.
+    """
+    GLOBAL_STATE.STATE = MODE.BENCHMARK
+    framework_specific_info = {
+        "device": conf.device,
+        "approach": None,
+        "random_seed": options.random_seed,
+        "backend": conf.backend if conf.backend is not None else "default",
+        "format": "default",
+    }
+    framework = conf.framework.lower()
+    if "tensorflow" in framework:
+        framework_specific_info.update(
+            {"inputs": conf.inputs, "outputs": conf.outputs, "recipes": {}, "workspace_path": options.workspace}
+        )
+    if framework == "keras":
+        framework_specific_info.update({"workspace_path": options.workspace})
+    if framework == "mxnet":
+        framework_specific_info.update({"b_dataloader": b_dataloader})
+    if "onnx" in framework:
+        framework_specific_info.update(
+            {"workspace_path": options.workspace, "graph_optimization": OPTIONS[framework].graph_optimization}
+        )
+    if framework == "pytorch_ipex" or framework == "pytorch" or framework == "pytorch_fx":
+        framework_specific_info.update({"workspace_path": options.workspace, "q_dataloader": None})
+
+    assert isinstance(model, BaseModel), "need set neural_compressor Model for quantization...."
+
+    adaptor = FRAMEWORKS[framework](framework_specific_info)
+
+    assert b_dataloader is not None, "dataloader should not be None"
+
+    from neural_compressor.utils.create_obj_from_config import create_eval_func
+
+    return create_eval_func(conf.framework, b_dataloader, adaptor, None, iteration=conf.iteration)
+
+
 def run_instance(model, conf, b_dataloader=None, b_func=None):
     """Run the instance with the configuration.
 
@@ -152,39 +201,7 @@ def run_instance(model, conf, b_dataloader=None, b_func=None):
     """
     results = {}
     if b_func is None:
-        GLOBAL_STATE.STATE = MODE.BENCHMARK
-        framework_specific_info = {
-            "device": conf.device,
-            "approach": None,
-            "random_seed": options.random_seed,
-            "backend": conf.backend if conf.backend is not None else "default",
-            "format": "default",
-        }
-        framework = conf.framework.lower()
-        if "tensorflow" in framework:
-            framework_specific_info.update(
-                {"inputs": conf.inputs, "outputs": conf.outputs, "recipes": {}, "workspace_path": options.workspace}
-            )
-        if framework == "keras":
-            framework_specific_info.update({"workspace_path": options.workspace})
-        if framework == "mxnet":
-            framework_specific_info.update({"b_dataloader": b_dataloader})
-        if "onnx" in framework:
-            framework_specific_info.update(
-                {"workspace_path": options.workspace, "graph_optimization": OPTIONS[framework].graph_optimization}
-            )
-        if framework == "pytorch_ipex" or framework == "pytorch" or framework == "pytorch_fx":
-            framework_specific_info.update({"workspace_path": options.workspace, "q_dataloader": None})
-
-        assert isinstance(model, BaseModel), "need set neural_compressor Model for quantization...."
-
-        adaptor = FRAMEWORKS[framework](framework_specific_info)
-
-        assert b_dataloader is not None, "dataloader should not be None"
-
-        from neural_compressor.utils.create_obj_from_config import create_eval_func
-
-        b_func = create_eval_func(conf.framework, b_dataloader, adaptor, None, iteration=conf.iteration)
+        b_func = create_benchmark_func(model, conf, b_dataloader)
 
         objectives = MultiObjective(["performance"], {"relative": 0.1}, is_measure=True)
 
@@ -215,6 +232,32 @@ def run_instance(model, conf, b_dataloader=None, b_func=None):
         b_func(model.model)
 
 
+def get_instance_core_lists(num_of_instance, cores_per_instance):
+    """Get the list of cores bound with each instance.
+
+    Args:
+        num_of_instance (int): the number of instances.
+        cores_per_instance (int): the number of cores of each instance.
+
+    Returns:
+        list: the core indexes of each instance as numpy arrays.
+    """
+    if sys.platform in ["linux"] and get_architecture() == "aarch64" and int(get_threads_per_core()) > 1:
+        raise OSError("Currently no support on ARM with hyperthreads")
+    elif sys.platform in ["linux"]:
+        bounded_threads = get_bounded_threads(get_core_ids(), get_threads(), get_physical_ids())
+
+    core_lists = []
+    for i in range(0, num_of_instance):
+        if sys.platform in ["linux"] and get_architecture() == "x86_64":
+            core_list_idx = np.arange(0, cores_per_instance) + i * cores_per_instance
+            core_list = np.array(bounded_threads)[core_list_idx]
+        else:
+            core_list = np.arange(0, cores_per_instance) + i * cores_per_instance
+        core_lists.append(core_list)
+    return core_lists
+
+
 def generate_prefix(core_list):
     """Generate the command prefix with numactl.
 
@@ -269,17 +312,7 @@ def config_instance(raw_cmd):
     logger.info("num of instance: {}".format(num_of_instance))
     logger.info("cores per instance: {}".format(cores_per_instance))
 
-    if sys.platform in ["linux"] and get_architecture() == "aarch64" and int(get_threads_per_core()) > 1:
-        raise OSError("Currently no support on ARM with hyperthreads")
-    elif sys.platform in ["linux"]:
-        bounded_threads = get_bounded_threads(get_core_ids(), get_threads(), get_physical_ids())
-
-    for i in range(0, num_of_instance):
-        if sys.platform in ["linux"] and get_architecture() == "x86_64":
-            core_list_idx = np.arange(0, cores_per_instance) + i * cores_per_instance
-            core_list = np.array(bounded_threads)[core_list_idx]
-        else:
-            core_list = np.arange(0, cores_per_instance) + i * cores_per_instance
+    for i, core_list in enumerate(get_instance_core_lists(num_of_instance, cores_per_instance)):
         # bind cores only allowed in linux/mac os with numactl enabled
         prefix = generate_prefix(core_list)
         instance_cmd = "{} {}".format(prefix, raw_cmd)
@@ -352,6 +385,215 @@ def summary_benchmark():
         pass
 
 
+class BenchmarkResult:
+    """The result of a multi-instance benchmark run by `benchmark_in_process`.
+
+    Attributes:
+        latencies (list): the durations in seconds of the measured iterations of each instance.
+        batch_size (int): the batch size of the dataloader.
+        throughput (float): the sum of the throughputs of all instances in samples/second.
+        latency_mean (float): the average latency in second/sample.
+        latency_p50, latency_p90, latency_p99 (float): the percentiles of the latency in second/sample.
+    """
+
+    def __init__(self, latencies, batch_size, cores_per_instance):
+        """Init a BenchmarkResult.
+
+        Args:
+            latencies (list): the durations in seconds of the measured iterations of each instance.
+            batch_size (int): the batch size of the dataloader.
+            cores_per_instance (int): the number of cores bound with each instance.
+        """
+        assert all(len(latency) > 0 for latency in latencies), "Multiple instance benchmark failed with some instance!"
+        self.latencies = latencies
+        self.batch_size = batch_size
+        self.num_of_instance = len(latencies)
+        self.cores_per_instance = cores_per_instance
+        self.throughput = sum(batch_size * len(latency) / latency.sum() for latency in latencies)
+        sample_latencies = np.concatenate(latencies) / batch_size
+        self.latency_mean = sample_latencies.mean()
+        self.latency_p50, self.latency_p90, self.latency_p99 = np.percentile(sample_latencies, [50, 90, 99])
+
+    def summary(self):
+        """Print the summary table of the benchmark."""
+        output_data = [
+            ["Latency average [second/sample]", "{:.6f}".format(self.latency_mean)],
+            ["Latency p50 [second/sample]", "{:.6f}".format(self.latency_p50)],
+            ["Latency p90 [second/sample]", "{:.6f}".format(self.latency_p90)],
+            ["Latency p99 [second/sample]", "{:.6f}".format(self.latency_p99)],
+            ["Throughput sum [samples/second]", "{:.3f}".format(self.throughput)],
+        ]
+        logger.info("********************************************")
+        Statistics(
+            output_data, header="Multiple Instance Benchmark Summary", field_names=["Items", "Result"]
+        ).print_stat()
+
+
+class SharedMemoryPerformance(Performance):
+    """The latency measurer of an instance of `benchmark_in_process`.
+
+    The first iteration starts once all instances are ready, and the latency of each iteration is written to the
+    memory shared with the main process.
+    """
+
+    def __init__(self, barrier, latencies, counts, index, capacity, start_timeout=None):
+        """Init a SharedMemoryPerformance.
+
+        Args:
+            barrier (multiprocessing.Barrier): the barrier waited by all instances before the first iteration.
+            latencies (multiprocessing.RawArray): the latencies of all instances, `capacity` slots per instance.
+            counts (multiprocessing.RawArray): the number of measured iterations of each instance.
+            index (int): the index of the instance.
+            capacity (int): the max number of iterations recorded per instance.
+            start_timeout (float, optional): the max seconds to wait for the other instances. Defaults to None,
+                which waits until the barrier is aborted.
+        """
+        super().__init__()
+        self.barrier = barrier
+        self.start_timeout = start_timeout
+        self.latencies = latencies
+        self.counts = counts
+        self.index = index
+        self.capacity = capacity
+        self.started = False
+
+    def start(self):
+        """Wait for the other instances before the first iteration, then start the timer."""
+        if not self.started:
+            self.barrier.wait(timeout=self.start_timeout)
+            self.started = True
+        super().start()
+
+    def end(self):
+        """Stop the timer and write the latency to the shared memory."""
+        super().end()
+        count = self.counts[self.index]
+        if count < self.capacity:
+            self.latencies[self.index * self.capacity + count] = self.duration
+            self.counts[self.index] = count + 1
+
+
+def _run_pinned_instance(
+    index, core_list, model, conf, b_dataloader, barrier, latencies, counts, capacity, start_timeout
+):
+    """Run one instance of `benchmark_in_process` on its cores."""
+    os.sched_setaffinity(0, [int(core) for core in core_list])
+    measurer = SharedMemoryPerformance(barrier, latencies, counts, index, capacity, start_timeout)
+    try:
+        if conf.backend == "ipex":
+            import intel_extension_for_pytorch
+        # the model is loaded by each instance, after the thread settings of the instance are in place.
+        model = Model(model, conf=conf)
+        create_benchmark_func(model, conf, b_dataloader)(model, measurer)
+    finally:
+        # release the other instances if this one fails before its first iteration
+        if not measurer.started:
+            barrier.abort()
+
+
+def benchmark_in_process(model, conf, b_dataloader, start_timeout=3600):
+    """Benchmark the model with multiple instances without launching and parsing shell commands.
+
+    Each instance is a process spawned from the current one and bound to its own cores. It starts with the thread
+    environment variables of its cores, e.g. OMP_NUM_THREADS, and loads the model itself, since the frameworks are
+    not fork-safe once their thread pools are initialized. The instances start their first iteration together and
+    stream their latencies back over shared memory. The model and the dataloader are pickled to the instances, so
+    pass the model path rather than a loaded model if possible, and run it under `if __name__ == "__main__":`.
+    Once an instance fails, e.g. it is killed before its first iteration, the other instances are terminated.
+
+    Args:
+        model (object):           The model to be benchmarked, e.g. the path of the model.
+        conf (BenchmarkConfig):   The configuration for benchmark.
+        b_dataloader:             The dataloader for frameworks.
+        start_timeout (float):    The max seconds an instance waits for the others to be ready. Defaults to 3600.
+
+    Returns:
+        BenchmarkResult: the throughput and the latency statistics of all instances.
+
+    Example::
+
+        from neural_compressor.benchmark import benchmark_in_process
+
+        conf = BenchmarkConfig(iteration=100, cores_per_instance=4, num_of_instance=7)
+        result = benchmark_in_process(model='./int8.pb', conf=conf, b_dataloader=eval_dataloader)
+        print(result.throughput, result.latency_p99)
+    """
+    assert sys.platform in ["linux"], "in-process benchmark is only supported on linux..."
+    check_dataloader(b_dataloader)
+    set_all_env_var(conf)
+    num_of_instance = int(conf.num_of_instance)
+    cores_per_instance = int(conf.cores_per_instance)
+    core_lists = get_instance_core_lists(num_of_instance, cores_per_instance)
+    logger.info("num of instance: {}".format(num_of_instance))
+    logger.info("cores per instance: {}".format(cores_per_instance))
+
+    if conf.iteration > 0:
+        capacity = conf.iteration
+    else:
+        try:
+            capacity = len(b_dataloader)
+        except TypeError:  # pragma: no cover
+            capacity = 10000
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(num_of_instance)
+    latencies = context.RawArray("d", num_of_instance * capacity)
+    counts = context.RawArray("l", num_of_instance)
+    processes = [
+        context.Process(
+            target=_run_pinned_instance,
+            args=(i, core_list, model, conf, b_dataloader, barrier, latencies, counts, capacity, start_timeout),
+            daemon=True,
+        )
+        for i, core_list in enumerate(core_lists)
+    ]
+    # the spawned instances inherit the environment variables, so they are set before any framework is imported.
+    thread_env_vars = {var: os.environ.get(var) for var in ["OMP_NUM_THREADS", "CORES_PER_INSTANCE"]}
+    try:
+        for process, core_list in zip(processes, core_lists):
+            for var in thread_env_vars:
+                set_env_var(var, len(core_list), overwrite_existing=True)
+            process.start()
+    finally:
+        for var, value in thread_env_vars.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+    failed = []
+    try:
+        running = list(processes)
+        while running and not failed:
+            connection.wait([process.sentinel for process in running])
+            for process in [process for process in running if not process.is_alive()]:
+                running.remove(process)
+                if process.exitcode != 0:
+                    failed.append(processes.index(process))
+        if failed:
+            # release the instances waiting for the failed one at the barrier, the others are stopped
+            barrier.abort()
+            for process in running:
+                process.terminate()
+            for process in running:
+                process.join()
+    except KeyboardInterrupt:  # pragma: no cover
+        for process in processes:
+            process.terminate()
+        raise
+    if failed:
+        raise RuntimeError("Multiple instance benchmark failed with instance {}.".format(failed))
+
+    instance_latencies = []
+    for i in range(num_of_instance):
+        latency = np.array(latencies[i * capacity : i * capacity + counts[i]])
+        warmup = conf.warmup
+        if len(latency) < warmup:
+            warmup = 1 if len(latency) > 1 and warmup != 0 else 0
+        instance_latencies.append(latency[warmup:])
+    result = BenchmarkResult(instance_latencies, b_dataloader.batch_size, cores_per_instance)
+    result.summary()
+    return result
+
+
 def profile(model, conf, b_dataloader) -> None:
     """Execute profiling for benchmark configuration.
 
@@ -14,6 +14,11 @@
 
 
 import copy
+import json
+import multiprocessing
+import os
+import pickle
+import queue
 import uuid
 from typing import Any, Callable, Dict, Generator, Iterator, List, Optional, Sized, Tuple, Union
 
@@ -32,24 +37,77 @@ __all__ = [
     "SequentialSampler",
     "default_sampler",
     "ConfigSet",
+    "ParallelTrialExecutor",
+    "TrialResultCache",
 ]
 
 
+class TrialResultCache:
+    """On-disk cache of the evaluation results of the fp32 baseline and tuning trials.
+
+    The results of one model are stored in `{cache_dir}/{model_fingerprint}.json`, where the fingerprint is a hash of
+    the model weights and structure computed by the framework. Trial results are keyed by the quantization config,
+    so rerunning a tuning job with the same model and configs doesn't evaluate them again.
+
+    Note: the evaluation function isn't part of the key, please use another `cache_dir` if it is changed.
+    """
+
+    BASELINE_KEY = "baseline"
+
+    def __init__(self, cache_dir: str, model_fingerprint: str) -> None:
+        self.cache_path = os.path.join(cache_dir, f"{model_fingerprint}.json")
+        self.results: Dict[str, Union[float, int]] = {}
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path) as f:
+                self.results = json.load(f)
+            logger.info(f"Loaded {len(self.results)} cached evaluation results from {self.cache_path}.")
+
+    @classmethod
+    def get_key(cls, quant_config: Optional[BaseConfig] = None) -> str:
+        if quant_config is None:
+            return cls.BASELINE_KEY
+        return f"{quant_config.__class__.__name__} {quant_config.to_json_string()}"
+
+    def get(self, quant_config: Optional[BaseConfig] = None) -> Optional[Union[float, int]]:
+        """Get the cached result of a quantization config, or the fp32 baseline if `quant_config` is None."""
+        return self.results.get(self.get_key(quant_config))
+
+    def put(self, result: Union[float, int], quant_config: Optional[BaseConfig] = None) -> None:
+        self.results[self.get_key(quant_config)] = result
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        # write to a temporary file first to keep the cache file complete if the process is killed.
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.results, f, indent=2)
+        os.replace(tmp_path, self.cache_path)
+
+
 class EvaluationFuncWrapper:
-    def __init__(self, eval_fn: Callable, eval_args=None):
+    def __init__(self, eval_fn: Callable, eval_args=None, result_cache: Optional[TrialResultCache] = None):
         """Evaluation function wrapper.
 
         Args:
             eval_fn: a function for evaluated the float or quantized model
             eval_args: positional arguments for `eval_fn`
+            result_cache: the cache of evaluation results from previous tuning runs. Defaults to None.
         """
         self.eval_fn = eval_fn
         self.eval_args = eval_args
+        self.result_cache = result_cache
 
     def evaluate(self, model) -> Union[float, int]:
         result = self.eval_fn(model, *self.eval_args) if self.eval_args else self.eval_fn(model)
         return result
 
+    def evaluate_baseline(self, model) -> Union[float, int]:
+        """Evaluate the fp32 model, the result of previous tuning runs is reused if it is cached."""
+        if self.result_cache is not None:
+            cached_result = self.result_cache.get()
+            if cached_result is not None:
+                logger.info("Reuse the cached fp32 baseline.")
+                return cached_result
+        return self.evaluate(model)
+
 
 class Evaluator:
     """Evaluator is a collection of evaluation functions.
@@ -271,6 +329,8 @@ class TuningConfig:
         sampler: Sampler = default_sampler,
         tolerable_loss=0.01,
         max_trials=100,
+        num_workers=1,
+        cache_dir=None,
     ):
         """Initial a TuningConfig.
 
@@ -280,11 +340,20 @@ class TuningConfig:
             tolerable_loss: This float indicates how much metric loss we can accept.
                 The metric loss is relative, it can be both positive and negative. Default is 0.01.
             max_trials: Max tuning times. Combine with `tolerable_loss` field to decide when to stop. Default is 100.
+            num_workers: The number of worker processes that run trials in parallel, each worker gets its own share
+                of cores. The workers are spawned, so the evaluation function must be picklable, e.g. a module-level
+                function, and the main script must be guarded by `if __name__ == "__main__":`. Otherwise the trials
+                run one after another. Default is 1, which runs trials one after another in the current process.
+            cache_dir: The directory of the on-disk cache of evaluation results. If it is set, the fp32 baseline and
+                the trials already evaluated with the same model and config in previous runs are not evaluated again.
+                Default is None, which disables the cache.
         """
         self.config_set = config_set
         self.sampler = sampler
         self.tolerable_loss = tolerable_loss
         self.max_trials = max_trials
+        self.num_workers = num_workers
+        self.cache_dir = cache_dir
 
 
 class _TrialRecord:
@@ -302,31 +371,57 @@ class _TrialRecord:
 
 
 class TuningMonitor:
-    def __init__(self, tuning_config: TuningConfig) -> None:
+    def __init__(self, tuning_config: TuningConfig, result_cache: Optional[TrialResultCache] = None) -> None:
         self.tuning_config = tuning_config
         self.trial_cnt = 0
         self.tuning_history: List[_TrialRecord] = []
         self.baseline = None
+        self.result_cache = result_cache
 
     def add_trial_result(self, trial_index: int, trial_result: Union[int, float], quant_config: BaseConfig) -> None:
         self.trial_cnt += 1
         trial_record = _TrialRecord(trial_index, trial_result, quant_config)
         self.tuning_history.append(trial_record)
+        if self.result_cache is not None:
+            self.result_cache.put(trial_result, quant_config)
+
+    def get_cached_trial_result(self, quant_config: BaseConfig) -> Optional[Union[int, float]]:
+        """Get the result of a trial evaluated in previous tuning runs, None if it is not cached."""
+        if self.result_cache is None:
+            return None
+        cached_result = self.result_cache.get(quant_config)
+        if cached_result is not None:
+            logger.info("Reuse the cached evaluation result: %.4f", cached_result)
+        return cached_result
 
     def set_baseline(self, baseline: float):
         self.baseline = baseline
         logger.info(f"Fp32 baseline is {self.baseline}")
+        if self.result_cache is not None:
+            self.result_cache.put(baseline)
 
     def get_number_of_trials(self):
         return len(self.tuning_history)
 
-    def get_best_quant_config(self) -> BaseConfig:
+    def get_best_trial_record(self) -> _TrialRecord:
         assert self.get_number_of_trials() > 0, "No trial record in tuning monitor."
         # Put the record with a higher score at the beginning
         sorted_trials_records: List[_TrialRecord] = sorted(
             self.tuning_history, key=lambda x: x.trial_result, reverse=True
         )
-        return sorted_trials_records[0].quant_config
+        return sorted_trials_records[0]
+
+    def get_best_quant_config(self) -> BaseConfig:
+        return self.get_best_trial_record().quant_config
+
+    def is_best_trial(self, trial_index: int) -> bool:
+        """Check if the trial is the best one so far, the earliest trial wins a tie."""
+        return self.get_best_trial_record().trial_index == trial_index
+
+    def meet_accuracy_goal(self, trial_result: Union[int, float]) -> bool:
+        if self.baseline is None:
+            return False
+        return trial_result >= (self.baseline * (1 - self.tuning_config.tolerable_loss))
 
     def need_stop(self) -> bool:
         """Check if need to stop tuning. Either accuracy goal is met, max trials is reached or timeout is reached.
@@ -338,17 +433,185 @@ class TuningMonitor:
         # reach max trials
         reach_max_trials = self.trial_cnt >= self.tuning_config.max_trials
         # reach accuracy goal
-        meet_accuracy_goal = (
-            False
-            if self.baseline is None
-            else self.tuning_history[-1].trial_result >= (self.baseline * (1 - self.tuning_config.tolerable_loss))
-        )
         # [-1] is the last element representing the latest trail record.
+        meet_accuracy_goal = self.meet_accuracy_goal(self.tuning_history[-1].trial_result)
         return reach_max_trials or meet_accuracy_goal
 
 
-def init_tuning(tuning_config: TuningConfig) -> Tuple[ConfigLoader, TuningLogger, TuningMonitor]:
+# The states of a trial worker process, they are sent to the worker when it starts.
+_trial_worker_states: Dict[str, Any] = {}
+
+
+def _init_trial_worker(quant_fn, eval_fn, min_accepted_result, core_queue, worker_init_fn):
+    cores = core_queue.get()
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    if worker_init_fn is not None:
+        worker_init_fn(cores)
+    _trial_worker_states.update(quant_fn=quant_fn, eval_fn=eval_fn, min_accepted_result=min_accepted_result)
+
+
+def _run_trial_in_worker(trial_index: int, quant_config: BaseConfig):
+    TuningLogger.quantization_start()
+    q_model = _trial_worker_states["quant_fn"](quant_config)
+    TuningLogger.quantization_end()
+    TuningLogger.evaluation_start()
+    eval_result = _trial_worker_states["eval_fn"](q_model)
+    TuningLogger.evaluation_end()
+    # Only send back the models that may be the final result, the others are dropped in the worker.
+    serialized_model = None
+    min_accepted_result = _trial_worker_states["min_accepted_result"]
+    if min_accepted_result is not None and eval_result >= min_accepted_result:
+        try:
+            serialized_model = pickle.dumps(q_model)
+        except Exception as e:
+            logger.warning(
+                "Failed to send back the quantized model of trial %d, it will be rebuilt: %s", trial_index, e
+            )
+    return trial_index, eval_result, serialized_model
+
+
+class ParallelTrialExecutor:
+    """Run tuning trials in a pool of worker processes.
+
+    The workers are spawned rather than forked, since the thread pools of the frameworks (e.g. GNU OpenMP) are not
+    fork-safe once they are initialized in the current process. So `quant_fn`, `eval_fn` and `worker_init_fn` are
+    pickled to the workers, use `is_picklable` to check them before running. Each worker is bound to its own share of
+    the available cores and at most `num_workers` trials are in flight.
+
+    The results are fed to the tuning monitor in the order of the trial index, so the tuning stops at the same trial
+    and picks the same best trial as the sequential tuning, while the later trials already run ahead. The quantized
+    model of the winning trial is sent back by its worker instead of being rebuilt, unless it can't be pickled.
+
+    Examples:
+        executor = ParallelTrialExecutor(quant_fn, eval_fn, num_workers=4)
+        best_quant_model = executor.run(config_loader, tuning_monitor, tuning_logger)
+    """
+
+    def __init__(
+        self,
+        quant_fn: Callable[[BaseConfig], Any],
+        eval_fn: Callable[[Any], Union[float, int]],
+        num_workers: int,
+        worker_init_fn: Optional[Callable[[List[int]], None]] = None,
+    ) -> None:
+        """Init a ParallelTrialExecutor.
+
+        Args:
+            quant_fn: a picklable function that returns a quantized model for the given quantization config.
+            eval_fn: a picklable function that evaluates a quantized model.
+            num_workers: the number of worker processes.
+            worker_init_fn: a picklable function called with the core ids bound to a worker when the worker starts,
+                e.g. to set the number of threads of the framework.
+        """
+        self.quant_fn = quant_fn
+        self.eval_fn = eval_fn
+        self.num_workers = num_workers
+        self.worker_init_fn = worker_init_fn
+
+    def is_picklable(self) -> bool:
+        """Check whether the functions can be sent to the spawned workers."""
+        try:
+            pickle.dumps((self.quant_fn, self.eval_fn, self.worker_init_fn))
+        except Exception as e:
+            logger.warning("The quantization or evaluation function can't be sent to the trial workers: %s", e)
+            return False
+        return True
+
+    def _split_cores(self) -> List[List[int]]:
+        cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count()))
+        if len(cores) < self.num_workers:
+            return [[cores[i % len(cores)]] for i in range(self.num_workers)]
+        cores_per_worker = len(cores) // self.num_workers
+        return [cores[i * cores_per_worker : (i + 1) * cores_per_worker] for i in range(self.num_workers)]
+
+    def run(self, config_loader: ConfigLoader, tuning_monitor: "TuningMonitor", tuning_logger: TuningLogger) -> Any:
+        """Run trials until the tuning monitor asks to stop.
+
+        Returns:
+            The quantized model with the best config, or None if all configs were tried before the monitor stops.
+        """
+        context = multiprocessing.get_context("spawn")
+        core_queue = context.Queue()
+        for cores in self._split_cores():
+            core_queue.put(cores)
+        min_accepted_result = None
+        if tuning_monitor.baseline is not None:
+            min_accepted_result = tuning_monitor.baseline * (1 - tuning_monitor.tuning_config.tolerable_loss)
+        finished_trials = queue.Queue()
+        pending_configs = iter(enumerate(config_loader))
+        quant_configs: Dict[int, BaseConfig] = {}
+        # the finished trials which wait for the earlier trials.
+        unordered_trials: Dict[int, Tuple[int, Union[float, int], Optional[bytes]]] = {}
+        next_trial_index = 0
+        best_quant_model = None
+        stopped = False
+        pool = context.Pool(
+            processes=self.num_workers,
+            initializer=_init_trial_worker,
+            initargs=(self.quant_fn, self.eval_fn, min_accepted_result, core_queue, self.worker_init_fn),
+        )
+        try:
+
+            def submit_next_trial() -> bool:
+                if len(quant_configs) >= tuning_monitor.tuning_config.max_trials:
+                    return False
+                trial = next(pending_configs, None)
+                if trial is None:
+                    return False
+                trial_index, quant_config = trial
+                quant_configs[trial_index] = quant_config
+                tuning_logger.trial_start(trial_index=trial_index)
+                logger.info(quant_config.to_dict())
+                cached_result = tuning_monitor.get_cached_trial_result(quant_config)
+                if cached_result is not None:
+                    finished_trials.put((trial_index, cached_result, None))
+                    return True
+                pool.apply_async(
+                    _run_trial_in_worker,
+                    (trial_index, quant_config),
+                    callback=finished_trials.put,
+                    error_callback=finished_trials.put,
+                )
+                return True
+
+            num_running = sum(submit_next_trial() for _ in range(self.num_workers))
+            while num_running > 0 and not stopped:
+                finished_trial = finished_trials.get()
+                num_running -= 1
+                if isinstance(finished_trial, BaseException):
+                    raise finished_trial
+                unordered_trials[finished_trial[0]] = finished_trial
+                while next_trial_index in unordered_trials:
+                    trial_index, eval_result, serialized_model = unordered_trials.pop(next_trial_index)
+                    next_trial_index += 1
+                    logger.info("Evaluation result of trial %d: %.4f", trial_index, eval_result)
+                    tuning_monitor.add_trial_result(trial_index, eval_result, quant_configs[trial_index])
+                    tuning_logger.trial_end(trial_index)
+                    if tuning_monitor.is_best_trial(trial_index):
+                        best_quant_model = pickle.loads(serialized_model) if serialized_model is not None else None
+                    if tuning_monitor.need_stop():
+                        logger.info("Stopped tuning.")
+                        stopped = True
+                        break
+                if not stopped:
+                    num_running += submit_next_trial()
+        finally:
+            # terminate the running trials that are no longer needed.
+            pool.terminate()
+            pool.join()
+        if not stopped:
+            return None
+        if best_quant_model is None:
+            # the model of the best trial was not sent back by the worker or the trial result was cached.
+            best_quant_model = self.quant_fn(tuning_monitor.get_best_quant_config())
+        return best_quant_model
+
+
+def init_tuning(
+    tuning_config: TuningConfig, result_cache: Optional[TrialResultCache] = None
+) -> Tuple[ConfigLoader, TuningLogger, TuningMonitor]:
     config_loader = ConfigLoader(config_set=tuning_config.config_set, sampler=tuning_config.sampler)
     tuning_logger = TuningLogger()
-    tuning_monitor = TuningMonitor(tuning_config)
+    tuning_monitor = TuningMonitor(tuning_config, result_cache=result_cache)
     return config_loader, tuning_logger, tuning_monitor
@@ -18,8 +18,11 @@
 """Default dataloader for multiple framework backends."""
 
 import collections
+import threading
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from math import ceil, floor
+from queue import Empty, Full, Queue
 
 import numpy as np
 
@@ -60,6 +63,7 @@ class DefaultDataLoader(BaseDataLoader):  # pragma: no cover
         pin_memory=False,
         shuffle=False,
         distributed=False,
+        prefetch_factor=2,
     ):
         """Initialize DefaultDataLoader.
 
@@ -72,10 +76,12 @@ class DefaultDataLoader(BaseDataLoader):  # pragma: no cover
             collate_fn (callable, optional): merge data with outer dimension batch size. Defaults to None.
             sampler (Sampler, optional): Sampler object to sample data. Defaults to None.
             batch_sampler (BatchSampler, optional): BatchSampler object to generate batch of indices. Defaults to None.
-            num_workers (int, optional): number of subprocesses to use for data loading. Defaults to 0.
+            num_workers (int, optional): number of worker threads to fetch and collate batches ahead of the
+                                         consumer, 0 means the data is loaded in the calling thread. Defaults to 0.
             pin_memory (bool, optional): whether to copy data into pinned memory before returning. Defaults to False.
             shuffle (bool, optional): whether to shuffle data. Defaults to False.
             distributed (bool, optional): whether the dataloader is distributed. Defaults to False.
+            prefetch_factor (int, optional): number of batches loaded in advance by each worker. Defaults to 2.
         """
         self.dataset = dataset
         self.last_batch = last_batch
@@ -87,6 +93,7 @@ class DefaultDataLoader(BaseDataLoader):  # pragma: no cover
         self._batch_size = batch_size
         self.shuffle = shuffle
         self.distributed = distributed
+        self.prefetch_factor = prefetch_factor
         self.drop_last = False if last_batch == "rollover" else True
         if self.collate_fn is None:
             self.collate_fn = default_collate
@@ -152,6 +159,13 @@ class DefaultDataLoader(BaseDataLoader):  # pragma: no cover
         self.batch_sampler = BatchSampler(sampler, batch_size, self.drop_last)
         self.fetcher = FETCHERS[self.dataset_type](dataset, collate_fn, self.drop_last, distributed)
 
+        if num_workers > 0:
+            # the sampler only yields the indices of this process, so the workers load its shard of the dataset.
+            if self.dataset_type == "index":
+                yield from self._generate_index_batches(num_workers)
+            else:
+                yield from self._generate_iterable_batches(num_workers)
+            return
         for batched_indices in self.batch_sampler:
             try:
                 data = self.fetcher(batched_indices)
@@ -159,6 +173,73 @@ class DefaultDataLoader(BaseDataLoader):  # pragma: no cover
             except StopIteration:
                 return
 
+    def _generate_index_batches(self, num_workers):
+        """Fetch batches in a pool of workers and yield them in the order of the batch sampler."""
+        max_pending = max(1, num_workers * self.prefetch_factor)
+        pending = collections.deque()
+        executor = ThreadPoolExecutor(max_workers=num_workers)
+        try:
+            for batched_indices in self.batch_sampler:
+                pending.append(executor.submit(self.fetcher, batched_indices))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _generate_iterable_batches(self, num_workers):
+        """Fetch batches of an iterable dataset in a background thread.
+
+        The samples of an iterable dataset can only be drawn in order, so one thread fetches and collates the batches
+        ahead of the consumer through a bounded queue.
+        """
+        queue = Queue(maxsize=max(1, num_workers * self.prefetch_factor))
+        stopped = threading.Event()
+        end = object()
+
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    queue.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for batched_indices in self.batch_sampler:
+                    if not put(self.fetcher(batched_indices)):
+                        return
+            except StopIteration:
+                pass
+            except BaseException as e:
+                put((end, e))
+                return
+            put((end, None))
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = queue.get()
+                if isinstance(item, tuple) and len(item) == 2 and item[0] is end:
+                    if item[1] is not None:
+                        raise item[1]
+                    return
+                yield item
+        finally:
+            stopped.set()
+            try:
+                while True:
+                    queue.get_nowait()
+            except Empty:
+                pass
+            producer.join()
+
     def _generate_sampler(self, dataset, distributed):
         if hasattr(dataset, "__getitem__"):
             self.dataset_type = "index"
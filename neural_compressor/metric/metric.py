@@ -602,15 +602,13 @@ class Accuracy(BaseMetric):
     that were correct classified.
 
     Attributes:
-        pred_list: List of prediction to score.
-        label_list: List of labels to score.
+        correct_num: The number of predictions that were correct classified.
         sample: The total number of samples.
     """
 
     def __init__(self):
-        """Initialize predictions, labels and sample."""
-        self.pred_list = []
-        self.label_list = []
+        """Initialize the number of correct predictions and samples."""
+        self.correct_num = 0
         self.sample = 0
 
     def update(self, preds, labels, sample_weight=None):
@@ -624,12 +622,13 @@ class Accuracy(BaseMetric):
         preds, labels = _accuracy_shape_check(preds, labels)
         update_type = _accuracy_type_check(preds, labels)
         if update_type == "binary":
-            self.pred_list.extend(preds)
-            self.label_list.extend(labels)
+            if preds.size == labels.size:
+                # binary predictions of shape (N, 1) are compared with labels of shape (N,) per sample
+                preds = preds.reshape(labels.shape)
+            self.correct_num += np.sum(preds == labels)
             self.sample += labels.shape[0]
         elif update_type == "multiclass":
-            self.pred_list.extend(np.argmax(preds, axis=1).astype("int32"))
-            self.label_list.extend(labels)
+            self.correct_num += np.sum(np.argmax(preds, axis=1).astype("int32") == labels)
             self.sample += labels.shape[0]
         elif update_type == "multilabel":
             # (N, C, ...) -> (N*..., C)
@@ -642,18 +641,16 @@ class Accuracy(BaseMetric):
                 preds = preds.transpose(trans_list).reshape(-1, num_label)
                 labels = labels.transpose(trans_list).reshape(-1, num_label)
             self.sample += preds.shape[0] * preds.shape[1]
-            self.pred_list.append(preds)
-            self.label_list.append(labels)
+            self.correct_num += np.sum(preds == labels)
 
     def reset(self):
-        """Clear the predictions and labels."""
-        self.pred_list = []
-        self.label_list = []
+        """Reset the number of correct predictions and samples."""
+        self.correct_num = 0
         self.sample = 0
 
     def result(self):
         """Compute the accuracy."""
-        correct_num = np.sum(np.array(self.pred_list) == np.array(self.label_list))
+        correct_num = self.correct_num
         if getattr(self, "_hvd", None) is not None:
             allghter_correct_num = sum(self._hvd.allgather_object(correct_num))
             allgather_sample = sum(self._hvd.allgather_object(self.sample))
@@ -763,21 +760,21 @@ class MAE(BaseMetric):
     difference between the predicted and actual numeric values.
 
     Attributes:
-        pred_list: List of prediction to score.
-        label_list: List of references corresponding to the prediction result.
+        aes_sum: The sum of absolute errors.
+        aes_size: The number of compared elements.
         compare_label (bool): Whether to compare label. False if there are no
           labels and will use FP32 preds as labels.
     """
 
     def __init__(self, compare_label=True):
-        """Initialize the list of prediction and labels.
+        """Initialize the sum and number of absolute errors.
 
         Args:
             compare_label: Whether to compare label. False if there are no
               labels and will use FP32 preds as labels.
         """
-        self.label_list = []
-        self.pred_list = []
+        self.aes_sum = 0
+        self.aes_size = 0
         self.compare_label = compare_label
 
     def update(self, preds, labels, sample_weight=None):
@@ -789,13 +786,15 @@ class MAE(BaseMetric):
             sample_weight: The sample weight.
         """
         preds, labels = _shape_validate(preds, labels)
-        self.label_list.extend(labels)
-        self.pred_list.extend(preds)
+        for label, pred in zip(labels, preds):
+            ae = abs(label - pred)
+            self.aes_sum += np.sum(ae)
+            self.aes_size += ae.size
 
     def reset(self):
-        """Clear the predictions and labels."""
-        self.label_list = []
-        self.pred_list = []
+        """Reset the sum and number of absolute errors."""
+        self.aes_sum = 0
+        self.aes_size = 0
 
     def result(self):
         """Compute the MAE score.
@@ -803,9 +802,8 @@ class MAE(BaseMetric):
         Returns:
             The MAE score.
         """
-        aes = [abs(a - b) for (a, b) in zip(self.label_list, self.pred_list)]
-        aes_sum = sum([np.sum(ae) for ae in aes])
-        aes_size = sum([ae.size for ae in aes])
+        aes_sum = self.aes_sum
+        aes_size = self.aes_size
         assert aes_size, "predictions shouldn't be none"
         if getattr(self, "_hvd", None) is not None:
             aes_sum = sum(self._hvd.allgather_object(aes_sum))
@@ -864,21 +862,21 @@ class MSE(BaseMetric):
     and the actual values.
 
     Attributes:
-        pred_list: List of prediction to score.
-        label_list: List of references corresponding to the prediction result.
+        squares_sum: The sum of squared errors.
+        squares_size: The number of compared elements.
         compare_label (bool): Whether to compare label. False if there are no labels
                               and will use FP32 preds as labels.
     """
 
     def __init__(self, compare_label=True):
-        """Initialize the list of prediction and labels.
+        """Initialize the sum and number of squared errors.
 
         Args:
             compare_label: Whether to compare label. False if there are no
               labels and will use FP32 preds as labels.
         """
-        self.label_list = []
-        self.pred_list = []
+        self.squares_sum = 0
+        self.squares_size = 0
         self.compare_label = compare_label
 
     def update(self, preds, labels, sample_weight=None):
@@ -890,13 +888,15 @@ class MSE(BaseMetric):
             sample_weight: The sample weight.
         """
         preds, labels = _shape_validate(preds, labels)
-        self.pred_list.extend(preds)
-        self.label_list.extend(labels)
+        for label, pred in zip(labels, preds):
+            square = (label - pred) ** 2.0
+            self.squares_sum += np.sum(square)
+            self.squares_size += square.size
 
     def reset(self):
-        """Clear the predictions and labels."""
-        self.label_list = []
-        self.pred_list = []
+        """Reset the sum and number of squared errors."""
+        self.squares_sum = 0
+        self.squares_size = 0
 
     def result(self):
         """Compute the MSE score.
@@ -904,9 +904,8 @@ class MSE(BaseMetric):
         Returns:
             The MSE score.
         """
-        squares = [(a - b) ** 2.0 for (a, b) in zip(self.label_list, self.pred_list)]
-        squares_sum = sum([np.sum(square) for square in squares])
-        squares_size = sum([square.size for square in squares])
+        squares_sum = self.squares_sum
+        squares_size = self.squares_size
         assert squares_size, "predictions shouldn't be None"
         if getattr(self, "_hvd", None) is not None:
             squares_sum = sum(self._hvd.allgather_object(squares_sum))
@@ -1028,12 +1027,8 @@ class GeneralTopK(BaseMetric):
             self.num_correct += correct
 
         else:
-            for p, l in zip(preds, labels):
-                # get top-k labels with np.argpartition
-                # p = np.argpartition(p, -self.k)[-self.k:]
-                l = l.astype("int32")
-                if l in p:
-                    self.num_correct += 1
+            # a label is correct if it is among the top-k predictions of its sample
+            self.num_correct += int(np.sum(np.any(preds == labels.astype("int32"), axis=1)))
 
         self.num_sample += len(labels)
 
@@ -62,12 +62,7 @@ class ONNXModel(BaseModel):
             self._config = AutoConfig.from_pretrained(Path(model).parent.as_posix())
 
         self.node_name_counter = {}
-        self._output_name_to_node = {}
-        self._input_name_to_nodes = {}
-        self._get_input_name_to_nodes(self._model.graph.node)
-        self._get_output_name_to_node(self._model.graph.node)
-        self._graph_info = {}
-        self._get_graph_info()
+        self.update()
         self._q_config = None
 
     def check_is_large_model(self):
@@ -136,12 +131,7 @@ class ONNXModel(BaseModel):
     def model(self, model):
         """Set model itself."""
         self._model = model
-        self._graph_info = {}
-        self._get_graph_info()
-        self._output_name_to_node = {}
-        self._input_name_to_nodes = {}
-        self._get_input_name_to_nodes(self._model.graph.node)
-        self._get_output_name_to_node(self._model.graph.node)
+        self.update()
 
     def input(self):
         """Return input of model."""
@@ -157,8 +147,36 @@ class ONNXModel(BaseModel):
         self._get_graph_info()
         self._output_name_to_node = {}
         self._input_name_to_nodes = {}
+        self._has_subgraph = False
         self._get_input_name_to_nodes(self._model.graph.node)
         self._get_output_name_to_node(self._model.graph.node)
+        self._get_name_index()
+
+    def _get_name_index(self):
+        """Index the nodes and initializers by name, the first one of a name is indexed as a linear search finds."""
+        self._name_to_node = {node.name: node for node in reversed(self._model.graph.node)}
+        self._name_to_initializer = {tensor.name: tensor for tensor in reversed(self._model.graph.initializer)}
+        self._graph_signature = self._get_graph_signature()
+
+    def _get_graph_signature(self):
+        """Get the length, the first and the last element of the node and initializer lists.
+
+        The indexes are updated by the methods of ONNXModel. The signature changes when the lists are changed in place
+        by other code, e.g. graph().node.extend or ClearField, so the indexes are rebuilt before they are used.
+        """
+        return [
+            (len(items), items[0] if len(items) > 0 else None, items[-1] if len(items) > 0 else None)
+            for items in [self._model.graph.node, self._model.graph.initializer]
+        ]
+
+    def _check_index(self):
+        """Rebuild the indexes if the node or initializer lists are changed by other code."""
+        for (length, first, last), (indexed_length, indexed_first, indexed_last) in zip(
+            self._get_graph_signature(), self._graph_signature
+        ):
+            if length != indexed_length or first is not indexed_first or last is not indexed_last:
+                self.update()
+                return
 
     @property
     def graph_info(self):
@@ -218,26 +236,44 @@ class ONNXModel(BaseModel):
 
     def remove_node(self, node):
         """Remove a node from model."""
-        if node in self._model.graph.node:
-            self._model.graph.node.remove(node)
+        self.remove_nodes([node])
 
     def remove_nodes(self, nodes_to_remove):
         """Remove nodes from model."""
-        for node in nodes_to_remove:
-            self.remove_node(node)
+        self._check_index()
+        removed_nodes, removed_by_equality = self._remove_items(self._model.graph.node, nodes_to_remove)
+        if removed_by_equality:
+            self.update()
+            return
+        for node in removed_nodes:
+            if self._name_to_node.get(node.name) is node:
+                del self._name_to_node[node.name]
+            self._remove_node_from_io_index(node)
+        self._graph_signature = self._get_graph_signature()
 
     def add_node(self, node):
         """Add a node to model."""
-        self._model.graph.node.extend([node])
+        self.add_nodes([node])
 
     def add_nodes(self, nodes_to_add):
         """Add nodes to model."""
+        self._check_index()
+        nodes_to_add = list(nodes_to_add)
         self._model.graph.node.extend(nodes_to_add)
+        # the nodes are copied into the graph, index the copies
+        for node in self._model.graph.node[len(self._model.graph.node) - len(nodes_to_add) :]:
+            self._name_to_node.setdefault(node.name, node)
+            self._graph_info[node.name] = node.op_type
+            self._add_node_to_io_index(node)
+        self._graph_signature = self._get_graph_signature()
 
     def add_initializer(self, tensor):
         """Add a initializer to model."""
-        if ortq.find_by_name(tensor.name, self._model.graph.initializer) is None:
+        self._check_index()
+        if tensor.name not in self._name_to_initializer:
             self._model.graph.initializer.extend([tensor])
+            self._name_to_initializer[tensor.name] = self._model.graph.initializer[-1]
+            self._graph_signature = self._get_graph_signature()
 
     def add_initializers(self, tensors):
         """Add initializers to model."""
@@ -246,10 +282,8 @@ class ONNXModel(BaseModel):
 
     def get_initializer(self, name):
         """Get an initializer by name."""
-        for tensor in self._model.graph.initializer:
-            if tensor.name == name:
-                return tensor
-        return None
+        self._check_index()
+        return self._name_to_initializer.get(name, None)
 
     def get_initializer_share_num(self, name):
         """Get the number of shares of initializer."""
@@ -257,6 +291,8 @@ class ONNXModel(BaseModel):
         if self.get_initializer(name) is None:
             return num
 
+        if not self._has_subgraph:
+            return len({id(node) for node in self._input_name_to_nodes.get(name, []) if name in node.input})
         for node in self.nodes():
             if name in node.input:
                 num += 1
@@ -264,33 +300,142 @@ class ONNXModel(BaseModel):
 
     def get_node(self, name):
         """Get a node by name."""
-        for node in self._model.graph.node:
-            if node.name == name:
-                return node
-        return None
+        self._check_index()
+        return self._name_to_node.get(name, None)
 
     def remove_initializer(self, tensor):
         """Remove an initializer from model."""
-        if tensor in self._model.graph.initializer:
-            self._model.graph.initializer.remove(tensor)
+        self.remove_initializers([tensor])
 
     def remove_initializers(self, init_to_remove):
         """Remove initializers from model."""
-        for initializer in init_to_remove:
-            self.remove_initializer(initializer)
+        self._check_index()
+        removed_tensors, removed_by_equality = self._remove_items(self._model.graph.initializer, init_to_remove)
+        if removed_by_equality:
+            self.update()
+            return
+        for tensor in removed_tensors:
+            if self._name_to_initializer.get(tensor.name) is tensor:
+                del self._name_to_initializer[tensor.name]
+        self._graph_signature = self._get_graph_signature()
+
+    @staticmethod
+    def _remove_items(items, items_to_remove):
+        """Remove the items from the repeated field in one pass.
+
+        The items are found by identity, the ones not found are removed by equality as before.
+
+        Returns:
+            tuple: the removed items and whether some items are removed by equality, then the indexes are rebuilt.
+        """
+        items_to_remove = {id(item): item for item in items_to_remove if item is not None}
+        positions = [position for position, item in enumerate(items) if id(item) in items_to_remove]
+        removed_items = [items[position] for position in positions]
+        for position in reversed(positions):
+            del items[position]
+        for item in removed_items:
+            del items_to_remove[id(item)]
+        removed_by_equality = False
+        for item in items_to_remove.values():
+            if item in items:
+                items.remove(item)
+                removed_items.append(item)
+                removed_by_equality = True
+        return removed_items, removed_by_equality
+
+    def _add_node_to_io_index(self, node):
+        """Add the node to the input and output indexes, the lists are copied as they may be iterated."""
+        for attr in node.attribute:
+            if attr.type == onnx.AttributeProto.GRAPH or attr.type == onnx.AttributeProto.GRAPHS:
+                self._has_subgraph = True
+                for subgraph_node in attr.g.node:
+                    self._add_node_to_io_index(subgraph_node)
+        for input_name in node.input:
+            if len(input_name.strip()) != 0:
+                self._input_name_to_nodes[input_name] = self._input_name_to_nodes.get(input_name, []) + [node]
+        for output_name in node.output:
+            if len(output_name.strip()) != 0:
+                self._output_name_to_node[output_name] = node
+
+    def _remove_node_from_io_index(self, node):
+        """Remove the node from the input and output indexes, the lists are copied as they may be iterated."""
+        for attr in node.attribute:
+            if attr.type == onnx.AttributeProto.GRAPH or attr.type == onnx.AttributeProto.GRAPHS:
+                for subgraph_node in attr.g.node:
+                    self._remove_node_from_io_index(subgraph_node)
+        for input_name in node.input:
+            if input_name in self._input_name_to_nodes:
+                nodes = [i for i in self._input_name_to_nodes[input_name] if i is not node]
+                if len(nodes) > 0:
+                    self._input_name_to_nodes[input_name] = nodes
+                else:
+                    del self._input_name_to_nodes[input_name]
+        for output_name in node.output:
+            if self._output_name_to_node.get(output_name) is node:
+                del self._output_name_to_node[output_name]
 
     def set_initializer(self, tensor, array, raw=False):
         """Update initializer."""
-        old_tensor = self.get_initializer(tensor)
-        self.remove_initializer(old_tensor)
-        dims = old_tensor.dims
-        data_type = old_tensor.data_type
-        new_tensor = (
-            onnx.helper.make_tensor(tensor, data_type, dims, array.flatten().tolist())
-            if not raw
-            else onnx.helper.make_tensor(tensor, data_type, dims, array.tostring(), raw=raw)
-        )
-        self.add_initializer(new_tensor)
+        self.set_initializers({tensor: array}, raw=raw)
+
+    def set_initializers(self, tensors, raw=False):
+        """Update initializers in place in one pass.
+
+        The data of numeric initializers is written to raw_data from the contiguous array buffers. The initializers
+        stored as external data of a large model are kept in memory too, until save() writes all the external data.
+
+        Args:
+            tensors (dict): the new arrays of the initializer names, which are cast to the initializer data types.
+            raw (bool, optional): make the initializers of the other data types, e.g. bfloat16, with raw data.
+                Defaults to False.
+        """
+        import numpy as np
+
+        for name, array in tensors.items():
+            tensor = self.get_initializer(name)
+            np_dtype = self._get_raw_data_dtype(tensor.data_type)
+            if np_dtype is None:
+                self.remove_initializer(tensor)
+                self.add_initializer(
+                    onnx.helper.make_tensor(name, tensor.data_type, tensor.dims, array.flatten().tolist())
+                    if not raw
+                    else onnx.helper.make_tensor(name, tensor.data_type, tensor.dims, array.tobytes(), raw=raw)
+                )
+                continue
+
+            # raw data is little-endian, the array is only copied if the dtype or the layout differs
+            data = np.ascontiguousarray(array, dtype=np.dtype(np_dtype).newbyteorder("<"))
+            if data.size != int(np.prod(tensor.dims, dtype=np.int64)):
+                raise ValueError(
+                    "Number of values does not match tensor's size. Expected {}, but it is {}.".format(
+                        int(np.prod(tensor.dims, dtype=np.int64)), data.size
+                    )
+                )
+            for field in ["float_data", "int32_data", "int64_data", "double_data", "uint64_data"]:
+                tensor.ClearField(field)
+            tensor.ClearField("external_data")
+            tensor.ClearField("data_location")
+            tensor.raw_data = data.tobytes()
+
+    @staticmethod
+    def _get_raw_data_dtype(data_type):
+        """Get the numpy dtype of the data type whose raw data is the numpy buffer, or None."""
+        import numpy as np
+
+        return {
+            onnx.TensorProto.FLOAT: np.float32,
+            onnx.TensorProto.UINT8: np.uint8,
+            onnx.TensorProto.INT8: np.int8,
+            onnx.TensorProto.UINT16: np.uint16,
+            onnx.TensorProto.INT16: np.int16,
+            onnx.TensorProto.INT32: np.int32,
+            onnx.TensorProto.INT64: np.int64,
+            onnx.TensorProto.BOOL: np.bool_,
+            onnx.TensorProto.FLOAT16: np.float16,
+            onnx.TensorProto.DOUBLE: np.float64,
+            onnx.TensorProto.UINT32: np.uint32,
+            onnx.TensorProto.UINT64: np.uint64,
+        }.get(data_type, None)
 
     @property
     def input_name_to_nodes(self):
@@ -306,6 +451,7 @@ class ONNXModel(BaseModel):
                 if attr.type == onnx.AttributeProto.GRAPH or attr.type == onnx.AttributeProto.GRAPHS
             ]
             if len(attrs) > 0:
+                self._has_subgraph = True
                 for attr in attrs:
                     self._get_input_name_to_nodes(attr.g.node)
             for input_name in node.input:
@@ -469,6 +615,15 @@ class ONNXModel(BaseModel):
 
     def replace_input_of_all_nodes(self, old_input_name, new_input_name, white_optype=[], black_optype=[]):
         """Replace inputs of all nodes."""
+        self._check_index()
+        if not self._has_subgraph:
+            # only the nodes consuming the old input are visited
+            for node in list({id(node): node for node in self._input_name_to_nodes.get(old_input_name, [])}.values()):
+                if (len(white_optype) > 0 and node.op_type in white_optype) or (
+                    len(white_optype) == 0 and node.op_type not in black_optype
+                ):
+                    self.replace_input_of_node(node, old_input_name, new_input_name)
+            return
         if len(white_optype) > 0:
             for node in self.model.graph.node:
                 if node.op_type in white_optype:
@@ -477,6 +632,36 @@ class ONNXModel(BaseModel):
             for node in self.model.graph.node:
                 if node.op_type not in black_optype:
                     ONNXModel.replace_node_input(node, old_input_name, new_input_name)
+        self.update()
+
+    def replace_input_of_node(self, node, old_input_name, new_input_name):
+        """Replace input of a node and update the input index of the model."""
+        assert isinstance(old_input_name, str) and isinstance(new_input_name, str)
+        for j in range(len(node.input)):
+            if node.input[j] == old_input_name:
+                self.set_node_input(node, j, new_input_name)
+
+    def set_node_input(self, node, index, name):
+        """Set an input of a node.
+
+        The inputs of the nodes in the model should be set by this method or the replace methods, so the input index
+        used by get_initializer_share_num and replace_input_of_all_nodes is kept up to date. The nodes not added to the
+        model yet are only edited.
+        """
+        self._check_index()
+        old_name = node.input[index]
+        nodes = self._input_name_to_nodes.get(old_name, [])
+        position = next((i for i, indexed_node in enumerate(nodes) if indexed_node is node), None)
+        node.input[index] = name
+        if position is None and self._name_to_node.get(node.name) is not node:
+            return
+        if position is not None:
+            if len(nodes) > 1:
+                self._input_name_to_nodes[old_name] = nodes[:position] + nodes[position + 1 :]
+            else:
+                del self._input_name_to_nodes[old_name]
+        if len(name.strip()) != 0:
+            self._input_name_to_nodes[name] = self._input_name_to_nodes.get(name, []) + [node]
 
     @staticmethod
     def replace_node_output(node, old_output_name, new_output_name):
@@ -488,6 +673,18 @@ class ONNXModel(BaseModel):
 
     def replace_output_of_all_nodes(self, old_output_name, new_output_name, white_optype=[], black_optype=[]):
         """Replace outputs of all nodes."""
+        self._check_index()
+        if not self._has_subgraph:
+            # only the node producing the old output is visited
+            node = self._output_name_to_node.get(old_output_name, None)
+            if node is not None and (
+                (len(white_optype) > 0 and node.op_type in white_optype)
+                or (len(white_optype) == 0 and node.op_type not in black_optype)
+            ):
+                for j in range(len(node.output)):
+                    if node.output[j] == old_output_name:
+                        self.set_node_output(node, j, new_output_name)
+            return
         if len(white_optype) > 0:
             for node in self.model.graph.node:
                 if node.op_type in white_optype:
@@ -496,6 +693,19 @@ class ONNXModel(BaseModel):
             for node in self.model.graph.node:
                 if node.op_type not in black_optype:
                     ONNXModel.replace_node_output(node, old_output_name, new_output_name)
+        self.update()
+
+    def set_node_output(self, node, index, name):
+        """Set an output of a node and update the output index of the model, see set_node_input."""
+        self._check_index()
+        old_name = node.output[index]
+        node.output[index] = name
+        if self._output_name_to_node.get(old_name) is node:
+            del self._output_name_to_node[old_name]
+        elif self._name_to_node.get(node.name) is not node:
+            return
+        if len(name.strip()) != 0:
+            self._output_name_to_node[name] = node
 
     def remove_unused_nodes(self):
         """Remove unused nodes."""
@@ -33,6 +33,91 @@ logger = Logger().get_logger()
 __all__ = ["Calibrator"]
 
 
+def _abs_per_channel(data):
+    """Reshape a tensor to (-1, input channel) and get its absolute values."""
+    if len(data.shape) == 3:  # TODO: mammul batchsize*seq*inchannel, conv:batchsize*inchannle*f*f
+        return np.abs(np.reshape(data, (-1, data.shape[-1])))
+    elif len(data.shape) == 4:
+        tensor = np.swapaxes(data, 1, -1)
+        return np.abs(np.reshape(tensor, (-1, tensor.shape[-1])))
+    elif len(data.shape) == 2:
+        return np.abs(data)
+    else:
+        assert False, "not supported"
+
+
+class PerChannelPercentileCollector:
+    """Fold calibration batches into the per input channel percentile of absolute values.
+
+    Only the largest values of each channel which can affect the percentile are kept, so the memory is
+    O(channels * (100 - percentile) / 100 * samples) instead of O(channels * samples). If the total number of
+    samples is known, exactly the values needed for it are kept. Otherwise the kept size is doubled ahead of the
+    samples seen so far, and `is_exact` tells whether the result is still the same as np.percentile over all data,
+    which fails if the number of samples more than doubles after a value is dropped.
+    """
+
+    def __init__(self, percentile: float, num_samples: int = None):
+        """Initialize a PerChannelPercentileCollector.
+
+        Args:
+            percentile (float): percentile of calibration to remove outliers.
+            num_samples (int, optional): the total number of samples per channel if it is known. Defaults to None.
+        """
+        self.percentile = percentile
+        self.total_num_samples = num_samples
+        self.num_samples = 0
+        self.top_values = None
+        # the max of the dropped values per channel.
+        self.max_dropped = None
+        self.shape = None
+
+    def _get_top_k(self, num_samples):
+        # np.percentile interpolates between the sorted values at floor(index) and floor(index) + 1.
+        index = self.percentile / 100 * (num_samples - 1)
+        return num_samples - int(np.floor(index))
+
+    def collect(self, data):
+        """Fold a batch of a tensor into the collector."""
+        if self.shape is None:
+            self.shape = data.shape
+        data = _abs_per_channel(data)
+        self.num_samples += data.shape[0]
+        if self.top_values is not None:
+            data = np.concatenate([self.top_values, data], axis=0)
+        if self.total_num_samples is not None:
+            k = self._get_top_k(self.total_num_samples)
+        else:
+            k = self._get_top_k(2 * self.num_samples)
+        if k < data.shape[0]:
+            data = np.partition(data, data.shape[0] - k, axis=0)
+            max_dropped = data[: data.shape[0] - k].max(axis=0)
+            if self.max_dropped is not None:
+                max_dropped = np.maximum(self.max_dropped, max_dropped)
+            self.max_dropped = max_dropped
+            data = data[data.shape[0] - k :]
+        self.top_values = data
+
+    def is_exact(self):
+        """Check whether the kept values are enough to get the exact percentile of all collected data."""
+        if self.max_dropped is None:
+            return True
+        # the kept values are the largest ones of each channel, and they include the interpolated ones.
+        num_dropped = self.num_samples - self.top_values.shape[0]
+        index = self.percentile / 100 * (self.num_samples - 1)
+        return bool(np.all(self.top_values.min(axis=0) >= self.max_dropped)) and np.floor(index) >= num_dropped
+
+    def result(self):
+        """Get the max values per input channel."""
+        top_values = np.sort(self.top_values, axis=0)
+        index = self.percentile / 100 * (self.num_samples - 1)
+        # the index in top_values of the value at floor(index) of all sorted values.
+        low = int(np.floor(index)) - (self.num_samples - top_values.shape[0])
+        high = min(low + 1, top_values.shape[0] - 1)
+        fraction = index - np.floor(index)
+        max_per_channels = top_values[low] + fraction * (top_values[high] - top_values[low])
+        return max_per_channels.astype(np.single)
+
+
 class Calibrator:
     """Dump information for smooth quant."""
 
@@ -124,26 +209,23 @@ class Calibrator:
         Returns:
             The max values per input channel
         """
-        permute_datas = []
-        for data in datas:
-            if len(data.shape) == 3:  # TODO: mammul batchsize*seq*inchannel, conv:batchsize*inchannle*f*f
-                tensor = np.abs(np.reshape(data, (-1, data.shape[-1])))
-                permute_datas.append(tensor)
-            elif len(data.shape) == 4:
-                tensor = np.swapaxes(data, 1, -1)
-                tensor = np.abs(np.reshape(tensor, (-1, tensor.shape[-1])))
-                permute_datas.append(tensor)
-            elif len(data.shape) == 2:
-                permute_datas.append(np.abs(data))
-            else:
-                assert False, "not supported"
+        permute_datas = [_abs_per_channel(data) for data in datas]
         permute_datas = np.stack(permute_datas, axis=0)
         permute_datas = permute_datas.reshape(-1, permute_datas.shape[-1])
         max_per_channels = np.percentile(permute_datas, percentile, axis=0)
         max_per_channels = max_per_channels.astype(np.single)
         return max_per_channels
 
-    def get_intermediate_outputs(self):
+    def get_intermediate_outputs(self, collectors: dict = None):
+        """Run the augmented model on the calibration data and get the outputs.
+
+        Args:
+            collectors (dict, optional): output name to an object with `collect` method. If given, each output is
+                passed to its collector as soon as the batch finishes instead of being kept. Defaults to None.
+
+        Returns:
+            dict: output name to the list of outputs of each batch, the outputs passed to collectors are not included.
+        """
         so = onnxruntime.SessionOptions()
         if sys.version_info < (3, 11) and find_spec("onnxruntime_extensions"):  # pragma: no cover
             from onnxruntime_extensions import get_library_path
@@ -186,7 +268,11 @@ class Calibrator:
 
         def _collect_data(ort_inputs):
             for output_idx, output in enumerate(session.run(None, ort_inputs)):
-                output_dicts.setdefault(node_output_names[output_idx], []).append(output)
+                output_name = node_output_names[output_idx]
+                if collectors is not None and output_name in collectors:
+                    collectors[output_name].collect(output)
+                else:
+                    output_dicts.setdefault(output_name, []).append(output)
 
         idx = 0
         while True:
@@ -203,7 +289,7 @@ class Calibrator:
             idx += 1
         return output_dicts
 
-    def calib_smooth(self, op_types, percentile: float = 99.999):
+    def calib_smooth(self, op_types, percentile: float = 99.999, streaming: bool = True):
         """Smooth model calibration.
 
         Mainly get the max info per channel of input tensors.
@@ -212,6 +298,8 @@ class Calibrator:
             op_types (_type_): The op types whose input tensor will be dumped.
             percentile (float, optional): Percentile of calibration to remove outliers.
                 Defaults to 99.999.
+            streaming (bool, optional): Whether to fold each batch into per channel statistics once it is
+                computed instead of keeping all the input tensors. Defaults to True.
 
         Returns:
             max_vals_per_channel: max values per channel of input tensors
@@ -221,7 +309,19 @@ class Calibrator:
         # add the input tensors of {op_types} to outputs of the model
         tensors_to_node = self._get_input_tensor_of_ops(op_types)
         self.model_wrapper.add_tensors_to_outputs(tensors_to_node.keys())
-        output_dicts = self.get_intermediate_outputs()
+        collectors = None
+        if streaming:
+            collectors = {key: PerChannelPercentileCollector(percentile) for key in tensors_to_node}
+        output_dicts = self.get_intermediate_outputs(collectors)
+        if streaming and not all(collector.is_exact() for collector in collectors.values()):
+            # the number of samples grew faster than expected, so the calibration runs again with the known number.
+            logger.info("Rerun smooth model calibration with the known number of samples.")
+            collectors = {
+                key: PerChannelPercentileCollector(percentile, collector.num_samples)
+                for key, collector in collectors.items()
+            }
+            self.dataloader.rewind()
+            output_dicts = self.get_intermediate_outputs(collectors)
 
         # remove the input tensors of {op_types} to outputs of the model
         self.model_wrapper.remove_tensors_from_outputs(tensors_to_node.keys())
@@ -229,9 +329,12 @@ class Calibrator:
         shape_infos = {}
 
         for key, val in tensors_to_node.items():
-            max_val_per_channel = self._get_max_per_channel(output_dicts[key], percentile=percentile)
-            max_vals_per_channel[key] = max_val_per_channel
-            shape_infos[key] = output_dicts[key][0].shape
+            if streaming:
+                max_vals_per_channel[key] = collectors[key].result()
+                shape_infos[key] = collectors[key].shape
+            else:
+                max_vals_per_channel[key] = self._get_max_per_channel(output_dicts[key], percentile=percentile)
+                shape_infos[key] = output_dicts[key][0].shape
             for item in val:
                 shape_infos[item[1][1]] = self.model_wrapper.get_initializer(item[1][1]).dims
         return max_vals_per_channel, shape_infos, tensors_to_node
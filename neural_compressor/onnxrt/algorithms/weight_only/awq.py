@@ -28,7 +28,12 @@ from packaging.version import Version
 
 from neural_compressor.common import Logger
 from neural_compressor.onnxrt.algorithms.weight_only.rtn import rtn_quantize
-from neural_compressor.onnxrt.algorithms.weight_only.utility import pad_tensor, prepare_inputs, qdq_tensor
+from neural_compressor.onnxrt.algorithms.weight_only.utility import (
+    pad_tensor,
+    prepare_inputs,
+    qdq_tensor,
+    save_augmented_model,
+)
 from neural_compressor.onnxrt.quantization.calibrate import CalibrationDataReader
 from neural_compressor.onnxrt.quantization.config import AWQConfig
 from neural_compressor.onnxrt.utils.onnx_model import ONNXModel
@@ -144,7 +149,7 @@ def _apply_awq_scale(model, weight_config, absorb_pairs, output_dicts, num_bits,
                 raw=True,
             )
             model.add_initializer(new_tensor)
-            node.input[1] = new_tensor.name
+            model.set_node_input(node, 1, new_tensor.name)
 
             if init_share_num == 1:
                 model.remove_initializer(weight_tensor)
@@ -156,12 +161,14 @@ def _apply_awq_scale(model, weight_config, absorb_pairs, output_dicts, num_bits,
         if parent.op_type in ["LayerNormalization", "BatchNormalization", "InstanceNormalization"] and len(
             model.input_name_to_nodes()[nodes[0].input[0]]
         ) == len(nodes):
+            new_tensors = {}
             for idx in [1, 2]:
                 tensor = onnx.numpy_helper.to_array(model.get_initializer(parent.input[idx]), base_dir)
                 dtype = tensor.dtype
                 new_tensor = tensor / np.reshape(best_scale, (1, -1))
-                model.set_initializer(parent.input[idx], new_tensor.astype(dtype), raw=True)
+                new_tensors[parent.input[idx]] = new_tensor.astype(dtype)
                 updated_nodes.append(parent.name)
+            model.set_initializers(new_tensors, raw=True)
             output_dicts[parent.output[0]] = output_dicts[parent.output[0]] / np.reshape(best_scale, (1, -1))
 
         elif (
@@ -169,12 +176,14 @@ def _apply_awq_scale(model, weight_config, absorb_pairs, output_dicts, num_bits,
             and not all([model.get_initializer(inp) is None for inp in parent.input])
             and len(model.input_name_to_nodes()[nodes[0].input[0]]) == len(nodes)
         ):  # pragma: no cover
+            new_tensors = {}
             for inp in parent.input:
                 if model.get_initializer(inp) is not None:
                     tensor = onnx.numpy_helper.to_array(model.get_initializer(inp), base_dir)
                     dtype = tensor.dtype
                     new_tensor = tensor / np.reshape(best_scale, (1, -1))
-                    model.set_initializer(inp, new_tensor.astype(dtype), raw=True)
+                    new_tensors[inp] = new_tensor.astype(dtype)
+            model.set_initializers(new_tensors, raw=True)
             updated_nodes.append(parent.name)
             output_dicts[parent.output[0]] = output_dicts[parent.output[0]] / np.reshape(best_scale, (1, -1))
 
@@ -213,7 +222,7 @@ def _apply_awq_scale(model, weight_config, absorb_pairs, output_dicts, num_bits,
     model.add_nodes(new_added_mul_nodes)
     model.add_initializers(new_init_tensors)
     for node, old_input_name, new_input_name in replace_input:
-        model.replace_node_input(node, old_input_name, new_input_name)
+        model.replace_input_of_node(node, old_input_name, new_input_name)
 
     return model, output_dicts
 
@@ -325,43 +334,12 @@ def awq_quantize(
     if enable_mse_search:
         inputs, so = prepare_inputs(model, data_reader, providers)
         del data_reader
+        try:
+            org_output = copy.deepcopy(model.model.graph.output)
+            model.remove_tensors_from_outputs([i.name for i in org_output])
 
-        org_output = copy.deepcopy(model.model.graph.output)
-        model.remove_tensors_from_outputs([i.name for i in org_output])
-
-        output_names = []
-        for node in model.nodes():
-            # check op_type of node is MatMul
-            # check dim 1 of input is weight tensor
-            # check weight_type is not "fp32"
-            if (
-                node.op_type in ["MatMul"]
-                and model.get_initializer(node.input[1]) is not None
-                and weight_config.get((node.name, node.op_type), {}).get("weight_dtype", "fp32") != "fp32"
-            ):
-                output_names.append(node.input[0])
-        output_names = list(set(output_names))
-        model.add_tensors_to_outputs(output_names)
-        if model.is_large_model:
-            onnx.save_model(
-                model.model,
-                model.model_path + "_augment.onnx",
-                save_as_external_data=True,
-                all_tensors_to_one_file=True,
-                convert_attribute=False,
-            )
-
-        session = (
-            ort.InferenceSession(model.model.SerializeToString(), so, providers=providers)
-            if not model.is_large_model
-            else ort.InferenceSession(model.model_path + "_augment.onnx", so, providers=providers)
-        )
-
-        for input_name in output_names:
-            parent = model.output_name_to_node()[input_name]
-            dump_pairs = {parent.name: []}
-
-            for node in model.input_name_to_nodes()[input_name]:
+            output_names = []
+            for node in model.nodes():
                 # check op_type of node is MatMul
                 # check dim 1 of input is weight tensor
                 # check weight_type is not "fp32"
@@ -370,40 +348,66 @@ def awq_quantize(
                     and model.get_initializer(node.input[1]) is not None
                     and weight_config.get((node.name, node.op_type), {}).get("weight_dtype", "fp32") != "fp32"
                 ):
-                    dump_pairs[parent.name].append(model.get_node(node.name))
-
-            if len(dump_pairs[parent.name]) == 0:
-                continue
-
-            output_dicts = {}
-            for inp in inputs:
-                output = session.run([input_name], inp)
-                output_dicts.setdefault(input_name, []).append(output)
-
-            if enable_auto_scale:
-                model, output_dicts = _apply_awq_scale(
-                    model,
-                    weight_config,
-                    dump_pairs,
-                    output_dicts,
-                    num_bits,
-                    group_size,
-                    scheme,
-                )
-            if enable_mse_search:
-                ratios = _apply_awq_clip(
-                    model,
-                    weight_config,
-                    dump_pairs,
-                    output_dicts,
-                    num_bits,
-                    group_size,
-                    scheme,
-                )
-            del output_dicts
-            del dump_pairs
-            full_ratio.update(ratios)
+                    output_names.append(node.input[0])
+            output_names = list(set(output_names))
+            model.add_tensors_to_outputs(output_names)
+            if model.is_large_model:
+                save_augmented_model(model, model.model_path + "_augment.onnx")
+
+            session = (
+                ort.InferenceSession(model.model.SerializeToString(), so, providers=providers)
+                if not model.is_large_model
+                else ort.InferenceSession(model.model_path + "_augment.onnx", so, providers=providers)
+            )
+
+            for input_name in output_names:
+                parent = model.output_name_to_node()[input_name]
+                dump_pairs = {parent.name: []}
+
+                for node in model.input_name_to_nodes()[input_name]:
+                    # check op_type of node is MatMul
+                    # check dim 1 of input is weight tensor
+                    # check weight_type is not "fp32"
+                    if (
+                        node.op_type in ["MatMul"]
+                        and model.get_initializer(node.input[1]) is not None
+                        and weight_config.get((node.name, node.op_type), {}).get("weight_dtype", "fp32") != "fp32"
+                    ):
+                        dump_pairs[parent.name].append(model.get_node(node.name))
+
+                if len(dump_pairs[parent.name]) == 0:
+                    continue
 
+                output_dicts = {}
+                for inp in inputs:
+                    output = session.run([input_name], inp)
+                    output_dicts.setdefault(input_name, []).append(output)
+
+                if enable_auto_scale:
+                    model, output_dicts = _apply_awq_scale(
+                        model,
+                        weight_config,
+                        dump_pairs,
+                        output_dicts,
+                        num_bits,
+                        group_size,
+                        scheme,
+                    )
+                if enable_mse_search:
+                    ratios = _apply_awq_clip(
+                        model,
+                        weight_config,
+                        dump_pairs,
+                        output_dicts,
+                        num_bits,
+                        group_size,
+                        scheme,
+                    )
+                del output_dicts
+                del dump_pairs
+                full_ratio.update(ratios)
+        finally:
+            inputs.close()
         model.remove_tensors_from_outputs(output_names)
         model.model.graph.output.MergeFrom(org_output)
     model = rtn_quantize(model, weight_config, num_bits, group_size, scheme, full_ratio, accuracy_level, providers)
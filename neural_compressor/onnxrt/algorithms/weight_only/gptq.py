@@ -31,6 +31,7 @@ from neural_compressor.onnxrt.algorithms.weight_only.utility import (
     pad_tensor,
     prepare_inputs,
     quant_tensor,
+    save_augmented_model,
 )
 from neural_compressor.onnxrt.quantization.calibrate import CalibrationDataReader
 from neural_compressor.onnxrt.quantization.config import GPTQConfig
@@ -249,42 +250,11 @@ def gptq_quantize(
 
     inputs, so = prepare_inputs(model, data_reader, providers)
     del data_reader
-    org_output = copy.deepcopy(model.model.graph.output)
-    model.remove_tensors_from_outputs([i.name for i in org_output])
-    output_names = []
-    for node in model.nodes():
-        # check op_type of node is MatMul
-        # check dim 1 of input is weight tensor
-        # check weight_type is not "fp32"
-        if (
-            node.op_type in ["MatMul"]
-            and model.get_initializer(node.input[1]) is not None
-            and weight_config.get((node.name, node.op_type), {}).get("weight_dtype", "fp32") != "fp32"
-        ):
-            output_names.append(node.input[0])
-    output_names = list(set(output_names))
-    model.add_tensors_to_outputs(output_names)
-    if model.is_large_model:
-        onnx.save_model(
-            model.model,
-            model.model_path + "_augment.onnx",
-            save_as_external_data=True,
-            all_tensors_to_one_file=True,
-            convert_attribute=False,
-        )
-
-    session = (
-        ort.InferenceSession(model.model.SerializeToString(), so, providers=providers)
-        if not model.is_large_model
-        else ort.InferenceSession(model.model_path + "_augment.onnx", so, providers=providers)
-    )
-
-    for idx, input_name in enumerate(output_names):
-        simple_progress_bar(len(output_names), idx + 1)
-        node_list = []
-        weights = []
-
-        for node in model.input_name_to_nodes()[input_name]:
+    try:
+        org_output = copy.deepcopy(model.model.graph.output)
+        model.remove_tensors_from_outputs([i.name for i in org_output])
+        output_names = []
+        for node in model.nodes():
             # check op_type of node is MatMul
             # check dim 1 of input is weight tensor
             # check weight_type is not "fp32"
@@ -293,100 +263,127 @@ def gptq_quantize(
                 and model.get_initializer(node.input[1]) is not None
                 and weight_config.get((node.name, node.op_type), {}).get("weight_dtype", "fp32") != "fp32"
             ):
-                weight = onnx.numpy_helper.to_array(
-                    model.get_initializer(model.get_node(node.name).input[1]), base_dir
-                ).copy()
-                if len(weight.shape) != 2:
-                    continue
-
-                weights.append(weight)
-                node_list.append(model.get_node(node.name))
-
-        if len(weights) == 0:
-            continue
-
-        Hs = [np.zeros((i.shape[0], i.shape[0])) for i in weights]
-        nsamples = 0
-        for data in inputs:
-            inp = session.run([input_name], data)[0]
-            tmp = inp.shape[0]
-            inp = np.reshape(inp, (-1, inp.shape[-1]))
-            Hs = [i * (nsamples / (nsamples + tmp)) for i in Hs]
-            nsamples += tmp
-            inp = np.sqrt(2 / nsamples) * inp
-            Hs = [i + np.matmul(inp.T, inp) for i in Hs]
-
-        for (
-            node,
-            weight,
-            H,
-        ) in zip(node_list, weights, Hs):
-            if node.name in weight_config:
-                num_bits = weight_config[node.name]["bits"]
-                group_size = weight_config[node.name]["group_size"]
-                scheme = weight_config[node.name]["scheme"]
-                accuracy_level = weight_config[(node.name, node.op_type)].accuracy_level
-            group_size = group_size if group_size != -1 else weight.shape[0]
-            dtype = weight.dtype
-
-            q_weight = _gptq(
+                output_names.append(node.input[0])
+        output_names = list(set(output_names))
+        model.add_tensors_to_outputs(output_names)
+        if model.is_large_model:
+            save_augmented_model(model, model.model_path + "_augment.onnx")
+
+        session = (
+            ort.InferenceSession(model.model.SerializeToString(), so, providers=providers)
+            if not model.is_large_model
+            else ort.InferenceSession(model.model_path + "_augment.onnx", so, providers=providers)
+        )
+
+        for idx, input_name in enumerate(output_names):
+            simple_progress_bar(len(output_names), idx + 1)
+            node_list = []
+            weights = []
+
+            for node in model.input_name_to_nodes()[input_name]:
+                # check op_type of node is MatMul
+                # check dim 1 of input is weight tensor
+                # check weight_type is not "fp32"
+                if (
+                    node.op_type in ["MatMul"]
+                    and model.get_initializer(node.input[1]) is not None
+                    and weight_config.get((node.name, node.op_type), {}).get("weight_dtype", "fp32") != "fp32"
+                ):
+                    weight = onnx.numpy_helper.to_array(
+                        model.get_initializer(model.get_node(node.name).input[1]), base_dir
+                    ).copy()
+                    if len(weight.shape) != 2:
+                        continue
+
+                    weights.append(weight)
+                    node_list.append(model.get_node(node.name))
+
+            if len(weights) == 0:
+                continue
+
+            Hs = [np.zeros((i.shape[0], i.shape[0])) for i in weights]
+            nsamples = 0
+            for data in inputs:
+                inp = session.run([input_name], data)[0]
+                tmp = inp.shape[0]
+                inp = np.reshape(inp, (-1, inp.shape[-1]))
+                Hs = [i * (nsamples / (nsamples + tmp)) for i in Hs]
+                nsamples += tmp
+                inp = np.sqrt(2 / nsamples) * inp
+                Hs = [i + np.matmul(inp.T, inp) for i in Hs]
+
+            for (
+                node,
                 weight,
                 H,
-                num_bits=num_bits,
-                group_size=group_size,
-                scheme=scheme,
-                blocksize=blocksize,
-                percdamp=percdamp,
-                actorder=actorder,
-                mse=mse,
-                perchannel=perchannel,
-            )
-
-            weight_tensor = model.get_initializer(node.input[1])
-            init_share_num = model.get_initializer_share_num(node.input[1])
-
-            satisfy_MatMulNBits_condition = Version(ort.__version__) > ONNXRT1161_VERSION and num_bits == 4
-            satisfy_MatMulFpQ4_condition = (
-                Version(ort.__version__) >= ONNXRT116_VERSION and num_bits == 4 and group_size == 32
-            )
-            if ("CUDAExecutionProvider" in providers and satisfy_MatMulNBits_condition) or (
-                "CUDAExecutionProvider" not in providers
-                and (satisfy_MatMulFpQ4_condition or satisfy_MatMulNBits_condition)
-            ):  # pragma: no cover
-                # MatMulFpQ4 support 4 bits and 32 group_size with ort 1.16.0 and 1.16.1 versions, supported by CPU EP
-                # MatMulNBits supports 4 bits and 2^n group_size with ort > 1.16.1, supported by CPU EP AND CUDA EP
-                org_shape = weight.shape
-                k_blocks = (org_shape[0] + group_size - 1) // group_size
-                q_weight = pad_tensor(q_weight, group_size, k_blocks)
-                q_weight, scale, zp = quant_tensor(q_weight.T, num_bits, group_size, scheme, "uint")
-                q_matmul_node, new_inits = make_matmul_weight_only_node(
-                    node=node,
-                    weight_shape=org_shape,
+            ) in zip(node_list, weights, Hs):
+                if node.name in weight_config:
+                    num_bits = weight_config[node.name]["bits"]
+                    group_size = weight_config[node.name]["group_size"]
+                    scheme = weight_config[node.name]["scheme"]
+                    accuracy_level = weight_config[(node.name, node.op_type)].accuracy_level
+                group_size = group_size if group_size != -1 else weight.shape[0]
+                dtype = weight.dtype
+
+                q_weight = _gptq(
+                    weight,
+                    H,
                     num_bits=num_bits,
                     group_size=group_size,
-                    k_blocks=k_blocks,
-                    q_weight=q_weight.astype("uint8"),
-                    scale=scale.astype(dtype),
-                    zero_point=zp if scheme == "asym" else None,
-                    accuracy_level=accuracy_level,
+                    scheme=scheme,
+                    blocksize=blocksize,
+                    percdamp=percdamp,
+                    actorder=actorder,
+                    mse=mse,
+                    perchannel=perchannel,
                 )
 
-                model.add_initializers(new_inits)
-                model.remove_node(node)
-                model.add_node(q_matmul_node)
-            else:
-                q_weight_tensor = onnx.helper.make_tensor(
-                    name=node.input[1] + "_Q{}G{}".format(str(num_bits), str(group_size)),
-                    data_type=dtype_mapping[str(dtype)],
-                    dims=q_weight.shape,
-                    vals=q_weight.astype(dtype).tobytes(),
-                    raw=True,
-                )
-                model.add_initializer(q_weight_tensor)
-                node.input[1] = q_weight_tensor.name
-            if init_share_num == 1:
-                model.remove_initializer(weight_tensor)
+                weight_tensor = model.get_initializer(node.input[1])
+                init_share_num = model.get_initializer_share_num(node.input[1])
 
+                satisfy_MatMulNBits_condition = Version(ort.__version__) > ONNXRT1161_VERSION and num_bits == 4
+                satisfy_MatMulFpQ4_condition = (
+                    Version(ort.__version__) >= ONNXRT116_VERSION and num_bits == 4 and group_size == 32
+                )
+                if ("CUDAExecutionProvider" in providers and satisfy_MatMulNBits_condition) or (
+                    "CUDAExecutionProvider" not in providers
+                    and (satisfy_MatMulFpQ4_condition or satisfy_MatMulNBits_condition)
+                ):  # pragma: no cover
+                    # MatMulFpQ4 support 4 bits and 32 group_size with ort 1.16.0 and 1.16.1 versions, supported by CPU EP
+                    # MatMulNBits supports 4 bits and 2^n group_size with ort > 1.16.1, supported by CPU EP AND CUDA EP
+                    org_shape = weight.shape
+                    k_blocks = (org_shape[0] + group_size - 1) // group_size
+                    q_weight = pad_tensor(q_weight, group_size, k_blocks)
+                    q_weight, scale, zp = quant_tensor(q_weight.T, num_bits, group_size, scheme, "uint")
+                    q_matmul_node, new_inits = make_matmul_weight_only_node(
+                        node=node,
+                        weight_shape=org_shape,
+                        num_bits=num_bits,
+                        group_size=group_size,
+                        k_blocks=k_blocks,
+                        q_weight=q_weight.astype("uint8"),
+                        scale=scale.astype(dtype),
+                        zero_point=zp if scheme == "asym" else None,
+                        accuracy_level=accuracy_level,
+                    )
+
+                    model.add_initializers(new_inits)
+                    model.remove_node(node)
+                    model.add_node(q_matmul_node)
+                else:
+                    q_weight_tensor = onnx.helper.make_tensor(
+                        name=node.input[1] + "_Q{}G{}".format(str(num_bits), str(group_size)),
+                        data_type=dtype_mapping[str(dtype)],
+                        dims=q_weight.shape,
+                        vals=q_weight.astype(dtype).tobytes(),
+                        raw=True,
+                    )
+                    model.add_initializer(q_weight_tensor)
+                    model.set_node_input(node, 1, q_weight_tensor.name)
+                if init_share_num == 1:
+                    model.remove_initializer(weight_tensor)
+    finally:
+        inputs.close()
     model.remove_tensors_from_outputs(output_names)
     model.model.graph.output.MergeFrom(org_output)
 
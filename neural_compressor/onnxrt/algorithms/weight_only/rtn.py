@@ -168,7 +168,7 @@ def rtn_quantize(
                     raw=True,
                 )
                 model.add_initializer(q_weight_tensor)
-                node.input[1] = q_weight_tensor.name
+                model.set_node_input(node, 1, q_weight_tensor.name)
             if init_share_num == 1:
                 model.remove_initializer(weight_tensor)
 
@@ -18,8 +18,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import struct
 import sys
+import tempfile
 
 import numpy as np
 import onnx
@@ -31,6 +33,8 @@ from neural_compressor.onnxrt.utils.utility import ONNXRT1161_VERSION, dtype_map
 __all__ = [
     "make_matmul_weight_only_node",
     "prepare_inputs",
+    "ReplayableDataReader",
+    "save_augmented_model",
     "pad_tensor",
     "quant_tensor",
     "qdq_tensor",
@@ -193,6 +197,145 @@ def make_matmul_weight_only_node(
     return matmul_weight_only_node, new_inits
 
 
+class ReplayableDataReader:
+    """Iterate the batches of a CalibrationDataReader lazily for any number of passes.
+
+    The first pass reads the batches from the data reader and spills them to a cache file, the later passes read them
+    back memory-mapped, so only the batch being used is in memory.
+    """
+
+    ALIGNMENT = 64
+
+    def __init__(self, data_reader, cache_dir=None):
+        """Initialize a ReplayableDataReader.
+
+        Args:
+            data_reader (CalibrationDataReader): a calibration data reader.
+            cache_dir (str, optional): the directory of the cache file. Defaults to None, the temp directory.
+        """
+        self.data_reader = data_reader
+        fd, self.cache_path = tempfile.mkstemp(prefix="ort.calib.", suffix=".bin", dir=cache_dir)
+        self._cache_file = os.fdopen(fd, "wb")
+        self._offset = 0
+        # the name, dtype, shape and offset of the tensors of each cached batch.
+        self._batches = []
+        self._exhausted = False
+
+    def _spill(self, inputs):
+        batch = []
+        for name, value in inputs.items():
+            value = np.ascontiguousarray(value)
+            padding = -self._offset % self.ALIGNMENT
+            self._cache_file.write(b"\0" * padding)
+            self._offset += padding
+            batch.append((name, value.dtype, value.shape, self._offset))
+            self._cache_file.write(value.tobytes())
+            self._offset += value.nbytes
+        self._batches.append(batch)
+
+    def _read_cache(self):
+        self._cache_file.flush()
+        if self._offset == 0:
+            return
+        buffer = np.memmap(self.cache_path, dtype=np.uint8, mode="r", shape=(self._offset,))
+        for batch in list(self._batches):
+            inputs = {}
+            for name, dtype, shape, offset in batch:
+                nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+                inputs[name] = buffer[offset : offset + nbytes].view(dtype).reshape(shape)
+            yield inputs
+
+    def __iter__(self):
+        """Iterate the cached batches, then the batches left in the data reader."""
+        yield from self._read_cache()
+        while not self._exhausted:
+            inputs = self.data_reader.get_next()
+            if not inputs:
+                self._exhausted = True
+                break
+            self._spill(inputs)
+            yield inputs
+
+    def __len__(self):
+        """Get the number of batches, the data reader is drained if it is not done."""
+        for _ in self:
+            pass
+        return len(self._batches)
+
+    def close(self):
+        """Remove the cache file."""
+        if not self._cache_file.closed:
+            self._cache_file.close()
+        if os.path.exists(self.cache_path):
+            os.remove(self.cache_path)
+
+    def __del__(self):
+        """Remove the cache file."""
+        self.close()
+
+
+def _is_same_initializer(tensor, base_tensor, base_dir):
+    """Check whether an initializer has the same data as the one of the model file, whose external data isn't loaded."""
+    if (
+        tensor.name != base_tensor.name
+        or tensor.data_type != base_tensor.data_type
+        or list(tensor.dims) != list(base_tensor.dims)
+    ):
+        return False
+    if tensor.data_location == onnx.TensorProto.EXTERNAL or base_tensor.data_location != onnx.TensorProto.EXTERNAL:
+        # both refer to the external data or both are stored in the model file.
+        return tensor == base_tensor
+    if not tensor.HasField("raw_data"):
+        return False
+    from onnx.external_data_helper import ExternalDataInfo
+
+    info = ExternalDataInfo(base_tensor)
+    if info.length is not None and info.length != len(tensor.raw_data):
+        return False
+    with open(os.path.join(base_dir, info.location), "rb") as f:
+        f.seek(info.offset or 0)
+        return f.read(len(tensor.raw_data)) == tensor.raw_data
+
+
+def save_augmented_model(model, path):
+    """Save a large model whose outputs are changed, for creating a session with a path.
+
+    If the graph and the initializers are the same as the model file, only the graph is saved next to the model file
+    and the initializers keep referring to its external data, instead of writing all the weights again.
+
+    Args:
+        model (ONNXModel): onnx model with model_path.
+        path (str): the path to save the model, should be in the same directory as the model file.
+    """
+    base_model = None
+    if model.model_path is not None and os.path.dirname(os.path.abspath(path)) == os.path.dirname(
+        os.path.abspath(model.model_path)
+    ):
+        base_model = onnx.load(model.model_path, load_external_data=False)
+        base_dir = os.path.dirname(os.path.abspath(model.model_path))
+        if list(base_model.graph.node) != list(model.model.graph.node) or list(base_model.graph.input) != list(
+            model.model.graph.input
+        ):
+            base_model = None
+        elif len(base_model.graph.initializer) != len(model.model.graph.initializer) or not all(
+            _is_same_initializer(tensor, base_tensor, base_dir)
+            for tensor, base_tensor in zip(model.model.graph.initializer, base_model.graph.initializer)
+        ):
+            base_model = None
+    if base_model is None:
+        onnx.save_model(
+            model.model,
+            path,
+            save_as_external_data=True,
+            all_tensors_to_one_file=True,
+            convert_attribute=False,
+        )
+        return
+    del base_model.graph.output[:]
+    base_model.graph.output.extend(model.model.graph.output)
+    onnx.save_model(base_model, path)
+
+
 def prepare_inputs(model, data_reader, providers):
     """Prepare inputs for weight only quantization.
 
@@ -202,7 +345,7 @@ def prepare_inputs(model, data_reader, providers):
         providers (list): providers to use.
 
     Returns:
-        inputs: prepared inputs.
+        inputs: prepared inputs, a ReplayableDataReader which can be iterated multiple times.
         so: session options
     """
     from importlib.util import find_spec
@@ -212,22 +355,7 @@ def prepare_inputs(model, data_reader, providers):
         from onnxruntime_extensions import get_library_path
 
         so.register_custom_ops_library(get_library_path())
-    if model.is_large_model:
-        onnx.save_model(
-            model.model,
-            model.model_path + "_augment.onnx",
-            save_as_external_data=True,
-            all_tensors_to_one_file=True,
-            convert_attribute=False,
-        )
-
-    inputs_list = []
-    while True:
-        inputs = data_reader.get_next()
-        if not inputs:
-            break
-        inputs_list.append(inputs)
-    return inputs_list, so
+    return ReplayableDataReader(data_reader), so
 
 
 def pad_tensor(weight, group_size, k_blocks):
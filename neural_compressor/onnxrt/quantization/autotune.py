@@ -21,10 +21,11 @@ import onnx
 
 from neural_compressor.common import logger
 from neural_compressor.common.base_config import BaseConfig, get_all_config_set_from_config_registry
-from neural_compressor.common.base_tuning import EvaluationFuncWrapper, TuningConfig, init_tuning
+from neural_compressor.common.base_tuning import EvaluationFuncWrapper, TrialResultCache, TuningConfig, init_tuning
 from neural_compressor.onnxrt.quantization.calibrate import CalibrationDataReader
 from neural_compressor.onnxrt.quantization.config import FRAMEWORK_NAME
 from neural_compressor.onnxrt.quantization.quantize import _quantize
+from neural_compressor.onnxrt.utils.utility import get_model_fingerprint
 
 __all__ = [
     "autotune",
@@ -60,10 +61,13 @@ def autotune(
         calibration_data_reader (CalibrationDataReader): dataloader for calibration.
     """
     best_quant_model = None
-    eval_func_wrapper = EvaluationFuncWrapper(eval_fn, eval_args)
-    config_loader, tuning_logger, tuning_monitor = init_tuning(tuning_config=tune_config)
+    result_cache = None
+    if tune_config.cache_dir is not None:
+        result_cache = TrialResultCache(tune_config.cache_dir, get_model_fingerprint(model_input))
+    eval_func_wrapper = EvaluationFuncWrapper(eval_fn, eval_args, result_cache=result_cache)
+    config_loader, tuning_logger, tuning_monitor = init_tuning(tuning_config=tune_config, result_cache=result_cache)
     try:
-        baseline: float = eval_func_wrapper.evaluate(model_input)
+        baseline: float = eval_func_wrapper.evaluate_baseline(model_input)
     except Exception as e:
         print(e)
         if "'str' object has no attribute 'SerializeToString'" in str(e):
@@ -72,42 +76,46 @@ def autotune(
     tuning_monitor.set_baseline(baseline)
     tuning_logger.tuning_start()
     for trial_index, quant_config in enumerate(config_loader):
-        if calibration_data_reader is not None:
-            calibration_data_reader.rewind()
         tuning_logger.trial_start(trial_index=trial_index)
-        tuning_logger.quantization_start()
         logger.debug("quant config: {}".format(quant_config))
-        q_model = _quantize(model_input, quant_config=quant_config, calibration_data_reader=calibration_data_reader)
-        tuning_logger.quantization_end()
-        tuning_logger.evaluation_start()
-        with tempfile.TemporaryDirectory(prefix="ort.quant.") as tmp_dir:
-            # evaluate API requires str input
-            onnx.save_model(
-                q_model,
-                Path(tmp_dir).joinpath(Path(model_input).name).as_posix(),
-                save_as_external_data=True,
-                all_tensors_to_one_file=True,
-                location=Path(model_input).with_suffix(Path(model_input).suffix + "_data").name,
-                size_threshold=1024,
-                convert_attribute=False,
-            )
-            # copy config.json to tmp dir for evaluation, LLMs evaluation may need it
-            if isinstance(model_input, str) and os.path.exists(
-                Path(model_input).parent.joinpath("config.json").as_posix()
-            ):
-                import shutil
-
-                shutil.copyfile(
-                    Path(model_input).parent.joinpath("config.json").as_posix(),
-                    Path(tmp_dir).joinpath("config.json").as_posix(),
+        eval_result = tuning_monitor.get_cached_trial_result(quant_config)
+        if eval_result is None:
+            if calibration_data_reader is not None:
+                calibration_data_reader.rewind()
+            tuning_logger.quantization_start()
+            q_model = _quantize(model_input, quant_config=quant_config, calibration_data_reader=calibration_data_reader)
+            tuning_logger.quantization_end()
+            tuning_logger.evaluation_start()
+            with tempfile.TemporaryDirectory(prefix="ort.quant.") as tmp_dir:
+                # evaluate API requires str input
+                onnx.save_model(
+                    q_model,
+                    Path(tmp_dir).joinpath(Path(model_input).name).as_posix(),
+                    save_as_external_data=True,
+                    all_tensors_to_one_file=True,
+                    location=Path(model_input).with_suffix(Path(model_input).suffix + "_data").name,
+                    size_threshold=1024,
+                    convert_attribute=False,
                 )
-            eval_result: float = eval_func_wrapper.evaluate(Path(tmp_dir).joinpath(Path(model_input).name).as_posix())
-        tuning_logger.evaluation_end()
-        logger.info("Evaluation result: %.4f", eval_result)
+                # copy config.json to tmp dir for evaluation, LLMs evaluation may need it
+                if isinstance(model_input, str) and os.path.exists(
+                    Path(model_input).parent.joinpath("config.json").as_posix()
+                ):
+                    import shutil
+
+                    shutil.copyfile(
+                        Path(model_input).parent.joinpath("config.json").as_posix(),
+                        Path(tmp_dir).joinpath("config.json").as_posix(),
+                    )
+                eval_result = eval_func_wrapper.evaluate(Path(tmp_dir).joinpath(Path(model_input).name).as_posix())
+            tuning_logger.evaluation_end()
+            logger.info("Evaluation result: %.4f", eval_result)
         tuning_monitor.add_trial_result(trial_index, eval_result, quant_config)
         tuning_logger.trial_end(trial_index)
         if tuning_monitor.need_stop():
             best_quant_config: BaseConfig = tuning_monitor.get_best_quant_config()
+            if calibration_data_reader is not None:
+                calibration_data_reader.rewind()
             best_quant_model = _quantize(
                 model_input, quant_config=best_quant_config, calibration_data_reader=calibration_data_reader
             )
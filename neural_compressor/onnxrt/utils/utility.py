@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import os
 from pathlib import Path
 from typing import Callable, Dict, List, Tuple, Union
 
@@ -43,6 +45,7 @@ __all__ = [
     "get_qrange_for_qType",
     "quantize_data",
     "check_model_with_infer_shapes",
+    "get_model_fingerprint",
 ]
 
 ONNXRT116_VERSION = Version("1.16.0")
@@ -286,3 +289,26 @@ def check_model_with_infer_shapes(model):
     if len(model.graph.value_info) > 0:
         return True
     return False
+
+
+def get_model_fingerprint(model: Union[onnx.ModelProto, Path, str]) -> str:
+    """Get a hash of the model graph and weights, used as the key of tuning result cache.
+
+    For a model path, external data files are hashed in chunks instead of being loaded.
+    """
+    sha256 = hashlib.sha256()
+    if isinstance(model, onnx.ModelProto):
+        sha256.update(model.graph.SerializeToString(deterministic=True))
+        return sha256.hexdigest()
+    model_proto = onnx.load(model, load_external_data=False)
+    sha256.update(model_proto.graph.SerializeToString(deterministic=True))
+    external_data_files = set()
+    for tensor in onnx.external_data_helper._get_all_tensors(model_proto):
+        if onnx.external_data_helper.uses_external_data(tensor):
+            info = onnx.external_data_helper.ExternalDataInfo(tensor)
+            external_data_files.add(info.location)
+    for location in sorted(external_data_files):
+        with open(os.path.join(os.path.dirname(model), location), "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 24), b""):
+                sha256.update(chunk)
+    return sha256.hexdigest()
@@ -19,11 +19,11 @@ import tensorflow as tf
 
 from neural_compressor.common import logger
 from neural_compressor.common.base_config import BaseConfig, get_all_config_set_from_config_registry
-from neural_compressor.common.base_tuning import EvaluationFuncWrapper, TuningConfig, init_tuning
+from neural_compressor.common.base_tuning import EvaluationFuncWrapper, TrialResultCache, TuningConfig, init_tuning
 from neural_compressor.common.utils import dump_elapsed_time
 from neural_compressor.tensorflow.quantization import quantize_model
 from neural_compressor.tensorflow.quantization.config import FRAMEWORK_NAME, StaticQuantConfig
-from neural_compressor.tensorflow.utils import BaseModel, constants
+from neural_compressor.tensorflow.utils import BaseModel, constants, get_model_fingerprint
 
 __all__ = [
     "autotune",
@@ -46,26 +46,31 @@ def autotune(
 ) -> Optional[BaseModel]:
     """The main entry of auto-tune."""
     best_quant_model = None
-    eval_func_wrapper = EvaluationFuncWrapper(eval_fn, eval_args)
-    config_loader, tuning_logger, tuning_monitor = init_tuning(tuning_config=tune_config)
-    baseline: float = eval_func_wrapper.evaluate(model)
+    result_cache = None
+    if tune_config.cache_dir is not None:
+        result_cache = TrialResultCache(tune_config.cache_dir, get_model_fingerprint(model))
+    eval_func_wrapper = EvaluationFuncWrapper(eval_fn, eval_args, result_cache=result_cache)
+    config_loader, tuning_logger, tuning_monitor = init_tuning(tuning_config=tune_config, result_cache=result_cache)
+    baseline: float = eval_func_wrapper.evaluate_baseline(model)
     tuning_monitor.set_baseline(baseline)
     tuning_logger.tuning_start()
     for trial_index, quant_config in enumerate(config_loader):
         tuning_logger.trial_start(trial_index=trial_index)
-        tuning_logger.quantization_start()
         logger.info(quant_config.to_dict())
-        q_model = quantize_model(model, quant_config, calib_dataloader, calib_iteration)
-        tuning_logger.quantization_end()
-        tuning_logger.evaluation_start()
-        eval_result: float = eval_func_wrapper.evaluate(q_model)
-        tuning_logger.evaluation_end()
+        eval_result = tuning_monitor.get_cached_trial_result(quant_config)
+        if eval_result is None:
+            tuning_logger.quantization_start()
+            q_model = quantize_model(model, quant_config, calib_dataloader, calib_iteration)
+            tuning_logger.quantization_end()
+            tuning_logger.evaluation_start()
+            eval_result = eval_func_wrapper.evaluate(q_model)
+            tuning_logger.evaluation_end()
         tuning_monitor.add_trial_result(trial_index, eval_result, quant_config)
         tuning_logger.trial_end(trial_index)
         if tuning_monitor.need_stop():
             logger.info("Stopped tuning.")
             best_quant_config: BaseConfig = tuning_monitor.get_best_quant_config()
-            best_quant_model = quantize_model(model, quant_config, calib_dataloader, calib_iteration)
+            best_quant_model = quantize_model(model, best_quant_config, calib_dataloader, calib_iteration)
             break
     tuning_logger.tuning_end()
     return best_quant_model
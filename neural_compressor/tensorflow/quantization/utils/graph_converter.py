@@ -78,6 +78,7 @@ from neural_compressor.tensorflow.quantization.utils.graph_rewriter.int8.post_qu
 from neural_compressor.tensorflow.quantization.utils.graph_rewriter.int8.scale_propagation import (
     ScaleProPagationTransformer,
 )
+from neural_compressor.tensorflow.quantization.utils.graph_rewriter.pass_manager import PassManager
 from neural_compressor.tensorflow.quantization.utils.graph_rewriter.qdq.insert_qdq_pattern import (
     GenerateGraphWithQDQPattern,
 )
@@ -223,13 +224,16 @@ class GraphConverter:
         self.new_api = new_api  # bool(version1_gte_version2(tf.version.VERSION, '2.8.0'))
         self.use_bf16 = use_bf16
         self.exclude_node_names = []
+        self._pass_manager = PassManager("Graph Converter")
+        self.pass_time = {}
 
     # pylint: disable=no-member
-    def _inference(self, model):
+    def _inference(self, model, output_callback=None):
         """Run the calibration on the input graph.
 
         Args:
             model(TensorflowBaseModel): input TensorflowBaseModel
+            output_callback(callable, optional): the function called with the outputs of each iteration.
         """
         if self.calib_func:
             self.calib_func(model.model)
@@ -256,11 +260,13 @@ class GraphConverter:
         logger.info("Start sampling on calibration dataset.")
         if hasattr(self.data_loader, "__len__") and len(self.data_loader) == 0:
             feed_dict = {}
-            _ = (
+            outputs = (
                 sess.run(output_tensor, feed_dict)
                 if iter_op == []
                 else iterator_sess_run(sess, iter_op, feed_dict, output_tensor, self.calib_iteration)
             )
+            if output_callback:
+                output_callback(outputs)
         for idx, (inputs, labels) in enumerate(self.data_loader):
             if len(input_tensor) == 1:
                 feed_dict = {}
@@ -318,11 +324,13 @@ class GraphConverter:
                             if check_shape(dis_tensor, dis_input):
                                 feed_dict.update({dis_tensor: dis_input})
                                 break
-            _ = (
+            outputs = (
                 sess.run(output_tensor, feed_dict)
                 if iter_op == []
                 else iterator_sess_run(sess, iter_op, feed_dict, output_tensor, self.calib_iteration)
             )
+            if output_callback:
+                output_callback(outputs)
             if idx + 1 == self.calib_iteration:
                 break
         os.environ["ITEX_REMAPPER"] = "1"
@@ -467,9 +475,10 @@ class GraphConverter:
                 model = self.quantize()
 
         if self.itex_mode:
-            host_const_graph_def = PostHostConstConverter(self._tmp_model.graph_def).do_transformation()
+            host_const_graph_def = self._pass_manager.run(PostHostConstConverter, self._tmp_model.graph_def)
             host_const_graph_def.library.CopyFrom(self.model.graph_def.library)
             self._tmp_model.graph_def = host_const_graph_def
+            self.pass_time = self._pass_manager.summary()
 
             return self._tmp_model
 
@@ -485,14 +494,15 @@ class GraphConverter:
 
         if self.new_api:
             if self.performance_only:
-                model.graph_def = FuseConvRedundantDequantizeTransformer(model.graph_def).do_transformation()
-            post_optimize_graph_def = FuseMatMulRedundantDequantizeTransformer(model.graph_def).do_transformation()
+                model.graph_def = self._pass_manager.run(FuseConvRedundantDequantizeTransformer, model.graph_def)
+            post_optimize_graph_def = self._pass_manager.run(FuseMatMulRedundantDequantizeTransformer, model.graph_def)
             post_optimize_graph_def.library.CopyFrom(self.model.graph_def.library)
             model.graph_def = post_optimize_graph_def
-        post_cse_graph_def = PostCseOptimizer(model.graph_def).do_transformation()
-        post_hostconst_graph_def = PostHostConstConverter(post_cse_graph_def).do_transformation()
+        post_cse_graph_def = self._pass_manager.run(PostCseOptimizer, model.graph_def)
+        post_hostconst_graph_def = self._pass_manager.run(PostHostConstConverter, post_cse_graph_def)
         post_hostconst_graph_def.library.CopyFrom(self.model.graph_def.library)
         model.graph_def = post_hostconst_graph_def
+        self.pass_time = self._pass_manager.summary()
 
         if debug:
             model.save(self.output_graph)
@@ -545,9 +555,14 @@ class GraphConverter:
 
         fp32_graph_def = graph_pb2.GraphDef()
         fp32_graph_def.CopyFrom(self._fp32_model.graph_def)
-        self._fp32_model.graph_def = InsertLogging(
-            self._fp32_model.graph_def, node_name_list=output_node_names, message="__KL:", summarize=-1, dump_fp32=True
-        ).do_transformation()
+        self._fp32_model.graph_def = self._pass_manager.run(
+            InsertLogging,
+            self._fp32_model.graph_def,
+            node_name_list=output_node_names,
+            message="__KL:",
+            summarize=-1,
+            dump_fp32=True,
+        )
 
         self._fp32_model.save(self._fp32_logged_model_path)
         self._fp32_model.graph_def = fp32_graph_def
@@ -604,23 +619,16 @@ class GraphConverter:
                 # TODO: this is a workaround to make Min/Max node be completely eliminated in int8 graph
                 # after enabling pad+conv2d in new API.
                 non_pad_ops = list(list(set(self.fp32_ops).union(set(self.bf16_ops))))
-                sampling_graph_def = FusePadWithFP32Conv2DOptimizer(
-                    sampling_graph_def, non_pad_ops, self._tmp_model.input_node_names, self.op_wise_config, self.new_api
-                ).do_transformation()
-
-                for i in self.quantized_node_info:
-                    sampling_graph_def, output_names = InsertPrintMinMaxNode(
-                        sampling_graph_def, i[0], i[-1], self.new_api
-                    ).do_transformation()
-                    output_tensor_names.extend(output_names)
-                if self.quantized_node_info:
-                    sampling_graph_def.library.CopyFrom(self.model.graph_def.library)
-                    self._sampling_model.graph_def = sampling_graph_def
-                    self._sampling_model.output_tensor_names = output_tensor_names
-                    tmp_dump_file = tempfile.mkstemp(suffix=".log")[1]
-                    with CaptureOutputToFile(tmp_dump_file):
-                        self._inference(self._sampling_model)
-                    self._calibration_data = Helper.gen_valid_sampling_log(tmp_dump_file)
+                sampling_graph_def = self._pass_manager.run(
+                    FusePadWithFP32Conv2DOptimizer,
+                    sampling_graph_def,
+                    non_pad_ops,
+                    self._tmp_model.input_node_names,
+                    self.op_wise_config,
+                    self.new_api,
+                )
+
+                self._calibrate_min_max(sampling_graph_def, output_tensor_names)
 
                 del output_tensor_names
                 del sampling_graph_def
@@ -653,9 +661,9 @@ class GraphConverter:
         """Convert fp32 nodes in bf16_node to bf16 dtype based on FP32 + INT8 mixed precision graph."""
         try:
             logger.info("Start BF16 conversion.")
-            self._tmp_model.graph_def = BF16Convert(
-                self._tmp_model.graph_def, self.fp32_ops, self.bf16_ops
-            ).do_transformation()
+            self._tmp_model.graph_def = self._pass_manager.run(
+                BF16Convert, self._tmp_model.graph_def, self.fp32_ops, self.bf16_ops
+            )
 
         except Exception as e:
             import traceback
@@ -673,9 +681,14 @@ class GraphConverter:
         """Quantize graph."""
         non_pad_ops = list(list(set(self.fp32_ops).union(set(self.bf16_ops))))
 
-        self._tmp_graph_def = FusePadWithConv2DOptimizer(
-            self._tmp_graph_def, non_pad_ops, self._tmp_model.input_node_names, self.op_wise_config, self.new_api
-        ).do_transformation()
+        self._tmp_graph_def = self._pass_manager.run(
+            FusePadWithConv2DOptimizer,
+            self._tmp_graph_def,
+            non_pad_ops,
+            self._tmp_model.input_node_names,
+            self.op_wise_config,
+            self.new_api,
+        )
 
         self._tmp_graph_def = QuantizeGraphHelper().get_sorted_graph(
             self._tmp_graph_def, self._tmp_model.input_node_names, self._tmp_model.output_node_names
@@ -699,6 +712,52 @@ class GraphConverter:
             self._tmp_model.graph_def = self._tmp_graph_def
             self._tmp_model.save(self._int8_dynamic_range_model_path)
 
+    def _calibrate_min_max(self, sampling_graph_def, output_tensor_names):
+        """Insert the min/max nodes of the quantized nodes and run the calibration to get the calibration data.
+
+        The min/max values are fetched as extra outputs and collected in process. The print nodes are inserted and
+        their log is parsed instead when the outputs can't be fetched, e.g. the calib_func runs the model.
+
+        Args:
+            sampling_graph_def (graphdef): the fp32 graphdef to insert the min/max nodes.
+            output_tensor_names (string list): the output tensor names of the model.
+        """
+        print_node = (
+            self.calib_func is not None
+            or self._sampling_model.model_type == "llm_saved_model"
+            or any(node.op == "MakeIterator" for node in sampling_graph_def.node)
+        )
+        min_max_outputs = {}
+        for i in self.quantized_node_info:
+            sampling_graph_def, output_names = self._pass_manager.run(
+                InsertPrintMinMaxNode, sampling_graph_def, i[0], i[-1], self.new_api, print_node=print_node
+            )
+            if print_node:
+                output_tensor_names.extend(output_names)
+            else:
+                min_max_outputs.update(output_names)
+
+        if not self.quantized_node_info:
+            return
+
+        sampling_graph_def.library.CopyFrom(self.model.graph_def.library)
+        self._sampling_model.graph_def = sampling_graph_def
+        if print_node:
+            self._sampling_model.output_tensor_names = output_tensor_names
+            tmp_dump_file = tempfile.mkstemp(suffix=".log")[1]
+            with CaptureOutputToFile(tmp_dump_file):
+                self._inference(self._sampling_model)
+            self._calibration_data = Helper.gen_valid_sampling_log(tmp_dump_file)
+        else:
+            # only the min/max nodes need to run
+            self._sampling_model.output_tensor_names = list(min_max_outputs)
+            messages = list(min_max_outputs.values())
+            self._calibration_data = []
+            self._inference(
+                self._sampling_model,
+                lambda outputs: self._calibration_data.extend(Helper.gen_min_max_sampling_data(messages, outputs)),
+            )
+
     def _generate_calibration_data(self, tmp_path, output_data, enable_kl_algo=False):
         """Generate the calibration data."""
         tmp_dump_file = os.path.join(os.path.dirname(self.output_graph), "requant_min_max.log")
@@ -737,26 +796,27 @@ class GraphConverter:
 
     def _freeze_requantization_ranges(self, additional_data=None):
         """Freeze requantization ranges after doing quantization."""
-        self._tmp_graph_def, quantizev2_max = FreezeValueTransformer(
-            self._tmp_graph_def, self._calibration_data, "__max:", device=self.device
-        ).do_transformation()
-        self._tmp_graph_def, quantizev2_min = FreezeValueTransformer(
-            self._tmp_graph_def, self._calibration_data, "__min:", device=self.device
-        ).do_transformation()
-        self._tmp_graph_def, requant_min_max = FreezeValueTransformer(
+        self._tmp_graph_def, quantizev2_max = self._pass_manager.run(
+            FreezeValueTransformer, self._tmp_graph_def, self._calibration_data, "__max:", device=self.device
+        )
+        self._tmp_graph_def, quantizev2_min = self._pass_manager.run(
+            FreezeValueTransformer, self._tmp_graph_def, self._calibration_data, "__min:", device=self.device
+        )
+        self._tmp_graph_def, requant_min_max = self._pass_manager.run(
+            FreezeValueTransformer,
             self._tmp_graph_def,
             self._calibration_data,
             "__requant_min_max",
             tensor_data=additional_data,
             device=self.device,
-        ).do_transformation()
+        )
 
         self.scale_info.update(quantizev2_max)
         self.scale_info.update(quantizev2_min)
         self.scale_info.update(requant_min_max)
 
         if "scale_propagation_max_pooling" in self.recipes and self.recipes["scale_propagation_max_pooling"]:
-            self._tmp_graph_def = ScaleProPagationTransformer(self._tmp_graph_def).do_transformation()
+            self._tmp_graph_def = self._pass_manager.run(ScaleProPagationTransformer, self._tmp_graph_def)
 
         if debug and not self.new_api:
             self._tmp_graph_def.library.CopyFrom(self.model.graph_def.library)
@@ -766,52 +826,57 @@ class GraphConverter:
     def _fuse_requantize_with_fused_quantized_node(self):
         """Fuse the Requantize/Dequantize with fused quantized Ops."""
         if self.fake_quant:  # pragma: no cover
-            self._tmp_graph_def = FreezeFakeQuantOpOptimizer(self._tmp_graph_def).do_transformation()
+            self._tmp_graph_def = self._pass_manager.run(FreezeFakeQuantOpOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = FuseConvRequantizeTransformer(
-            self._tmp_graph_def, self.device, self.new_api
-        ).do_transformation()
+        self._tmp_graph_def = self._pass_manager.run(
+            FuseConvRequantizeTransformer, self._tmp_graph_def, self.device, self.new_api
+        )
 
         if not self.fake_quant:
             if self.qdq_enabled:
-                self._tmp_graph_def = FuseMatMulRequantizeNewAPITransformer(self._tmp_graph_def).do_transformation()
+                self._tmp_graph_def = self._pass_manager.run(FuseMatMulRequantizeNewAPITransformer, self._tmp_graph_def)
 
-                self._tmp_graph_def = FuseMatMulRequantizeDequantizeNewAPITransformer(
-                    self._tmp_graph_def
-                ).do_transformation()
+                self._tmp_graph_def = self._pass_manager.run(
+                    FuseMatMulRequantizeDequantizeNewAPITransformer, self._tmp_graph_def
+                )
             else:
-                self._tmp_graph_def = FuseMatMulRequantizeTransformer(self._tmp_graph_def).do_transformation()
+                self._tmp_graph_def = self._pass_manager.run(FuseMatMulRequantizeTransformer, self._tmp_graph_def)
 
-                self._tmp_graph_def = FuseMatMulRequantizeDequantizeTransformer(self._tmp_graph_def).do_transformation()
+                self._tmp_graph_def = self._pass_manager.run(
+                    FuseMatMulRequantizeDequantizeTransformer, self._tmp_graph_def
+                )
 
-        self._tmp_graph_def = StripUnusedNodesOptimizer(
-            self._tmp_graph_def, self._tmp_model.input_node_names, self._tmp_model.output_node_names
-        ).do_transformation()
+        self._tmp_graph_def = self._pass_manager.run(
+            StripUnusedNodesOptimizer,
+            self._tmp_graph_def,
+            self._tmp_model.input_node_names,
+            self._tmp_model.output_node_names,
+        )
 
         input_output_names = self._tmp_model.input_node_names + self._tmp_model.output_node_names
-        self._tmp_graph_def = RemoveTrainingNodesOptimizer(
-            self._tmp_graph_def, protected_nodes=input_output_names
-        ).do_transformation()
+        self._tmp_graph_def = self._pass_manager.run(
+            RemoveTrainingNodesOptimizer, self._tmp_graph_def, protected_nodes=input_output_names
+        )
 
-        self._tmp_graph_def = FoldBatchNormNodesOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = self._pass_manager.run(FoldBatchNormNodesOptimizer, self._tmp_graph_def)
 
         if self.performance_only or (
             "scale_propagation_concat" in self.recipes and self.recipes["scale_propagation_concat"]
         ):
-            self._tmp_graph_def = RerangeQuantizedConcat(
-                self._tmp_graph_def, self.device, performance_only=self.performance_only
-            ).do_transformation()
+            self._tmp_graph_def = self._pass_manager.run(
+                RerangeQuantizedConcat, self._tmp_graph_def, self.device, performance_only=self.performance_only
+            )
 
-        self._tmp_graph_def = MetaInfoChangingMemOpOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = self._pass_manager.run(MetaInfoChangingMemOpOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = StripEquivalentNodesOptimizer(
-            self._tmp_graph_def, self._tmp_model.output_node_names
-        ).do_transformation()
+        self._tmp_graph_def = self._pass_manager.run(
+            StripEquivalentNodesOptimizer, self._tmp_graph_def, self._tmp_model.output_node_names
+        )
 
         if self.advance_config is not None and deep_get(self.advance_config, "bias_correction") is not None:
-            self._tmp_graph_def = BiasCorrection(
-                self._tmp_graph_def, self.model.graph_def, self.new_api
-            ).do_transformation()
+            self._tmp_graph_def = self._pass_manager.run(
+                BiasCorrection, self._tmp_graph_def, self.model.graph_def, self.new_api
+            )
 
         self._tmp_graph_def.library.CopyFrom(self.model.graph_def.library)
 
@@ -860,9 +925,15 @@ class GraphConverter:
         """Insert QDQ pairs before Conv/MatMul/Pooling Ops."""
         # Fuse Pad into Conv2D, Conv3D, DepthwiseConv2dNative
         non_pad_ops = list(list(set(self.fp32_ops).union(set(self.bf16_ops))))
-        self._tmp_graph_def = FusePadWithConv2DOptimizer(
-            self._tmp_graph_def, non_pad_ops, self._tmp_model.input_node_names, self.op_wise_config, self.new_api, True
-        ).do_transformation()
+        self._tmp_graph_def = self._pass_manager.run(
+            FusePadWithConv2DOptimizer,
+            self._tmp_graph_def,
+            non_pad_ops,
+            self._tmp_model.input_node_names,
+            self.op_wise_config,
+            self.new_api,
+            True,
+        )
 
         # Sort graph
         self._tmp_graph_def = QuantizeGraphHelper().get_sorted_graph(
@@ -898,24 +969,17 @@ class GraphConverter:
         # TODO: this is a workaround to make Min/Max node be completely eliminated in int8 graph
         # after enabling pad+conv2d in new API.
         non_pad_ops = list(list(set(self.fp32_ops).union(set(self.bf16_ops))))
-        sampling_graph_def = FusePadWithFP32Conv2DOptimizer(
-            sampling_graph_def, non_pad_ops, self._tmp_model.input_node_names, self.op_wise_config, self.new_api, True
-        ).do_transformation()
+        sampling_graph_def = self._pass_manager.run(
+            FusePadWithFP32Conv2DOptimizer,
+            sampling_graph_def,
+            non_pad_ops,
+            self._tmp_model.input_node_names,
+            self.op_wise_config,
+            self.new_api,
+            True,
+        )
 
-        for i in self.quantized_node_info:
-            sampling_graph_def, output_names = InsertPrintMinMaxNode(
-                sampling_graph_def, i[0], i[-1], self.new_api
-            ).do_transformation()
-            output_tensor_names.extend(output_names)
-
-        if self.quantized_node_info:
-            sampling_graph_def.library.CopyFrom(self.model.graph_def.library)
-            self._sampling_model.graph_def = sampling_graph_def
-            self._sampling_model.output_tensor_names = output_tensor_names
-            tmp_dump_file = tempfile.mkstemp(suffix=".log")[1]
-            with CaptureOutputToFile(tmp_dump_file):
-                self._inference(self._sampling_model)
-            self._calibration_data = Helper.gen_valid_sampling_log(tmp_dump_file)
+        self._calibrate_min_max(sampling_graph_def, output_tensor_names)
 
         if hasattr(self._sampling_model, "_weight_tensor_minmax_dict"):
             self._llm_weight_minmax = self._sampling_model.weight_tensor_minmax_dict
@@ -928,7 +992,8 @@ class GraphConverter:
         gc.collect()
 
         # Insert QDQ pattern
-        self._tmp_graph_def = GenerateGraphWithQDQPattern(
+        self._tmp_graph_def = self._pass_manager.run(
+            GenerateGraphWithQDQPattern,
             self._tmp_graph_def,
             self._calibration_data,
             self.op_wise_config,
@@ -940,36 +1005,40 @@ class GraphConverter:
             self.performance_only,
             self.itex_mode,
             self._llm_weight_minmax,
-        ).do_transformation()
+        )
 
     def _convert_qdq(self):
         """Convert Dequantize + Op + QuantizeV2 into QuantizedOps."""
         if self.itex_mode:
-            self._tmp_graph_def, quantizev2_max = FreezeValueTransformer(
-                self._tmp_graph_def, self._calibration_data, "__max:", self.itex_mode
-            ).do_transformation()
-            self._tmp_graph_def, quantizev2_min = FreezeValueTransformer(
-                self._tmp_graph_def, self._calibration_data, "__min:", self.itex_mode
-            ).do_transformation()
-            self._tmp_graph_def, requant_min_max = FreezeValueTransformer(
+            self._tmp_graph_def, quantizev2_max = self._pass_manager.run(
+                FreezeValueTransformer, self._tmp_graph_def, self._calibration_data, "__max:", self.itex_mode
+            )
+            self._tmp_graph_def, quantizev2_min = self._pass_manager.run(
+                FreezeValueTransformer, self._tmp_graph_def, self._calibration_data, "__min:", self.itex_mode
+            )
+            self._tmp_graph_def, requant_min_max = self._pass_manager.run(
+                FreezeValueTransformer,
                 self._tmp_graph_def,
                 self._calibration_data,
                 "__requant_min_max",
                 tensor_data=self._kl_op_dict,
                 device=self.device,
                 itex_mode=self.itex_mode,
-            ).do_transformation()
+            )
 
             self.scale_info.update(quantizev2_max)
             self.scale_info.update(quantizev2_min)
             self.scale_info.update(requant_min_max)
 
-            self._tmp_graph_def = StripUnusedNodesOptimizer(
-                self._tmp_graph_def, self._tmp_model.input_node_names, self._tmp_model.output_node_names
-            ).do_transformation()
+            self._tmp_graph_def = self._pass_manager.run(
+                StripUnusedNodesOptimizer,
+                self._tmp_graph_def,
+                self._tmp_model.input_node_names,
+                self._tmp_model.output_node_names,
+            )
 
-            self._tmp_graph_def = ShareQDQForItexYPatternOptimizer(self._tmp_graph_def).do_transformation()
-            self._tmp_graph_def = MergeDuplicatedQDQOptimizer(self._tmp_graph_def).do_transformation()
+            self._tmp_graph_def = self._pass_manager.run(ShareQDQForItexYPatternOptimizer, self._tmp_graph_def)
+            self._tmp_graph_def = self._pass_manager.run(MergeDuplicatedQDQOptimizer, self._tmp_graph_def)
 
             self._tmp_graph_def.library.CopyFrom(self.model.graph_def.library)
             self._tmp_model.graph_def = self._tmp_graph_def
@@ -28,6 +28,8 @@ from neural_compressor.tensorflow.utils import SPR_BASE_VERSIONS, dump_elapsed_t
 class ConvertAddToBiasAddOptimizer(GraphRewriterBase):
     """Convert MatMul/Conv2D + Add(AddV2) to MatMul + BiasAdd."""
 
+    edits_node_defs_directly = False
+
     @dump_elapsed_time("Pass ConvertAddToBiasAddOptimizer")
     def do_transformation(self):
         """Execute conversion Add to BiasAdd."""
@@ -38,6 +38,8 @@ class ConvertLeakyReluOptimizer(GraphRewriterBase):
     Note, the coefficient of Mul should be less than 1 or the conversion is not valid.
     """
 
+    edits_node_defs_directly = False
+
     @dump_elapsed_time("Pass ConvertLeakyReluOptimizer")
     def do_transformation(self):
         """Fuse small ops to LeakyRelu."""
@@ -28,6 +28,8 @@ from ..graph_base import GraphRewriterBase
 class ConvertNanToRandom(GraphRewriterBase):
     """Convert Const node which value consists of NAN to random data."""
 
+    edits_node_defs_directly = False
+
     def do_transformation(self):
         """Execute convert NAN to random."""
         cur_graph = GraphAnalyzer()
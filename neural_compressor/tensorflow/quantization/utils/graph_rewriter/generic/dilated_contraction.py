@@ -29,6 +29,8 @@ from ..graph_base import GraphRewriterBase
 class DilatedContraction(GraphRewriterBase):
     """Fuse the SpaceToBatchND + Conv + BatchToSpaceND pattern."""
 
+    edits_node_defs_directly = False
+
     @dump_elapsed_time("Pass DilatedContraction")
     def do_transformation(self):
         """Dilated Contraction fusion."""
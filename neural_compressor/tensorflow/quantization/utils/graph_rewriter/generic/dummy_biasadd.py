@@ -28,6 +28,8 @@ from neural_compressor.tensorflow.utils import dump_elapsed_time
 class InjectDummyBiasAddOptimizer(GraphRewriterBase):
     """Inject dummy BiasAdd for MatMul, Conv2D for pattern fusion."""
 
+    edits_node_defs_directly = False
+
     def __init__(self, model, outputs):
         """Initialization."""
         super().__init__(model)
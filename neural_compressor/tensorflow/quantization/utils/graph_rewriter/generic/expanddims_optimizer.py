@@ -30,6 +30,8 @@ from ..graph_base import GraphRewriterBase
 class ExpandDimsOptimizer(GraphRewriterBase):
     """Calculate ExpandDims and remove it if its input is weight and next node is Conv2D."""
 
+    edits_node_defs_directly = False
+
     @dump_elapsed_time("Pass ExpandDimsOptimizer")
     def do_transformation(self):
         """Handle all ExpandDims ops whose input is weight and output is Conv2D.
@@ -30,6 +30,8 @@ from ..graph_base import GraphRewriterBase
 class GraphFoldConstantOptimizer(GraphRewriterBase):
     """Folding all the sequences only consist of const and self.supported_op_type."""
 
+    edits_node_defs_directly = False
+
     supported_op_type = ["Add", "AddV2", "Const", "Mul", "Rsqrt", "Sub"]
 
     def __init__(self, model=None):
@@ -28,6 +28,8 @@ from ..graph_base import GraphRewriterBase
 class FuseBiasAddAndAddOptimizer(GraphRewriterBase):
     """Fuse Biasadd + Add into BiasAdd when the second input of Add is const node."""
 
+    edits_node_defs_directly = False
+
     def do_transformation(self):
         """Fuse Biasadd + Add into BiasAdd for pattern fusion."""
         cur_graph = GraphAnalyzer()
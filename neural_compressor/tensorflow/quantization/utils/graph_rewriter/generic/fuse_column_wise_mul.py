@@ -29,6 +29,8 @@ from ..graph_base import GraphRewriterBase
 class FuseColumnWiseMulOptimizer(GraphRewriterBase):
     """Fuse Mul op into Conv2D/DepthwiseConv2dNative/MatMul."""
 
+    edits_node_defs_directly = False
+
     @dump_elapsed_time("Pass FuseColumnWiseMulOptimizer")
     def do_transformation(self):
         """Fuse Mul + Conv2D/DepthwiseConv2dNative/MatMul --> Conv2D/DepthwiseConv2dNative/MatMul."""
@@ -40,6 +40,8 @@ class FuseConvWithMathOptimizer(GraphRewriterBase):
     BiasAdd           BiasAdd
     """
 
+    edits_node_defs_directly = False
+
     @dump_elapsed_time("Pass FuseConvWithMathOptimizer")
     def do_transformation(self):
         """Fuse Conv + Sub + RealDiv + Mul + BiasAdd to Conv + BiasAdd."""
@@ -28,6 +28,8 @@ from neural_compressor.tensorflow.utils import SPR_BASE_VERSIONS
 class FuseGeluOptimizer(GraphRewriterBase):  # pragma: no cover
     """Fuse Sqrt + RealDiv + Erf + AddV2 + Mul + Mul into Gelu op."""
 
+    edits_node_defs_directly = False
+
     def do_transformation(self):
         """Execute the fusion from small ops to Gelu."""
         if not (tf.version.VERSION in ("1.15.0-up2", "1.15.0-up3") or tf.version.VERSION in SPR_BASE_VERSIONS):
@@ -28,6 +28,8 @@ from ..graph_base import GraphRewriterBase
 class FuseTransposeReshapeOptimizer(GraphRewriterBase):
     """Fuse Transpose + Reshape + MatMul/Conv ==> MatMul/Conv."""
 
+    edits_node_defs_directly = False
+
     @dump_elapsed_time("Pass FuseTransposeReshapeOptimizer")
     def do_transformation(self):
         """Execute Transpose + Reshape + MatMul/Conv fusion."""
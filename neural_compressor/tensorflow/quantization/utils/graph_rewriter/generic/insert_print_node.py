@@ -30,16 +30,31 @@ from neural_compressor.tensorflow.utils import version1_gt_version2
 class InsertPrintMinMaxNode(GraphRewriterBase):
     """InsertPrintMinMaxNode Pass for tensorflow sampling."""
 
-    def __init__(self, model, pre_node_name, post_node_name, new_api):
-        """Initialization."""
+    def __init__(self, model, pre_node_name, post_node_name, new_api, print_node=True):
+        """Initialization.
+
+        Args:
+            model (graphdef): input model
+            pre_node_name (string): the quantized node name.
+            post_node_name (string): the last node name of the quantized pattern.
+            new_api (bool): use the new quantization api or not.
+            print_node (bool, optional): insert the print nodes or only the min/max nodes which are fetched as
+                                         outputs. Defaults to True.
+        """
         super().__init__(model)
         self.pre_node_name = pre_node_name
         self.post_node_name = post_node_name
         self.signature = pre_node_name + post_node_name
         self.new_api = new_api
+        self.print_node = print_node
 
     def do_transformation(self):
-        """Insert print node in the graph to do the calibration."""
+        """Insert print node in the graph to do the calibration.
+
+        Returns:
+            tuple: the graphdef and the output node names of the print nodes. If print_node is False, the output
+                node names are the dict of the min/max node names to the messages of the print nodes.
+        """
         cur_graph = GraphAnalyzer()
         cur_graph.graph = self.model
 
@@ -79,7 +94,7 @@ class InsertPrintMinMaxNode(GraphRewriterBase):
 
             insert_node_pairs.append([refresh_pre_node_name, self.post_node_name])
 
-        output_names = []
+        output_names = [] if self.print_node else {}
         for node_pair_names in insert_node_pairs:
             for index, each_node_name in enumerate(node_pair_names):
                 name_with_sig = each_node_name + self.signature
@@ -161,6 +176,18 @@ class InsertPrintMinMaxNode(GraphRewriterBase):
                 attr_u = [dtypes.as_dtype(src_dt.type).as_datatype_enum]
                 min_print_node.attr["U"].list.CopyFrom(attr_value_pb2.AttrValue.ListValue(type=attr_u))
                 max_print_node.attr["U"].list.CopyFrom(attr_value_pb2.AttrValue.ListValue(type=attr_u))
+
+                if not self.print_node:
+                    # the min/max values are fetched with the messages instead of printed
+                    cur_graph.add_node(reshape_dims_node, None, [reshape_input_name])
+                    cur_graph.add_node(reduction_dims_node, None, [max_input_name, min_input_name])
+                    cur_graph.add_node(reshape_input_node, each_node_name, [max_input_name, min_input_name])
+                    cur_graph.add_node(max_input_node, reshape_input_name, [])
+                    cur_graph.add_node(min_input_node, reshape_input_name, [])
+                    output_names[max_input_name] = max_msg
+                    output_names[min_input_name] = min_msg
+                    continue
+
                 post_node_names = graph_info[Helper.node_name_from_input(each_node_name)].outputs
                 if post_node_names:
                     for post_node_name in post_node_names:
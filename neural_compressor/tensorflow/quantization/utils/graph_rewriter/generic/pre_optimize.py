@@ -29,6 +29,7 @@ from neural_compressor.tensorflow.utils import (
     version1_lt_version2,
 )
 
+from ..pass_manager import PassManager
 from .convert_add_to_biasadd import ConvertAddToBiasAddOptimizer
 from .convert_layout import ConvertLayoutOptimizer
 from .convert_leakyrelu import ConvertLeakyReluOptimizer
@@ -95,6 +96,7 @@ class PreOptimization:
         self.analyzer.parse_graph()
         self._tmp_graph_def = None
         self._excluded_node_names = []
+        self.pass_time = {}
 
     def get_excluded_node_names(self):
         """Get the excluded node name.
@@ -132,6 +134,7 @@ class PreOptimization:
         output_node_names = self.model.output_node_names
         input_node_names = self.model.input_node_names
         input_output_names = output_node_names + input_node_names
+        pass_manager = PassManager("Pre Optimization")
 
         # Add device info before convert layout
         # Google in layout optimizer where all nodes in the graph are expected to have their device
@@ -160,84 +163,82 @@ class PreOptimization:
                 node.device = node_device
             self._tmp_graph_def = cur_graph.dump_graph()
 
-            self._tmp_graph_def = ConvertLayoutOptimizer(self._tmp_graph_def, output_node_names).do_transformation()
+            self._tmp_graph_def = pass_manager.run(ConvertLayoutOptimizer, self._tmp_graph_def, output_node_names)
         else:
-            self._tmp_graph_def = ConvertLayoutOptimizer(self.model.graph_def, output_node_names).do_transformation()
+            self._tmp_graph_def = pass_manager.run(ConvertLayoutOptimizer, self.model.graph_def, output_node_names)
 
-        self._tmp_graph_def = ConvertPlaceholderToConst(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(ConvertPlaceholderToConst, self._tmp_graph_def)
 
-        self._tmp_graph_def = SwitchOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(SwitchOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = GrapplerOptimizer(
-            self._tmp_graph_def, input_output_names, self.optimization
-        ).do_transformation()
+        self._tmp_graph_def = pass_manager.run(
+            GrapplerOptimizer, self._tmp_graph_def, input_output_names, self.optimization
+        )
 
-        self._tmp_graph_def = StripUnusedNodesOptimizer(
-            self._tmp_graph_def, input_node_names, output_node_names
-        ).do_transformation()
+        self._tmp_graph_def = pass_manager.run(
+            StripUnusedNodesOptimizer, self._tmp_graph_def, input_node_names, output_node_names
+        )
 
-        self._tmp_graph_def = RemoveTrainingNodesOptimizer(
-            self._tmp_graph_def, protected_nodes=input_output_names
-        ).do_transformation()
+        self._tmp_graph_def = pass_manager.run(
+            RemoveTrainingNodesOptimizer, self._tmp_graph_def, protected_nodes=input_output_names
+        )
 
-        self._tmp_graph_def = SplitSharedInputOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(SplitSharedInputOptimizer, self._tmp_graph_def)
 
         # Put FuseDecomposedBNOptimizer before GraphFoldConstantOptimizer
         # The 'Sub' op in the small decomposed ops of BN will be converted to const by GraphFoldConstantOptimizer.
         # Then the FuseDecomposedBNOptimizer can't fuse the small decomposed ops to BN.
         if self.new_api:
-            self._tmp_graph_def = FuseDecomposedBNOptimizer(self._tmp_graph_def).do_transformation()
-            self._tmp_graph_def = FuseDecomposedINOptimizer(self._tmp_graph_def).do_transformation()
-            self._tmp_graph_def = FuseLayerNormOptimizer(self._tmp_graph_def).do_transformation()
+            self._tmp_graph_def = pass_manager.run(FuseDecomposedBNOptimizer, self._tmp_graph_def)
+            self._tmp_graph_def = pass_manager.run(FuseDecomposedINOptimizer, self._tmp_graph_def)
+            self._tmp_graph_def = pass_manager.run(FuseLayerNormOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = GraphFoldConstantOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(GraphFoldConstantOptimizer, self._tmp_graph_def)
 
         if not self.new_api:
-            self._tmp_graph_def = FuseDecomposedBNOptimizer(self._tmp_graph_def).do_transformation()
+            self._tmp_graph_def = pass_manager.run(FuseDecomposedBNOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = FuseColumnWiseMulOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(FuseColumnWiseMulOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = StripUnusedNodesOptimizer(
-            self._tmp_graph_def, input_node_names, output_node_names
-        ).do_transformation()
+        self._tmp_graph_def = pass_manager.run(
+            StripUnusedNodesOptimizer, self._tmp_graph_def, input_node_names, output_node_names
+        )
 
-        self._tmp_graph_def = FuseGeluOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(FuseGeluOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = GraphCseOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(GraphCseOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = FoldBatchNormNodesOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(FoldBatchNormNodesOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = RenameBatchNormOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(RenameBatchNormOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = ConvertLeakyReluOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(ConvertLeakyReluOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = ConvertAddToBiasAddOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(ConvertAddToBiasAddOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = FuseTransposeReshapeOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(FuseTransposeReshapeOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = FuseConvWithMathOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(FuseConvWithMathOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = ExpandDimsOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(ExpandDimsOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = FetchWeightFromReshapeOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(FetchWeightFromReshapeOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = MoveSqueezeAfterReluOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(MoveSqueezeAfterReluOptimizer, self._tmp_graph_def)
 
         if not self.new_api and not itex_mode:
             # TODO we need to remove below optimizer once the TF enabled the single
             # matmul op quantization
-            self._tmp_graph_def = InjectDummyBiasAddOptimizer(
-                self._tmp_graph_def, output_node_names
-            ).do_transformation()
+            self._tmp_graph_def = pass_manager.run(InjectDummyBiasAddOptimizer, self._tmp_graph_def, output_node_names)
 
-        self._tmp_graph_def = FuseBiasAddAndAddOptimizer(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(FuseBiasAddAndAddOptimizer, self._tmp_graph_def)
 
-        self._tmp_graph_def = ConvertNanToRandom(self._tmp_graph_def).do_transformation()
+        self._tmp_graph_def = pass_manager.run(ConvertNanToRandom, self._tmp_graph_def)
 
-        self._tmp_graph_def = StripEquivalentNodesOptimizer(self._tmp_graph_def, output_node_names).do_transformation()
+        self._tmp_graph_def = pass_manager.run(StripEquivalentNodesOptimizer, self._tmp_graph_def, output_node_names)
 
         if self.new_api or itex_mode:
-            self._tmp_graph_def = DilatedContraction(self._tmp_graph_def).do_transformation()
+            self._tmp_graph_def = pass_manager.run(DilatedContraction, self._tmp_graph_def)
 
         # node device info will be removed by GrapplerOptimizer, insert it again.
         if version1_lt_version2(tf.version.VERSION, "2.0.0"):  # pragma: no cover
@@ -276,6 +277,7 @@ class PreOptimization:
                 self._tmp_graph_def.library.function.extend([copy.deepcopy(function_def)])
 
         origin_model.graph_def = self._tmp_graph_def
+        self.pass_time = pass_manager.summary()
         return origin_model
 
     def get_matched_nodes(self, patterns):
@@ -28,6 +28,8 @@ from ..graph_base import GraphRewriterBase
 class SplitSharedInputOptimizer(GraphRewriterBase):
     """Split the shared input if the input node is shared and const."""
 
+    edits_node_defs_directly = False
+
     @dump_elapsed_time("Pass SplitSharedInputOptimizer")
     def do_transformation(self):
         """Execute splitting the shared input."""
@@ -29,6 +29,10 @@ class GraphRewriterBase:
         object (model): the input model to be converted.
     """
 
+    # The passes which change the node inputs or ops only together with a GraphAnalyzer node details update set this to
+    # False, then PassManager hands their node details to the next pass if no node is changed.
+    edits_node_defs_directly = True
+
     def __init__(self, model):
         """Initialization."""
         self.model = model
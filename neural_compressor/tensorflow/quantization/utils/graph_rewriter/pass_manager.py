@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2024 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Graph Rewriter Pass Manager."""
+
+import logging
+import time
+from collections import OrderedDict
+
+from ..graph_util import GraphAnalyzer
+
+logger = logging.getLogger("neural_compressor")
+
+
+class PassManager:
+    """Run the graph rewriter passes of a pipeline and record the elapsed time of each pass.
+
+    The manager keeps the GraphAnalyzer node details which the output graph of a pass is dumped from, and the next pass
+    reuses them instead of parsing that graph again. They are only kept if the pass doesn't edit the NodeDefs directly,
+    see GraphRewriterBase.edits_node_defs_directly, and no node is changed, since the mutators of GraphAnalyzer don't
+    keep the node outputs fully updated. Otherwise the next pass parses its input graph again.
+    """
+
+    def __init__(self, name):
+        """Initialization.
+
+        Args:
+            name (string): the pipeline name.
+        """
+        self.name = name
+        self.pass_time = OrderedDict()
+        # (output graphdef of the last pass, node details it is dumped from)
+        self._parsed_graph = None
+
+    def run(self, rewriter, model, *args, **kwargs):
+        """Run one graph rewriter pass.
+
+        Args:
+            rewriter (class): the graph rewriter class, e.g. a GraphRewriterBase subclass.
+            model (graphdef): the input graphdef object.
+            args: the other arguments of the rewriter.
+            kwargs: the other keyword arguments of the rewriter.
+
+        Returns:
+            the result of do_transformation.
+        """
+        graph_analyzer = GraphAnalyzer()
+        if self._parsed_graph is not None:
+            graph_analyzer.reuse_parsed_graph(*self._parsed_graph)
+        start = time.perf_counter()
+        try:
+            result = rewriter(model, *args, **kwargs).do_transformation()
+        finally:
+            graph_analyzer.reuse_parsed_graph(None, None)
+        elapsed_time = (time.perf_counter() - start) * 1000
+        # the passes run more than once are accumulated
+        pass_name = rewriter.__name__
+        self.pass_time[pass_name] = self.pass_time.get(pass_name, 0) + elapsed_time
+
+        self._parsed_graph = None
+        if not getattr(rewriter, "edits_node_defs_directly", True):
+            node_name_details = graph_analyzer.get_dumped_node_name_details(result)
+            if node_name_details is not None and not node_name_details.modified:
+                self._parsed_graph = (result, node_name_details)
+        return result
+
+    def summary(self):
+        """Log the elapsed time of the passes.
+
+        Returns:
+            OrderedDict: the elapsed time in ms of each pass in the running order.
+        """
+        for pass_name, elapsed_time in sorted(self.pass_time.items(), key=lambda i: i[1], reverse=True):
+            logger.debug("{} pass {} elapsed time: {} ms".format(self.name, pass_name, round(elapsed_time, 2)))
+        logger.info(
+            "{} ran {} passes in {} ms.".format(self.name, len(self.pass_time), round(sum(self.pass_time.values()), 2))
+        )
+        return self.pass_time
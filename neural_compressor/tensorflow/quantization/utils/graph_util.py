@@ -30,6 +30,122 @@ from neural_compressor.tensorflow.utils import singleton
 logger = logging.getLogger("neural_compressor")
 
 
+class NodeNameDetails(dict):
+    """The node name to node details dict of GraphAnalyzer, which indexes the node names by op type.
+
+    The op type buckets are updated on every write of the dict, so the pattern search only visits the nodes of the
+    possible start op types instead of the whole graph. A node whose op is changed in place is moved to the bucket of
+    its new op on the next query. The modified flag records whether any node is set or deleted since parse_graph.
+    """
+
+    def __init__(self):
+        """Initialization."""
+        super().__init__()
+        self._op_buckets = {}
+        # node name -> (insertion position, indexed op type)
+        self._node_index = {}
+        self._next_position = 0
+        self.modified = False
+
+    def _unindex(self, node_name):
+        op_type = self._node_index[node_name][1]
+        bucket = self._op_buckets[op_type]
+        del bucket[node_name]
+        if not bucket:
+            del self._op_buckets[op_type]
+
+    def __setitem__(self, node_name, node_details):
+        """Set the node details and index the node name by its op type."""
+        if node_name in self._node_index:
+            # the dict keeps the position of an existing key
+            self._unindex(node_name)
+            position = self._node_index[node_name][0]
+        else:
+            position = self._next_position
+            self._next_position += 1
+        super().__setitem__(node_name, node_details)
+        self.modified = True
+        op_type = node_details.node.op
+        self._node_index[node_name] = (position, op_type)
+        self._op_buckets.setdefault(op_type, {})[node_name] = None
+
+    def __delitem__(self, node_name):
+        """Delete the node details and its op type index."""
+        super().__delitem__(node_name)
+        self._unindex(node_name)
+        del self._node_index[node_name]
+        self.modified = True
+
+    def pop(self, node_name, *default):
+        """Pop the node details and its op type index."""
+        if node_name not in self:
+            if default:
+                return default[0]
+            raise KeyError(node_name)
+        node_details = super().__getitem__(node_name)
+        del self[node_name]
+        return node_details
+
+    def popitem(self):
+        """Pop the last inserted node details and its op type index."""
+        node_name, node_details = super().popitem()
+        self._unindex(node_name)
+        del self._node_index[node_name]
+        self.modified = True
+        return node_name, node_details
+
+    def setdefault(self, node_name, default=None):
+        """Set the node details if the node name doesn't exist."""
+        if node_name not in self:
+            self[node_name] = default
+        return super().__getitem__(node_name)
+
+    def update(self, *args, **kwargs):
+        """Update the node details with the op type index."""
+        for node_name, node_details in dict(*args, **kwargs).items():
+            self[node_name] = node_details
+
+    def __ior__(self, other):
+        """Update the node details with the op type index."""
+        self.update(other)
+        return self
+
+    def clear(self):
+        """Clear the node details and the op type index."""
+        super().clear()
+        self._op_buckets.clear()
+        self._node_index.clear()
+        self.modified = True
+
+    def _reindex_changed_ops(self):
+        """Move the nodes whose op is changed in place to the buckets of their new ops."""
+        changed_nodes = [
+            (node_name, position, dict.__getitem__(self, node_name).node.op)
+            for node_name, (position, op_type) in self._node_index.items()
+            if dict.__getitem__(self, node_name).node.op != op_type
+        ]
+        for node_name, position, op_type in changed_nodes:
+            self._unindex(node_name)
+            self._node_index[node_name] = (position, op_type)
+            self._op_buckets.setdefault(op_type, {})[node_name] = None
+
+    def get_node_names_by_op_types(self, op_types):
+        """Get the node names of the specified op types.
+
+        Args:
+            op_types (iterable): op types.
+
+        Returns:
+            [string list]: the node names in the order of the dict.
+        """
+        self._reindex_changed_ops()
+        node_names = []
+        for op_type in set(op_types):
+            node_names.extend(self._op_buckets.get(op_type, ()))
+        node_names.sort(key=lambda node_name: self._node_index[node_name][0])
+        return node_names
+
+
 @singleton
 class GraphAnalyzer:
     """Tensorflow Graph Analyzer class which implemented under singleton mode.
@@ -50,6 +166,8 @@ class GraphAnalyzer:
         """
         self._graph = None
         self.extend_engine = extend_engine
+        self._reusable_graph = None
+        self._dumped_graph = None
 
     @property
     def graph(self):
@@ -296,12 +414,11 @@ class GraphAnalyzer:
 
             if start_index == end_index:
                 if matched_flag:
-                    matched_res = copy.deepcopy(op_names)
-                    matched_res.reverse()
-                    op_types_copy = copy.deepcopy(op_types)
-                    op_types_copy.reverse()
-                    matched_res.append(op_types_copy)
-                    if matched_res not in output_result:
+                    matched_key = (tuple(op_names), tuple(op_types))
+                    if matched_key not in matched_keys:
+                        matched_keys.add(matched_key)
+                        matched_res = op_names[::-1]
+                        matched_res.append(op_types[::-1])
                         output_result.append(matched_res)
 
                     op_names.pop()
@@ -316,8 +433,23 @@ class GraphAnalyzer:
                     op_types.pop()
 
         output_result = []
+        matched_keys = set()
 
-        for _, v in self.node_name_details.items():
+        # only the nodes of the last mandatory type and the optional types after it could be the end of a match
+        start_op_types = set()
+        for criteria in reversed(input_pattern):
+            start_op_types.update([criteria] if isinstance(criteria, str) else criteria)
+            if not isinstance(criteria, tuple):
+                break
+        if isinstance(self.node_name_details, NodeNameDetails):
+            start_nodes = [
+                self.node_name_details[node_name]
+                for node_name in self.node_name_details.get_node_names_by_op_types(start_op_types)
+            ]
+        else:
+            start_nodes = self.node_name_details.values()
+
+        for v in start_nodes:
             start_index = len(input_pattern) - 1
             while start_index >= 0:
                 find_first_match = _validate_input(v.node.op, input_pattern[start_index])
@@ -340,17 +472,17 @@ class GraphAnalyzer:
 
         sorted_output = sorted(output_result, key=lambda i: i[-1])
 
-        useless_match_list = []
+        useless_match_ids = set()
         for index, value in enumerate(sorted_output):
             if index == len(sorted_output) - 1:
                 break
 
             next_matched_op_names = sorted_output[index + 1][:-1]
             if len(value[:-1]) < len(next_matched_op_names) and _compare_list(value[:-1], next_matched_op_names):
-                useless_match_list.append(value)
+                useless_match_ids.add(id(value))
 
-        for i in useless_match_list:
-            sorted_output.remove(i)
+        # the matches are unique, so they can be filtered by identity
+        sorted_output = [i for i in sorted_output if id(i) not in useless_match_ids]
 
         longest_match = {}
         final_output = []
@@ -395,6 +527,8 @@ class GraphAnalyzer:
             logger.debug("The target node {} has more than one input.".format(node_name))
             return False
 
+        # the inputs of the bottom nodes are edited in place
+        self.node_name_details.modified = True
         try:
             top_node_name = GraphRewriterHelper.node_name_from_input(self.node_name_details[node_name].node.input[0])
 
@@ -628,8 +762,31 @@ class GraphAnalyzer:
         for _, v in self.node_name_details.items():
             output_graph_def.node.extend([v.node])
 
+        self._dumped_graph = (output_graph_def, self.node_name_details)
         return output_graph_def
 
+    def get_dumped_node_name_details(self, graph_def):
+        """Get the node details which the graphdef is dumped from by the last dump_graph.
+
+        Args:
+            graph_def (graphdef): graphdef object.
+
+        Returns:
+            [NodeNameDetails]: the node details, None if the graphdef isn't the last dumped one.
+        """
+        if self._dumped_graph is None or self._dumped_graph[0] is not graph_def:
+            return None
+        return self._dumped_graph[1]
+
+    def reuse_parsed_graph(self, graph_def, node_name_details):
+        """Reuse the node details instead of parsing the graphdef dumped from them on the next parse_graph.
+
+        Args:
+            graph_def (graphdef): the graphdef dumped from the node details, None to stop reusing.
+            node_name_details (NodeNameDetails): the node details which the graphdef is dumped from.
+        """
+        self._reusable_graph = None if graph_def is None else (graph_def, node_name_details)
+
     def get_frame_info(self):
         """Get the frame info of the model.
 
@@ -690,7 +847,16 @@ class GraphAnalyzer:
         if not input_graph_def:
             input_graph_def = self._graph
 
-        self.node_name_details = {}
+        if self._reusable_graph is not None and self._reusable_graph[0] is input_graph_def:
+            self.node_name_details = self._reusable_graph[1]
+            self._reusable_graph = None
+            # the graphdef is dumped from the node details in order, bind them to its nodes as parsing it does
+            for (node_name, node_details), node in zip(list(self.node_name_details.items()), input_graph_def.node):
+                self.node_name_details[node_name] = node_details._replace(node=node)
+            self.node_name_details.modified = False
+            return self.node_name_details
+
+        self.node_name_details = NodeNameDetails()
 
         for node in input_graph_def.node:
             node_name = GraphRewriterHelper.node_name_from_input(node.name)
@@ -705,6 +871,7 @@ class GraphAnalyzer:
             for each_input in node_details.node.input:
                 self.node_name_details[GraphRewriterHelper.node_name_from_input(each_input)].outputs.append(node_name)
 
+        self.node_name_details.modified = False
         return self.node_name_details
 
 
@@ -1093,6 +1260,36 @@ class GraphRewriterHelper:
 
         return final_res
 
+    @staticmethod
+    def gen_min_max_sampling_data(messages, values):
+        """Generate the sampling min max value of one iteration from the fetched min/max outputs.
+
+        The result is the same as what gen_valid_sampling_log generates from the log of the print nodes.
+
+        Args:
+          messages: the print messages of the min/max outputs.
+          values: the min/max output values.
+
+        Returns:
+          the sampling min max value.
+        """
+        res = []
+        requant_ranges = {}
+        for message, value in zip(messages, values):
+            value = float(value)
+            if message.find("__print__;__requant_") == -1:
+                res.append("{}[{}]".format(message, value))
+            else:
+                # e.g. ';conv_eightbit_requant_range__print__;__requant_max:'
+                name, postfix = message.rsplit("_", 1)
+                requant_ranges.setdefault(name, {})[postfix] = value
+
+        for name, requant_range in requant_ranges.items():
+            min_value = min(0, requant_range["min:"])
+            max_value = requant_range["max:"] if requant_range["max:"] > min_value else min_value + 1e-05
+            res.append("{}_min_max:[{}][{}]".format(name, min_value, max_value))
+        return res
+
     @staticmethod
     def analysis_rnn_model(graph_def, bf16_ops=[], fp32_ops=[]):
         """Match the RNN and dynamic RNN patterns."""
@@ -46,6 +46,7 @@ from neural_compressor.tensorflow.utils.utility import (
     dequantize_weight,
     dump_data_to_local,
     load_data_from_pkl,
+    get_model_fingerprint,
     singleton,
     CpuInfo,
     Statistics,
@@ -187,18 +187,21 @@ def graph_session(model, input_tensor_names, output_tensor_names, **kwargs):
     return sess, input_tensor_names, output_tensor_names
 
 
-def graph_def_session(model, input_tensor_names, output_tensor_names, **kwargs):
+def graph_def_session(model, input_tensor_names, output_tensor_names, return_repaired=False, **kwargs):
     """Build session with tf.compat.v1.GraphDef.
 
     Args:
         model (tf.compat.v1.GraphDef): tf.compat.v1.GraphDef object.
         input_tensor_names (list of string): input_tensor_names of model.
         output_tensor_names (list of string): output_tensor_names of model.
+        return_repaired (bool, optional): also return whether the graph_def is fixed and stripped because it can't
+            be imported directly. Defaults to False.
 
     Returns:
         sess (tf.compat.v1.Session): tf.compat.v1.Session object
         input_tensor_names (list of string): validated input_tensor_names
         output_tensor_names (list of string): validated output_tensor_names
+        repaired (bool): whether the graph_def is repaired, only returned if return_repaired is True.
     """
     device = kwargs.get("device")
     graph = tf.Graph()
@@ -209,10 +212,12 @@ def graph_def_session(model, input_tensor_names, output_tensor_names, **kwargs):
     else:
         list_physical_devices = tf.config.list_physical_devices
 
+    repaired = False
     try:
         with graph.as_default():
             tf.import_graph_def(model, name="")
     except:
+        repaired = True
         input_tensor_names, output_tensor_names = validate_and_inference_input_output(
             model, input_tensor_names, output_tensor_names
         )
@@ -228,7 +233,25 @@ def graph_def_session(model, input_tensor_names, output_tensor_names, **kwargs):
         with graph.as_default():
             tf.import_graph_def(model, name="")
 
-    return graph_session(graph, input_tensor_names, output_tensor_names, **kwargs)
+    output_sess = graph_session(graph, input_tensor_names, output_tensor_names, **kwargs)
+    return (*output_sess, repaired) if return_repaired else output_sess
+
+
+# the ref type ops fixed by fix_ref_type_of_graph_def if the graph_def can't be imported directly
+_REF_TYPE_OPS = ["RefSwitch", "AssignSub", "AssignAdd", "Assign"]
+
+
+def _add_default_attrs(graph_def):
+    """Add the default attrs of the registered ops to the nodes in place, as importing the graph_def does."""
+    from tensorflow.python.framework import op_def_registry
+
+    for node in graph_def.node:
+        op_def = op_def_registry.get(node.op)
+        if op_def is None:
+            continue
+        for attr_def in op_def.attr:
+            if attr_def.name not in node.attr and attr_def.HasField("default_value"):
+                node.attr[attr_def.name].CopyFrom(attr_def.default_value)
 
 
 def frozen_pb_session(model, input_tensor_names, output_tensor_names, **kwargs):
@@ -736,11 +759,13 @@ class TensorflowBaseModel(BaseModel):
         self._name = ""
         self._weights = None
         self.kwargs = kwargs
-        self._graph_info = {}
+        self._graph_info = None
         self._input_tensor_names = []
         self._output_tensor_names = []
         self._model_type = ""
         self._sess = None
+        # the graph_def assigned by the graph_def setter, the session is built from it when it is needed
+        self._assigned_graph_def = None
         self._iter_op = None
         self._workspace_path = ""
         self._q_config = None
@@ -820,14 +845,24 @@ class TensorflowBaseModel(BaseModel):
     @property
     def graph_def(self):
         """Return graph definition."""
+        if self._assigned_graph_def is not None:
+            # return a copy as as_graph_def does, the callers may modify it in place
+            graph_def = tf.compat.v1.GraphDef()
+            graph_def.CopyFrom(self._assigned_graph_def)
+            return graph_def
         return self.graph.as_graph_def()
 
+    def _get_graph_def(self):
+        """Return the graph definition to read without copying the assigned one."""
+        if self._assigned_graph_def is not None:
+            return self._assigned_graph_def
+        return self.graph_def
+
     @property
     def graph_info(self):
         """Return graph info."""
-        self._graph_info = {}
-        for node in self.graph_def.node:
-            self._graph_info[node.name] = node.op
+        if self._graph_info is None:
+            self._graph_info = {node.name: node.op for node in self._get_graph_def().node}
         return self._graph_info
 
     @property
@@ -844,26 +879,49 @@ class TensorflowBaseModel(BaseModel):
 
     @graph_def.setter
     def graph_def(self, graph_def):
-        """Set graph definition."""
+        """Set graph definition.
+
+        The graph passes assign the graph_def after most rewrites, so the session is not built here but when sess,
+        graph, input_tensor or output_tensor is used.
+        """
         if self._sess is not None:
             self._sess.close()
-        output_sess = SESSIONS["graph_def"](
-            graph_def, self._input_tensor_names, self._output_tensor_names, **self.kwargs
+            self._sess = None
+        self._assigned_graph_def = tf.compat.v1.GraphDef()
+        self._assigned_graph_def.CopyFrom(graph_def)
+        _add_default_attrs(self._assigned_graph_def)
+        self._input_tensor_names, self._output_tensor_names = validate_and_inference_input_output(
+            self._assigned_graph_def, self._input_tensor_names, self._output_tensor_names
         )
-
-        self._sess = output_sess[0]
-        self._input_tensor_names = output_sess[1]
-        self._output_tensor_names = output_sess[2]
+        self._graph_info = None
         self.model_type = "graph_def"
+        if any(node.op in _REF_TYPE_OPS for node in self._assigned_graph_def.node):
+            # the graph_def is repaired when the session is built, so build it now to return the repaired graph_def
+            self._load_sess(self._model, **self.kwargs)
 
     def _load_sess(self, model, **kwargs):
         if self.name:
             kwargs.update({"name": self.name})
-        # assert self.model_type, 'model type not set....'
-        output_sess = SESSIONS[self.model_type](model, self._input_tensor_names, self._output_tensor_names, **kwargs)
+        if self._assigned_graph_def is not None:
+            output_sess = graph_def_session(
+                self._assigned_graph_def,
+                self._input_tensor_names,
+                self._output_tensor_names,
+                return_repaired=True,
+                **kwargs,
+            )
+            if output_sess[3]:
+                # the graph_def is fixed and stripped if it can't be imported directly
+                self._assigned_graph_def = output_sess[0].graph.as_graph_def()
+        else:
+            # assert self.model_type, 'model type not set....'
+            output_sess = SESSIONS[self.model_type](
+                model, self._input_tensor_names, self._output_tensor_names, **kwargs
+            )
         self._sess = output_sess[0]
         self._input_tensor_names = output_sess[1]
         self._output_tensor_names = output_sess[2]
+        self._graph_info = None
 
         tf.compat.v1.get_variable_scope().reuse_variables()
         return self._sess
@@ -872,17 +930,14 @@ class TensorflowBaseModel(BaseModel):
     def iter_op(self):
         """Return model iter op list."""
         self._iter_op = []
-        if self._sess is None:
-            self._load_sess(self._model, **self.kwargs)
-        op_list = [node.op for node in self._sess.graph.as_graph_def().node]
-        if "MakeIterator" in op_list:
-            self._iter_op.append(self._sess.graph.get_operation_by_name("MakeIterator"))
+        if "MakeIterator" in self.graph_info.values():
+            self._iter_op.append(self.sess.graph.get_operation_by_name("MakeIterator"))
         return self._iter_op
 
     @property
     def input_tensor_names(self):
         """Return input tensor names."""
-        if self._sess is None:
+        if self._sess is None and self._assigned_graph_def is None:
             self._load_sess(self._model, **self.kwargs)
         return copy.deepcopy(self._input_tensor_names)
 
@@ -892,9 +947,9 @@ class TensorflowBaseModel(BaseModel):
         if len(tensor_names) == 0:
             logger.warning("Input tensor names is empty.")
             return
-        if self._sess is not None:
+        if self._sess is not None or self._assigned_graph_def is not None:
             assert validate_graph_node(
-                self.graph_def, tensor_to_node(tensor_names)
+                self._get_graph_def(), tensor_to_node(tensor_names)
             ), "tensor names {} not in graph".format(tensor_names)
         self._input_tensor_names = tensor_names
 
@@ -911,9 +966,9 @@ class TensorflowBaseModel(BaseModel):
         if len(tensor_names) == 0:
             logger.warning("Output tensor names should not be empty.")
             return
-        if self._sess is not None:
+        if self._sess is not None or self._assigned_graph_def is not None:
             assert validate_graph_node(
-                self.graph_def, tensor_to_node(tensor_names)
+                self._get_graph_def(), tensor_to_node(tensor_names)
             ), "tensor names {} not in graph".format(tensor_names)
         self._output_tensor_names = tensor_names
 
@@ -1188,6 +1243,7 @@ class TensorflowLLMModel(TensorflowSavedModelModel):
     def graph_def(self, graph_def):
         """Set graph definition."""
         self._graph_def = graph_def
+        self._graph_info = None
         # the attributes of some nodes can't be correctly read if don't import the graph_def
         tf.import_graph_def(self._graph_def, name="")
 
@@ -1385,7 +1441,7 @@ class TensorflowCheckpointModel(TensorflowBaseModel):
     def graph_def(self):
         """Return graph definition."""
         if self.model_type == "graph_def":
-            return self.sess.graph.as_graph_def()
+            return super().graph_def
         from tensorflow.compat.v1 import graph_util
 
         from neural_compressor.tensorflow.quantization.utils.utility import _parse_ckpt_bn_input
@@ -1399,15 +1455,7 @@ class TensorflowCheckpointModel(TensorflowBaseModel):
     @graph_def.setter
     def graph_def(self, graph_def):
         """Set graph definition."""
-        if self._sess is not None:
-            self._sess.close()
-        output_sess = SESSIONS["graph_def"](
-            graph_def, self._input_tensor_names, self._output_tensor_names, **self.kwargs
-        )
-        self._sess = output_sess[0]
-        self._input_tensor_names = output_sess[1]
-        self._output_tensor_names = output_sess[2]
-        self.model_type = "graph_def"
+        TensorflowBaseModel.graph_def.fset(self, graph_def)
 
     @property
     def model(self):
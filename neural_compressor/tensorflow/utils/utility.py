@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
 import importlib
 import logging
 import os
@@ -222,6 +223,38 @@ def load_data_from_pkl(path, filename):
         logging.getLogger("neural_compressor").info("Can not open %s." % path)
 
 
+def get_model_fingerprint(model):
+    """Get a hash of the model graph and weights, used as the key of tuning result cache.
+
+    Args:
+        model: the path to a model file or folder, a keras model or a model object supported by Model.
+
+    Returns:
+        str: the hex digest of the model.
+    """
+    import tensorflow as tf
+
+    sha256 = hashlib.sha256()
+    if isinstance(model, str):
+        model_files = [model]
+        if os.path.isdir(model):
+            model_files = sorted(os.path.join(root, name) for root, _, files in os.walk(model) for name in files)
+        for model_file in model_files:
+            sha256.update(os.path.relpath(model_file, model).encode())
+            with open(model_file, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 24), b""):
+                    sha256.update(chunk)
+    elif isinstance(model, tf.keras.Model):
+        sha256.update(model.to_json().encode())
+        for weight in model.get_weights():
+            sha256.update(np.ascontiguousarray(weight).data)
+    else:
+        from neural_compressor.tensorflow.utils.model import Model
+
+        sha256.update(Model(model).graph_def.SerializeToString(deterministic=True))
+    return sha256.hexdigest()
+
+
 def singleton(cls):
     """Not displayed in API Docs.
 
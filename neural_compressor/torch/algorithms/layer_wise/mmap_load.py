@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2024 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Memory-mapped tensor index of safetensors and pytorch checkpoints."""
+
+import io
+import json
+import mmap
+import os
+import pickle
+import struct
+import threading
+from collections import namedtuple
+
+import torch
+from packaging.version import Version
+from torch.serialization import StorageType, _is_zipfile, _maybe_decode_ascii, _open_zipfile_reader
+
+torch_version = torch.__version__.split("+")[0]
+version = Version(torch_version)
+
+SAFETENSORS_DTYPES = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+for _name, _dtype in [("F8_E4M3", "float8_e4m3fn"), ("F8_E5M2", "float8_e5m2")]:
+    if hasattr(torch, _dtype):
+        SAFETENSORS_DTYPES[_name] = getattr(torch, _dtype)
+SAFETENSORS_DTYPE_NAMES = {v: k for k, v in SAFETENSORS_DTYPES.items()}
+
+# the location of a tensor in a checkpoint file, `offset` is None if the file can't be memory-mapped.
+TensorInfo = namedtuple("TensorInfo", ["name", "file", "offset", "dtype", "shape", "stride"])
+
+
+def _contiguous_stride(shape):
+    stride = []
+    acc = 1
+    for size in reversed(shape):
+        stride.append(acc)
+        acc *= size
+    return tuple(reversed(stride))
+
+
+def _parse_safetensors(file):
+    """Get the TensorInfo of every tensor in a safetensors file from its header."""
+    with open(file, "rb") as f:
+        (header_len,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_len))
+    header.pop("__metadata__", None)
+    infos = {}
+    for name, meta in header.items():
+        shape = tuple(meta["shape"])
+        offset = 8 + header_len + meta["data_offsets"][0]
+        infos[name] = TensorInfo(
+            name, file, offset, SAFETENSORS_DTYPES[meta["dtype"]], shape, _contiguous_stride(shape)
+        )
+    return infos
+
+
+class _StorageRecord:
+    def __init__(self, key, dtype):
+        self.key = key
+        self.dtype = dtype
+
+
+def _record_tensor(storage, storage_offset, size, stride, *args, **kwargs):
+    return (storage, storage_offset, tuple(size), tuple(stride))
+
+
+def _record_tensor_v3(storage, storage_offset, size, stride, requires_grad, backward_hooks, dtype, metadata=None):
+    storage.dtype = dtype
+    return (storage, storage_offset, tuple(size), tuple(stride))
+
+
+class _MetadataUnpickler(pickle.Unpickler):
+    """Unpickle the data.pkl of a pytorch zip checkpoint without loading any storage."""
+
+    def find_class(self, mod_name, name):
+        if mod_name == "torch._utils" and name == "_rebuild_tensor_v2":
+            return _record_tensor
+        if mod_name == "torch._utils" and name == "_rebuild_tensor_v3":
+            return _record_tensor_v3
+        if mod_name == "torch._utils" and name == "_rebuild_parameter":
+            return lambda data, *args: data
+        if type(name) is str and "Storage" in name:
+            try:
+                return StorageType(name)
+            except KeyError:  # pragma: no cover
+                pass
+        if mod_name == "torch.tensor":  # pragma: no cover
+            mod_name = "torch._tensor"
+        return super().find_class(mod_name, name)
+
+    def persistent_load(self, saved_id):
+        typename = _maybe_decode_ascii(saved_id[0])
+        assert typename == "storage", f"Unknown typename for persistent_load, expected 'storage' but got '{typename}'"
+        storage_type, key, location, numel = saved_id[1:]
+        dtype = torch.uint8 if storage_type is torch.UntypedStorage else storage_type.dtype
+        return _StorageRecord(key, dtype)
+
+
+def _parse_torch_zip(file):
+    """Get the TensorInfo of every tensor in a pytorch zip checkpoint, storages are located with the zip records."""
+    infos = {}
+    # the offsets of the zip records are available since torch 2.1.
+    can_mmap = version.release >= Version("2.1.0").release
+    with _open_zipfile_reader(file) as zip_file:
+        state_dict = _MetadataUnpickler(io.BytesIO(zip_file.get_record("data.pkl")), encoding="utf-8").load()
+        for name, value in state_dict.items():
+            if not (isinstance(value, tuple) and isinstance(value[0], _StorageRecord)):  # pragma: no cover
+                continue
+            storage, storage_offset, shape, stride = value
+            offset = None
+            if can_mmap:
+                record_offset = zip_file.get_record_offset(f"data/{storage.key}")
+                offset = record_offset + storage_offset * torch._utils._element_size(storage.dtype)
+            infos[name] = TensorInfo(name, file, offset, storage.dtype, shape, stride)
+    return infos
+
+
+def _parse_checkpoint_file(file):
+    if file.endswith(".safetensors"):
+        return _parse_safetensors(file)
+    with open(file, "rb") as f:
+        is_zipfile = _is_zipfile(f)
+    if is_zipfile:
+        return _parse_torch_zip(file)
+    # the legacy format is loaded by the pickle loader.
+    from .utils import load_tensor  # pragma: no cover
+
+    state_dict = load_tensor(file)  # pragma: no cover
+    return {  # pragma: no cover
+        name: TensorInfo(name, file, None, v.dtype, tuple(v.shape), v.stride()) for name, v in state_dict.items()
+    }
+
+
+def map_tensor(info):
+    """Map a tensor from its file without copying.
+
+    Every call maps the bytes privately, so changing the returned tensor in place neither touches the file nor the
+    tensors returned by other calls.
+
+    Args:
+        info (TensorInfo): the location of the tensor.
+
+    Returns:
+        torch.Tensor: the tensor.
+    """
+    if info.offset is None:  # pragma: no cover
+        from .utils import load_tensor
+
+        return load_tensor(info.file, info.name)
+    numel = 1
+    for size in info.shape:
+        numel *= size
+    if numel == 0:
+        return torch.empty(info.shape, dtype=info.dtype)
+    extent = 1 + sum((size - 1) * stride for size, stride in zip(info.shape, info.stride))
+    element_size = torch._utils._element_size(info.dtype)
+    # the offset of a mapping has to be aligned with the allocation granularity.
+    start = info.offset - info.offset % mmap.ALLOCATIONGRANULARITY
+    with open(info.file, "rb") as f:
+        buffer = mmap.mmap(
+            f.fileno(), info.offset - start + extent * element_size, access=mmap.ACCESS_COPY, offset=start
+        )
+    tensor = torch.frombuffer(buffer, dtype=info.dtype, count=extent, offset=info.offset - start)
+    if info.stride == _contiguous_stride(info.shape):
+        return tensor.view(info.shape)
+    return tensor.as_strided(info.shape, info.stride)
+
+
+class CheckpointIndex:
+    """Index from tensor name to its location in the files of a checkpoint.
+
+    Safetensors files and pytorch zip files are supported, the headers are parsed only once and the tensors are
+    memory-mapped on demand.
+    """
+
+    INDEX_FILES = ["model.safetensors.index.json", "pytorch_model.bin.index.json"]
+    WEIGHT_FILES = ["model.safetensors", "pytorch_model.bin"]
+
+    def __init__(self, path):
+        """Init a CheckpointIndex.
+
+        Args:
+            path (str): the local path of the checkpoint directory or a checkpoint file.
+        """
+        self.path = path
+        self.weight_map = {}
+        self.infos = {}
+        self.lock = threading.Lock()
+        if os.path.isfile(path):
+            self.weight_map = None
+            self.files = [path]
+            return
+        files = os.listdir(path)
+        for index_file in self.INDEX_FILES:
+            if index_file in files:
+                with open(os.path.join(path, index_file), "r") as f:
+                    weight_map = json.load(f)["weight_map"]
+                self.weight_map = {name: os.path.join(path, file) for name, file in weight_map.items()}
+                self.files = sorted(set(self.weight_map.values()))
+                return
+        for weight_file in self.WEIGHT_FILES:
+            if weight_file in files:
+                self.weight_map = None
+                self.files = [os.path.join(path, weight_file)]
+                return
+        raise FileNotFoundError(f"No checkpoint file is found in {path}.")
+
+    def _get_file_infos(self, file):
+        with self.lock:
+            if file not in self.infos:
+                self.infos[file] = _parse_checkpoint_file(file)
+            return self.infos[file]
+
+    def get_info(self, tensor_name):
+        """Get the TensorInfo of a tensor, None if it is not in the checkpoint."""
+        if self.weight_map is None:
+            return self._get_file_infos(self.files[0]).get(tensor_name)
+        if tensor_name not in self.weight_map:
+            return None
+        return self._get_file_infos(self.weight_map[tensor_name]).get(tensor_name)
+
+    def get_tensor(self, tensor_name, prefix=None):
+        """Get a memory-mapped tensor by name.
+
+        Args:
+            tensor_name (str): the name of the tensor.
+            prefix (str, optional): the base model prefix which may be missing in the checkpoint. Defaults to None.
+
+        Returns:
+            torch.Tensor: the tensor.
+        """
+        # transformers.modeling_utils
+        if "gamma" in tensor_name:  # pragma: no cover
+            tensor_name = tensor_name.replace("gamma", "weight")
+        if "beta" in tensor_name:  # pragma: no cover
+            tensor_name = tensor_name.replace("beta", "bias")
+        info = self.get_info(tensor_name)
+        if info is None and prefix:
+            info = self.get_info(tensor_name.replace(f"{prefix}.", ""))
+        assert info is not None, "{} not in the checkpoint {}".format(tensor_name, self.path)
+        return map_tensor(info)
+
+
+_checkpoint_indexes = {}
+_checkpoint_indexes_lock = threading.Lock()
+
+
+def get_checkpoint_index(path):
+    """Get the cached CheckpointIndex of a checkpoint."""
+    path = os.path.abspath(path)
+    with _checkpoint_indexes_lock:
+        if path not in _checkpoint_indexes:
+            _checkpoint_indexes[path] = CheckpointIndex(path)
+        return _checkpoint_indexes[path]
+
+
+def save_safetensors(state_dict, path):
+    """Save a state dict in the safetensors format so that it can be memory-mapped by `load_safetensors`.
+
+    The file is written to a temporary path first and then replaced, so the tensors mapped from an old file are not
+    affected.
+
+    Args:
+        state_dict (dict): the state dict.
+        path (str): the path of the file.
+    """
+    header = {}
+    tensors = []
+    offset = 0
+    for name, value in state_dict.items():
+        value = value.detach().to("cpu").contiguous()
+        nbytes = value.numel() * value.element_size()
+        header[name] = {
+            "dtype": SAFETENSORS_DTYPE_NAMES[value.dtype],
+            "shape": list(value.shape),
+            "data_offsets": [offset, offset + nbytes],
+        }
+        tensors.append(value)
+        offset += nbytes
+    header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    # the data is aligned to 8 bytes as in the safetensors library.
+    header += b" " * (-len(header) % 8)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for value in tensors:
+            if value.numel() > 0:
+                f.write(memoryview(value.reshape(-1).view(torch.uint8).numpy()))
+    os.replace(tmp_path, path)
+
+
+def load_safetensors(path):
+    """Load a memory-mapped state dict saved by `save_safetensors`."""
+    return {name: map_tensor(info) for name, info in _parse_safetensors(path).items()}
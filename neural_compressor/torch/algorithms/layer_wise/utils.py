@@ -19,6 +19,9 @@
 import gc
 import json
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import torch
 from accelerate import init_empty_weights
@@ -29,6 +32,7 @@ from transformers.models.auto.auto_factory import _BaseAutoModelClass
 from neural_compressor.common import options
 
 from .load import load
+from .mmap_load import get_checkpoint_index, load_safetensors, save_safetensors
 
 LWQ_WORKSPACE = os.path.join(options.workspace, "layer_wise_tmp")
 
@@ -223,11 +227,7 @@ def load_value(model, param_name, path):
             if module == input_embeddings:
                 param_name = name + "." + param_name.split(".")[-1]
     prefix = model.base_model_prefix
-    if "pytorch_model.bin.index.json" in os.listdir(path):
-        value = load_tensor_from_shard(path, param_name, prefix)
-    else:
-        value = load_tensor(os.path.join(path, "pytorch_model.bin"), param_name, prefix)
-    return value
+    return get_checkpoint_index(path).get_tensor(param_name, prefix)
 
 
 def load_module(model, module_name, path, device="cpu"):
@@ -238,36 +238,176 @@ def load_module(model, module_name, path, device="cpu"):
         set_module_tensor_to_device(model, param_name, device, value)
 
 
-def register_weight_hooks(model, path, device="cpu", clean_weight=True, saved_path=None):
+def get_workspace_file(name, workspace=LWQ_WORKSPACE):
+    """Get the path of the weights of a submodule dumped to the layer-wise workspace."""
+    return os.path.join(workspace, f"{name}.safetensors")
+
+
+def _load_module_state_dict(model, name, module, path, from_workspace=True):
+    """Load the parameters of a submodule from the layer-wise workspace or the checkpoint."""
+    state_dict = None
+    if from_workspace and os.path.exists(get_workspace_file(name)):
+        state_dict = load_safetensors(get_workspace_file(name))
+    values = {}
+    for n, p in module.named_parameters():
+        if state_dict:
+            values[n] = state_dict[n]
+        else:
+            values[n] = load_value(model, name + "." + n, path)
+    return values
+
+
+class WeightPrefetcher:
+    """Load the weights of the next submodules in a background thread while the current one is running.
+
+    The submodules are expected to run in the same order every time, which is recorded while the hooks are called.
+    Before the order is known, the order of `get_named_children` is used. At most `prefetch_num` submodules are
+    loaded ahead, and the total size of them is limited by `max_memory` in bytes. Prefetched weights that are not
+    going to be used next are evicted. The prefetcher is owned by the caller, which closes it once all weights are
+    loaded.
+
+    Examples:
+        prefetcher = WeightPrefetcher(model, path, get_named_children(model), prefetch_num=2)
+        handles = register_weight_hooks(model, path, prefetcher=prefetcher)
+        ...
+        prefetcher.close()
+    """
+
+    def __init__(self, model, path, modules, prefetch_num=1, max_memory=None, from_workspace=True):
+        """Init a WeightPrefetcher.
+
+        Args:
+            model (torch.nn.Module): the empty model.
+            path (str): the path of the checkpoint.
+            modules (list): the list of (name, submodule) whose weights are loaded.
+            prefetch_num (int, optional): the number of submodules loaded ahead. Defaults to 1.
+            max_memory (int, optional): the memory budget of prefetched weights in bytes. Defaults to None.
+            from_workspace (bool, optional): whether to load the weights saved to the layer-wise workspace instead of
+                the checkpoint if they exist. Defaults to True.
+        """
+        self.model = model
+        self.path = path
+        self.from_workspace = from_workspace
+        self.modules = OrderedDict((name, module) for name, module in modules if len(module._parameters) > 0)
+        self.prefetch_num = prefetch_num
+        self.max_memory = max_memory
+        names = list(self.modules)
+        # the recorded execution order, initialized with the order of definition.
+        self.next_name = dict(zip(names, names[1:]))
+        self.last_name = None
+        self.futures = OrderedDict()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lwq_prefetch")
+
+    def _get_size(self, name):
+        # the parameters of the empty model are on meta device but have the right shapes and dtypes.
+        return sum(p.numel() * p.element_size() for p in self.modules[name].parameters())
+
+    def _get_upcoming_names(self, name):
+        names = []
+        next_name = self.next_name.get(name)
+        while next_name is not None and next_name != name and next_name not in names:
+            if len(names) >= self.prefetch_num:
+                break
+            names.append(next_name)
+            next_name = self.next_name.get(next_name)
+        return names
+
+    def _schedule(self, name):
+        upcoming_names = self._get_upcoming_names(name)
+        with self.lock:
+            for evicted_name in [n for n in self.futures if n not in upcoming_names]:
+                self.futures.pop(evicted_name).cancel()
+            memory = sum(self._get_size(n) for n in self.futures)
+            for next_name in upcoming_names:
+                if next_name in self.futures:
+                    continue
+                size = self._get_size(next_name)
+                if self.max_memory is not None and memory + size > self.max_memory:
+                    break
+                memory += size
+                self.futures[next_name] = self.executor.submit(self._load, next_name)
+
+    def _load(self, name):
+        return _load_module_state_dict(self.model, name, self.modules[name], self.path, self.from_workspace)
+
+    def get(self, name):
+        """Get the weights of a submodule and start loading the ones of the next submodules.
+
+        Args:
+            name (str): the name of the submodule.
+
+        Returns:
+            dict: the parameter names and values of the submodule.
+        """
+        if self.last_name is not None and self.last_name != name:
+            self.next_name[self.last_name] = name
+        self.last_name = name
+        with self.lock:
+            future = self.futures.pop(name, None)
+        self._schedule(name)
+        if future is not None:
+            return future.result()
+        return self._load(name)
+
+    def invalidate(self, name):
+        """Drop the prefetched weights of a submodule since they are changed."""
+        with self.lock:
+            future = self.futures.pop(name, None)
+        if future is not None:
+            future.cancel()
+
+    def close(self):
+        """Stop loading weights and release the prefetched weights."""
+        with self.lock:
+            for future in self.futures.values():
+                future.cancel()
+            self.futures.clear()
+        self.executor.shutdown(wait=True)
+
+
+def register_weight_hooks(model, path, device="cpu", clean_weight=True, saved_path=None, prefetcher=None):
+    """Register hooks to load the weights of each submodule before its forward and to clean them after.
+
+    Args:
+        model (torch.nn.Module): the empty model.
+        path (str): the path of the checkpoint.
+        device (str, optional): the device to load the weights to. Defaults to "cpu".
+        clean_weight (bool, optional): whether to clean the weights after forward. Defaults to True.
+        saved_path (str, optional): the path to save the weights after forward. Defaults to None.
+        prefetcher (WeightPrefetcher, optional): the prefetcher which loads the weights of the next submodules in a
+            background thread, it is closed by the caller. Defaults to None, which loads the weights synchronously.
+
+    Returns:
+        dict: the hook handles of each submodule.
+    """
     if saved_path:
         os.makedirs(saved_path, exist_ok=True)
 
+    modules = get_named_children(model)
+
     def forward_pre_hook(name):
         def hook(module, input):
-            state_dict = None
-            if os.path.exists(os.path.join(LWQ_WORKSPACE, f"{name}.pt")):
-                state_dict = torch.load(os.path.join(LWQ_WORKSPACE, f"{name}.pt"))
-            for n, p in module.named_parameters():
-                param_name = name + "." + n
-                if state_dict:
-                    value = state_dict[n]
-                else:
-                    value = load_value(model, param_name, path)
-                set_module_tensor_to_device(model, param_name, device, value)
+            if prefetcher is not None and name in prefetcher.modules:
+                values = prefetcher.get(name)
+            else:
+                values = _load_module_state_dict(model, name, module, path)
+            for n, value in values.items():
+                set_module_tensor_to_device(model, name + "." + n, device, value)
 
         return hook
 
     def forward_hook(name):
         def hook(module, input, output):
             if saved_path:
-                file_path = os.path.join(saved_path, f"{name}.pt")
-                torch.save(module.state_dict(), file_path)
+                save_safetensors(module.state_dict(), get_workspace_file(name, saved_path))
+                if prefetcher is not None:
+                    prefetcher.invalidate(name)
             clean_module_weight(module)
 
         return hook
 
     handle = {}
-    modules = get_named_children(model)
     for name, module in modules:
         handle[name] = [module.register_forward_pre_hook(forward_pre_hook(name))]
         if clean_weight:
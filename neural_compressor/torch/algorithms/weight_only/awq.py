@@ -14,7 +14,7 @@
 
 # Copied from neural_compressor/adaptor/torch_utils/awq.py
 
-import copy
+import itertools
 
 import torch
 
@@ -32,6 +32,11 @@ from .utility import (
     set_module,
 )
 
+try:
+    from torch.func import functional_call
+except ImportError:  # pragma: no cover
+    from torch.nn.utils.stateless import functional_call
+
 __all__ = ["awq_quantize"]
 
 
@@ -106,6 +111,56 @@ def _get_act_scale(input_val):
     return tmp.mean(0)
 
 
+def _get_weight_name(module, module_name):
+    # the weight of MulLinear is owned by the wrapped linear
+    if isinstance(module, MulLinear):
+        return module_name + ".linear.weight"
+    return module_name + ".weight"
+
+
+@torch.no_grad()
+def _get_batched_loss(module, input_val, org_out, weights, max_batch_numel=2**27):
+    """Get the MSE loss of a linear module with each candidate weight, the module is not changed.
+
+    The candidates are stacked and evaluated against the cached inputs in batched matmuls. The number of elements of
+    the stacked weights and outputs in one batch is bounded by `max_batch_numel`.
+
+    Args:
+        module (torch.nn.Module): a Linear or MulLinear module.
+        input_val (list): the cached inputs of the module.
+        org_out (list): the original outputs of the module.
+        weights (iterable): the candidate weights, which are consumed lazily.
+        max_batch_numel (int, optional): the bound of elements in one batch. Defaults to 2**27.
+
+    Returns:
+        list: the loss of each candidate weight.
+    """
+    if isinstance(module, MulLinear):
+        input_scale, linear = module.input_scale, module.linear
+    else:
+        input_scale, linear = None, module
+    out_features, in_features = linear.weight.shape
+    rows = max(inp.numel() // in_features for inp in input_val)
+    batch_size = max(1, max_batch_numel // (out_features * (in_features + rows)))
+    losses = []
+    weights = iter(weights)
+    while True:
+        candidates = list(itertools.islice(weights, batch_size))
+        if len(candidates) == 0:
+            break
+        candidates = torch.stack(candidates).transpose(1, 2)
+        loss = torch.zeros(candidates.shape[0], dtype=torch.float64, device=candidates.device)
+        for inp, out in zip(input_val, org_out):
+            if input_scale is not None:
+                inp = torch.mul(inp, input_scale)
+            cur_out = torch.matmul(inp.reshape(1, -1, in_features), candidates)
+            if linear.bias is not None:
+                cur_out = cur_out + linear.bias
+            loss += (out.reshape(1, -1, out_features) - cur_out).float().pow(2).mean(dim=(1, 2)).double()
+        losses.extend(loss.tolist())
+    return losses
+
+
 class ActAwareWeightQuant:
     """Implementation of Activation-aware Weight quantization (AWQ) algo."""
 
@@ -255,52 +310,60 @@ class ActAwareWeightQuant:
             input_val = input_values[module_name_list[0]]["input"]
             x_max = _get_act_scale(input_val)
             absorbed_modules = {_m: fetch_module(block, _m) for _m in module_name_list}
-            # Step 4: collect origin output for MSE and state_dict for recover.
-            org_stat = {_m: copy.deepcopy(module.state_dict()) for _m, module in absorbed_modules.items()}
+            # Step 4: collect origin output for MSE.
             if len(module_tuple) > 1:
                 # use block inference for multi-modules
                 org_out = self.block_inference(block)
             else:
                 module = absorbed_modules[module_name_list[0]]
                 org_out = self.module_inference(module, input_val)
-            # Step 5: collect origin output for MSE and state_dict for recover.
+            n_grid = 20
+            ratios = [ratio * 1 / n_grid for ratio in range(n_grid)]
+
+            def get_scales(ratio):
+                scales = (x_max.pow(ratio) / w_max.pow(1 - ratio)).clamp(min=1e-4).view(-1)
+                return scales / (scales.max() * scales.min()).sqrt()
+
+            def get_weight(module, scales):
+                return quant_tensor(
+                    module.weight.data.mul(scales.view(1, -1)),
+                    data_type=cur_dtype,
+                    num_bits=cur_bits,
+                    group_size=cur_group_size,
+                    scheme=cur_scheme,
+                    full_range=self.use_full_range,
+                ) / scales.view(1, -1)
+
+            # Step 5: set different alpha for scale and compare the MSE loss, the modules are not changed.
+            if len(module_tuple) > 1:
+                # use block inference for multi-modules
+                history = []
+                for ratio in ratios:
+                    scales = get_scales(ratio)
+                    params = {
+                        _get_weight_name(module, name): get_weight(module, scales)
+                        for name, module in absorbed_modules.items()
+                    }
+                    cur_out = self.block_inference(block, params)
+                    loss = 0
+                    for out1, out2 in zip(org_out, cur_out):
+                        loss += (out1 - out2).float().pow(2).mean().item()
+                    history.append(loss)
+            else:
+                # evaluate all ratios in batched matmuls against the cached input
+                module = absorbed_modules[module_name_list[0]]
+                history = _get_batched_loss(
+                    module, input_val, org_out, (get_weight(module, get_scales(ratio)) for ratio in ratios)
+                )
+            # Step 6: pick the scale with the minimum MSE loss.
             best_error = float("inf")
             best_scales = None
             best_scale_alpha = None
-            n_grid = 20
-            history = []
-            # Step 6: set different alpha for scale and compare the MSE loss.
-            for ratio in range(n_grid):
-                ratio = ratio * 1 / n_grid
-                scales = (x_max.pow(ratio) / w_max.pow(1 - ratio)).clamp(min=1e-4).view(-1)
-                scales = scales / (scales.max() * scales.min()).sqrt()
-                for name, module in absorbed_modules.items():
-                    module.weight.data = module.weight.data.mul(scales.view(1, -1))
-                    module.weight.data = quant_tensor(
-                        module.weight.data,
-                        data_type=cur_dtype,
-                        num_bits=cur_bits,
-                        group_size=cur_group_size,
-                        scheme=cur_scheme,
-                        full_range=self.use_full_range,
-                    ) / scales.view(1, -1)
-                loss = 0
-                if len(module_tuple) > 1:
-                    # use block inference for multi-modules
-                    cur_out = self.block_inference(block)
-                else:
-                    module = absorbed_modules[module_name_list[0]]
-                    cur_out = self.module_inference(module, input_val)
-                for out1, out2 in zip(org_out, cur_out):
-                    loss += (out1 - out2).float().pow(2).mean().item()
-                history.append(loss)
-                is_best = loss < best_error
-                if is_best:
+            for ratio, loss in zip(ratios, history):
+                if loss < best_error:
                     best_error = loss
-                    best_scales = scales
+                    best_scales = get_scales(ratio)
                     best_scale_alpha = ratio
-                for name, module in absorbed_modules.items():
-                    module.load_state_dict(org_stat[name])
             # Step 7: record the best scale alpha of each module_tuple
             assert best_scales is not None, "Loss is infinity! Cannot find the correct scale."
             best_scales = best_scales.view(-1)
@@ -375,21 +438,16 @@ class ActAwareWeightQuant:
                 logger.info(f"[CLIP] Processing module: {module_name}")
                 # Step 2: update module name
                 module = fetch_module(self.model, module_name)
-                # Step 3: collect origin output for MSE and state_dict for recover.
-                org_stat = copy.deepcopy(module.state_dict())
+                # Step 3: collect origin output for MSE.
                 org_out = self.module_inference(module, input_val)
                 # Step 4:  set different clip range for weight and compare the MSE loss.
                 logger.info("Searching the best clip range with AWQ algorithm")
-                best_error = float("inf")
-                best_clip_ratio = None
                 n_grid = 100
                 max_shrink = 0.1
-                history = []
-                for i_s in range(int(max_shrink * n_grid)):
-                    ratio = 1 - i_s / n_grid  # 1, 0.91-1.0
-                    # MulLinear can also work with @weight.setter
-                    module.weight.data = quant_tensor(
-                        module.weight.data,
+                ratios = [1 - i_s / n_grid for i_s in range(int(max_shrink * n_grid))]  # 1, 0.91-1.0
+                weights = (
+                    quant_tensor(
+                        module.weight.data.clone(),
                         data_type=cur_dtype,
                         num_bits=cur_bits,
                         group_size=cur_group_size,
@@ -397,16 +455,15 @@ class ActAwareWeightQuant:
                         full_range=self.use_full_range,
                         quantile=ratio,
                     )
-                    loss = 0
-                    cur_out = self.module_inference(module, input_val)
-                    for out1, out2 in zip(org_out, cur_out):
-                        loss += (out1 - out2).float().pow(2).mean().item()
-                    history.append(loss)
-                    is_best = loss < best_error
-                    if is_best:
+                    for ratio in ratios
+                )
+                history = _get_batched_loss(module, input_val, org_out, weights)
+                best_error = float("inf")
+                best_clip_ratio = None
+                for ratio, loss in zip(ratios, history):
+                    if loss < best_error:
                         best_error = loss
                         best_clip_ratio = ratio
-                    module.load_state_dict(org_stat)
                 logger.debug("The loss history of different clip range:{}".format(history))
                 if module_name not in self.weight_config:
                     self.weight_config[module_name] = {
@@ -456,18 +513,23 @@ class ActAwareWeightQuant:
             else:  # pragma: no cover
                 assert False, "cannot find hidden_states position for next block"
 
-    def block_inference(self, model):
+    def block_inference(self, model, params=None):
         """Collect output of block.
 
         Args:
             model (torch.nn.Module): input model.
+            params (dict, optional): parameters used in place of the model's own ones without changing the model.
+                                     Defaults to None.
 
         Returns:
             output(list):  a list of block output.
         """
         total_out = []
         for args, kwargs in zip(self.total_block_args, self.total_block_kwargs):
-            out = model(*args, **kwargs)
+            if params is None:
+                out = model(*args, **kwargs)
+            else:
+                out = functional_call(model, params, tuple(args), kwargs)
             if isinstance(out, tuple):  # pragma: no cover
                 out = out[0]
             total_out.append(out)
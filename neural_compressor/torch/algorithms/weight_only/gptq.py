@@ -21,7 +21,9 @@ import random
 import re
 import time
 from collections import UserDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
+from queue import Queue
 
 import torch
 import torch.nn as nn
@@ -228,6 +230,8 @@ class GPTQuantizer(object):
             model_path (str): Model path that is used to load state_dict per layer.
             run_fn: a function to run model inference for collecting input information.
             device: cpu or cuda
+            num_workers (int): Number of threads to quantize the layers of a block concurrently and to calibrate
+                the next block while the inputs are produced. Defaults to 1, which is sequential.
         """
         # model
         self.model = model
@@ -264,6 +268,8 @@ class GPTQuantizer(object):
         self.export_compressed_model = export_compressed_model
         self.use_layer_wise = use_layer_wise
         self.model_path = model_path
+        self.weight_prefetcher = None
+        self.num_workers = kwargs.get("num_workers", 1)
 
         # dataloader
         self.use_max_length = use_max_length
@@ -600,6 +606,141 @@ class GPTQuantizer(object):
         else:
             self.cache_positional_arguments[0] = outs[:]
 
+    def prepare_block(self, block_idx):
+        """Place a transformer block and initialize the GPTQ quantizers of its layers.
+
+        Args:
+            block_idx (int): the index of the transformer block.
+
+        Returns:
+            tuple: the transformer block, the layers to quantize and their GPTQ quantizers.
+        """
+        if not self.use_layer_wise:
+            # if we do not apply layer-wise feature, we still place the entire block on the GPU
+            transformer_block = self.gptq_related_blocks["transformers"][block_idx].to(self.device)
+        else:
+            transformer_block = self.gptq_related_blocks["transformers"][block_idx]  # .to(self.device)
+        # Step2.1: obtain all layers (Linear, Conv2d, etc) in the block which can be quantized.
+        sub_layers = find_layers(transformer_block)
+        sub_layers_to_quant = {}
+        for layer_name, layer_obj in sub_layers.items():
+            # filter sub_layers with included layer_names in self.weight_config
+            full_layer_name = self.get_full_layer_name(layer_name, block_idx)
+            # if self.weight_config.get(full_layer_name, None) == None:
+            if self.get_layer_config(full_layer_name) is None:
+                logger.warning(f"{full_layer_name} can be quantized " + "but excluded from quantization configs.")
+            else:
+                sub_layers_to_quant[layer_name] = layer_obj
+        del sub_layers
+        sub_layers = sub_layers_to_quant
+        # Step 2.2: Initialize GPTQ quantizers for collected layers.
+        gptq_for_this_block = {}
+        # initialize gptq quantizer for every layer in a transformer block
+        for layer_name in sub_layers:
+            # weight_config_this_layer = self.weight_config.get(
+            #     self.get_full_layer_name(layer_name, block_idx), None
+            # )
+            full_layer_name = self.get_full_layer_name(layer_name, block_idx)
+            weight_config_this_layer = self.get_layer_config(full_layer_name)
+            if self.use_layer_wise:
+                # only the shape of the weight is needed here, it is loaded when the layer is quantized.
+                W = sub_layers[layer_name].weight.data
+            else:
+                W = sub_layers[layer_name].weight.data.clone()
+
+            gptq_for_this_block[layer_name] = GPTQ(sub_layers[layer_name], W, self.device)
+            # gptq_for_this_block[layer_name].quantizer = Quantizer()
+            gptq_for_this_block[layer_name].quantizer.configure(weight_config_this_layer)
+        return transformer_block, sub_layers, gptq_for_this_block
+
+    def gather_block_inputs(self, idx, hidden_states=None):
+        """Obtain the cached positional and keyword inputs of a batch, optionally with new hidden_states."""
+        cache_keyword_batch = self.gather_single_batch_from_dict(self.cache_key_arguments, idx)
+        cache_positional_batch = self.gather_single_batch_from_list(self.cache_positional_arguments, idx)
+        if hidden_states is not None:
+            if "hidden_states" in cache_keyword_batch:
+                cache_keyword_batch["hidden_states"] = hidden_states
+            else:
+                cache_positional_batch[0] = hidden_states
+        return cache_positional_batch, cache_keyword_batch
+
+    @torch.no_grad()
+    def calibrate_block(self, transformer_block, sub_layers, gptq_for_this_block, block_inputs):
+        """Run the block on calibration inputs and accumulate the Hessians of its layers.
+
+        Args:
+            transformer_block (torch.nn.Module): the transformer block.
+            sub_layers (dict): the layers to quantize.
+            gptq_for_this_block (dict): the GPTQ quantizers of the layers.
+            block_inputs (iterable): (positional arguments, keyword arguments) of each batch.
+        """
+
+        # Step 2.3: modify forward functions to hook inputs data (used in gptq execution)
+        # (layer name, input) of the current batch, the outputs are not needed and are released by the block.
+        batch_records = []
+
+        def add_batch(_name):
+            def tmp(_, inp, out):
+                batch_records.append((_name, inp[0]))
+
+            return tmp
+
+        handles = []  # register handles which add inputs and outputs to gptq object
+        for layer_name in sub_layers:
+            handles.append(sub_layers[layer_name].register_forward_hook(add_batch(layer_name)))
+        try:
+            for cache_positional_batch, cache_keyword_batch in block_inputs:
+                accelerator.mark_step()
+                transformer_block(*cache_positional_batch, **cache_keyword_batch)
+                # layers fed with the same tensor, e.g. q/k/v or gate/up projections, accumulate one Hessian.
+                for inp, layer_names in group_records_by_input(batch_records):
+                    add_batch_to_layers([gptq_for_this_block[name] for name in layer_names], inp.data)
+                batch_records.clear()
+        finally:
+            for h in handles:
+                h.remove()
+
+    def quantize_layer(self, layer_name, block_idx, sub_layers, gptq_for_this_block):
+        """Run GPTQ on a layer whose Hessian is ready, return the scale, zero point and quantized weight."""
+        # weight_config_this_layer = self.weight_config.get(
+        #     self.get_full_layer_name(layer_name, block_idx), None
+        # )
+        weight_config_this_layer = self.get_layer_config(self.get_full_layer_name(layer_name, block_idx))
+        logger.info(f"Quantizing layer {layer_name}")
+        if self.use_layer_wise:
+            full_layer_name = self.get_full_layer_name(layer_name, block_idx)
+            W = self.weight_prefetcher.get(full_layer_name)["weight"]
+        else:
+            W = sub_layers[layer_name].weight.data.clone()
+        accelerator.mark_step()
+        if "hpu" in self.device:
+            W = W.to("cpu")
+        return gptq_for_this_block[layer_name].fasterquant(
+            W,
+            blocksize=weight_config_this_layer["block_size"],
+            percdamp=weight_config_this_layer["percdamp"],
+            groupsize=weight_config_this_layer["group_size"],
+            act_order=weight_config_this_layer["act_order"],
+            static_groups=weight_config_this_layer["static_groups"],
+        )
+
+    def create_weight_prefetcher(self):
+        """Create a prefetcher which loads the weights of the next layer to quantize while GPTQ runs on a layer.
+
+        Returns:
+            WeightPrefetcher: the prefetcher of the layers to quantize in the order of quantization.
+        """
+        from neural_compressor.torch.algorithms.layer_wise import WeightPrefetcher
+
+        layers = []
+        for block_idx, transformer_block in enumerate(self.gptq_related_blocks["transformers"]):
+            for layer_name, layer_obj in find_layers(transformer_block).items():
+                full_layer_name = self.get_full_layer_name(layer_name, block_idx)
+                if self.get_layer_config(full_layer_name) is not None:
+                    layers.append((full_layer_name, layer_obj))
+        # the original weights are quantized, rather than the ones saved to the workspace by a previous run.
+        return WeightPrefetcher(self.model, self.model_path, layers, prefetch_num=1, from_workspace=False)
+
     @torch.no_grad()
     def execute_quantization(self, means=None, stds=None):
         """Run quantization."""
@@ -609,182 +750,161 @@ class GPTQuantizer(object):
         self.pre_quantization()
         model_path = self.model_path
 
+        # The Hessians of all layers in a block are collected by one forward pass, so their GPTQ solves are
+        # independent and run in a thread pool. The calibration forward of the next block is also overlapped
+        # with the forward pass which produces its inputs. Layer-wise and HPU modes stay sequential.
+        executor = None
+        if self.num_workers > 1 and not self.use_layer_wise and "hpu" not in self.device:
+            executor = ThreadPoolExecutor(max_workers=self.num_workers)
+        # In layer-wise mode, the weights of the next layer are loaded while the current one is quantized.
+        if self.use_layer_wise:
+            self.weight_prefetcher = self.create_weight_prefetcher()
+
         # Step2: run gptq quantization in a transformer block-wise manner.
         gptq_config = {}
         tblock_length = len(self.gptq_related_blocks["transformers"])
-        for block_idx in range(tblock_length):
-            logger.info(f"Quantizing layer {block_idx + 1} / {tblock_length}..")
-            if not self.use_layer_wise:
-                # if we do not apply layer-wise feature, we still place the entire block on the GPU
-                transformer_block = self.gptq_related_blocks["transformers"][block_idx].to(self.device)
-            else:
-                transformer_block = self.gptq_related_blocks["transformers"][block_idx]  # .to(self.device)
-            # Step2.1: obtain all layers (Linear, Conv2d, etc) in the block which can be quantized.
-            sub_layers = find_layers(transformer_block)
-            sub_layers_to_quant = {}
-            for layer_name, layer_obj in sub_layers.items():
-                # filter sub_layers with included layer_names in self.weight_config
-                full_layer_name = self.get_full_layer_name(layer_name, block_idx)
-                # if self.weight_config.get(full_layer_name, None) == None:
-                if self.get_layer_config(full_layer_name) is None:
-                    logger.warning(f"{full_layer_name} can be quantized " + "but excluded from quantization configs.")
-                else:
-                    sub_layers_to_quant[layer_name] = layer_obj
-            del sub_layers
-            sub_layers = sub_layers_to_quant
-            # Step 2.2: Initialize GPTQ quantizers for collected layers.
-            gptq_for_this_block = {}
-            # initialize gptq quantizer for every layer in a transformer block
-            for layer_name in sub_layers:
-                # weight_config_this_layer = self.weight_config.get(
-                #     self.get_full_layer_name(layer_name, block_idx), None
-                # )
-                full_layer_name = self.get_full_layer_name(layer_name, block_idx)
-                weight_config_this_layer = self.get_layer_config(full_layer_name)
-                if self.use_layer_wise:
-                    from neural_compressor.torch.algorithms.layer_wise import load_value
-
-                    W = load_value(self.model, full_layer_name + ".weight", model_path)
-                else:
-                    W = sub_layers[layer_name].weight.data.clone()
-
-                gptq_for_this_block[layer_name] = GPTQ(sub_layers[layer_name], W, self.device)
-                # gptq_for_this_block[layer_name].quantizer = Quantizer()
-                gptq_for_this_block[layer_name].quantizer.configure(weight_config_this_layer)
-
-            # Step 2.3: modify forward functions to hook inputs data (used in gptq execution)
-            def add_batch(_name):
-                def tmp(_, inp, out):
-                    gptq_for_this_block[_name].add_batch(inp[0].data, out.data)  # noqa: F821
-
-                return tmp
-
-            handles = []  # register handles which add inputs and outputs to gptq object
-            for layer_name in sub_layers:
-                handles.append(sub_layers[layer_name].register_forward_hook(add_batch(layer_name)))
-            batch_num = self.cache_key_arguments.pop("batch_num")
-            for j in range(batch_num):
-                cache_keyword_batch = self.gather_single_batch_from_dict(self.cache_key_arguments, j)
-                cache_positional_batch = self.gather_single_batch_from_list(self.cache_positional_arguments, j)
-                accelerator.mark_step()
-                out = transformer_block(*cache_positional_batch, **cache_keyword_batch)
-                out = self.track_hidden_states(out)
-            self.cache_key_arguments["batch_num"] = batch_num
-            for h in handles:
-                h.remove()
-            # Step 2.4: everything is prepared, so start quantization!
-            for layer_name in sub_layers:
-                # weight_config_this_layer = self.weight_config.get(
-                #     self.get_full_layer_name(layer_name, block_idx), None
-                # )
-                weight_config_this_layer = self.get_layer_config(self.get_full_layer_name(layer_name, block_idx))
-                logger.info(f"Quantizing layer {layer_name}")
-                if self.use_layer_wise:
-                    from neural_compressor.torch.algorithms.layer_wise import load_value
-
-                    full_layer_name = self.get_full_layer_name(layer_name, block_idx)
-                    W = load_value(self.model, full_layer_name + ".weight", model_path)
-                else:
-                    W = sub_layers[layer_name].weight.data.clone()
-                accelerator.mark_step()
-                if "hpu" in self.device:
-                    W = W.to("cpu")
-                scale, zp, Q = gptq_for_this_block[layer_name].fasterquant(
-                    W,
-                    blocksize=weight_config_this_layer["block_size"],
-                    percdamp=weight_config_this_layer["percdamp"],
-                    groupsize=weight_config_this_layer["group_size"],
-                    act_order=weight_config_this_layer["act_order"],
-                    static_groups=weight_config_this_layer["static_groups"],
-                )
-                if self.export_compressed_model:
-                    m = fetch_module(transformer_block, layer_name)
-                    gptq_scale = scale
-                    gptq_zp = None if weight_config_this_layer["sym"] else torch.tensor(zp, dtype=torch.int32)
-                    # recover INT weight
-                    gptq_perm = gptq_for_this_block[layer_name].perm if weight_config_this_layer["act_order"] else None
-                    if weight_config_this_layer["act_order"]:
-                        Q.copy_(Q[:, gptq_perm])
-                    from .utility import quant_weight_w_scale
-
-                    quant_weight_w_scale(
-                        Q,
-                        gptq_scale,
-                        gptq_zp,
-                        weight_config_this_layer["group_size"],
-                        dtype=weight_config_this_layer["dtype"],
-                    )
-                    # import pdb;pdb.set_trace()
-                    if weight_config_this_layer["act_order"]:
-                        invperm = torch.argsort(gptq_perm)
-                        Q.copy_(Q[:, invperm])
-                    int_weight = Q.type(torch.int32)  # copy_ is not workable for different types.
-                    # replace module
-                    new_module = WeightOnlyLinear(
-                        m.in_features,
-                        m.out_features,
-                        dtype=weight_config_this_layer["dtype"],
-                        bits=weight_config_this_layer["bits"],
-                        group_size=weight_config_this_layer["group_size"],
-                        zp=gptq_zp is not None,
-                        bias=m.bias is not None,
-                        g_idx=gptq_perm is not None,
-                        device=self.device,
+        next_block = None
+        try:
+            for block_idx in range(tblock_length):
+                logger.info(f"Quantizing layer {block_idx + 1} / {tblock_length}..")
+                if next_block is None:
+                    transformer_block, sub_layers, gptq_for_this_block = self.prepare_block(block_idx)
+                    batch_num = self.cache_key_arguments.pop("batch_num")
+                    self.calibrate_block(
+                        transformer_block,
+                        sub_layers,
+                        gptq_for_this_block,
+                        [self.gather_block_inputs(j) for j in range(batch_num)],
                     )
-                    new_module.pack(int_weight, gptq_scale, gptq_zp, m.bias)
-                    set_module(transformer_block, layer_name, new_module)
+                    self.cache_key_arguments["batch_num"] = batch_num
+                else:
+                    # the Hessians were accumulated while the previous block produced the inputs.
+                    transformer_block, sub_layers, gptq_for_this_block = next_block
+                    next_block = None
+                # Step 2.4: everything is prepared, so start quantization!
+                if executor is not None:
+                    futures = {
+                        layer_name: executor.submit(
+                            self.quantize_layer, layer_name, block_idx, sub_layers, gptq_for_this_block
+                        )
+                        for layer_name in sub_layers
+                    }
+                for layer_name in sub_layers:
+                    weight_config_this_layer = self.get_layer_config(self.get_full_layer_name(layer_name, block_idx))
+                    if executor is not None:
+                        scale, zp, Q = futures[layer_name].result()
+                    else:
+                        scale, zp, Q = self.quantize_layer(layer_name, block_idx, sub_layers, gptq_for_this_block)
+                    if self.export_compressed_model:
+                        m = fetch_module(transformer_block, layer_name)
+                        gptq_scale = scale
+                        gptq_zp = None if weight_config_this_layer["sym"] else torch.tensor(zp, dtype=torch.int32)
+                        # recover INT weight
+                        gptq_perm = (
+                            gptq_for_this_block[layer_name].perm if weight_config_this_layer["act_order"] else None
+                        )
+                        if weight_config_this_layer["act_order"]:
+                            Q.copy_(Q[:, gptq_perm])
+                        from .utility import quant_weight_w_scale
+
+                        quant_weight_w_scale(
+                            Q,
+                            gptq_scale,
+                            gptq_zp,
+                            weight_config_this_layer["group_size"],
+                            dtype=weight_config_this_layer["dtype"],
+                        )
+                        # import pdb;pdb.set_trace()
+                        if weight_config_this_layer["act_order"]:
+                            invperm = torch.argsort(gptq_perm)
+                            Q.copy_(Q[:, invperm])
+                        int_weight = Q.type(torch.int32)  # copy_ is not workable for different types.
+                        # replace module
+                        new_module = WeightOnlyLinear(
+                            m.in_features,
+                            m.out_features,
+                            dtype=weight_config_this_layer["dtype"],
+                            bits=weight_config_this_layer["bits"],
+                            group_size=weight_config_this_layer["group_size"],
+                            zp=gptq_zp is not None,
+                            bias=m.bias is not None,
+                            g_idx=gptq_perm is not None,
+                            device=self.device,
+                        )
+                        new_module.pack(int_weight, gptq_scale, gptq_zp, m.bias)
+                        set_module(transformer_block, layer_name, new_module)
+                    if self.use_layer_wise:
+                        from neural_compressor.torch.algorithms.layer_wise import (
+                            clean_module_weight,
+                            get_workspace_file,
+                            load_value,
+                            save_safetensors,
+                            set_module_tensor_to_device,
+                        )
+
+                        sub_layer = sub_layers[layer_name]
+                        full_layer_name = self.get_full_layer_name(layer_name, block_idx)
+                        for n, p in sub_layer.named_parameters():
+                            param_name = full_layer_name + "." + n
+                            if n == "weight":
+                                set_module_tensor_to_device(self.model, param_name, self.device, Q)
+                            else:
+                                value = load_value(self.model, param_name, model_path)
+                                set_module_tensor_to_device(self.model, param_name, self.device, value)
+                        # sub_layer.weight.data = Q
+                        save_safetensors(sub_layer.state_dict(), get_workspace_file(full_layer_name))
+                        clean_module_weight(sub_layer)
+                        del Q
+                        gc.collect()
+                    else:
+                        sub_layers[layer_name].weight.data = Q
+                    gptq_config[self.get_full_layer_name(layer_name, block_idx)] = {"scale": scale}
+                    if not weight_config_this_layer["sym"]:
+                        gptq_config[self.get_full_layer_name(layer_name, block_idx)]["zero"] = zp
+                    if weight_config_this_layer["act_order"]:  # save perm for restoring the weights
+                        gptq_config[self.get_full_layer_name(layer_name, block_idx)]["perm"] = gptq_for_this_block[
+                            layer_name
+                        ].perm
+                    gptq_for_this_block[layer_name].free()
+
+                # Step 2.5: replace output data with quantized weights
+                next_inputs = None
+                if executor is not None and block_idx + 1 < tblock_length:
+                    # the outputs are final once computed, so the next block is calibrated with them on the fly.
+                    next_block = self.prepare_block(block_idx + 1)
+                    next_inputs = Queue()
+                    next_calibration = executor.submit(self.calibrate_block, *next_block, iter(next_inputs.get, None))
+                outs = []
+                batch_num = self.cache_key_arguments.pop("batch_num")
+                try:
+                    for j in range(batch_num):
+                        cache_positional_batch, cache_keyword_batch = self.gather_block_inputs(j)
+                        out = transformer_block(*cache_positional_batch, **cache_keyword_batch)
+                        out = self.track_hidden_states(out)
+                        outs.append(out)
+                        if next_inputs is not None:
+                            next_inputs.put(self.gather_block_inputs(j, out))
+                finally:
+                    if next_inputs is not None:
+                        next_inputs.put(None)
+                if next_inputs is not None:
+                    next_calibration.result()
+                self.cache_key_arguments["batch_num"] = batch_num
                 if self.use_layer_wise:
-                    from neural_compressor.torch.algorithms.layer_wise import (
-                        LWQ_WORKSPACE,
-                        clean_module_weight,
-                        load_value,
-                        set_module_tensor_to_device,
-                    )
-
-                    sub_layer = sub_layers[layer_name]
-                    full_layer_name = self.get_full_layer_name(layer_name, block_idx)
-                    for n, p in sub_layer.named_parameters():
-                        param_name = full_layer_name + "." + n
-                        if n == "weight":
-                            set_module_tensor_to_device(self.model, param_name, self.device, Q)
-                        else:
-                            value = load_value(self.model, param_name, model_path)
-                            set_module_tensor_to_device(self.model, param_name, self.device, value)
-                    # sub_layer.weight.data = Q
-                    torch.save(sub_layer.state_dict(), LWQ_WORKSPACE + f"/{full_layer_name}.pt")
-                    clean_module_weight(sub_layer)
-                    del Q
-                    gc.collect()
+                    self.gptq_related_blocks["transformers"][block_idx] = transformer_block
                 else:
-                    sub_layers[layer_name].weight.data = Q
-                gptq_config[self.get_full_layer_name(layer_name, block_idx)] = {"scale": scale}
-                if not weight_config_this_layer["sym"]:
-                    gptq_config[self.get_full_layer_name(layer_name, block_idx)]["zero"] = zp
-                if weight_config_this_layer["act_order"]:  # save perm for restoring the weights
-                    gptq_config[self.get_full_layer_name(layer_name, block_idx)]["perm"] = gptq_for_this_block[
-                        layer_name
-                    ].perm
-                gptq_for_this_block[layer_name].free()
-
-            # Step 2.5: replace output data with quantized weights
-            outs = []
-            batch_num = self.cache_key_arguments.pop("batch_num")
-            for j in range(batch_num):
-                cache_keyword_batch = self.gather_single_batch_from_dict(self.cache_key_arguments, j)
-                cache_positional_batch = self.gather_single_batch_from_list(self.cache_positional_arguments, j)
-                out = transformer_block(*cache_positional_batch, **cache_keyword_batch)
-                out = self.track_hidden_states(out)
-                outs.append(out)
-            self.cache_key_arguments["batch_num"] = batch_num
-            if self.use_layer_wise:
-                self.gptq_related_blocks["transformers"][block_idx] = transformer_block
-            else:
-                self.gptq_related_blocks["transformers"][block_idx] = transformer_block.cpu()
-            del gptq_for_this_block
-            torch.cuda.empty_cache()
-            # iteratively replace the input with output, thus layerwise quantization can continue.
-            self.update_blockwise_hidden_states(outs)
-            logger.info("------------------------------")
+                    self.gptq_related_blocks["transformers"][block_idx] = transformer_block.cpu()
+                del gptq_for_this_block
+                torch.cuda.empty_cache()
+                # iteratively replace the input with output, thus layerwise quantization can continue.
+                self.update_blockwise_hidden_states(outs)
+                logger.info("------------------------------")
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            if self.weight_prefetcher is not None:
+                self.weight_prefetcher.close()
+                self.weight_prefetcher = None
 
         logger.info("Quantization done")
         # self.model.config.use_cache = self.use_cache
@@ -796,6 +916,68 @@ class GPTQuantizer(object):
         return self.model, gptq_config
 
 
+def _is_same_tensor(a, b):
+    return a is b or (
+        a.data_ptr() == b.data_ptr()
+        and a.dtype == b.dtype
+        and a.device == b.device
+        and a.shape == b.shape
+        and a.stride() == b.stride()
+    )
+
+
+def group_records_by_input(records):
+    """Group the (layer name, input) records of a forward pass by the input tensor.
+
+    Returns:
+        list: (input, layer names) of each distinct input.
+    """
+    groups = []
+    for layer_name, inp in records:
+        for group in groups:
+            if _is_same_tensor(group[0], inp) and layer_name not in group[1]:
+                group[1].append(layer_name)
+                break
+        else:
+            groups.append((inp, [layer_name]))
+    return groups
+
+
+def add_batch_to_layers(gptq_objects, inp):
+    """Accumulate a batch into the Hessians of layers which received the same input.
+
+    Layers with the same input history share one Hessian tensor, so it is computed and stored once. The layers whose
+    input differs from the other layers they shared with get their own copy of the Hessian.
+
+    Args:
+        gptq_objects (list): the GPTQ objects of the layers.
+        inp (torch.Tensor): the input of the layers.
+    """
+    for gptq in gptq_objects:
+        sharers = [sharer for sharer in gptq.hessian_group if sharer in gptq_objects]
+        if len(sharers) < len(gptq.hessian_group):
+            gptq.unshare_hessian(sharers)
+    # the layers without any batch have equal Hessians.
+    fresh = [
+        gptq
+        for gptq in gptq_objects
+        if gptq.nsamples == 0
+        and len(gptq.hessian_group) == 1
+        and isinstance(gptq.layer, (nn.Linear, transformers.Conv1D))
+    ]
+    for gptq in fresh[1:]:
+        if gptq.H.shape == fresh[0].H.shape:
+            gptq.share_hessian(fresh[0])
+    hessian_groups = []
+    for gptq in gptq_objects:
+        if not any(gptq.hessian_group is group for group in hessian_groups):
+            hessian_groups.append(gptq.hessian_group)
+    for group in hessian_groups:
+        group[0].add_batch(inp, None)
+        for gptq in group[1:]:
+            gptq.nsamples = group[0].nsamples
+
+
 class GPTQ:
     """
     Please refer to:
@@ -816,6 +998,23 @@ class GPTQ:
         self.nsamples = 0
         self.quantizer = Quantizer()
         self.perm = None  # act_order choice
+        self.hessian_group = [self]  # the layers sharing self.H
+
+    def share_hessian(self, other):
+        """Use the Hessian of another layer with the same inputs, it must not be changed in place."""
+        self.H = other.H
+        self.nsamples = other.nsamples
+        other.hessian_group.append(self)
+        self.hessian_group = other.hessian_group
+
+    def unshare_hessian(self, sharers):
+        """Copy the shared Hessian for a subset of its sharers, so that it can be accumulated separately."""
+        H = self.H.clone()
+        for sharer in sharers:
+            self.hessian_group.remove(sharer)
+        for sharer in sharers:
+            sharer.H = H
+            sharer.hessian_group = sharers
 
     def add_batch(self, inp, out):
         # if DEBUG:
@@ -863,6 +1062,9 @@ class GPTQ:
         H = self.H
         if "hpu" in self.device:
             H = H.to("cpu")
+        if len(self.hessian_group) > 1 and H is self.H:
+            # damping and permutation are applied per layer, the shared Hessian stays read-only.
+            H = H.clone()
         del self.H
         dead = torch.diag(H) == 0
         H[dead, dead] = 1
@@ -1157,6 +1359,7 @@ def gptq_quantize(
     model_path=None,
     run_fn=None,
     run_args=None,
+    num_workers=1,
 ):
     """Run weight-only quantization with."""
     # TODO: unify weight_config keys, add docstring, and support default config
@@ -1178,6 +1381,7 @@ def gptq_quantize(
         model_path=model_path,
         run_fn=run_fn,
         run_args=run_args,
+        num_workers=num_workers,
     )
     fp32_modified_model, gptq_config = gptq_quantizer.execute_quantization()
     logger.info("GPTQ quantizing done.")
@@ -61,9 +61,14 @@ class WeightOnlyLinear(torch.nn.Module):
         g_idx=False,
         device="cpu",
         use_optimum_format=True,
+        cache_weight=True,
+        dequant_tile_size=128,
     ):
         super().__init__()
         self.use_optimum_format = use_optimum_format
+        # cache_weight=False dequantizes weight tiles in forward instead of keeping a float weight.
+        self.cache_weight = cache_weight
+        self.dequant_tile_size = dequant_tile_size
         self.dtype = dtype
         if self.dtype != "int" and "int" in self.dtype:  # for nf4, fp4
             bits = self.dtype.lstrip("int")
@@ -172,6 +177,50 @@ class WeightOnlyLinear(torch.nn.Module):
         else:
             self.g_idx = None
 
+    def pack_tensor_with_torch(self, raw_tensor):
+        """Pack the last dimension of an integer tensor into compression_dtype.
+
+        Every n_pack adjacent values are masked to self.bits, shifted into place and merged with bitwise OR,
+        so the result is bit-identical with packing column by column.
+
+        Args:
+            raw_tensor (torch.Tensor): 2-D integer tensor, shape (rows, cols).
+
+        Returns:
+            torch.Tensor: packed tensor, shape (rows, ceil(cols / n_pack)).
+        """
+        rows, cols = raw_tensor.shape
+        target_len = math.ceil(cols / self.n_pack)
+        raw_tensor = raw_tensor.type(self.compression_dtype)
+        if target_len * self.n_pack != cols:
+            raw_tensor = F.pad(raw_tensor, (0, target_len * self.n_pack - cols))
+        raw_tensor = raw_tensor.reshape(rows, target_len, self.n_pack) & (2**self.bits - 1)
+        packed_tensor = torch.zeros(rows, target_len, dtype=self.compression_dtype, device=raw_tensor.device)
+        for e in range(self.n_pack):
+            packed_tensor |= raw_tensor[:, :, e] << (self.bits * e)
+        return packed_tensor
+
+    def unpack_tensor_with_torch(self, packed_tensor, origin_len, dtype, apply_mask=True):
+        """Unpack the last dimension of a tensor packed by pack_tensor_with_torch.
+
+        Args:
+            packed_tensor (torch.Tensor): 2-D packed tensor, shape (rows, ceil(origin_len / n_pack)).
+            origin_len (int): length of the unpacked last dimension.
+            dtype (torch.dtype): dtype of the unpacked tensor.
+            apply_mask (bool): keep only the low self.bits bits. If False, values are sign-extended.
+
+        Returns:
+            torch.Tensor: unpacked tensor, shape (rows, origin_len).
+        """
+        rows = packed_tensor.shape[0]
+        left_shift = self.compress_bits - self.bits * torch.arange(
+            1, self.n_pack + 1, dtype=self.compression_dtype, device=packed_tensor.device
+        )
+        unpacked_tensor = (packed_tensor.unsqueeze(-1) << left_shift) >> (self.compress_bits - self.bits)
+        if apply_mask:
+            unpacked_tensor &= 2**self.bits - 1
+        return unpacked_tensor.reshape(rows, -1)[:, :origin_len].type(dtype)
+
     def pack(self, int_weight, scale, zp, bias, g_idx=None):
         if self.use_optimum_format:
             self.scales = self.scales.t_().contiguous()
@@ -202,17 +251,10 @@ class WeightOnlyLinear(torch.nn.Module):
         origin_shape = int_weight.shape
         target_shape = self.qweight.shape
         assert origin_shape[0] == target_shape[0], "output channels mismatch, please check."
-        mask = torch.tensor(2**self.bits - 1, dtype=self.compression_dtype).to(self.device)
 
         # pack weight
-        for j in range(target_shape[1]):
-            start = self.n_pack * j
-            end = self.n_pack * (j + 1)
-            tmp = int_weight[:, start:end].type(self.compression_dtype)
-            for e in range(tmp.shape[1]):
-                tmp[:, e] &= mask
-                tmp[:, e] = tmp[:, e] << (self.bits * e)
-                self.qweight[:, j] |= tmp[:, e]
+        self.qweight = self.pack_tensor_with_torch(int_weight)
+        assert self.qweight.shape == target_shape, "qweight shape is mismatched."
         if not self.use_optimum_format and self.compression_dim == 0:
             self.qweight = self.qweight.t_().contiguous()
 
@@ -225,14 +267,8 @@ class WeightOnlyLinear(torch.nn.Module):
                 self.qzeros = self.qzeros.t_().contiguous()
             assert hasattr(self, "qzeros"), "zp is not set when initializing."
             target_shape = self.qzeros.shape
-            for j in range(target_shape[1]):
-                start = self.n_pack * j
-                end = self.n_pack * (j + 1)
-                tmp = zp[:, start:end].type(self.compression_dtype)
-                for e in range(tmp.shape[1]):
-                    tmp[:, e] &= mask
-                    tmp[:, e] = tmp[:, e] << (self.bits * e)
-                    self.qzeros[:, j] |= tmp[:, e]
+            self.qzeros = self.pack_tensor_with_torch(zp)
+            assert self.qzeros.shape == target_shape, "qzeros shape is mismatched."
             if self.use_optimum_format or self.compression_dim == 0:
                 self.qzeros = self.qzeros.t_().contiguous()
         if self.use_optimum_format:
@@ -242,95 +278,119 @@ class WeightOnlyLinear(torch.nn.Module):
 
     def recover(self):
         logger.debug(f"Recovering {self} weight")
-        scales = self.scales.t_().contiguous() if self.use_optimum_format else self.scales
-        qweight = self.qweight.t_().contiguous() if self.use_optimum_format else self.qweight
+        return self.recover_rows(0, self.out_features)
+
+    def recover_rows(self, start, end):
+        """Recover the float weight of output channels [start, end).
+
+        Only the packed rows/columns covering the range are unpacked, so the peak memory is bounded by the tile
+        instead of the whole weight. start must be a multiple of n_pack if weights or zero points are packed along
+        the output channel.
+
+        Args:
+            start (int): first output channel.
+            end (int): output channel after the last one.
+
+        Returns:
+            torch.Tensor: float weight, shape (end - start, in_features).
+        """
+        rows = end - start
+        pack_start, pack_end = start // self.n_pack, math.ceil(end / self.n_pack)
+        if self.use_optimum_format:
+            scales = self.scales[:, start:end].t()
+            qweight = self.qweight[:, start:end].t().contiguous()
+        else:
+            scales = self.scales[start:end]
+            qweight = self.qweight[start:end] if self.compression_dim == 1 else self.qweight[pack_start:pack_end]
 
         device = scales.device
-        fp32_weight = torch.zeros(self.out_features, self.in_features, dtype=self.float_type).to(device)
         if self.g_idx is None:
             # used for recovering fp32_weight
-            self.g_idx = torch.tensor([i // self.group_size for i in range(self.in_features)], dtype=torch.int32)
-        mask = torch.tensor(2**self.bits - 1, dtype=self.compression_dtype).to(device)
+            g_idx = torch.arange(self.in_features, dtype=torch.int64, device=device) // self.group_size
+        else:
+            g_idx = self.g_idx.type(torch.int64).to(device)
         if hasattr(self, "qzeros"):
             weight_dtype = torch.uint8
         else:
             weight_dtype = torch.int8
         # unpack weight
-        weight = torch.zeros(self.out_features, self.in_features, dtype=weight_dtype).to(device)
         if not self.use_optimum_format and self.compression_dim == 0:
-            weight = weight.t_().contiguous()
-            qweight = qweight.t_().contiguous()
-        origin_shape = weight.shape
-        target_shape = qweight.shape
-        for j in range(target_shape[1]):
-            for e in range(self.n_pack):
-                index = j * self.n_pack + e
-                if index >= origin_shape[1]:
-                    continue
-                tmp = qweight[:, j]
-                tmp = tmp << (self.compress_bits - self.bits * (e + 1))
-                tmp = tmp >> self.compress_bits - self.bits
-                if weight_dtype == torch.uint8:
-                    tmp &= mask  # remove sign bit
-                weight[:, index] = tmp.type(weight_dtype)
-        if not self.use_optimum_format and self.compression_dim == 0:
-            weight = weight.t_().contiguous()
+            qweight = qweight.t().contiguous()
+            weight = self.unpack_tensor_with_torch(qweight, rows, weight_dtype, apply_mask=weight_dtype == torch.uint8)
+            weight = weight.t().contiguous()
+        else:
+            weight = self.unpack_tensor_with_torch(
+                qweight, self.in_features, weight_dtype, apply_mask=weight_dtype == torch.uint8
+            )
         if "int" not in self.dtype:
-            new_weight = torch.zeros(self.out_features, self.in_features).to(device)
+            # look up nf4/fp4 values, int values without mapping are recovered as 0.
+            offset = 2 ** (self.bits - 1)
+            lookup_table = torch.zeros(offset + 2**self.bits, device=device)
             for k, v in self.int2float_mapping.items():
-                new_weight += torch.where(weight == k, v, 0)
-            weight = new_weight
+                lookup_table[k + offset] = v
+            weight = lookup_table[weight.type(torch.int64) + offset]
         # unpack zero_point
         if hasattr(self, "qzeros"):
             zp_dtype = self.compression_dtype  # to avoid overflow when weight-zp
-            zp = torch.zeros(scales.shape, dtype=zp_dtype).to(device)
-            qzeros = self.qzeros.t_().contiguous() if self.use_optimum_format else self.qzeros
-            if self.use_optimum_format or self.compression_dim == 0:
-                zp = zp.t_().contiguous()
-                qzeros = qzeros.t_().contiguous()
-            origin_shape = zp.shape
-            target_shape = qzeros.shape
-            for j in range(target_shape[1]):
-                for e in range(self.n_pack):
-                    index = j * self.n_pack + e
-                    if index >= origin_shape[1]:
-                        continue
-                    tmp = qzeros[:, j]
-                    tmp = tmp << (self.compress_bits - self.bits * (e + 1))
-                    tmp = tmp >> self.compress_bits - self.bits
-                    tmp &= mask
-                    zp[:, index] = tmp.type(zp_dtype)
+            if self.use_optimum_format:
+                qzeros = self.qzeros[:, pack_start:pack_end].contiguous()
+            elif self.compression_dim == 0:
+                qzeros = self.qzeros[pack_start:pack_end].t().contiguous()
+            else:
+                qzeros = self.qzeros[start:end]
             if self.use_optimum_format or self.compression_dim == 0:
-                zp = zp.t_().contiguous()
+                zp = self.unpack_tensor_with_torch(qzeros, rows, zp_dtype)
+                zp = zp.t().contiguous()
+            else:
+                zp = self.unpack_tensor_with_torch(qzeros, scales.shape[1], zp_dtype)
             if self.use_optimum_format:
                 # zp -= 1 may cause zp == -1, after recover it becomes 2**self.bits - 1
                 zp += 1
                 zp = torch.where(zp > (2**self.bits - 1), 0, zp)
             # recover fp32 weight with int_weight, scale, and zero_point
-            for idx in range(self.in_features):
-                fp32_weight[:, idx] = (weight[:, idx] - zp[:, self.g_idx[idx]]) * scales[:, self.g_idx[idx]]
+            fp32_weight = (weight - zp[:, g_idx]) * scales[:, g_idx]
         else:
             # recover fp32 weight with int_weight, scale
-            for idx in range(self.in_features):
-                fp32_weight[:, idx] = weight[:, idx] * scales[:, self.g_idx[idx]]
-        return fp32_weight
+            fp32_weight = weight * scales[:, g_idx]
+        return fp32_weight.type(self.float_type)
 
     def forward(self, input):
+        if not self.cache_weight:
+            return self.forward_on_the_fly(input)
         if not hasattr(self, "weight"):
             weight = self.recover()
             device = self.scales.device
             if weight.dtype == torch.float16 and device.type == "cpu":
                 weight = weight.float()
                 self.bias = self.bias.float() if self.bias is not None else None
-        if True:  # keep reusing self.weight due to recover is too slow.
-            if not hasattr(self, "weight"):
-                self.weight = weight
-            input = input.type(self.weight.dtype)
-            logger.debug(f"Calculating {self}")
-            return F.linear(input, self.weight, self.bias)
-        else:
-            input = input.type(weight.dtype)
-            return F.linear(input, weight, self.bias)
+            # keep reusing self.weight due to recover is too slow.
+            self.weight = weight
+        input = input.type(self.weight.dtype)
+        logger.debug(f"Calculating {self}")
+        return F.linear(input, self.weight, self.bias)
+
+    def forward_on_the_fly(self, input):
+        """Dequantize the weight tile by tile inside the matmul without keeping a float weight.
+
+        Each tile holds dequant_tile_size output channels, so the scratch memory is bounded by
+        dequant_tile_size * in_features float values.
+        """
+        if hasattr(self, "weight"):
+            # release the float weight cached by a previous forward.
+            del self.weight
+        compute_dtype = self.float_type
+        if compute_dtype == torch.float16 and self.scales.device.type == "cpu":
+            compute_dtype = torch.float32
+        input = input.type(compute_dtype)
+        logger.debug(f"Calculating {self} with on-the-fly dequantization")
+        tile_size = math.ceil(self.dequant_tile_size / self.n_pack) * self.n_pack
+        output = torch.empty(*input.shape[:-1], self.out_features, dtype=compute_dtype, device=input.device)
+        for start in range(0, self.out_features, tile_size):
+            end = min(start + tile_size, self.out_features)
+            weight = self.recover_rows(start, end).type(compute_dtype)
+            bias = self.bias[start:end].type(compute_dtype) if self.bias is not None else None
+            output[..., start:end] = F.linear(input, weight, bias)
+        return output
 
     def extra_repr(self) -> str:
         tmp_str = "in_features={}, out_features={}, bits={}, group_size={}, bias={}".format(
@@ -342,6 +402,8 @@ class WeightOnlyLinear(torch.nn.Module):
         )
         if self.use_optimum_format:
             tmp_str += ", use_optimum_format=True"
+        if not self.cache_weight:
+            tmp_str += ", cache_weight=False, dequant_tile_size={}".format(self.dequant_tile_size)
         return tmp_str
 
 
@@ -103,6 +103,7 @@ def gptq_entry(
             "export_compressed_model": quant_config.export_compressed_model,
             "use_layer_wise": quant_config.use_layer_wise,
             "model_path": quant_config.model_path,
+            "num_workers": quant_config.num_workers,
         }
     )
     kwargs.pop("example_inputs")
@@ -17,12 +17,22 @@ from typing import Callable, List, Optional, Union
 
 import torch
 
-from neural_compressor.common.base_config import BaseConfig, get_all_config_set_from_config_registry
-from neural_compressor.common.base_tuning import EvaluationFuncWrapper, TuningConfig, init_tuning
+from neural_compressor.common.base_config import (
+    BaseConfig,
+    ComposableConfig,
+    get_all_config_set_from_config_registry,
+)
+from neural_compressor.common.base_tuning import (
+    EvaluationFuncWrapper,
+    ParallelTrialExecutor,
+    TrialResultCache,
+    TuningConfig,
+    init_tuning,
+)
 from neural_compressor.common.utils import dump_elapsed_time
 from neural_compressor.torch.quantization import quantize
-from neural_compressor.torch.quantization.config import FRAMEWORK_NAME, RTNConfig
-from neural_compressor.torch.utils import constants, logger
+from neural_compressor.torch.quantization.config import FRAMEWORK_NAME, GPTQConfig, HQQConfig, RTNConfig
+from neural_compressor.torch.utils import constants, get_model_fingerprint, logger, shallow_copy_model
 
 __all__ = [
     "autotune",
@@ -42,6 +52,52 @@ def get_all_config_set() -> Union[BaseConfig, List[BaseConfig]]:
     return get_all_config_set_from_config_registry(fwk_name=FRAMEWORK_NAME)
 
 
+# algorithms that only modify or replace the modules in the config mapping, the other modules can be shared.
+# the layer-wise mode loads the weights of whole blocks, so it is excluded.
+COPY_FREE_CONFIG_TYPES = (RTNConfig, GPTQConfig, HQQConfig)
+
+
+def _get_module_names_to_copy(model: torch.nn.Module, quant_config: BaseConfig) -> Optional[List[str]]:
+    """Get the names of modules that are changed by `quant_config`, None if the whole model may be changed."""
+    config_list = quant_config.config_list if isinstance(quant_config, ComposableConfig) else [quant_config]
+    if not all(
+        isinstance(config, COPY_FREE_CONFIG_TYPES) and not getattr(config, "use_layer_wise", False)
+        for config in config_list
+    ):
+        return None
+    model_info = quant_config.get_model_info(model=model)
+    configs_mapping = quant_config.to_config_mapping(model_info=model_info)
+    return [op_name for op_name, _ in configs_mapping]
+
+
+def _set_num_threads_for_worker(cores: List[int]) -> None:
+    torch.set_num_threads(len(cores))
+
+
+class _TrialQuantizer:
+    """Quantize a copy of the fp32 model for a trial, it is picklable to be sent to the trial workers."""
+
+    def __init__(self, model: torch.nn.Module, run_fn=None, run_args=None, example_inputs=None):
+        self.model = model
+        self.run_fn = run_fn
+        self.run_args = run_args
+        self.example_inputs = example_inputs
+
+    def __call__(self, quant_config: BaseConfig) -> torch.nn.Module:
+        # only copy the modules to be quantized and share the others with the fp32 model if possible.
+        module_names = _get_module_names_to_copy(self.model, quant_config)
+        trial_model = deepcopy(self.model) if module_names is None else shallow_copy_model(self.model, module_names)
+        # !!! Make sure to use a copy of the model only when inplace is set to `True`.
+        return quantize(
+            trial_model,
+            quant_config=quant_config,
+            run_fn=self.run_fn,
+            run_args=self.run_args,
+            inplace=True,
+            example_inputs=self.example_inputs,
+        )
+
+
 @dump_elapsed_time("Pass auto-tune")
 def autotune(
     model: torch.nn.Module,
@@ -54,44 +110,57 @@ def autotune(
 ) -> Optional[torch.nn.Module]:
     """The main entry of auto-tune."""
     best_quant_model = None
-    eval_func_wrapper = EvaluationFuncWrapper(eval_fn, eval_args)
-    config_loader, tuning_logger, tuning_monitor = init_tuning(tuning_config=tune_config)
-    baseline: float = eval_func_wrapper.evaluate(model)
+    result_cache = None
+    if tune_config.cache_dir is not None:
+        result_cache = TrialResultCache(tune_config.cache_dir, get_model_fingerprint(model))
+    eval_func_wrapper = EvaluationFuncWrapper(eval_fn, eval_args, result_cache=result_cache)
+    config_loader, tuning_logger, tuning_monitor = init_tuning(tuning_config=tune_config, result_cache=result_cache)
+    baseline: float = eval_func_wrapper.evaluate_baseline(model)
     tuning_monitor.set_baseline(baseline)
+
+    quant_fn = _TrialQuantizer(model, run_fn=run_fn, run_args=run_args, example_inputs=example_inputs)
+
     tuning_logger.tuning_start()
-    for trial_index, quant_config in enumerate(config_loader):
-        tuning_logger.trial_start(trial_index=trial_index)
-        tuning_logger.quantization_start()
-        logger.info(quant_config.to_dict())
-        # !!! Make sure to use deepcopy only when inplace is set to `True`.
-        q_model = quantize(
-            deepcopy(model),
-            quant_config=quant_config,
-            run_fn=run_fn,
-            run_args=run_args,
-            inplace=True,
-            example_inputs=example_inputs,
+    executor = None
+    if tune_config.num_workers > 1:
+        executor = ParallelTrialExecutor(
+            quant_fn,
+            eval_func_wrapper.evaluate,
+            num_workers=tune_config.num_workers,
+            worker_init_fn=_set_num_threads_for_worker,
         )
-        tuning_logger.quantization_end()
-        tuning_logger.evaluation_start()
-        eval_result: float = eval_func_wrapper.evaluate(q_model)
-        tuning_logger.evaluation_end()
-        tuning_monitor.add_trial_result(trial_index, eval_result, quant_config)
-        tuning_logger.trial_end(trial_index)
-        if tuning_monitor.need_stop():
-            logger.info("Stopped tuning.")
+        if not executor.is_picklable():
+            logger.warning("Run the trials one after another instead.")
+            executor = None
+    if executor is not None:
+        best_quant_model = executor.run(config_loader, tuning_monitor, tuning_logger)
+    else:
+        for trial_index, quant_config in enumerate(config_loader):
+            tuning_logger.trial_start(trial_index=trial_index)
+            logger.info(quant_config.to_dict())
+            q_model = None
+            eval_result = tuning_monitor.get_cached_trial_result(quant_config)
+            if eval_result is None:
+                tuning_logger.quantization_start()
+                q_model = quant_fn(quant_config)
+                tuning_logger.quantization_end()
+                tuning_logger.evaluation_start()
+                eval_result = eval_func_wrapper.evaluate(q_model)
+                tuning_logger.evaluation_end()
+            tuning_monitor.add_trial_result(trial_index, eval_result, quant_config)
+            tuning_logger.trial_end(trial_index)
+            # keep the best quantized model so far to avoid quantizing it again after tuning.
+            if tuning_monitor.is_best_trial(trial_index):
+                best_quant_model = q_model
             del q_model  # maybe gc.collect() is needed for memory release
-            best_quant_config: BaseConfig = tuning_monitor.get_best_quant_config()
-            # !!! Make sure to use deepcopy only when inplace is set to `True`.
-            q_model = quantize(
-                deepcopy(model),
-                quant_config=best_quant_config,
-                run_fn=run_fn,
-                run_args=run_args,
-                inplace=True,
-                example_inputs=example_inputs,
-            )
-            best_quant_model = q_model  # quantize model inplace
-            break
+            if tuning_monitor.need_stop():
+                logger.info("Stopped tuning.")
+                if best_quant_model is None:
+                    # the result of the best trial was cached.
+                    best_quant_model = quant_fn(tuning_monitor.get_best_quant_config())
+                break
+        else:
+            # all configs are tried before the accuracy goal is met.
+            best_quant_model = None
     tuning_logger.tuning_end()
     return best_quant_model
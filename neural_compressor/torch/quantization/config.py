@@ -244,6 +244,7 @@ class GPTQConfig(BaseConfig):
         "percdamp",
         "block_size",
         "static_groups",
+        "num_workers",
     ]
 
     def __init__(
@@ -268,6 +269,7 @@ class GPTQConfig(BaseConfig):
         percdamp: float = 0.01,
         block_size: int = 2048,
         static_groups: bool = False,
+        num_workers: int = 1,
         # Tuning space
         white_list: Optional[List[OP_NAME_OR_MODULE_TYPE]] = DEFAULT_WHITE_LIST,
     ):
@@ -296,6 +298,9 @@ class GPTQConfig(BaseConfig):
             static_groups (bool): Whether to calculate group wise quantization parameters in advance.
                                   This option mitigate actorder's extra computational requirements.
                                   Default is False.
+            num_workers (int): Number of threads to quantize the layers of a transformer block concurrently
+                               and to calibrate the next block while its inputs are produced.
+                               Default is 1, which runs sequentially.
         """
         super().__init__(white_list=white_list)
         self.dtype = dtype
@@ -318,6 +323,7 @@ class GPTQConfig(BaseConfig):
         self.percdamp = percdamp
         self.block_size = block_size
         self.static_groups = static_groups
+        self.num_workers = num_workers
         self._post_init()  # initialize global & local configuration
 
     @classmethod
@@ -13,7 +13,9 @@
 # limitations under the License.
 
 
-from typing import Callable, Dict, List, Tuple, Union
+import copy
+import hashlib
+from typing import Callable, Dict, Iterable, List, Tuple, Union
 
 import torch
 from typing_extensions import TypeAlias
@@ -124,3 +126,56 @@ def get_double_quant_config(double_quant_type):
         list(DOUBLE_QUANT_CONFIGS.keys())
     )
     return DOUBLE_QUANT_CONFIGS[double_quant_type]
+
+
+def get_model_fingerprint(model: torch.nn.Module) -> str:
+    """Get a hash of the model structure and weights, used as the key of tuning result cache."""
+    sha256 = hashlib.sha256(str(model).encode())
+    for name, tensor in model.state_dict().items():
+        sha256.update(f"{name}:{tensor.dtype}:{tuple(tensor.shape)}".encode())
+        tensor = tensor.detach().cpu().contiguous()
+        if tensor.numel() > 0:
+            sha256.update(tensor.reshape(-1).view(torch.uint8).numpy().data)
+    return sha256.hexdigest()
+
+
+def shallow_copy_model(model: torch.nn.Module, copy_module_names: Iterable[str]) -> torch.nn.Module:
+    """Copy a model without copying the weights of modules that are not going to be changed.
+
+    Every module object is copied along with its dicts of submodules, parameters, buffers and hooks, so replacing
+    them in the copy doesn't affect `model`. The modules in `copy_module_names` are deep-copied since quantization
+    may modify their weights in place, and the other parameters of the copy share storage with `model`. The memory
+    of the copy therefore scales with the modules to be quantized rather than the whole model.
+
+    Args:
+        model (torch.nn.Module): the original model.
+        copy_module_names (Iterable[str]): names of the modules to deep-copy.
+
+    Returns:
+        torch.nn.Module: the copied model.
+    """
+    copy_module_names = set(copy_module_names)
+    # deep-copy the modules first with a shared memo to keep the tied weights, a module may have several names.
+    memo = {}
+    for name, module in model.named_modules(remove_duplicate=False):
+        if name in copy_module_names:
+            copy.deepcopy(module, memo)
+
+    def _copy_module(module):
+        if id(module) in memo:
+            return memo[id(module)]
+        new_module = copy.copy(module)
+        memo[id(module)] = new_module
+        for attr, value in module.__dict__.items():
+            if isinstance(value, dict):
+                new_module.__dict__[attr] = value.copy()
+        for param_name, param in module._parameters.items():
+            if param is not None and id(param) not in memo:
+                # a new Parameter sharing the storage, so `.data` assignments in the copy don't leak into `model`.
+                memo[id(param)] = torch.nn.Parameter(param.data, requires_grad=param.requires_grad)
+            new_module._parameters[param_name] = None if param is None else memo[id(param)]
+        for child_name, child in module._modules.items():
+            new_module._modules[child_name] = None if child is None else _copy_module(child)
+        return new_module
+
+    return _copy_module(model)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Indexed tensor store for the inspected tensors.
+
+The inspect results are nested dicts and lists of tensors, e.g.
+{"activation": [{op_name: {tensor_name: array}}], "weight": {op_name: {tensor_name: array}}}.
+The store writes all the tensors into one binary file and keeps their offsets in an index with the same nesting, so
+the binary file can be memory-mapped and a tensor is only read when it is accessed.
+"""
+
+import logging
+import mmap
+import os
+import pickle
+from collections import namedtuple
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+INDEX_FILENAME = "index.pkl"
+DATA_FILENAME = "tensors.bin"
+# the tensors are aligned in the binary file, so they can be viewed in place
+ALIGNMENT = 64
+
+# a numeric array stored in the binary file
+ArrayEntry = namedtuple("ArrayEntry", ["offset", "dtype", "shape"])
+# any other value, pickled into the binary file
+ObjectEntry = namedtuple("ObjectEntry", ["offset", "length"])
+
+
+def dump_tensor_store(data, path, name="inspect_result"):
+    """Dump the nested dicts and lists of tensors as a tensor store.
+
+    Args:
+        data: the nested dicts and lists of tensors.
+        path: the directory to save the store.
+        name: the name of the store directory.
+
+    Returns:
+        the path of the store directory.
+    """
+    store_path = os.path.join(path, name)
+    os.makedirs(store_path, exist_ok=True)
+    index_path = os.path.join(store_path, INDEX_FILENAME)
+    # remove the index first, a store without index is incomplete
+    if os.path.exists(index_path):
+        os.remove(index_path)
+
+    # write a new binary file instead of overwriting it, the stores loaded before still map the old one
+    data_path = os.path.join(store_path, DATA_FILENAME)
+    tmp_data_path = data_path + ".tmp"
+    with open(tmp_data_path, "wb") as data_file:
+
+        def write(value):
+            if isinstance(value, dict):
+                return {key: write(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [write(item) for item in value]
+            offset = data_file.tell()
+            padding = -offset % ALIGNMENT
+            data_file.write(b"\0" * padding)
+            offset += padding
+            if isinstance(value, np.ndarray) and value.dtype.kind in "biufc":
+                data_file.write(np.ascontiguousarray(value).data)
+                return ArrayEntry(offset, value.dtype.str, value.shape)
+            data_file.write(pickle.dumps(value))
+            return ObjectEntry(offset, data_file.tell() - offset)
+
+        index = write(data)
+    os.replace(tmp_data_path, data_path)
+
+    tmp_index_path = index_path + ".tmp"
+    with open(tmp_index_path, "wb") as index_file:
+        pickle.dump(index, index_file)
+    os.replace(tmp_index_path, index_path)
+    logging.getLogger("neural_compressor").info("Dumped tensor store to %s" % store_path)
+    return store_path
+
+
+def is_tensor_store(path):
+    """Check whether the path is a complete tensor store."""
+    return os.path.isfile(os.path.join(path, INDEX_FILENAME))
+
+
+def load_tensor_store(path):
+    """Load the tensor store lazily.
+
+    Only the index is read, the tensors are read from the memory-mapped binary file when they are accessed.
+
+    Args:
+        path: the path of the store directory.
+
+    Returns:
+        the nested LazyTensorDict and LazyTensorList with the same structure as the dumped data.
+    """
+    with open(os.path.join(path, INDEX_FILENAME), "rb") as index_file:
+        index = pickle.load(index_file)
+    with open(os.path.join(path, DATA_FILENAME), "rb") as data_file:
+        if os.fstat(data_file.fileno()).st_size == 0:
+            buffer = b""
+        else:
+            buffer = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+    return _resolve(index, buffer)
+
+
+def _resolve(node, buffer):
+    if isinstance(node, dict):
+        return LazyTensorDict(node, buffer)
+    if isinstance(node, list):
+        return LazyTensorList(node, buffer)
+    if isinstance(node, ArrayEntry):
+        dtype = np.dtype(node.dtype)
+        count = int(np.prod(node.shape, dtype=np.int64))
+        return np.frombuffer(buffer, dtype=dtype, count=count, offset=node.offset).reshape(node.shape)
+    return pickle.loads(buffer[node.offset : node.offset + node.length])
+
+
+class LazyTensorDict(Mapping):
+    """Read-only dict of a tensor store, the values are read when they are accessed."""
+
+    def __init__(self, index, buffer):
+        """Init LazyTensorDict.
+
+        Args:
+            index: the dict of the store index.
+            buffer: the memory-mapped binary file.
+        """
+        self._index = index
+        self._buffer = buffer
+
+    def __getitem__(self, key):
+        """Read the value of the key."""
+        return _resolve(self._index[key], self._buffer)
+
+    def __iter__(self):
+        """Iterate the keys."""
+        return iter(self._index)
+
+    def __len__(self):
+        """Get the number of the keys."""
+        return len(self._index)
+
+
+class LazyTensorList(Sequence):
+    """Read-only list of a tensor store, the items are read when they are accessed."""
+
+    def __init__(self, index, buffer):
+        """Init LazyTensorList.
+
+        Args:
+            index: the list of the store index.
+            buffer: the memory-mapped binary file.
+        """
+        self._index = index
+        self._buffer = buffer
+
+    def __getitem__(self, position):
+        """Read the item at the position."""
+        if isinstance(position, slice):
+            return [_resolve(node, self._buffer) for node in self._index[position]]
+        return _resolve(self._index[position], self._buffer)
+
+    def __len__(self):
+        """Get the number of the items."""
+        return len(self._index)
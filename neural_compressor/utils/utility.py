@@ -28,11 +28,13 @@ import logging
 import os
 import os.path as osp
 import pickle
+import queue
 import re
 import subprocess
 import sys
 import threading
 import time
+from collections.abc import Mapping
 from contextlib import contextmanager
 from enum import Enum
 from functools import wraps
@@ -508,6 +510,86 @@ class Statistics:
             self.output_handle(i)
 
 
+class MetricUpdater:
+    """Update the metrics of an evaluation loop on a background thread.
+
+    The model outputs are handed over through a bounded queue, so the framework session keeps running the next batches
+    while the postprocess and the metric updates of the previous batches are done. The batches are processed in the
+    order they are put and an error raised by the worker is re-raised in the evaluation loop.
+
+    Usage:
+        with MetricUpdater(metrics, postprocess) as updater:
+            for inputs, labels in dataloader:
+                updater.put(session.run(inputs), labels)
+    """
+
+    def __init__(self, metrics, postprocess=None, max_pending=4):
+        """Init a MetricUpdater.
+
+        Args:
+            metrics (list): the metrics to update, the ones with `compare_label=False` are skipped.
+            postprocess (callable, optional): the postprocess applied to (predictions, labels). Defaults to None.
+            max_pending (int, optional): the max number of batches waiting for the worker. Defaults to 4.
+        """
+        self.metrics = [
+            metric for metric in metrics or [] if not hasattr(metric, "compare_label") or metric.compare_label
+        ]
+        self.postprocess = postprocess
+        self.queue = queue.Queue(maxsize=max(1, max_pending))
+        self.error = None
+        self.thread = None
+        if self.metrics:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            # keep draining the queue after an error so that `put` never blocks.
+            if self.error is not None:
+                continue
+            predictions, labels = item
+            try:
+                if self.postprocess is not None:
+                    predictions, labels = self.postprocess((predictions, labels))
+                for metric in self.metrics:
+                    metric.update(predictions, labels)
+            except BaseException as e:
+                self.error = e
+
+    def put(self, predictions, labels):
+        """Hand over the outputs of a batch to the worker, block if `max_pending` batches are waiting."""
+        if self.error is not None:
+            raise self.error
+        if self.thread is not None:
+            self.queue.put((predictions, labels))
+
+    def join(self):
+        """Wait until all batches are processed, re-raise the error of the worker if any."""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        """Return the updater."""
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Join the worker, the error of the evaluation loop takes precedence over the one of the worker."""
+        if type is None:
+            self.join()
+        else:
+            try:
+                self.join()
+            except BaseException:
+                pass
+
+
 class MODE(Enum):
     """Mode: Quantization, Benchmark or Pruning."""
 
@@ -784,21 +866,29 @@ def get_tensors_info(workload_location, model_type: str = "optimized") -> dict:
         model_type: type of model. Supported model types: "input", "optimized"
 
     Returns:
-        dictionary with tensors info
+        dictionary with tensors info, read lazily from the tensor store
     """
-    tensors_filenames = {
-        "input": os.path.join("fp32", "inspect_result.pkl"),
-        "optimized": os.path.join("quan", "inspect_result.pkl"),
+    from neural_compressor.utils.tensor_store import is_tensor_store, load_tensor_store
+
+    tensors_dirnames = {
+        "input": "fp32",
+        "optimized": "quan",
     }
 
-    tensors_filename = tensors_filenames.get(model_type, None)
-    if tensors_filename is None:
+    tensors_dirname = tensors_dirnames.get(model_type, None)
+    if tensors_dirname is None:
         raise Exception(f"Could not find tensors data for {model_type} model.")
-    tensors_path = os.path.join(
+    store_path = os.path.join(
         workload_location,
         "inspect_saved",
-        tensors_filename,
+        tensors_dirname,
+        "inspect_result",
     )
+    if is_tensor_store(store_path):
+        return load_tensor_store(store_path)
+
+    # the tensors of the workspaces dumped before the tensor store
+    tensors_path = store_path + ".pkl"
     if not os.path.exists(tensors_path):
         raise Exception("Could not find tensor data for specified optimization.")
     with open(tensors_path, "rb") as tensors_pickle:
@@ -827,7 +917,7 @@ def get_weights_details(workload_location: str) -> list:
         input_model_op_tensors = input_model_tensors[op_name]
         optimized_model_op_tensors = optimized_model_tensors[op_name]
 
-        if isinstance(input_model_op_tensors, dict):
+        if isinstance(input_model_op_tensors, Mapping):
             tensors_data = zip(input_model_op_tensors.items(), optimized_model_op_tensors.items())
             for (_, input_op_tensor_values), (_, optimized_op_tensor_values) in tensors_data:
                 if input_op_tensor_values.shape != optimized_op_tensor_values.shape:
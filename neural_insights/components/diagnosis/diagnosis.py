@@ -16,8 +16,11 @@
 import os
 import pickle
 from abc import abstractmethod
-from typing import Any, List, Optional
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
 
+from neural_compressor.utils.tensor_store import INDEX_FILENAME, is_tensor_store, load_tensor_store
 from neural_insights.components.diagnosis.op_details import OpDetails
 from neural_insights.components.diagnosis.op_entry import OpEntry
 from neural_insights.components.diagnosis.weights_details import WeightsDetails
@@ -27,6 +30,48 @@ from neural_insights.utils.exceptions import ClientErrorException, InternalExcep
 from neural_insights.utils.logger import log
 from neural_insights.utils.utils import check_module
 
+# the tensor store of a model, identified by its path and the modification time of its index
+TensorStoreKey = Tuple[str, int]
+
+
+@lru_cache(maxsize=8)
+def _load_tensor_store(store_path: str, mtime: int) -> dict:
+    """Load the tensor store lazily, the index is cached until the store is modified."""
+    return load_tensor_store(store_path)
+
+
+@lru_cache(maxsize=8)
+def _load_pickled_data(file_path: str, mtime: int) -> Any:
+    """Load the pickled data, it is cached until the file is modified."""
+    with open(file_path, "rb") as pickled_file:
+        return pickle.load(pickled_file)
+
+
+def load_min_max_data(workload_location: str) -> dict:
+    """Load activation min max data of the workload."""
+    minmax_file_path = os.path.join(
+        workload_location,
+        "inspect_saved",
+        "activation_min_max.pkl",
+    )
+    return _load_pickled_data(minmax_file_path, os.stat(minmax_file_path).st_mtime_ns)
+
+
+@lru_cache(maxsize=4096)
+def _get_cached_mse(input_store: TensorStoreKey, optimized_store: TensorStoreKey, op_name: str) -> Optional[float]:
+    """Calculate MSE for specified OP, only its tensors are read from the tensor stores."""
+    return Diagnosis.calculate_mse(
+        op_name,
+        _load_tensor_store(*input_store)["activation"][0],
+        _load_tensor_store(*optimized_store)["activation"][0],
+    )
+
+
+@lru_cache(maxsize=256)
+def _get_cached_histogram_data(optimized_store: TensorStoreKey, op_name: str, inspect_type: str) -> list:
+    """Get data to draw histogram, only the tensors of specified OP are read from the tensor store."""
+    return Diagnosis.calculate_histogram_data(_load_tensor_store(*optimized_store), op_name, inspect_type)
+
 
 class Diagnosis:
     """Diagnosis class."""
@@ -43,18 +88,15 @@ class Diagnosis:
 
     def get_tensors_info(self, model_type: str = "optimized") -> dict:
         """Get information about tensors."""
-        tensors_filenames = {
-            "input": os.path.join("fp32", "inspect_result.pkl"),
-            "optimized": os.path.join("quan", "inspect_result.pkl"),
-        }
+        tensor_store = self.get_tensor_store_key(model_type)
+        if tensor_store is not None:
+            return _load_tensor_store(*tensor_store)
 
-        tensors_filename = tensors_filenames.get(model_type, None)
-        if tensors_filename is None:
-            raise InternalException(f"Could not find tensors data for {model_type} model.")
         tensors_path = os.path.join(
             self.workload_location,
             "inspect_saved",
-            tensors_filename,
+            self._get_tensors_dirname(model_type),
+            "inspect_result.pkl",
         )
         if not os.path.exists(tensors_path):
             raise ClientErrorException("Could not find tensor data for specified optimization.")
@@ -62,6 +104,30 @@ class Diagnosis:
             dump_tensor_result = pickle.load(tensors_pickle)
         return dump_tensor_result
 
+    def get_tensor_store_key(self, model_type: str = "optimized") -> Optional[TensorStoreKey]:
+        """Get the key of the tensor store, None if the tensors are not dumped to a tensor store."""
+        store_path = os.path.join(
+            self.workload_location,
+            "inspect_saved",
+            self._get_tensors_dirname(model_type),
+            "inspect_result",
+        )
+        if not is_tensor_store(store_path):
+            return None
+        return store_path, os.stat(os.path.join(store_path, INDEX_FILENAME)).st_mtime_ns
+
+    @staticmethod
+    def _get_tensors_dirname(model_type: str) -> str:
+        """Get the directory of the tensors dumped for specified model type."""
+        tensors_dirnames = {
+            "input": "fp32",
+            "optimized": "quan",
+        }
+        tensors_dirname = tensors_dirnames.get(model_type, None)
+        if tensors_dirname is None:
+            raise InternalException(f"Could not find tensors data for {model_type} model.")
+        return tensors_dirname
+
     def load_quantization_config(self) -> dict:
         """Get config quantization data."""
         config_path = os.path.join(
@@ -95,22 +161,20 @@ class Diagnosis:
         input_model_tensors: dict = self.get_tensors_info(model_type="input")["activation"][0]
         optimized_model_tensors: dict = self.get_tensors_info(model_type="optimized")["activation"][0]
 
-        minmax_file_path = os.path.join(
-            self.workload_location,
-            "inspect_saved",
-            "activation_min_max.pkl",
-        )
-
         try:
-            with open(minmax_file_path, "rb") as min_max_file:
-                min_max_data: dict = pickle.load(min_max_file)
+            min_max_data: dict = load_min_max_data(self.workload_location)
         except FileNotFoundError:
             log.debug("Could not find minmax file.")
             common_ops = list(set(input_model_tensors.keys()) & set(optimized_model_tensors.keys()))
             min_max_data = dict(zip(common_ops, [{"min": None, "max": None}] * len(common_ops)))
 
+        input_store = self.get_tensor_store_key(model_type="input")
+        optimized_store = self.get_tensor_store_key(model_type="optimized")
         for op_name, min_max in min_max_data.items():
-            mse = self.calculate_mse(op_name, input_model_tensors, optimized_model_tensors)
+            if input_store is not None and optimized_store is not None:
+                mse = _get_cached_mse(input_store, optimized_store, op_name)
+            else:
+                mse = self.calculate_mse(op_name, input_model_tensors, optimized_model_tensors)
             if mse is None or np.isnan(mse):
                 continue
             min = min_max.get("min", None)
@@ -129,13 +193,7 @@ class Diagnosis:
         """Get weights details for model."""
         weights_details = []
 
-        minmax_file_path = os.path.join(
-            self.workload_location,
-            "inspect_saved",
-            "activation_min_max.pkl",
-        )
-        with open(minmax_file_path, "rb") as min_max_file:
-            min_max_data: dict = pickle.load(min_max_file)
+        min_max_data: dict = load_min_max_data(self.workload_location)
 
         input_model_tensors: dict = self.get_tensors_info(model_type="input")[inspect_type]
         optimized_model_tensors: dict = self.get_tensors_info(model_type="optimized")[inspect_type]
@@ -150,7 +208,7 @@ class Diagnosis:
             if op_name not in min_max_data.keys():
                 continue
 
-            if isinstance(input_model_op_tensors, dict):
+            if isinstance(input_model_op_tensors, Mapping):
                 for (input_op_name, input_op_values), (optimized_op_name, optimized_op_values) in zip(
                     input_model_op_tensors.items(), optimized_model_op_tensors.items()
                 ):
@@ -165,8 +223,8 @@ class Diagnosis:
                     weights_details.append(weights_entry)
         return weights_details
 
+    @staticmethod
     def calculate_mse(
-        self,
         op_name: str,
         input_model_tensors: dict,
         optimized_model_tensors: dict,
@@ -178,7 +236,7 @@ class Diagnosis:
         if input_model_op_data is None or optimized_model_op_data is None:
             return None
 
-        mse: float = self.mse_metric_gap(
+        mse: float = Diagnosis.mse_metric_gap(
             next(iter(input_model_op_data.values()))[0],
             next(iter(optimized_model_op_data.values()))[0],
         )
@@ -195,7 +253,15 @@ class Diagnosis:
 
     def get_histogram_data(self, op_name: str, inspect_type: str) -> list:
         """Get data to draw histogram."""
-        tensors = self.get_tensors_info(model_type="optimized").get(inspect_type, None)
+        optimized_store = self.get_tensor_store_key(model_type="optimized")
+        if optimized_store is not None:
+            return _get_cached_histogram_data(optimized_store, op_name, inspect_type)
+        return self.calculate_histogram_data(self.get_tensors_info(model_type="optimized"), op_name, inspect_type)
+
+    @staticmethod
+    def calculate_histogram_data(tensors_info: dict, op_name: str, inspect_type: str) -> list:
+        """Calculate data to draw histogram from the tensors information."""
+        tensors = tensors_info.get(inspect_type, None)
         if tensors is None:
             raise ClientErrorException(
                 f"Could not get tensor information for {inspect_type} type.",
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test Diagnosis."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from neural_compressor.utils.tensor_store import dump_tensor_store
+from neural_compressor.utils.utility import dump_data_to_local
+from neural_insights.components.diagnosis.diagnosis import Diagnosis
+from neural_insights.components.workload_manager.workload import Workload
+
+
+class TestDiagnosis(unittest.TestCase):
+    """Test Diagnosis class."""
+
+    def setUp(self) -> None:
+        """Dump the inspected tensors of a workload."""
+        self.workload_location = tempfile.mkdtemp()
+        inspect_saved = os.path.join(self.workload_location, "inspect_saved")
+        min_max = {}
+        for model_dir in ["fp32", "quan"]:
+            tensors = {
+                "activation": [{f"conv{i}": {f"conv{i}_out": np.random.randn(1, 2, 4, 4)} for i in range(3)}],
+                "weight": {f"conv{i}": {f"conv{i}_weight": np.random.randn(2, 2, 3, 3)} for i in range(3)},
+            }
+            dump_data_to_local(tensors, os.path.join(inspect_saved, model_dir), "inspect_result.pkl")
+            dump_tensor_store(tensors, os.path.join(inspect_saved, model_dir), "inspect_result")
+            min_max = {op_name: {"min": -1.0, "max": 1.0} for op_name in tensors["activation"][0]}
+        dump_data_to_local(min_max, inspect_saved, "activation_min_max.pkl")
+        self.diagnosis = Diagnosis(
+            Workload({"workload_location": self.workload_location, "model_path": "/path/to/model.onnx"}),
+        )
+
+    def tearDown(self) -> None:
+        """Remove the workload."""
+        shutil.rmtree(self.workload_location, ignore_errors=True)
+
+    def test_tensor_store_matches_pickle(self) -> None:
+        """Test that the tensor store gives the same results as the pickled tensors."""
+        op_list = self.diagnosis.get_op_list()
+        histogram_data = self.diagnosis.get_histogram_data("conv1", "weight")
+        weights_details = self.diagnosis.get_weights_details("weight")
+        self.assertEqual(len(op_list), 3)
+
+        for model_dir in ["fp32", "quan"]:
+            shutil.rmtree(os.path.join(self.workload_location, "inspect_saved", model_dir, "inspect_result"))
+        self.assertIsNone(self.diagnosis.get_tensor_store_key("optimized"))
+        self.assertEqual(self.diagnosis.get_op_list(), op_list)
+        self.assertEqual(self.diagnosis.get_histogram_data("conv1", "weight"), histogram_data)
+        self.assertEqual(
+            sorted(details.serialize()["MSE"] for details in self.diagnosis.get_weights_details("weight")),
+            sorted(details.serialize()["MSE"] for details in weights_details),
+        )
+
+    def test_cached_results(self) -> None:
+        """Test that MSE and histograms are calculated once for the tensor store."""
+        with patch.object(Diagnosis, "mse_metric_gap", wraps=Diagnosis.mse_metric_gap) as mock_mse_metric_gap:
+            op_list = self.diagnosis.get_op_list()
+            self.assertEqual(self.diagnosis.get_op_list(), op_list)
+            self.assertEqual(mock_mse_metric_gap.call_count, 3)
+        with patch.object(
+            Diagnosis,
+            "calculate_histogram_data",
+            wraps=Diagnosis.calculate_histogram_data,
+        ) as mock_calculate_histogram_data:
+            histogram_data = self.diagnosis.get_histogram_data("conv0", "activation")
+            self.assertEqual(self.diagnosis.get_histogram_data("conv0", "activation"), histogram_data)
+            mock_calculate_histogram_data.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -40,12 +40,21 @@ class Cluster:
         self.initial_cluster_from_node_lst(node_lst)
         self.lock = threading.Lock()
 
-    def reserve_resource(self, task):
-        """Reserve the resource and return the requested list of resources."""
+    @synchronized
+    def reserve_resource(self, task, keep=0):
+        """Reserve the resource and return the requested list of resources.
+
+        The sockets are taken from the socket queue and booked in the cluster table under the same lock, so the
+        concurrent reservations and frees always see a consistent cluster.
+
+        Args:
+            task (Task): the task.
+            keep (int, optional): the number of free sockets that must be left to other tasks. Defaults to 0.
+        """
         reserved_resource_lst = []
         workers = task.workers
         logger.info(f"task {task.task_id} needs {workers}")
-        reserved_resource_lst = self.get_free_socket(workers)
+        reserved_resource_lst = self._get_free_socket(workers, keep)
         if reserved_resource_lst:
             allocated_resources = {}
             counts = Counter(int(item.split()[0]) for item in reserved_resource_lst)
@@ -100,6 +109,9 @@ class Cluster:
     @synchronized
     def get_free_socket(self, num_sockets: int) -> List[str]:
         """Get the free sockets list."""
+        return self._get_free_socket(num_sockets)
+
+    def _get_free_socket(self, num_sockets: int, keep: int = 0) -> List[str]:
         booked_socket_lst = []
 
         # detect and append new resource
@@ -131,8 +143,11 @@ class Cluster:
         self.cursor.execute("DELETE FROM cluster WHERE status='remove' AND busy_sockets=0")
         self.conn.commit()
 
-        if len(self.socket_queue) < num_sockets:
-            logger.info(f"Can not allocate {num_sockets} sockets, due to only {len(self.socket_queue)} left.")
+        if len(self.socket_queue) < num_sockets + keep:
+            logger.info(
+                f"Can not allocate {num_sockets} sockets, due to only {len(self.socket_queue)} left "
+                + f"and {keep} kept."
+            )
             return 0
         else:
             booked_socket_lst = self.socket_queue[:num_sockets]
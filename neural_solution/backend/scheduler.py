@@ -13,6 +13,7 @@
 # limitations under the License.
 """Neural Solution scheduler."""
 import glob
+import hashlib
 import json
 import os
 import re
@@ -42,6 +43,117 @@ cmd = "echo $(conda info --base)/etc/profile.d/conda.sh"
 CONDA_SOURCE_PATH = subprocess.getoutput(cmd)
 
 
+class CondaEnvIndex:
+    """CondaEnvIndex maps the requirement sets to the conda environments which have them installed.
+
+    The index is persisted as a json file, so the lookups are answered without listing the conda environments and the
+    packages installed in them.
+
+    Attributes:
+        index_path: the json file of the index, the index is not persisted if it is None
+        index: the map from the hash of a base environment and a requirement set to the environment name
+        preparing: the threads which are preparing the environments, keyed by the same hashes
+        failures: the time of the last failed preparation, keyed by the same hashes
+        retry_interval: the seconds to wait before preparing an environment again after a failure
+        lock: the lock on the index
+    """
+
+    def __init__(self, index_path=None, retry_interval=600):
+        """Init CondaEnvIndex.
+
+        Args:
+            index_path (str, optional): the json file of the index. Defaults to None.
+            retry_interval (float, optional): the seconds to wait before preparing an environment again after a
+                failure. Defaults to 600.
+        """
+        self.index_path = index_path
+        self.index = {}
+        self.preparing = {}
+        self.failures = {}
+        self.retry_interval = retry_interval
+        self.lock = threading.Lock()
+        if index_path is not None and os.path.exists(index_path):
+            with open(index_path, "r") as f:
+                self.index = json.load(f)
+
+    @staticmethod
+    def get_key(base_env, requirement: str):
+        """Get the hash of the base environment and the requirement set, the order of the packages is ignored."""
+        packages = sorted(set(requirement.split()))
+        return hashlib.sha256(json.dumps([base_env, packages]).encode("utf-8")).hexdigest()
+
+    def lookup(self, base_env, requirement: str):
+        """Get the environment which has the requirements, None if it is unknown."""
+        with self.lock:
+            return self.index.get(self.get_key(base_env, requirement))
+
+    def add(self, base_env, requirement: str, env_name):
+        """Record the environment which has the requirements."""
+        with self.lock:
+            self.index[self.get_key(base_env, requirement)] = env_name
+            self._save()
+
+    def remove(self, base_env, requirement: str):
+        """Forget the environment of the requirements, e.g. when it is removed."""
+        with self.lock:
+            self.index.pop(self.get_key(base_env, requirement), None)
+            self._save()
+
+    def prepare_async(self, base_env, requirement: str, prepare_func, callback=None):
+        """Prepare the environment of the requirements in a thread, unless it is being prepared or failed recently.
+
+        Args:
+            base_env (str): the base environment.
+            requirement (str): the requirements.
+            prepare_func (function): the function which returns the prepared environment name.
+            callback (function, optional): the function called after the environment is prepared. Defaults to None.
+        """
+        key = self.get_key(base_env, requirement)
+
+        def prepare():
+            try:
+                env_name = prepare_func()
+                self.add(base_env, requirement, env_name)
+                with self.lock:
+                    self.failures.pop(key, None)
+            except Exception as e:
+                logger.error(f"[Scheduler] Failed to prepare environment for {requirement}: {e}")
+                with self.lock:
+                    self.failures[key] = time.time()
+            finally:
+                with self.lock:
+                    self.preparing.pop(key, None)
+                if callback is not None:
+                    callback()
+
+        with self.lock:
+            if key in self.preparing:
+                return
+            if time.time() - self.failures.get(key, float("-inf")) < self.retry_interval:
+                return
+            self.preparing[key] = threading.Thread(target=prepare, daemon=True)
+            self.preparing[key].start()
+
+    def _save(self):
+        if self.index_path is None:
+            return
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+
+
+def conda_env_exists(env_name):
+    """Check whether the conda environment exists without calling conda."""
+    conda_base = os.path.dirname(os.path.dirname(os.path.dirname(CONDA_SOURCE_PATH)))
+    envs_dir = os.path.join(conda_base, "envs")
+    # the check is skipped when the environments are not in the default location
+    if env_name == "base" or not os.path.isdir(envs_dir):
+        return True
+    return os.path.isdir(os.path.join(envs_dir, env_name))
+
+
 class Scheduler:
     """Scheduler dispatches the task with the available resources, calls the mpi command and report results."""
 
@@ -54,6 +166,11 @@ class Scheduler:
         upload_path="./examples",
         config=None,
         num_threads_per_process=5,
+        backfill=True,
+        aging_rate=1 / 60,
+        reserve_after=1800,
+        idle_interval=5,
+        env_index_path=None,
     ):
         """Scheduler dispatches the task with the available resources, calls the mpi command and report results.
 
@@ -63,6 +180,13 @@ class Scheduler:
             result_monitor_port: The result monitor port to report the accuracy and performance result
             conda_env_name: The basic environment for task execution
             upload_path： Custom example path.
+            backfill: Whether to dispatch the tasks behind a task which doesn't fit the free sockets.
+            aging_rate: The priority a pending task gains per second of waiting.
+            reserve_after: The seconds after which the sockets needed by a blocked task are kept for it, the tasks
+                behind it are only backfilled with the other free sockets.
+            idle_interval: The max seconds between two scheduling rounds without any event.
+            env_index_path: The json file of the conda environment index, defaults to conda_env_index.json in the db
+                directory of the workspace.
         """
         self.cluster = cluster
         self.task_db = task_db
@@ -71,12 +195,19 @@ class Scheduler:
         self.upload_path = upload_path
         self.config = config
         self.num_threads_per_process = num_threads_per_process
+        self.backfill = backfill
+        self.aging_rate = aging_rate
+        self.reserve_after = reserve_after
+        self.idle_interval = idle_interval
+        if env_index_path is None and config is not None:
+            env_index_path = os.path.join(config.workspace, "db", "conda_env_index.json")
+        self.env_index = CondaEnvIndex(env_index_path)
 
     def prepare_env(self, task: Task):
         """Check and create a conda environment.
 
-        If the required packages are not installed in the conda environment,
-        create a new conda environment and install the required packages.
+        The environment is looked up in the environment index first. If it is unknown and the required packages are
+        not installed in the conda environments, create a new conda environment and install the required packages.
 
         Args:
             task (Task): task
@@ -87,6 +218,39 @@ class Scheduler:
         # Skip check when requirement is empty.
         if requirement == [""]:
             return env_prefix
+        conda_env = self.env_index.lookup(env_prefix, task.requirement)
+        if conda_env is not None:
+            if conda_env_exists(conda_env):
+                return conda_env
+            self.env_index.remove(env_prefix, task.requirement)
+        conda_env = self._find_or_create_env(task)
+        self.env_index.add(env_prefix, task.requirement, conda_env)
+        return conda_env
+
+    def prepare_env_async(self, task: Task):
+        """Check whether the conda environment of the task is ready, otherwise prepare it in a thread.
+
+        The scheduler is woken up once the environment is prepared, so the other tasks can be dispatched meanwhile.
+
+        Args:
+            task (Task): task
+
+        Returns:
+            bool: whether the environment is ready.
+        """
+        if task.requirement.split(" ") == [""]:
+            return True
+        conda_env = self.env_index.lookup(self.conda_env_name, task.requirement)
+        if conda_env is not None and conda_env_exists(conda_env):
+            return True
+        self.env_index.prepare_async(
+            self.conda_env_name, task.requirement, lambda: self.prepare_env(task), self.task_db.notify
+        )
+        return False
+
+    def _find_or_create_env(self, task: Task):
+        env_prefix = self.conda_env_name
+        requirement = task.requirement.split(" ")
         # Construct the command to list all the conda environments
         cmd = "conda env list"
         output = subprocess.getoutput(cmd)
@@ -109,20 +273,20 @@ class Scheduler:
                     conda_env = env_name
                     break
         if conda_env is None:
+            # the name is derived from the requirement set, so the environments prepared concurrently never collide
+            conda_env = f"{env_prefix}_{CondaEnvIndex.get_key(env_prefix, task.requirement)[:16]}"
+            # remove the environment left by a failed creation, it would have been found above if it was complete
+            remove_cmd = f" && conda env remove -y -n {conda_env}" if conda_env in env_list else ""
             # Construct the command to create a new conda environment and install the required packages
-            from datetime import datetime
-
-            now = datetime.now()
-            suffix = now.strftime("%Y%m%d-%H%M%S")
-            conda_env = f"{env_prefix}_{suffix}"
-            # Construct the name of the new conda environment
             cmd = (
-                f"source {CONDA_SOURCE_PATH} && conda create -n {conda_env} --clone {env_prefix}"
+                f"source {CONDA_SOURCE_PATH}{remove_cmd} && conda create -n {conda_env} --clone {env_prefix}"
                 f" && conda activate {conda_env} && pip install {task.requirement.replace('=','==')}"
             )
             p = subprocess.Popen(cmd, shell=True)  # nosec
             logger.info(f"[Scheduler] Creating new environment {conda_env} start.")
-            p.wait()
+            returncode = p.wait()
+            if returncode != 0:
+                raise RuntimeError(f"Creating new environment {conda_env} failed with exit code {returncode}.")
             logger.info(f"[Scheduler] Creating new environment {conda_env} end.")
         return conda_env
 
@@ -265,6 +429,7 @@ class Scheduler:
         start_time = time.time()
         p.wait()
         self.cluster.free_resource(resource)
+        self.task_db.notify()
         task_runtime = time.time() - start_time
         logger.info(
             f"[TaskScheduler] Finished task {task.task_id}, and free resource {resource}, dump log into {log_path}"
@@ -279,25 +444,60 @@ class Scheduler:
         t = threading.Thread(target=self.launch_task, args=(task, resource))
         t.start()
 
-    def schedule_tasks(self):
-        """After each 5 seconds, check the task queue and try to schedule a task."""
-        while True:
-            time.sleep(5)
-            logger.info(f"[TaskScheduler {get_current_time()}] try to dispatch a task...")
+    def try_dispatch_tasks(self, now=None):
+        """Dispatch the pending tasks which fit the free sockets.
+
+        The pending tasks are visited by their aged priorities. A task which doesn't fit is skipped and the smaller
+        tasks behind it are backfilled. Once it has waited for `reserve_after` seconds, the sockets it needs are kept
+        for it, so the backfilled tasks can't starve it.
+
+        Args:
+            now (float, optional): the current time. Defaults to time.time().
+
+        Returns:
+            int: the number of dispatched tasks.
+        """
+        num_dispatched = 0
+        num_kept = 0
+        for task_id, waiting_time in self.task_db.get_ordered_pending_tasks(now, self.aging_rate):
+            task = self.task_db.get_task_by_id(task_id)
+            if not self.prepare_env_async(task):
+                logger.info(f"[TaskScheduler] the environment of task {task_id} is being prepared, try the next task.")
+                continue
+            resource = self.cluster.reserve_resource(task, keep=num_kept)
+            if resource:
+                self.task_db.remove_pending_task(task_id)
+                self.task_db.update_task_status(task.task_id, "running")
+                self.dispatch_task(task, resource)
+                num_dispatched += 1
+            elif not self.backfill:
+                logger.info("[TaskScheduler] no enough node resources!")
+                break
+            elif waiting_time >= self.reserve_after:
+                logger.info(
+                    f"[TaskScheduler] no enough node resources, keep {task.workers} sockets for task {task_id}."
+                )
+                num_kept += task.workers
+            else:
+                logger.info(f"[TaskScheduler] no enough node resources for task {task_id}, try the next task.")
+        return num_dispatched
+
+    def schedule_tasks(self, stop_event=None):
+        """Try to schedule the pending tasks when a task is submitted or a task frees its resources.
+
+        Args:
+            stop_event (threading.Event, optional): the scheduling loop ends after the event is set and the task db is
+                notified. Defaults to None, the tasks are scheduled forever.
+        """
+        while stop_event is None or not stop_event.is_set():
+            self.task_db.wait_for_change(timeout=self.idle_interval)
+            logger.info(f"[TaskScheduler {get_current_time()}] try to dispatch tasks...")
             if self.task_db.get_pending_task_num() > 0:
                 logger.info(
                     f"[TaskScheduler {get_current_time()}], "
                     + f"there are {self.task_db.get_pending_task_num()} task pending."
                 )
-                task_id = self.task_db.task_queue[0]
-                task = self.task_db.get_task_by_id(task_id)
-                resource = self.cluster.reserve_resource(task)
-                if resource:
-                    self.task_db.task_queue.popleft()
-                    self.task_db.update_task_status(task.task_id, "running")
-                    self.dispatch_task(task, resource)
-                else:
-                    logger.info("[TaskScheduler] no enough node resources!")
+                self.try_dispatch_tasks()
             else:
                 logger.info("[TaskScheduler] no requests in the deque!")
 
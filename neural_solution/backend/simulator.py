@@ -0,0 +1,170 @@
+# Copyright (c) 2023 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Neural Solution scheduler simulator.
+
+Replay a workload on a local cluster with the real Scheduler, Cluster and TaskDB, on a virtual clock, to measure the
+queue wait of the tasks and the utilization of the cluster.
+
+Example:
+    python -m neural_solution.backend.simulator --num_tasks 200
+"""
+
+import argparse
+import heapq
+import os
+import random
+import tempfile
+from collections import deque, namedtuple
+
+from neural_solution.backend.scheduler import Scheduler
+from neural_solution.backend.task import Task
+from neural_solution.backend.task_db import TaskDB
+from neural_solution.backend.utils.utility import build_local_cluster
+
+# a task of the workload, the times are in seconds
+SimulatedTask = namedtuple("SimulatedTask", ["submit_time", "workers", "duration", "priority"], defaults=[0])
+
+# the statistics of a simulation, the times are in seconds
+SimulationResult = namedtuple("SimulationResult", ["waits", "mean_wait", "max_wait", "utilization", "makespan"])
+
+
+class SimulatedScheduler(Scheduler):
+    """Scheduler which runs the dispatched tasks on a virtual clock instead of launching them."""
+
+    def __init__(self, cluster, task_db, durations, **kwargs):
+        """Init SimulatedScheduler.
+
+        Args:
+            cluster: the Cluster object that manages the server resources
+            task_db: the TaskDb object that manages the tasks
+            durations (dict): the running time of each task id.
+            kwargs: the scheduling options of Scheduler.
+        """
+        super().__init__(cluster, task_db, result_monitor_port=None, **kwargs)
+        self.durations = durations
+        self.now = 0
+        self.start_time = {}
+        self.finish_events = []
+
+    def dispatch_task(self, task, resource):
+        """Record the start of the task and schedule its end on the virtual clock."""
+        self.start_time[task.task_id] = self.now
+        heapq.heappush(self.finish_events, (self.now + self.durations[task.task_id], task.task_id, resource))
+
+
+def simulate(workload, **scheduler_kwargs):
+    """Replay the workload on the local cluster built by `build_local_cluster`.
+
+    The scheduler runs a round whenever a task is submitted or finished, as the event-driven `schedule_tasks` does.
+
+    Args:
+        workload (list): the SimulatedTask list.
+        scheduler_kwargs: the scheduling options of Scheduler, e.g. backfill, aging_rate and reserve_after.
+
+    Returns:
+        SimulationResult: the queue wait of each task and the statistics of the cluster.
+    """
+    workload = sorted(workload, key=lambda task: task.submit_time)
+    with tempfile.TemporaryDirectory() as workspace:
+        db_path = os.path.join(workspace, "db", "task.db")
+        cluster, _ = build_local_cluster(db_path)
+        total_sockets = len(cluster.socket_queue)
+        assert all(task.workers <= total_sockets for task in workload), "some tasks need more sockets than the cluster"
+        task_db = TaskDB(db_path)
+        tasks = deque()
+        for index, simulated_task in enumerate(workload):
+            task = Task(
+                str(index), "", simulated_task.workers, "pending", "", 1, "static", "", priority=simulated_task.priority
+            )
+            task_db.cursor.execute(
+                "insert into task(id, arguments, workers, status, script_url, optimized, approach, requirements)"
+                + " values (?, '', ?, 'pending', '', 1, 'static', '')",
+                (task.task_id, task.workers),
+            )
+            tasks.append((simulated_task.submit_time, task))
+        task_db.conn.commit()
+        scheduler = SimulatedScheduler(
+            cluster, task_db, {str(i): task.duration for i, task in enumerate(workload)}, **scheduler_kwargs
+        )
+
+        while tasks or scheduler.finish_events:
+            next_submit = tasks[0][0] if tasks else float("inf")
+            next_finish = scheduler.finish_events[0][0] if scheduler.finish_events else float("inf")
+            scheduler.now = min(next_submit, next_finish)
+            while scheduler.finish_events and scheduler.finish_events[0][0] <= scheduler.now:
+                _, task_id, resource = heapq.heappop(scheduler.finish_events)
+                cluster.free_resource(resource)
+                task_db.update_task_status(task_id, "done")
+            while tasks and tasks[0][0] <= scheduler.now:
+                task_db.append_task(tasks.popleft()[1], submit_time=scheduler.now)
+            scheduler.try_dispatch_tasks(scheduler.now)
+        task_db.conn.close()
+        cluster.conn.close()
+
+    waits = [scheduler.start_time[str(i)] - task.submit_time for i, task in enumerate(workload)]
+    makespan = scheduler.now - workload[0].submit_time if workload else 0
+    busy = sum(task.workers * task.duration for task in workload)
+    return SimulationResult(
+        waits=waits,
+        mean_wait=sum(waits) / len(waits) if waits else 0,
+        max_wait=max(waits, default=0),
+        utilization=busy / (total_sockets * makespan) if makespan else 0,
+        makespan=makespan,
+    )
+
+
+def generate_workload(num_tasks, max_workers=6, mean_interval=200, mean_duration=300, seed=0):
+    """Generate a random workload with Poisson arrivals and mostly small tasks.
+
+    Args:
+        num_tasks (int): the number of tasks.
+        max_workers (int, optional): the max number of sockets of a task. Defaults to 6.
+        mean_interval (int, optional): the mean seconds between two submits. Defaults to 200.
+        mean_duration (int, optional): the mean running seconds of a task. Defaults to 300.
+        seed (int, optional): the random seed. Defaults to 0.
+
+    Returns:
+        list: the SimulatedTask list.
+    """
+    rng = random.Random(seed)
+    workload = []
+    submit_time = 0
+    for _ in range(num_tasks):
+        submit_time += rng.expovariate(1 / mean_interval)
+        workers = max_workers if rng.random() < 0.2 else rng.randint(1, max(1, max_workers // 3))
+        workload.append(SimulatedTask(submit_time, workers, rng.expovariate(1 / mean_duration)))
+    return workload
+
+
+def main():
+    """Compare the FIFO scheduling with the backfilling on a random workload."""
+    parser = argparse.ArgumentParser(description="Neural Solution scheduler simulator")
+    parser.add_argument("--num_tasks", type=int, default=200, help="the number of tasks")
+    parser.add_argument("--mean_interval", type=float, default=200, help="the mean seconds between two submits")
+    parser.add_argument("--mean_duration", type=float, default=300, help="the mean running seconds of a task")
+    parser.add_argument("--seed", type=int, default=0, help="the random seed")
+    args = parser.parse_args()
+    workload = generate_workload(
+        args.num_tasks, mean_interval=args.mean_interval, mean_duration=args.mean_duration, seed=args.seed
+    )
+    for name, backfill in [("fifo", False), ("backfill", True)]:
+        result = simulate(workload, backfill=backfill)
+        print(
+            f"{name}: mean wait {result.mean_wait:.1f}s, max wait {result.max_wait:.1f}s, "
+            f"utilization {result.utilization:.1%}, makespan {result.makespan:.1f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,7 @@ class Task:
         workers: The requested resource unit number
         status: The status of the task: pending/running/done
         result: The result of the task, which is only value-assigned when the task is done
+        priority: The scheduling priority of the task, the larger the earlier
     """
 
     def __init__(
@@ -37,6 +38,7 @@ class Task:
         requirement,
         result="",
         q_model_path="",
+        priority=0,
     ):
         """Init task.
 
@@ -51,6 +53,7 @@ class Task:
             requirement (str): python packages
             result (str, optional): the result of task. Defaults to "".
             q_model_path (str, optional): the quantized model path. Defaults to "".
+            priority (int, optional): the scheduling priority, the larger the earlier. Defaults to 0.
         """
         self.task_id = task_id
         self.arguments = arguments
@@ -62,3 +65,4 @@ class Task:
         self.requirement = requirement
         self.result = result
         self.q_model_path = q_model_path
+        self.priority = priority
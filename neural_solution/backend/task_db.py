@@ -14,6 +14,7 @@
 """Neural Solution task database."""
 import sqlite3
 import threading
+import time
 from collections import deque
 
 from neural_solution.backend.task import Task
@@ -27,8 +28,11 @@ class TaskDB:
 
     Attributes:
         task_queue: a FIFO queue that only holds pending task ids
+        task_priority: the priority of each pending task
+        submit_time: the submit time of each pending task
         task_collections: a growing-only list of all task objects and their details (no garbage collection currently)
         lock: the lock on the data structures to provide atomic operations
+        changed: the condition notified when a task is submitted or resources are freed
     """
 
     def __init__(self, db_path):
@@ -38,6 +42,8 @@ class TaskDB:
             db_path (str): the database path.
         """
         self.task_queue = deque()
+        self.task_priority = {}
+        self.submit_time = {}
         create_dir(db_path)
         # sqlite should set this check_same_thread to False
         self.conn = sqlite3.connect(f"{db_path}", check_same_thread=False)
@@ -50,11 +56,55 @@ class TaskDB:
         self.conn.commit()
         # self.task_collections = []
         self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self._notified = False
 
-    def append_task(self, task):
-        """Append the task to the task queue."""
+    def append_task(self, task, submit_time=None):
+        """Append the task to the task queue and wake up the scheduler."""
         with self.lock:
             self.task_queue.append(task.task_id)
+            self.task_priority[task.task_id] = getattr(task, "priority", 0)
+            self.submit_time[task.task_id] = time.time() if submit_time is None else submit_time
+            self._notified = True
+            self.changed.notify_all()
+
+    def remove_pending_task(self, task_id):
+        """Remove the task from the task queue once it is dispatched."""
+        with self.lock:
+            self.task_queue.remove(task_id)
+            self.task_priority.pop(task_id, None)
+            self.submit_time.pop(task_id, None)
+
+    def get_ordered_pending_tasks(self, now=None, aging_rate=0):
+        """Get the pending task ids ordered by their aged priorities.
+
+        The aged priority of a task is its priority plus `aging_rate` per second it has waited, tasks with the same aged
+        priority keep their submit order.
+
+        Args:
+            now (float, optional): the current time. Defaults to time.time().
+            aging_rate (float, optional): the priority gained per second of waiting. Defaults to 0.
+
+        Returns:
+            list: the pairs of the task id and its waiting time in seconds.
+        """
+        now = time.time() if now is None else now
+        with self.lock:
+            waits = [(task_id, now - self.submit_time.get(task_id, now)) for task_id in self.task_queue]
+            return sorted(waits, key=lambda item: -(self.task_priority.get(item[0], 0) + aging_rate * item[1]))
+
+    def notify(self):
+        """Wake up the scheduler, e.g. when resources are freed."""
+        with self.lock:
+            self._notified = True
+            self.changed.notify_all()
+
+    def wait_for_change(self, timeout=None):
+        """Wait until a task is submitted or `notify` is called, return False if timed out."""
+        with self.lock:
+            notified = self._notified or self.changed.wait(timeout)
+            self._notified = False
+            return notified
 
     def get_pending_task_num(self):
         """Get the number of the pending tasks."""
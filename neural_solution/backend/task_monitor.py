@@ -47,7 +47,9 @@ class TaskMonitor:
         task_id = task_dict["task_id"]
 
         logger.info("[TaskMonitor] getting task: {}".format(task_id))
-        return self.task_db.get_task_by_id(task_id)
+        task = self.task_db.get_task_by_id(task_id)
+        task.priority = task_dict.get("priority", 0)
+        return task
         # return Task(task_id=task["task_id"], arguments=task["arguments"],
         #     workers=task["workers"], status="pending", script_url=task['script_url'])
 
@@ -42,6 +42,14 @@ class TestCluster(unittest.TestCase):
         self.assertEqual(len(reserved_resource_lst), 2)
         self.assertEqual(self.cluster.socket_queue, ["2 node2", "2 node2"])
 
+    def test_reserve_resource_with_keep(self):
+        task = self.task
+        # only 4 sockets are free, 3 of them are kept for other tasks
+        self.assertEqual(self.cluster.reserve_resource(task, keep=3), 0)
+        self.assertEqual(len(self.cluster.socket_queue), 4)
+        reserved_resource_lst = self.cluster.reserve_resource(task, keep=2)
+        self.assertEqual(reserved_resource_lst, ["1 node1", "1 node1"])
+
     def test_free_resource(self):
         task = self.task
         reserved_resource_lst = self.cluster.reserve_resource(task)
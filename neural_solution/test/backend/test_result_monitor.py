@@ -18,7 +18,15 @@ class TestResultMonitor(unittest.TestCase):
         mock_c = MagicMock()
         mock_c.recv.return_value = serialized_result
 
-        mock_socket.return_value.accept.return_value = (mock_c, MagicMock())
+        stopped = threading.Event()
+
+        def accept():
+            # wait_result loops forever, end the monitor thread when the test is done
+            if stopped.is_set():
+                raise SystemExit
+            return mock_c, MagicMock()
+
+        mock_socket.return_value.accept.side_effect = accept
         mock_socket.return_value.recv.return_value = serialized_result
         mock_socket.return_value.__enter__.return_value = mock_socket.return_value
 
@@ -32,6 +40,8 @@ class TestResultMonitor(unittest.TestCase):
             )
             adding_abort.start()
             adding_abort.join(timeout=0.1)
+            stopped.set()
+            adding_abort.join()
 
     def test_query_task_status(self):
         # Mock data for testing
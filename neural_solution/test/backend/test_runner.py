@@ -6,13 +6,22 @@ import unittest
 from unittest.mock import patch
 
 from neural_solution.backend.runner import main, parse_args
+from neural_solution.config import config
 
 
 class TestMain(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.workspace = config.workspace
+
     @classmethod
     def tearDownClass(cls) -> None:
         os.remove("test.txt")
         shutil.rmtree("ns_workspace", ignore_errors=True)
+        # main sets the workspace of the global config, restore it for the other tests
+        config.workspace = cls.workspace
+        for path in ["db", "task_log", "task_workspace", "serve_log"]:
+            shutil.rmtree(path, ignore_errors=True)
 
     def test_parse_args(self):
         args = ["-H", "path/to/hostfile", "-TMP", "2222", "-RMP", "3333", "-CEN", "inc"]
@@ -1,12 +1,13 @@
 import os
 import shutil
+import tempfile
 import threading
 import unittest
 from subprocess import CalledProcessError
 from unittest.mock import MagicMock, Mock, mock_open, patch
 
-from neural_solution.backend.cluster import Cluster
-from neural_solution.backend.scheduler import Scheduler
+from neural_solution.backend.cluster import Cluster, Node
+from neural_solution.backend.scheduler import CondaEnvIndex, Scheduler
 from neural_solution.backend.task import Task
 from neural_solution.backend.task_db import TaskDB
 from neural_solution.backend.utils.utility import dump_elapsed_time, get_task_log_path
@@ -23,18 +24,30 @@ class TestScheduler(unittest.TestCase):
         self.cluster = Cluster(db_path=db_path)
         self.task_db = TaskDB(db_path=db_path)
         self.result_monitor_port = 1234
+        # every test starts with an empty conda environment index
+        self.env_index_dir = tempfile.mkdtemp()
+        self.env_index_path = os.path.join(self.env_index_dir, "conda_env_index.json")
         self.scheduler = Scheduler(
-            self.cluster, self.task_db, self.result_monitor_port, conda_env_name="for_ns_test", config=config
+            self.cluster,
+            self.task_db,
+            self.result_monitor_port,
+            conda_env_name="for_ns_test",
+            config=config,
+            env_index_path=self.env_index_path,
         )
 
     def tearDown(self) -> None:
         shutil.rmtree("ns_workspace", ignore_errors=True)
+        shutil.rmtree(self.env_index_dir, ignore_errors=True)
 
     @classmethod
     def tearDownClass(cls) -> None:
-        shutil.rmtree("examples")
+        shutil.rmtree("examples", ignore_errors=True)
 
-    def test_prepare_env(self):
+    @patch("subprocess.Popen")
+    @patch("subprocess.getoutput", return_value="")
+    def test_prepare_env(self, mock_getoutput, mock_popen):
+        mock_popen.return_value.wait.return_value = 0
         task = Task(
             "test_task",
             "test_arguments",
@@ -50,6 +63,26 @@ class TestScheduler(unittest.TestCase):
         result = self.scheduler.prepare_env(task)
         self.assertTrue(result.startswith(self.scheduler.conda_env_name))
 
+        # the name of a new environment is derived from the requirements, and a failed one is not indexed
+        task.requirement = "not_installed_package"
+        scheduler_test = Scheduler(
+            self.cluster,
+            self.task_db,
+            self.result_monitor_port,
+            conda_env_name="for_ns_test",
+            config=config,
+            env_index_path=self.env_index_path,
+        )
+        self.assertEqual(
+            scheduler_test._find_or_create_env(task),
+            "for_ns_test_" + CondaEnvIndex.get_key("for_ns_test", task.requirement)[:16],
+        )
+        mock_popen.return_value.wait.return_value = 1
+        with self.assertRaises(RuntimeError):
+            scheduler_test.prepare_env(task)
+        self.assertIsNone(scheduler_test.env_index.lookup("for_ns_test", task.requirement))
+        mock_popen.return_value.wait.return_value = 0
+
         # Test requirement in {conda_env} case
         task = Task(
             "test_task",
@@ -64,7 +97,12 @@ class TestScheduler(unittest.TestCase):
             "test_q_model_path",
         )
         scheduler_test = Scheduler(
-            self.cluster, self.task_db, self.result_monitor_port, conda_env_name="base", config=config
+            self.cluster,
+            self.task_db,
+            self.result_monitor_port,
+            conda_env_name="base",
+            config=config,
+            env_index_path=self.env_index_path,
         )
         result = scheduler_test.prepare_env(task)
         self.assertTrue(result.startswith("base"))
@@ -251,38 +289,140 @@ class TestScheduler(unittest.TestCase):
             'test_optimized', 'test_approach', 'test_requirement', 'test_result', 'test_q_model_path')"
         )
 
+        def run_schedule_tasks():
+            stop_event = threading.Event()
+            adding_abort = threading.Thread(
+                target=self.scheduler.schedule_tasks,
+                args=(stop_event,),
+                daemon=True,
+            )
+            adding_abort.start()
+            adding_abort.join(timeout=10)
+            # stop the scheduling loop, the threads must not share the task db with the later tests
+            stop_event.set()
+            self.task_db.notify()
+            adding_abort.join()
+
         # no pending task case
-        adding_abort = threading.Thread(
-            target=self.scheduler.schedule_tasks,
-            args=(),
-            daemon=True,
-        )
-        adding_abort.start()
-        adding_abort.join(timeout=10)
+        run_schedule_tasks()
 
         # task case
         self.task_db.append_task(task1)
         mock_reserve_resource.return_value = [("node1", 8)]
         mock_launch_task.return_value = None
-
-        adding_abort = threading.Thread(
-            target=self.scheduler.schedule_tasks,
-            args=(),
-            daemon=True,
-        )
-        adding_abort.start()
-        adding_abort.join(timeout=10)
+        run_schedule_tasks()
 
         # no resource case
         self.task_db.append_task(task1)
         mock_reserve_resource.return_value = False
-        adding_abort = threading.Thread(
-            target=self.scheduler.schedule_tasks,
-            args=(),
-            daemon=True,
+        run_schedule_tasks()
+
+    @patch("neural_solution.backend.scheduler.Scheduler.dispatch_task")
+    def test_try_dispatch_tasks(self, mock_dispatch_task):
+        cluster = Cluster(node_lst=[Node("node1", num_sockets=4)], db_path=db_path)
+        for task_id, workers in [("big", 3), ("small", 1)]:
+            self.task_db.cursor.execute(
+                "insert or replace into task values (?, 'test_arguments', ?, 'pending', 'test_script_url', "
+                + "0, 'test_approach', '', '', '')",
+                (task_id, workers),
+            )
+        self.task_db.conn.commit()
+        running = cluster.reserve_resource(Task("running", "", 2, "", "", 0, "", ""))
+        self.task_db.append_task(self.task_db.get_task_by_id("big"), submit_time=0)
+        self.task_db.append_task(self.task_db.get_task_by_id("small"), submit_time=0)
+
+        # the small task is backfilled behind the big one
+        scheduler = Scheduler(
+            cluster,
+            self.task_db,
+            self.result_monitor_port,
+            config=config,
+            reserve_after=100,
+            env_index_path=self.env_index_path,
+        )
+        self.assertEqual(scheduler.try_dispatch_tasks(now=10), 1)
+        self.assertEqual(list(self.task_db.task_queue), ["big"])
+        cluster.free_resource(running)
+        self.assertEqual(scheduler.try_dispatch_tasks(now=20), 1)
+        self.assertEqual(mock_dispatch_task.call_count, 2)
+
+        # the sockets needed by the starving big task are kept for it
+        cluster = Cluster(node_lst=[Node("node1", num_sockets=4)], db_path=db_path)
+        scheduler.cluster = cluster
+        running = cluster.reserve_resource(Task("running", "", 2, "", "", 0, "", ""))
+        self.task_db.append_task(self.task_db.get_task_by_id("big"), submit_time=0)
+        self.task_db.append_task(self.task_db.get_task_by_id("small"), submit_time=0)
+        self.assertEqual(scheduler.try_dispatch_tasks(now=200), 0)
+        self.assertEqual(list(self.task_db.task_queue), ["big", "small"])
+
+        # FIFO without backfilling
+        scheduler.backfill = False
+        scheduler.reserve_after = float("inf")
+        self.assertEqual(scheduler.try_dispatch_tasks(now=200), 0)
+
+    def test_conda_env_index(self):
+        index_path = self.env_index_path
+        env_index = CondaEnvIndex(index_path)
+        self.assertIsNone(env_index.lookup("base", "numpy torch"))
+        env_index.add("base", "numpy torch", "base_1")
+        # the order of the packages is ignored and the index is persisted
+        env_index = CondaEnvIndex(index_path)
+        self.assertEqual(env_index.lookup("base", "torch numpy"), "base_1")
+        self.assertIsNone(env_index.lookup("for_ns_test", "torch numpy"))
+        env_index.remove("base", "numpy torch")
+        self.assertIsNone(CondaEnvIndex(index_path).lookup("base", "numpy torch"))
+
+    def test_conda_env_index_retry(self):
+        env_index = CondaEnvIndex()
+        prepare_func = MagicMock(side_effect=RuntimeError("conda create failed"))
+        callback = MagicMock()
+
+        def prepare_async():
+            env_index.prepare_async("base", "numpy", prepare_func, callback)
+            for thread in list(env_index.preparing.values()):
+                thread.join(10)
+
+        # the failed environment is not indexed and is not prepared again until the retry interval passes
+        prepare_async()
+        self.assertIsNone(env_index.lookup("base", "numpy"))
+        callback.assert_called_once()
+        prepare_async()
+        prepare_func.assert_called_once()
+        env_index.retry_interval = 0
+        prepare_func.side_effect = None
+        prepare_func.return_value = "base_1"
+        prepare_async()
+        self.assertEqual(prepare_func.call_count, 2)
+        self.assertEqual(env_index.lookup("base", "numpy"), "base_1")
+        self.assertEqual(env_index.failures, {})
+
+    @patch("neural_solution.backend.scheduler.Scheduler.dispatch_task")
+    def test_prepare_env_async(self, mock_dispatch_task):
+        self.task_db.cursor.execute(
+            "insert or replace into task values ('env_task', 'test_arguments', 1, 'pending', 'test_script_url', "
+            + "0, 'test_approach', 'numpy', '', '')"
         )
-        adding_abort.start()
-        adding_abort.join(timeout=10)
+        self.task_db.conn.commit()
+        task = self.task_db.get_task_by_id("env_task")
+        self.scheduler.cluster = Cluster(node_lst=[Node("node1", num_sockets=1)], db_path=db_path)
+        prepared = threading.Event()
+        with patch(
+            "neural_solution.backend.scheduler.Scheduler._find_or_create_env",
+            side_effect=lambda task: prepared.wait(10) and "for_ns_test_1",
+        ) as mock_find_or_create_env, patch("neural_solution.backend.scheduler.conda_env_exists", return_value=True):
+            # the task is not dispatched until its environment is prepared
+            self.task_db.append_task(task)
+            self.assertEqual(self.scheduler.try_dispatch_tasks(), 0)
+            self.assertEqual(self.scheduler.try_dispatch_tasks(), 0)
+            self.assertEqual(list(self.task_db.task_queue), ["env_task"])
+            # the scheduler is woken up after the environment is prepared
+            self.task_db.wait_for_change(0)
+            prepared.set()
+            self.assertTrue(self.task_db.wait_for_change(10))
+            self.assertEqual(self.scheduler.try_dispatch_tasks(), 1)
+            self.assertEqual(self.scheduler.prepare_env(task), "for_ns_test_1")
+            mock_find_or_create_env.assert_called_once()
+            mock_dispatch_task.assert_called_once()
 
 
 class TestParseCmd(unittest.TestCase):
@@ -290,8 +430,14 @@ class TestParseCmd(unittest.TestCase):
         self.cluster = Cluster(db_path=db_path)
         self.task_db = TaskDB(db_path=db_path)
         self.result_monitor_port = 1234
+        self.env_index_dir = tempfile.mkdtemp()
         self.task_scheduler = Scheduler(
-            self.cluster, self.task_db, self.result_monitor_port, conda_env_name="for_ns_test", config=config
+            self.cluster,
+            self.task_db,
+            self.result_monitor_port,
+            conda_env_name="for_ns_test",
+            config=config,
+            env_index_path=os.path.join(self.env_index_dir, "conda_env_index.json"),
         )
         self.task = MagicMock()
         self.resource = ["1 node1", "2 node2", "3 node3"]
@@ -308,6 +454,10 @@ class TestParseCmd(unittest.TestCase):
         self.task_scheduler.script_name = self.script_name
         self.task_scheduler.task_path = self.task_path
 
+    def tearDown(self) -> None:
+        shutil.rmtree("ns_workspace", ignore_errors=True)
+        shutil.rmtree(self.env_index_dir, ignore_errors=True)
+
     def test__parse_cmd(self):
         expected_cmd = (
             "cd /path/to/task\nmpirun -np 3 -host node1,node2,node3 -map-by socket:pe=5"
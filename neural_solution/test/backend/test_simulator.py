@@ -0,0 +1,40 @@
+"""Tests for scheduler simulator."""
+
+import unittest
+
+from neural_solution.backend.simulator import SimulatedTask, generate_workload, simulate
+
+
+class TestSimulator(unittest.TestCase):
+    def test_simulate(self):
+        # the local cluster has 6 sockets, the small tasks are blocked by the big one in FIFO order
+        workload = [
+            SimulatedTask(0, 4, 100),
+            SimulatedTask(1, 4, 100),
+            SimulatedTask(2, 1, 10),
+            SimulatedTask(3, 1, 10),
+        ]
+        fifo = simulate(workload, backfill=False)
+        self.assertEqual(fifo.waits, [0, 99, 98, 97])
+        self.assertEqual(fifo.makespan, 200)
+        backfill = simulate(workload, backfill=True)
+        self.assertEqual(backfill.waits, [0, 99, 0, 0])
+        self.assertEqual(backfill.makespan, 200)
+        self.assertAlmostEqual(backfill.utilization, (4 * 100 * 2 + 1 * 10 * 2) / (6 * 200))
+
+        # the high priority task is dispatched first
+        workload = [SimulatedTask(0, 6, 100), SimulatedTask(1, 6, 10), SimulatedTask(2, 6, 10, priority=1)]
+        result = simulate(workload)
+        self.assertEqual(result.waits, [0, 109, 98])
+
+    def test_generate_workload(self):
+        workload = generate_workload(100, max_workers=6, seed=1)
+        self.assertEqual(len(workload), 100)
+        self.assertTrue(all(1 <= task.workers <= 6 for task in workload))
+        result = simulate(workload)
+        self.assertEqual(len(result.waits), 100)
+        self.assertTrue(0 < result.utilization <= 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -26,6 +26,29 @@ class TestTaskDB(unittest.TestCase):
         self.assertEqual(len(self.taskdb.task_queue), 1)
         self.assertEqual(self.taskdb.task_queue[0], "1")
 
+    def test_get_ordered_pending_tasks(self):
+        tasks = [
+            Task(str(i), "arguments", 1, "pending", "script_url", 0, "approach", "requirement", priority=priority)
+            for i, priority in enumerate([0, 1, 0])
+        ]
+        for task, submit_time in zip(tasks, [0, 100, 10]):
+            self.taskdb.append_task(task, submit_time=submit_time)
+        self.assertEqual([task_id for task_id, _ in self.taskdb.get_ordered_pending_tasks(now=100)], ["1", "0", "2"])
+        # the first task gains 4 priorities after waiting for 200 seconds
+        ordered = self.taskdb.get_ordered_pending_tasks(now=200, aging_rate=0.02)
+        self.assertEqual(ordered, [("0", 200), ("2", 190), ("1", 100)])
+
+        self.taskdb.remove_pending_task("0")
+        self.assertEqual(list(self.taskdb.task_queue), ["1", "2"])
+
+    def test_wait_for_change(self):
+        self.assertFalse(self.taskdb.wait_for_change(timeout=0.01))
+        self.taskdb.append_task(self.task)
+        self.assertTrue(self.taskdb.wait_for_change(timeout=0.01))
+        self.assertFalse(self.taskdb.wait_for_change(timeout=0.01))
+        self.taskdb.notify()
+        self.assertTrue(self.taskdb.wait_for_change(timeout=0.01))
+
     def test_get_pending_task_num(self):
         self.taskdb.append_task(self.task)
         self.assertEqual(self.taskdb.get_pending_task_num(), 1)
@@ -34,6 +34,9 @@ torch_included_folder:
     │   ├── torch
 """
 
+import shutil
+import tempfile
+import time
 import unittest
 
 from neural_compressor.common import Logger
@@ -49,7 +52,18 @@ from neural_compressor.common.base_config import (
     register_config,
     register_supported_configs_for_fwk,
 )
-from neural_compressor.common.base_tuning import ConfigLoader, ConfigSet, Evaluator, SequentialSampler
+from neural_compressor.common.base_tuning import (
+    ConfigLoader,
+    ConfigSet,
+    EvaluationFuncWrapper,
+    Evaluator,
+    ParallelTrialExecutor,
+    SequentialSampler,
+    TrialResultCache,
+    TuningConfig,
+    TuningMonitor,
+    init_tuning,
+)
 from neural_compressor.common.tuning_param import TuningParam
 from neural_compressor.common.utils import DEFAULT_WHITE_LIST, OP_NAME_OR_MODULE_TYPE
 
@@ -288,5 +302,62 @@ class TestConfigLoader(unittest.TestCase):
             self.assertEqual(config, self.config_set[i])
 
 
+class TestTrialResultCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_trial_result_cache(self) -> None:
+        config_4bits, config_8bits = FakeAlgoConfig(weight_bits=4), FakeAlgoConfig(weight_bits=8)
+        tuning_monitor = TuningMonitor(TuningConfig(), result_cache=TrialResultCache(self.cache_dir, "fake_model"))
+        self.assertIsNone(tuning_monitor.get_cached_trial_result(config_4bits))
+        tuning_monitor.set_baseline(1.0)
+        tuning_monitor.add_trial_result(0, 0.9, config_4bits)
+
+        # a new tuning run with the same model reuses the results.
+        eval_calls = []
+        eval_wrapper = EvaluationFuncWrapper(
+            lambda model: eval_calls.append(model) or 2.0,
+            result_cache=TrialResultCache(self.cache_dir, "fake_model"),
+        )
+        tuning_monitor = TuningMonitor(TuningConfig(), result_cache=eval_wrapper.result_cache)
+        self.assertEqual(eval_wrapper.evaluate_baseline(FakeModel()), 1.0)
+        self.assertEqual(tuning_monitor.get_cached_trial_result(FakeAlgoConfig(weight_bits=4)), 0.9)
+        self.assertIsNone(tuning_monitor.get_cached_trial_result(config_8bits))
+        self.assertEqual(len(eval_calls), 0)
+
+        # the results of another model are not reused.
+        eval_wrapper.result_cache = TrialResultCache(self.cache_dir, "another_model")
+        self.assertEqual(eval_wrapper.evaluate_baseline(FakeModel()), 2.0)
+        self.assertEqual(len(eval_calls), 1)
+
+
+def fake_quant_fn(quant_config):
+    # the trials with fewer bits finish later.
+    time.sleep((8 - quant_config.weight_bits) * 0.2)
+    return quant_config.weight_bits
+
+
+def fake_eval_fn(model):
+    return model / 10
+
+
+class TestParallelTrialExecutor(unittest.TestCase):
+    def test_parallel_trial_executor(self) -> None:
+        config_set = [FakeAlgoConfig(weight_bits=bits) for bits in [2, 4, 6, 8]]
+        tuning_config = TuningConfig(config_set=config_set, tolerable_loss=0.5, num_workers=4)
+        config_loader, tuning_logger, tuning_monitor = init_tuning(tuning_config)
+        tuning_monitor.set_baseline(1.0)
+        executor = ParallelTrialExecutor(fake_quant_fn, fake_eval_fn, num_workers=4)
+        self.assertTrue(executor.is_picklable())
+        # the 8-bit trial finishes first, but the 6-bit trial is picked as the sequential tuning does.
+        self.assertEqual(executor.run(config_loader, tuning_monitor, tuning_logger), 6)
+        self.assertEqual([record.trial_index for record in tuning_monitor.tuning_history], [0, 1, 2])
+
+        self.assertFalse(ParallelTrialExecutor(lambda config: config, fake_eval_fn, num_workers=2).is_picklable())
+
+
 if __name__ == "__main__":
     unittest.main()
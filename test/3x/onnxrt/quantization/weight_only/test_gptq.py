@@ -217,6 +217,70 @@ class TestGPTQQuant(unittest.TestCase):
             if node.name == "/h.4/mlp/fc_out/MatMul":
                 self.assertTrue(node.input[1].endswith("Q8G32"))
 
+    def test_replayable_data_reader(self):
+        from neural_compressor.onnxrt.algorithms.weight_only.utility import ReplayableDataReader
+
+        self.calibration_data_reader.rewind()
+        expected = list(self.calibration_data_reader.encoded_list)
+        self.calibration_data_reader.rewind()
+        data_reader = ReplayableDataReader(self.calibration_data_reader)
+        for _ in range(2):
+            inputs_list = list(data_reader)
+            self.assertEqual(len(inputs_list), len(expected))
+            for inputs, expected_inputs in zip(inputs_list, expected):
+                self.assertEqual(list(inputs), list(expected_inputs))
+                for name in inputs:
+                    self.assertTrue((inputs[name] == expected_inputs[name]).all())
+        cache_path = data_reader.cache_path
+        data_reader.close()
+        self.assertFalse(os.path.exists(cache_path))
+
+    def test_save_augmented_model(self):
+        import numpy as np
+        import onnx
+        from onnx.external_data_helper import load_external_data_for_model
+
+        from neural_compressor.onnxrt.algorithms.weight_only.utility import save_augmented_model
+        from neural_compressor.onnxrt.utils.onnx_model import ONNXModel
+
+        tmp_dir = "./save_augmented_model"
+        os.makedirs(tmp_dir, exist_ok=True)
+        weight = onnx.numpy_helper.from_array(np.random.rand(32, 32).astype(np.float32), "weight")
+        graph = onnx.helper.make_graph(
+            [
+                onnx.helper.make_node("MatMul", ["input", "weight"], ["matmul_output"], name="matmul"),
+                onnx.helper.make_node("Relu", ["matmul_output"], ["output"], name="relu"),
+            ],
+            "test",
+            [onnx.helper.make_tensor_value_info("input", onnx.TensorProto.FLOAT, [1, 32])],
+            [onnx.helper.make_tensor_value_info("output", onnx.TensorProto.FLOAT, [1, 32])],
+            [weight],
+        )
+        model_path = os.path.join(tmp_dir, "model.onnx")
+        onnx.save_model(
+            onnx.helper.make_model(graph), model_path, save_as_external_data=True, location="model.onnx.data"
+        )
+        augment_path = model_path + "_augment.onnx"
+
+        def save_and_load(model):
+            model.add_tensors_to_outputs(["matmul_output"])
+            save_augmented_model(model, augment_path)
+            model.remove_tensors_from_outputs(["matmul_output"])
+            return onnx.load(augment_path, load_external_data=False)
+
+        # the unchanged initializers keep referring to the external data of the model file.
+        model = ONNXModel(model_path)
+        load_external_data_for_model(model.model, tmp_dir)
+        self.assertEqual(save_and_load(model).graph.initializer[0].external_data[0].value, "model.onnx.data")
+
+        # the changed initializers are saved again.
+        model.get_initializer("weight").raw_data = np.zeros((32, 32), dtype=np.float32).tobytes()
+        augment_model = save_and_load(model)
+        self.assertNotEqual(augment_model.graph.initializer[0].external_data[0].value, "model.onnx.data")
+        load_external_data_for_model(augment_model, tmp_dir)
+        self.assertTrue((onnx.numpy_helper.to_array(augment_model.graph.initializer[0]) == 0).all())
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -188,6 +188,33 @@ class TestRTNQuant(unittest.TestCase):
             if node.name == "/h.4/mlp/fc_out/MatMul":
                 self.assertTrue(node.input[1].endswith("Q8G32"))
 
+    def test_rtn_shared_weight(self):
+        import numpy as np
+        from onnx import TensorProto, helper, numpy_helper
+
+        from neural_compressor.onnxrt.algorithms.weight_only.rtn import rtn_quantize
+
+        nodes = [
+            helper.make_node("MatMul", ["input", "W"], ["output" + str(i)], name="matmul" + str(i)) for i in range(2)
+        ]
+        graph = helper.make_graph(
+            nodes,
+            "shared_weight_graph",
+            [helper.make_tensor_value_info("input", TensorProto.FLOAT, [1, 32])],
+            [helper.make_tensor_value_info("output" + str(i), TensorProto.FLOAT, [1, 32]) for i in range(2)],
+            [numpy_helper.from_array(np.random.rand(32, 32).astype(np.float32), "W")],
+        )
+        model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+        weight_config = {
+            (node.name, node.op_type): {"weight_dtype": "int", "weight_bits": 8, "weight_group_size": 32}
+            for node in nodes
+        }
+
+        # the shared weight is removed after all its consumers are quantized
+        qmodel = rtn_quantize(model, weight_config=weight_config)
+        self.assertEqual([tensor.name for tensor in qmodel.graph.initializer], ["W_Q8G32"])
+        self.assertEqual([node.input[1] for node in qmodel.graph.node], ["W_Q8G32", "W_Q8G32"])
+
 
 if __name__ == "__main__":
     unittest.main()
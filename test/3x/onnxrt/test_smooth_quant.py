@@ -26,7 +26,9 @@ from optimum.exporters.onnx import main_export
 
 from neural_compressor.common import Logger
 from neural_compressor.onnxrt import CalibrationDataReader, QuantType, SmoohQuantConfig, get_default_sq_config
+from neural_compressor.onnxrt.algorithms.smoother.calibrator import Calibrator, PerChannelPercentileCollector
 from neural_compressor.onnxrt.quantization.quantize import _quantize
+from neural_compressor.onnxrt.utils.onnx_model import ONNXModel
 
 logger = Logger().get_logger()
 
@@ -122,6 +124,62 @@ class TestONNXRT3xSmoothQuant(unittest.TestCase):
         self.assertTrue(3 not in [i.data_type for i in model.graph.initializer])
         self.assertEqual(num_muls, 30)
 
+    def test_per_channel_percentile_collector(self):
+        datas = [np.random.randn(2, 100 * (i + 1), 8).astype(np.float32) for i in range(5)]
+        expected = np.concatenate([np.abs(data.reshape(-1, 8)) for data in datas])
+        for percentile in [99.999, 99.9, 100]:
+            collector = PerChannelPercentileCollector(percentile)
+            for data in datas:
+                collector.collect(data)
+            np.testing.assert_allclose(collector.result(), np.percentile(expected, percentile, axis=0), rtol=1e-6)
+            self.assertEqual(collector.shape, (2, 100, 8))
+            self.assertLess(collector.top_values.shape[0], 100)
+
+    def test_per_channel_percentile_collector_non_monotone_batches(self):
+        # a few large values come first, then a batch which is much larger than all the samples seen so far.
+        datas = [np.full((10, 8), 10.0, dtype=np.float32), np.random.rand(10000, 8).astype(np.float32)]
+        expected = np.percentile(np.concatenate(datas), 99.9, axis=0)
+        collector = PerChannelPercentileCollector(99.9)
+        for data in datas:
+            collector.collect(data)
+        self.assertFalse(collector.is_exact())
+        # the needed values are kept if the number of samples is known.
+        collector = PerChannelPercentileCollector(99.9, collector.num_samples)
+        for data in datas:
+            collector.collect(data)
+        self.assertTrue(collector.is_exact())
+        np.testing.assert_allclose(collector.result(), expected, rtol=1e-6)
+
+    def test_calib_smooth_streaming(self):
+        weight = onnx.helper.make_tensor("weight", onnx.TensorProto.FLOAT, [8, 4], np.random.rand(32).tolist())
+        graph = onnx.helper.make_graph(
+            [onnx.helper.make_node("MatMul", ["input", "weight"], ["output"], name="matmul")],
+            "test",
+            [onnx.helper.make_tensor_value_info("input", onnx.TensorProto.FLOAT, ["batch", 8])],
+            [onnx.helper.make_tensor_value_info("output", onnx.TensorProto.FLOAT, ["batch", 4])],
+            [weight],
+        )
+        model = onnx.helper.make_model(graph, opset_imports=[onnx.helper.make_opsetid("", 13)], ir_version=8)
+
+        class BatchReader(CalibrationDataReader):
+            def __init__(self, datas):
+                self.datas = datas
+                self.rewind()
+
+            def get_next(self):
+                return next(self.iter, None)
+
+            def rewind(self):
+                self.iter = iter([{"input": data} for data in self.datas])
+
+        # the batch sizes are not monotone, so the streaming calibration runs again with the known number of samples.
+        datas = [np.full((10, 8), 10.0, dtype=np.float32), np.random.rand(10000, 8).astype(np.float32)]
+        calibrator = Calibrator(ONNXModel(model), BatchReader(datas))
+        max_vals_per_channel, shape_infos, _ = calibrator.calib_smooth(["MatMul"], 99.9, streaming=True)
+        self.assertEqual(shape_infos["input"], (10, 8))
+        expected = np.percentile(np.concatenate(datas), 99.9, axis=0)
+        np.testing.assert_allclose(max_vals_per_channel["input"], expected, rtol=1e-6)
+
 
 if __name__ == "__main__":
     unittest.main()
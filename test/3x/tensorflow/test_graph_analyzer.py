@@ -0,0 +1,147 @@
+import os
+import tempfile
+import unittest
+
+from tensorflow.core.framework import graph_pb2
+
+from neural_compressor.tensorflow.quantization.utils.graph_rewriter.pass_manager import PassManager
+from neural_compressor.tensorflow.quantization.utils.graph_util import GraphAnalyzer
+from neural_compressor.tensorflow.quantization.utils.graph_util import GraphRewriterHelper as Helper
+
+
+def build_graph_def():
+    graph_def = graph_pb2.GraphDef()
+    graph_def.node.extend(
+        [
+            Helper.create_node("Placeholder", "input", []),
+            Helper.create_node("Const", "weight", []),
+            Helper.create_node("Conv2D", "conv", ["input", "weight"]),
+            Helper.create_node("Const", "bias", []),
+            Helper.create_node("BiasAdd", "bias_add", ["conv", "bias"]),
+            Helper.create_node("Relu", "relu", ["bias_add"]),
+            Helper.create_node("Conv2D", "conv_1", ["relu", "weight"]),
+            Helper.create_node("BiasAdd", "bias_add_1", ["conv_1", "bias"]),
+            Helper.create_node("Identity", "output", ["bias_add_1"]),
+        ]
+    )
+    return graph_def
+
+
+class RemoveIdentityRewriter:
+    def __init__(self, model, node_name):
+        self.model = model
+        self.node_name = node_name
+
+    def do_transformation(self):
+        g = GraphAnalyzer()
+        g.graph = self.model
+        g.parse_graph()
+        g.remove_node(self.node_name)
+        return g.dump_graph()
+
+
+class ParseGraphRewriter:
+    edits_node_defs_directly = False
+    parsed_graphs = []
+
+    def __init__(self, model):
+        self.model = model
+
+    def do_transformation(self):
+        g = GraphAnalyzer()
+        g.graph = self.model
+        self.parsed_graphs.append(g.parse_graph())
+        return g.dump_graph()
+
+
+class TestGraphAnalyzer(unittest.TestCase):
+    def test_op_type_index(self):
+        g = GraphAnalyzer()
+        g.graph = build_graph_def()
+        graph_info = g.parse_graph()
+        self.assertEqual(
+            graph_info.get_node_names_by_op_types(["BiasAdd", "Conv2D"]), ["conv", "bias_add", "conv_1", "bias_add_1"]
+        )
+
+        patterns = [["Conv2D"], ["BiasAdd"], ("Relu",)]
+        self.assertEqual(
+            g.query_fusion_pattern_nodes(patterns),
+            [
+                ["conv_1", "bias_add_1", ["Conv2D", "BiasAdd"]],
+                ["conv", "bias_add", "relu", ["Conv2D", "BiasAdd", "Relu"]],
+            ],
+        )
+
+        # the index is updated with the internal graph
+        relu_node = Helper.create_node("Relu6", "relu", ["bias_add"])
+        graph_info["relu"] = g.node_details(node=relu_node, outputs=["conv_1"])
+        self.assertEqual(graph_info.get_node_names_by_op_types(["Relu", "Relu6"]), ["relu"])
+        g.remove_node("bias_add_1")
+        self.assertEqual(graph_info.get_node_names_by_op_types(["BiasAdd"]), ["bias_add"])
+        self.assertEqual(g.query_fusion_pattern_nodes(patterns), [["conv", "bias_add", ["Conv2D", "BiasAdd"]]])
+        self.assertEqual(
+            g.query_fusion_pattern_nodes([["Conv2D"], ["BiasAdd"], ("Relu6",)]),
+            [["conv", "bias_add", "relu", ["Conv2D", "BiasAdd", "Relu6"]]],
+        )
+
+        # the node whose op is changed in place is moved to the bucket of the new op
+        graph_info["conv"].node.op = "DepthwiseConv2dNative"
+        self.assertEqual(graph_info.get_node_names_by_op_types(["Conv2D"]), ["conv_1"])
+        self.assertEqual(graph_info.get_node_names_by_op_types(["DepthwiseConv2dNative", "Conv2D"]), ["conv", "conv_1"])
+        self.assertEqual(g.query_fusion_pattern_nodes([["Conv2D"], ["BiasAdd"]]), [])
+
+    def test_pass_manager(self):
+        pass_manager = PassManager("Test")
+        graph_def = pass_manager.run(RemoveIdentityRewriter, build_graph_def(), "output")
+        graph_def = pass_manager.run(RemoveIdentityRewriter, graph_def, node_name="relu")
+        self.assertEqual(len(graph_def.node), 7)
+        pass_time = pass_manager.summary()
+        self.assertEqual(list(pass_time), ["RemoveIdentityRewriter"])
+        self.assertGreater(pass_time["RemoveIdentityRewriter"], 0)
+
+    def test_pass_manager_reuse_parsed_graph(self):
+        pass_manager = PassManager("Test")
+        ParseGraphRewriter.parsed_graphs.clear()
+        input_graph_def = pass_manager.run(ParseGraphRewriter, build_graph_def())
+        graph_def = pass_manager.run(ParseGraphRewriter, input_graph_def)
+        # the node details of the unchanged graph are reused and bound to the nodes of the input graph
+        first_graph_info, second_graph_info = ParseGraphRewriter.parsed_graphs
+        self.assertIs(first_graph_info, second_graph_info)
+        self.assertIs(second_graph_info["conv"].node, input_graph_def.node[2])
+        self.assertFalse(second_graph_info.modified)
+
+        # the changed graph is parsed again
+        graph_def = pass_manager.run(RemoveIdentityRewriter, graph_def, "output")
+        graph_def = pass_manager.run(ParseGraphRewriter, graph_def)
+        graph_info = ParseGraphRewriter.parsed_graphs[-1]
+        self.assertIsNot(graph_info, second_graph_info)
+        self.assertNotIn("output", graph_info)
+        self.assertEqual(graph_info["bias_add"].outputs, ["relu"])
+
+
+class TestGraphRewriterHelper(unittest.TestCase):
+    def test_gen_min_max_sampling_data(self):
+        messages = [
+            ";conv_eightbit_max_input__print__;__max:",
+            ";conv_eightbit_min_input__print__;__min:",
+            ";conv_eightbit_requant_range__print__;__requant_max:",
+            ";conv_eightbit_requant_range__print__;__requant_min:",
+        ]
+        iterations = [[2.5, -1.0, 6.0, 0.5], [3.0, -0.5, -1.0, -2.0]]
+        fd, log_path = tempfile.mkstemp(suffix=".log")
+        with os.fdopen(fd, "w") as f:
+            for values in iterations:
+                for message, value in zip(messages, values):
+                    f.write("{}[{}]\n".format(message, value))
+
+        # the fetched min/max values generate the same calibration data as the log of the print nodes
+        calibration_data = []
+        for values in iterations:
+            calibration_data.extend(Helper.gen_min_max_sampling_data(messages, values))
+        self.assertEqual(sorted(calibration_data), sorted(Helper.gen_valid_sampling_log(log_path)))
+        self.assertIn(";conv_eightbit_requant_range__print__;__requant_min_max:[-2.0][-1.0]", calibration_data)
+        os.remove(log_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.compat.v1 import graph_util
+
+from neural_compressor.tensorflow.utils import Model
+
+
+def build_graph_def():
+    tf.compat.v1.disable_eager_execution()
+    tf.compat.v1.reset_default_graph()
+
+    x = tf.compat.v1.placeholder(tf.float32, [1, 32, 32, 3], name="x")
+    conv_weights = tf.compat.v1.get_variable(
+        "weight", [3, 3, 3, 3], initializer=tf.compat.v1.random_normal_initializer()
+    )
+    conv = tf.nn.conv2d(x, conv_weights, strides=[1, 1, 1, 1], padding="SAME", name="conv")
+    tf.nn.relu(conv, name="relu")
+    with tf.compat.v1.Session() as sess:
+        sess.run(tf.compat.v1.global_variables_initializer())
+        graph_def = graph_util.convert_variables_to_constants(
+            sess=sess, input_graph_def=sess.graph_def, output_node_names=["relu"]
+        )
+    return graph_def
+
+
+class TestTensorflowBaseModel(unittest.TestCase):
+    def test_graph_def_setter(self):
+        graph_def = build_graph_def()
+        model = Model(graph_def)
+        self.assertEqual(model.input_tensor_names, ["x"])
+        self.assertEqual(model.output_tensor_names, ["relu"])
+
+        # the session is built lazily from the assigned graph_def
+        model.graph_def = graph_def
+        self.assertIsNone(model._sess)
+        self.assertEqual(model.graph_info["conv"], "Conv2D")
+        self.assertEqual(model.input_node_names, ["x"])
+        self.assertEqual(model.output_node_names, ["relu"])
+        # the default attrs are added as importing the graph_def does
+        conv_node = [node for node in model.graph_def.node if node.name == "conv"][0]
+        self.assertIn("data_format", conv_node.attr)
+        self.assertIsNone(model._sess)
+
+        # the returned graph_def is a copy
+        model.graph_def.node[0].name = "renamed"
+        self.assertNotIn("renamed", model.graph_info)
+
+        output = model.sess.run(model.output_tensor, {model.input_tensor[0]: np.ones([1, 32, 32, 3])})
+        self.assertEqual(output[0].shape, (1, 32, 32, 3))
+        sess = model.sess
+
+        new_graph_def = tf.compat.v1.GraphDef()
+        new_graph_def.CopyFrom(graph_def)
+        relu_node = [node for node in new_graph_def.node if node.name == "relu"][0]
+        relu_node.op = "Relu6"
+        model.graph_def = new_graph_def
+        self.assertIsNone(model._sess)
+        self.assertEqual(model.graph_info["relu"], "Relu6")
+        self.assertIsNot(model.sess, sess)
+        self.assertEqual(model.graph.get_operation_by_name("relu").type, "Relu6")
+
+    def test_ref_type_graph_def_setter(self):
+        graph_def = build_graph_def()
+        model = Model(graph_def)
+        self.assertEqual(model.output_tensor_names, ["relu"])
+
+        # the weight of conv is assigned by a ref type op, which is fixed without stripping any node
+        ref_graph_def = tf.compat.v1.GraphDef()
+        ref_graph_def.CopyFrom(graph_def)
+        value_node = ref_graph_def.node.add()
+        value_node.CopyFrom([node for node in graph_def.node if node.name == "weight"][0])
+        value_node.name = "value"
+        assign_node = ref_graph_def.node.add()
+        assign_node.name = "assign"
+        assign_node.op = "Assign"
+        assign_node.input.extend(["weight", "value"])
+        assign_node.attr["T"].CopyFrom(tf.compat.v1.AttrValue(type=tf.float32.as_datatype_enum))
+        conv_node = [node for node in ref_graph_def.node if node.name == "conv"][0]
+        conv_node.input[1] = "assign"
+
+        model.graph_def = ref_graph_def
+        self.assertIsNotNone(model._sess)
+        self.assertEqual(len(model.graph_def.node), len(ref_graph_def.node))
+        self.assertEqual(model.graph_info["assign"], "Identity")
+        assign_node = [node for node in model.graph_def.node if node.name == "assign"][0]
+        self.assertEqual(list(assign_node.input), ["value"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+import torch
+import transformers
+
+from neural_compressor.torch.algorithms.layer_wise import (
+    WeightPrefetcher,
+    get_named_children,
+    load_empty_model,
+    load_safetensors,
+    load_value,
+    register_weight_hooks,
+    save_safetensors,
+)
+
+
+@pytest.fixture(scope="module")
+def model_path():
+    path = tempfile.mkdtemp()
+    config = transformers.GPT2Config(n_embd=32, n_layer=2, n_head=2, vocab_size=100, n_positions=32)
+    torch.manual_seed(0)
+    model = transformers.GPT2LMHeadModel(config).eval()
+    model.save_pretrained(path, safe_serialization=False)
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def remove_hooks(handles):
+    for handle in handles.values():
+        for h in handle:
+            h.remove()
+
+
+class TestWeightPrefetcher:
+    example_inputs = torch.randint(0, 100, (1, 8))
+
+    @pytest.mark.parametrize("prefetch_num, max_prefetch_memory", [(0, None), (1, None), (3, None), (3, 8192)])
+    def test_register_weight_hooks(self, model_path, prefetch_num, max_prefetch_memory):
+        fp32_model = transformers.GPT2LMHeadModel.from_pretrained(model_path).eval()
+        model = load_empty_model(model_path, cls=transformers.GPT2LMHeadModel)
+        prefetcher = None
+        if prefetch_num > 0:
+            prefetcher = WeightPrefetcher(
+                model, model_path, get_named_children(model), prefetch_num, max_memory=max_prefetch_memory
+            )
+        handles = register_weight_hooks(model, model_path, prefetcher=prefetcher)
+        with torch.no_grad():
+            for _ in range(2):
+                out = model(self.example_inputs)[0]
+                assert torch.allclose(out, fp32_model(self.example_inputs)[0], atol=1e-5)
+        remove_hooks(handles)
+        if prefetcher is not None:
+            prefetcher.close()
+
+    def test_prefetch_order_and_budget(self, model_path):
+        model = load_empty_model(model_path, cls=transformers.GPT2LMHeadModel)
+        modules = [(name, model.get_submodule(name)) for name in ["transformer.h.0.ln_1", "transformer.h.1.ln_1"]]
+        modules.append(("transformer.h.0.mlp.c_fc", model.get_submodule("transformer.h.0.mlp.c_fc")))
+        prefetcher = WeightPrefetcher(model, model_path, modules, prefetch_num=2, max_memory=1024)
+        prefetcher.get("transformer.h.0.ln_1")
+        # the next LayerNorm takes 256 bytes, the linear layer exceeds the budget.
+        assert list(prefetcher.futures) == ["transformer.h.1.ln_1"]
+        # the weights are loaded in the recorded order in the next round.
+        prefetcher.max_memory = None
+        prefetcher.get("transformer.h.0.mlp.c_fc")
+        prefetcher.get("transformer.h.0.ln_1")
+        assert list(prefetcher.futures) == ["transformer.h.0.mlp.c_fc"]
+        values = prefetcher.get("transformer.h.0.mlp.c_fc")
+        assert values["weight"].shape == (32, 128)
+        prefetcher.close()
+        assert len(prefetcher.futures) == 0
+
+
+class TestCheckpointIndex:
+    @pytest.mark.parametrize("safe_serialization", [False, True])
+    def test_load_value(self, safe_serialization):
+        path = tempfile.mkdtemp()
+        config = transformers.GPT2Config(n_embd=32, n_layer=2, n_head=2, vocab_size=100, n_positions=32)
+        fp32_model = transformers.GPT2LMHeadModel(config).eval()
+        fp32_model.save_pretrained(path, safe_serialization=safe_serialization, max_shard_size="20KB")
+        model = load_empty_model(path, cls=transformers.GPT2LMHeadModel)
+        for name, param in fp32_model.named_parameters():
+            value = load_value(model, name, path)
+            assert torch.equal(value, param.data), name
+        # changing a loaded tensor in place doesn't affect the checkpoint.
+        value = load_value(model, "transformer.h.0.mlp.c_fc.weight", path)
+        value.zero_()
+        assert torch.equal(
+            load_value(model, "transformer.h.0.mlp.c_fc.weight", path), fp32_model.transformer.h[0].mlp.c_fc.weight
+        )
+        shutil.rmtree(path, ignore_errors=True)
+
+    def test_safetensors_round_trip(self):
+        path = tempfile.mkdtemp()
+        state_dict = {
+            "weight": torch.randn(3, 5).t(),
+            "bias": torch.randn(3, dtype=torch.bfloat16),
+            "scale": torch.tensor(0.5, dtype=torch.float16),
+            "zeros": torch.zeros(0, 4, dtype=torch.int32),
+        }
+        save_safetensors(state_dict, os.path.join(path, "module.safetensors"))
+        loaded = load_safetensors(os.path.join(path, "module.safetensors"))
+        assert list(loaded) == list(state_dict)
+        for name, value in state_dict.items():
+            assert loaded[name].dtype == value.dtype
+            assert torch.equal(loaded[name], value), name
+        shutil.rmtree(path, ignore_errors=True)
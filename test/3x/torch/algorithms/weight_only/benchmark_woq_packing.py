@@ -0,0 +1,89 @@
+"""Compare WeightOnlyLinear packing throughput with the former per-column loops.
+
+Usage:
+    python benchmark_woq_packing.py --in_features 4096 --out_features 4096 --bits 4
+"""
+
+import argparse
+import time
+
+import torch
+
+from neural_compressor.torch.algorithms.weight_only import WeightOnlyLinear
+
+
+def legacy_pack(module, int_weight):
+    """Pack the last dim of int_weight column by column, as WeightOnlyLinear.pack used to."""
+    packed = torch.zeros(
+        (int_weight.shape[0], (int_weight.shape[1] + module.n_pack - 1) // module.n_pack),
+        dtype=module.compression_dtype,
+    )
+    mask = torch.tensor(2**module.bits - 1, dtype=module.compression_dtype)
+    for j in range(packed.shape[1]):
+        tmp = int_weight[:, module.n_pack * j : module.n_pack * (j + 1)].type(module.compression_dtype)
+        for e in range(tmp.shape[1]):
+            tmp[:, e] &= mask
+            tmp[:, e] = tmp[:, e] << (module.bits * e)
+            packed[:, j] |= tmp[:, e]
+    return packed
+
+
+def legacy_recover(module, packed, scales, g_idx):
+    """Unpack and dequantize channel by channel, as WeightOnlyLinear.recover used to."""
+    weight = torch.zeros(module.out_features, module.in_features, dtype=torch.int8)
+    for j in range(packed.shape[1]):
+        for e in range(module.n_pack):
+            index = j * module.n_pack + e
+            if index >= weight.shape[1]:
+                continue
+            tmp = packed[:, j] << (module.compress_bits - module.bits * (e + 1))
+            weight[:, index] = (tmp >> module.compress_bits - module.bits).type(torch.int8)
+    fp32_weight = torch.zeros(module.out_features, module.in_features, dtype=module.float_type)
+    for idx in range(module.in_features):
+        fp32_weight[:, idx] = weight[:, idx] * scales[:, g_idx[idx]]
+    return fp32_weight
+
+
+def timeit(func, *args, repeat=3):
+    result, best = None, float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--in_features", type=int, default=4096)
+    parser.add_argument("--out_features", type=int, default=4096)
+    parser.add_argument("--bits", type=int, default=4)
+    parser.add_argument("--group_size", type=int, default=128)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    module = WeightOnlyLinear(
+        args.in_features, args.out_features, bits=args.bits, group_size=args.group_size, use_optimum_format=False
+    )
+    int_weight = torch.randint(-(2 ** (args.bits - 1)), 2 ** (args.bits - 1), (args.out_features, args.in_features))
+    scales = torch.rand(args.out_features, args.in_features // module.group_size)
+    g_idx = torch.arange(args.in_features) // module.group_size
+
+    legacy_packed, legacy_pack_time = timeit(legacy_pack, module, int_weight, repeat=args.repeat)
+    packed, pack_time = timeit(module.pack_tensor_with_torch, int_weight, repeat=args.repeat)
+    assert torch.equal(legacy_packed, packed), "Packed results are mismatched."
+
+    module.pack(int_weight, scales, None, None)
+    legacy_weight, legacy_recover_time = timeit(
+        legacy_recover, module, packed, module.scales, g_idx, repeat=args.repeat
+    )
+    weight, recover_time = timeit(module.recover, repeat=args.repeat)
+    assert torch.equal(legacy_weight, weight), "Recovered results are mismatched."
+
+    print(f"{'stage':<10}{'legacy(s)':>12}{'vectorized(s)':>16}{'speedup':>10}")
+    for stage, legacy, new in [("pack", legacy_pack_time, pack_time), ("recover", legacy_recover_time, recover_time)]:
+        print(f"{stage:<10}{legacy:>12.4f}{new:>16.4f}{legacy / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
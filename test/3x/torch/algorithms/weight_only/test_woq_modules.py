@@ -0,0 +1,117 @@
+import math
+
+import pytest
+import torch
+
+from neural_compressor.torch.algorithms.weight_only import FLOAT_MAPPING, INT_MAPPING, WeightOnlyLinear
+
+
+def get_int_weight(out_features, in_features, bits, group_size, zp):
+    n_groups = math.ceil(in_features / group_size)
+    if zp:
+        int_weight = torch.randint(0, 2**bits, (out_features, in_features))
+        zero_point = torch.randint(0, 2**bits, (out_features, n_groups))
+    else:
+        int_weight = torch.randint(-(2 ** (bits - 1)), 2 ** (bits - 1), (out_features, in_features))
+        zero_point = None
+    scale = torch.rand(out_features, n_groups)
+    return int_weight, scale, zero_point
+
+
+@pytest.mark.parametrize("bits", [2, 3, 4, 8])
+@pytest.mark.parametrize("compression_dtype", [torch.int16, torch.int32, torch.int64])
+@pytest.mark.parametrize("compression_dim", [0, 1])
+@pytest.mark.parametrize("zp", [True, False])
+@pytest.mark.parametrize("g_idx", [True, False])
+def test_pack_recover(bits, compression_dtype, compression_dim, zp, g_idx):
+    in_features, out_features, group_size = 70, 33, 32
+    int_weight, scale, zero_point = get_int_weight(out_features, in_features, bits, group_size, zp)
+    perm_g_idx = torch.randperm(in_features) // group_size if g_idx else None
+    module = WeightOnlyLinear(
+        in_features,
+        out_features,
+        bits=bits,
+        group_size=group_size,
+        zp=zp,
+        bias=True,
+        compression_dtype=compression_dtype,
+        compression_dim=compression_dim,
+        g_idx=g_idx,
+        use_optimum_format=False,
+    )
+    module.pack(
+        int_weight.clone(),
+        scale,
+        None if zero_point is None else zero_point.clone(),
+        torch.rand(out_features),
+        perm_g_idx,
+    )
+    group_index = perm_g_idx if g_idx else torch.arange(in_features) // group_size
+    expected = int_weight if zero_point is None else int_weight - zero_point[:, group_index]
+    expected = expected * scale[:, group_index]
+    assert torch.allclose(module.recover(), expected)
+
+
+@pytest.mark.parametrize("bits", [2, 4, 8])
+@pytest.mark.parametrize("zp", [True, False])
+def test_pack_recover_optimum_format(bits, zp):
+    in_features, out_features, group_size = 64, 40, 16
+    int_weight, scale, zero_point = get_int_weight(out_features, in_features, bits, group_size, zp)
+    module = WeightOnlyLinear(in_features, out_features, bits=bits, group_size=group_size, use_optimum_format=True)
+    module.pack(int_weight.clone(), scale, None if zero_point is None else zero_point.clone(), None)
+    assert module.qweight.shape == (in_features * bits // 32, out_features)
+    assert module.qzeros.shape == (in_features // group_size, math.ceil(out_features * bits / 32))
+    group_index = torch.arange(in_features) // group_size
+    expected = int_weight if zero_point is None else int_weight - zero_point[:, group_index]
+    expected = expected * scale.half()[:, group_index]
+    recovered = module.recover()
+    assert recovered.dtype == torch.float16
+    assert torch.allclose(recovered, expected.half())
+    # recover doesn't change the layout of packed buffers.
+    assert torch.equal(module.recover(), recovered)
+
+
+@pytest.mark.parametrize("dtype", ["nf4", "fp4", "fp4_e2m1"])
+def test_pack_recover_float_lookup(dtype):
+    in_features, out_features, group_size = 64, 16, 32
+    int_list = INT_MAPPING[dtype]
+    index = torch.randint(0, len(int_list), (out_features, in_features))
+    int_weight = torch.tensor(int_list)[index]
+    scale = torch.rand(out_features, in_features // group_size)
+    module = WeightOnlyLinear(
+        in_features, out_features, dtype=dtype, group_size=group_size, compression_dtype=torch.int8
+    )
+    module.pack(int_weight, scale, None, None)
+    expected = torch.tensor(FLOAT_MAPPING[dtype])[index] * scale.repeat_interleave(group_size, dim=1)
+    assert torch.allclose(module.recover(), expected)
+
+
+@pytest.mark.parametrize(
+    "compression_dim, use_optimum_format, zp",
+    [(1, False, True), (0, False, True), (0, False, False), (1, True, True), (1, True, False)],
+)
+@pytest.mark.parametrize("dequant_tile_size", [1, 8, 20, 128])
+def test_forward_on_the_fly(compression_dim, use_optimum_format, zp, dequant_tile_size):
+    in_features, out_features, group_size = 64, 44, 16
+    int_weight, scale, zero_point = get_int_weight(out_features, in_features, 4, group_size, zp)
+    kwargs = dict(
+        group_size=group_size,
+        zp=zp,
+        bias=True,
+        compression_dim=compression_dim,
+        use_optimum_format=use_optimum_format,
+    )
+    cached = WeightOnlyLinear(in_features, out_features, **kwargs)
+    on_the_fly = WeightOnlyLinear(
+        in_features, out_features, cache_weight=False, dequant_tile_size=dequant_tile_size, **kwargs
+    )
+    bias = torch.rand(out_features)
+    for module in [cached, on_the_fly]:
+        module.pack(int_weight.clone(), scale, None if zero_point is None else zero_point.clone(), bias)
+    input = torch.randn(2, 3, in_features)
+    assert torch.allclose(on_the_fly(input), cached(input), atol=1e-5)
+    assert hasattr(cached, "weight") and not hasattr(on_the_fly, "weight")
+    # switch a module to on-the-fly dequantization after its weight was cached.
+    cached.cache_weight = False
+    assert torch.allclose(cached(input), on_the_fly(input), atol=1e-5)
+    assert not hasattr(cached, "weight")
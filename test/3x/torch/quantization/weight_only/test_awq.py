@@ -57,6 +57,29 @@ class TestAWQ(unittest.TestCase):
         out2 = qdq_model(example_inputs)
         self.assertTrue(torch.allclose(out1[0], out2[0], atol=1e-1))
 
+    def test_batched_loss(self):
+        from neural_compressor.torch.algorithms.weight_only.awq import _get_batched_loss
+        from neural_compressor.torch.algorithms.weight_only.modules import MulLinear
+
+        linear = torch.nn.Linear(16, 8)
+        input_val = [torch.randn(1, 5, 16), torch.randn(1, 7, 16)]
+        weights = [linear.weight.data * (1 + 0.1 * i) for i in range(5)]
+        for module in [linear, MulLinear(copy.deepcopy(linear), torch.rand(16) + 0.5)]:
+            org_weight = module.weight.data.clone()
+            org_out = [module(inp) for inp in input_val]
+            expected = []
+            for weight in weights:
+                module.weight.data = weight
+                expected.append(
+                    sum((out - module(inp)).float().pow(2).mean().item() for inp, out in zip(input_val, org_out))
+                )
+            module.weight.data = org_weight
+            # a small bound evaluates the candidates in several batches.
+            for max_batch_numel in [2**27, 1]:
+                losses = _get_batched_loss(module, input_val, org_out, iter(weights), max_batch_numel=max_batch_numel)
+                self.assertTrue(torch.allclose(torch.tensor(losses), torch.tensor(expected), rtol=1e-4))
+            self.assertTrue(torch.equal(module.weight.data, org_weight))
+
 
 if __name__ == "__main__":
     unittest.main()
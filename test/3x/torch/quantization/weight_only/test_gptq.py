@@ -94,6 +94,64 @@ class TestGPTQQuant:
             atol_false > atol_true
         ), "use_mse_search=True doesn't help accuracy, maybe is reasonable, please double check."
 
+    @pytest.mark.parametrize("export_compressed_model", [False, True])
+    def test_num_workers(self, export_compressed_model):
+        model = copy.deepcopy(self.tiny_gptj)
+        quant_config = GPTQConfig(export_compressed_model=export_compressed_model)
+        model = quantize(model, quant_config, run_fn=run_fn)
+        out1 = model(self.example_inputs)[0]
+        # quantize layers concurrently and calibrate the next block while its inputs are produced.
+        model = copy.deepcopy(self.tiny_gptj)
+        quant_config = GPTQConfig(export_compressed_model=export_compressed_model, num_workers=4)
+        model = quantize(model, quant_config, run_fn=run_fn)
+        out2 = model(self.example_inputs)[0]
+        assert torch.allclose(out1, out2), "The pipelined GPTQ should have the same output as the sequential one."
+
+    def test_shared_hessian(self):
+        from neural_compressor.torch.algorithms.weight_only.gptq import (
+            GPTQ,
+            add_batch_to_layers,
+            group_records_by_input,
+        )
+
+        layers = [torch.nn.Linear(8, 4) for _ in range(3)]
+        gptq_objects = [GPTQ(layer, layer.weight.data.clone()) for layer in layers]
+        expected = [GPTQ(layer, layer.weight.data.clone()) for layer in layers]
+        for i in range(3):
+            inp = torch.randn(1, 5, 8)
+            # the third layer gets another input from the second batch on.
+            other = torch.randn(1, 5, 8) if i > 0 else inp
+            records = [(str(j), inp if j < 2 else other) for j in range(3)]
+            groups = group_records_by_input(records)
+            assert len(groups) == (1 if i == 0 else 2)
+            for inp_, names in groups:
+                add_batch_to_layers([gptq_objects[int(name)] for name in names], inp_)
+            for j, gptq in enumerate(expected):
+                gptq.add_batch(inp if j < 2 else other, None)
+        assert gptq_objects[0].H is gptq_objects[1].H
+        assert gptq_objects[2].H is not gptq_objects[0].H
+        for gptq, ref in zip(gptq_objects, expected):
+            assert torch.allclose(gptq.H, ref.H)
+        # the shared Hessian is not changed by quantization.
+        H = gptq_objects[1].H.clone()
+        gptq_objects[0].quantizer.configure(
+            {
+                "dtype": "int",
+                "bits": 4,
+                "sym": True,
+                "group_size": -1,
+                "mse": False,
+                "perchannel": True,
+                "use_double_quant": False,
+                "double_quant_dtype": "int",
+                "double_quant_bits": 4,
+                "double_quant_sym": False,
+                "double_quant_group_size": 128,
+            }
+        )
+        gptq_objects[0].fasterquant(layers[0].weight.data.clone(), act_order=True)
+        assert torch.equal(gptq_objects[1].H, H)
+
     # def test_layer_wise(self):
     #     model = copy.deepcopy(self.tiny_gptj)
     #     quant_config = GPTQConfig(
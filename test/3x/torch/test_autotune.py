@@ -1,3 +1,5 @@
+import shutil
+import tempfile
 import unittest
 from functools import wraps
 from typing import Any, Callable, Dict, List, Optional, Union
@@ -309,5 +311,115 @@ class TestAutoTune(unittest.TestCase):
         self.assertIsNone(best_model)
 
 
+class ErrorEvaluator:
+    """A picklable evaluation function for the trial workers, the accuracy is higher with less quantization error."""
+
+    def __init__(self, fp32_model, input):
+        self.input = input
+        with torch.no_grad():
+            self.fp32_output = fp32_model(input)
+
+    def __call__(self, model) -> float:
+        with torch.no_grad():
+            return 1.0 - float((model(self.input) - self.fp32_output).abs().mean())
+
+
+class TestParallelAutoTune(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.input = torch.randn(4, 30)
+
+    def test_parallel_autotune(self):
+        config_set = [RTNConfig(bits=[2, 3, 4, 8])]
+        # a local model class can't be sent to the workers, so the trials run one after another.
+        for fp32_model in [
+            torch.nn.Sequential(torch.nn.Linear(30, 50), torch.nn.Linear(50, 5)),
+            build_simple_torch_model(),
+        ]:
+            eval_fn = ErrorEvaluator(fp32_model, self.input)
+            for tolerable_loss, max_trials in [(0.01, 100), (-1, 3)]:
+                results = []
+                for num_workers in [1, 2]:
+                    custom_tune_config = TuningConfig(
+                        config_set=config_set,
+                        tolerable_loss=tolerable_loss,
+                        max_trials=max_trials,
+                        num_workers=num_workers,
+                    )
+                    best_model = autotune(model=fp32_model, tune_config=custom_tune_config, eval_fn=eval_fn)
+                    self.assertIsNotNone(best_model)
+                    results.append(eval_fn(best_model))
+                self.assertAlmostEqual(results[0], results[1])
+
+    def test_parallel_autotune_not_stopped(self):
+        fp32_model = torch.nn.Sequential(torch.nn.Linear(30, 50), torch.nn.Linear(50, 5))
+        eval_fn = ErrorEvaluator(fp32_model, self.input)
+        custom_tune_config = TuningConfig(config_set=[RTNConfig(bits=[2, 3])], tolerable_loss=-1, num_workers=2)
+        best_model = autotune(model=fp32_model, tune_config=custom_tune_config, eval_fn=eval_fn)
+        self.assertIsNone(best_model)
+
+
+class TestAutoTuneResultCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_autotune_result_cache(self):
+        fp32_model = build_simple_torch_model()
+
+        def eval_fn_by_config(model) -> float:
+            eval_calls.append(model)
+            return 1.0 if model is fp32_model else 0.9
+
+        custom_tune_config = TuningConfig(
+            config_set=[RTNConfig(bits=[4, 6, 8])], tolerable_loss=-1, max_trials=3, cache_dir=self.cache_dir
+        )
+        eval_calls = []
+        best_model = autotune(model=fp32_model, tune_config=custom_tune_config, eval_fn=eval_fn_by_config)
+        self.assertIsNotNone(best_model)
+        self.assertEqual(len(eval_calls), 4)
+        # the baseline and all trials are cached, the best model is quantized again.
+        eval_calls = []
+        best_model = autotune(model=fp32_model, tune_config=custom_tune_config, eval_fn=eval_fn_by_config)
+        self.assertIsNotNone(best_model)
+        self.assertEqual(len(eval_calls), 0)
+        # the cache is keyed by the model weights.
+        eval_calls = []
+        best_model = autotune(
+            model=build_simple_torch_model(), tune_config=custom_tune_config, eval_fn=eval_fn_by_config
+        )
+        self.assertEqual(len(eval_calls), 4)
+
+
+class TestAutoTuneTrialModel(unittest.TestCase):
+    def test_autotune_shares_unquantized_weights(self):
+        fp32_model = torch.nn.Sequential(torch.nn.Linear(30, 50), torch.nn.LayerNorm(50), torch.nn.Linear(50, 5))
+        fp32_state_dict = {k: v.clone() for k, v in fp32_model.state_dict().items()}
+
+        def eval_fn(model) -> float:
+            return 1.0 if model is fp32_model else 0.9
+
+        custom_tune_config = TuningConfig(config_set=[RTNConfig(bits=[4, 8])], tolerable_loss=-1, max_trials=2)
+        best_model = autotune(model=fp32_model, tune_config=custom_tune_config, eval_fn=eval_fn)
+        self.assertIsNotNone(best_model)
+        # only the quantized linear modules are copied.
+        self.assertEqual(best_model[1].weight.data_ptr(), fp32_model[1].weight.data_ptr())
+        self.assertNotEqual(best_model[0].weight.data_ptr(), fp32_model[0].weight.data_ptr())
+        for name, tensor in fp32_model.state_dict().items():
+            self.assertTrue(torch.equal(tensor, fp32_state_dict[name]))
+
+    def test_get_module_names_to_copy(self):
+        from neural_compressor.torch.quantization import GPTQConfig, StaticQuantConfig
+        from neural_compressor.torch.quantization.autotune import _get_module_names_to_copy
+
+        model = build_simple_torch_model()
+        self.assertEqual(_get_module_names_to_copy(model, RTNConfig()), ["fc1", "fc2", "fc3"])
+        quant_config = RTNConfig().set_local("fc2", RTNConfig()) + GPTQConfig().set_local("fc1", GPTQConfig())
+        self.assertEqual(sorted(_get_module_names_to_copy(model, quant_config)), ["fc1", "fc2"])
+        self.assertIsNone(_get_module_names_to_copy(model, StaticQuantConfig()))
+
+
 if __name__ == "__main__":
     unittest.main()
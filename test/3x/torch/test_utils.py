@@ -82,5 +82,43 @@ class TestTorchUtils(unittest.TestCase):
         self.assertEqual(len(model_info), 4)
 
 
+class TestShallowCopyModel(unittest.TestCase):
+    def test_shallow_copy_model(self):
+        from neural_compressor.torch.utils.utility import shallow_copy_model
+
+        model = build_simple_torch_model()
+        model.register_buffer("step", torch.tensor(1))
+        copied_model = shallow_copy_model(model, ["fc2"])
+        # fc2 is deep-copied and the other weights are shared.
+        self.assertIsNot(copied_model, model)
+        self.assertIsNot(copied_model.fc1, model.fc1)
+        self.assertEqual(copied_model.fc1.weight.data_ptr(), model.fc1.weight.data_ptr())
+        self.assertEqual(copied_model.step.data_ptr(), model.step.data_ptr())
+        self.assertNotEqual(copied_model.fc2.weight.data_ptr(), model.fc2.weight.data_ptr())
+        self.assertTrue(torch.equal(copied_model.fc2.weight, model.fc2.weight))
+        # changes of the copy don't affect the original model.
+        origin_fc1_weight, origin_fc3 = model.fc1.weight, model.fc3
+        copied_model.fc2.weight.data.zero_()
+        copied_model.fc1.weight.data = torch.zeros_like(origin_fc1_weight)
+        set_module(copied_model, "fc3", torch.nn.Linear(60, 30))
+        self.assertIs(model.fc1.weight, origin_fc1_weight)
+        self.assertTrue(torch.any(model.fc2.weight != 0))
+        self.assertIs(model.fc3, origin_fc3)
+        self.assertEqual(copied_model(torch.randn(2, 8)).shape, (2, 50))
+
+    def test_shallow_copy_model_shared_module(self):
+        from neural_compressor.torch.utils.utility import shallow_copy_model
+
+        linear = torch.nn.Linear(8, 8)
+        model = torch.nn.Sequential(linear, torch.nn.ReLU(), linear, torch.nn.Linear(8, 8))
+        model[3].weight = linear.weight
+        copied_model = shallow_copy_model(model, ["2"])
+        # the shared module and the tied weight are deep-copied once.
+        self.assertIs(copied_model[0], copied_model[2])
+        self.assertIs(copied_model[3].weight, copied_model[0].weight)
+        self.assertNotEqual(copied_model[0].weight.data_ptr(), linear.weight.data_ptr())
+        self.assertEqual(copied_model[3].bias.data_ptr(), model[3].bias.data_ptr())
+
+
 if __name__ == "__main__":
     unittest.main()
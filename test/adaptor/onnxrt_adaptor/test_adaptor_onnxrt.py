@@ -21,6 +21,7 @@ from neural_compressor.conf.config import conf
 from neural_compressor.data import DATALOADERS, DataLoader, Datasets
 from neural_compressor.experimental import Benchmark, Quantization, common
 from neural_compressor.model import Model
+from neural_compressor.utils.tensor_store import is_tensor_store
 
 
 def build_static_yaml():
@@ -965,7 +966,7 @@ class TestAdaptorONNXRT(unittest.TestCase):
         self.assertTrue("weight" not in data)
 
         adaptor.inspect_tensor(self.rn50_model, self.cv_dataloader, inspect_type="activation", save_to_disk=True)
-        self.assertTrue(os.path.isfile(framework_specific_info["workspace_path"] + "inspect_result.pkl"))
+        self.assertTrue(is_tensor_store(framework_specific_info["workspace_path"] + "inspect_result"))
 
         data = adaptor.inspect_tensor(self.rn50_model, self.cv_dataloader, inspect_type="weight", op_list=op_list)
         self.assertNotEqual(len(data["weight"]), 0)
@@ -1695,6 +1696,25 @@ class TestAdaptorONNXRT(unittest.TestCase):
         self.assertIsNone(res[1])
         del calibrator
 
+        from neural_compressor.adaptor.ox_utils.calibrator import KL_POOL_MIN_TENSORS, KLCalibrator
+
+        datas = [irregular_data, regular_data] + [
+            [np.random.randn(1000).astype("float32")] for _ in range(KL_POOL_MIN_TENSORS)
+        ]
+        # searched serially, then in a thread pool
+        for tensor_num, workers in [(3, 1), (len(datas), 2)]:
+            calibrators = []
+            for data in datas[:tensor_num]:
+                calibrator = KLCalibrator()
+                calibrator.collect_histogram(data)
+                calibrators.append(calibrator)
+            KLCalibrator.compute_kl_ranges(calibrators, workers=workers)
+            for data, calibrator in zip(datas, calibrators):
+                expected = CALIBRATOR["kl"]()
+                expected.collect(data)
+                self.assertEqual(calibrator.calib_range, expected.calib_range)
+            del calibrators
+
         calibrator = CALIBRATOR["percentile"]()
         calibrator.collect(irregular_data)
         res = calibrator.calib_range
@@ -1,6 +1,5 @@
 import copy
 import os
-import pickle
 import shutil
 import unittest
 
@@ -17,6 +16,7 @@ from neural_compressor.conf.config import QuantConf
 from neural_compressor.experimental import Quantization, common
 from neural_compressor.model import MODELS
 from neural_compressor.utils.pytorch import load
+from neural_compressor.utils.tensor_store import load_tensor_store
 from neural_compressor.utils.utility import LazyImport, recover
 
 try:
@@ -724,8 +724,7 @@ class TestPytorchAdaptor(unittest.TestCase):
             inspect_type="all",
             save_to_disk=True,
         )
-        with open("saved/inspect_result.pkl", "rb") as fp:
-            tensor_dict = pickle.load(fp)
+        tensor_dict = load_tensor_store("saved/inspect_result")
         a = tensor_dict["activation"][0]
         w = tensor_dict["weight"]
         if PT_VERSION >= Version("1.8.0").release:
@@ -1182,8 +1181,7 @@ class TestPytorchFXAdaptor(unittest.TestCase):
         quantizer.strategy.adaptor.inspect_tensor(
             model, dataloader, op_list=op_list, iteration_list=[1], inspect_type="all", save_to_disk=True
         )
-        with open("saved/inspect_result.pkl", "rb") as fp:
-            tensor_dict = pickle.load(fp)
+        tensor_dict = load_tensor_store("saved/inspect_result")
         a = tensor_dict["activation"][0]
         w = tensor_dict["weight"]
         self.assertTrue(w["conv1"]["conv1.weight"].shape[0] == a["conv1"]["conv1.output0"].shape[1])
@@ -1195,8 +1193,7 @@ class TestPytorchFXAdaptor(unittest.TestCase):
             inspect_type="all",
             save_to_disk=True,
         )
-        with open("saved/inspect_result.pkl", "rb") as fp:
-            tensor_dict = pickle.load(fp)
+        tensor_dict = load_tensor_store("saved/inspect_result")
         a = tensor_dict["activation"][0]
         w = tensor_dict["weight"]
         self.assertTrue(
@@ -163,17 +163,15 @@ class TestTensorflowInspectTensor(unittest.TestCase):
         self.model = build_fake_model()
         self.fp32_dumped_tensor_path = os.path.join(os.getcwd(), "./fake_graph_inspect_res_fp32/")
         self.quan_dumped_tensor_path = os.path.join(os.getcwd(), "./fake_graph_inspect_res_quan/")
-        self.fp32_dumped_tensor_file_path = os.path.join(self.fp32_dumped_tensor_path, "inspect_result.pkl")
-        self.quan_dumped_tensor_file_path = os.path.join(self.quan_dumped_tensor_path, "inspect_result.pkl")
+        self.fp32_dumped_tensor_file_path = os.path.join(self.fp32_dumped_tensor_path, "inspect_result")
+        self.quan_dumped_tensor_file_path = os.path.join(self.quan_dumped_tensor_path, "inspect_result")
         self.workspace = os.path.abspath(options.workspace)
 
     @classmethod
     def tearDownClass(self):
         os.remove("fake_yaml.yaml")
-        os.remove(self.fp32_dumped_tensor_file_path)
-        os.rmdir(self.fp32_dumped_tensor_path)
-        os.remove(self.quan_dumped_tensor_file_path)
-        os.rmdir(self.quan_dumped_tensor_path)
+        shutil.rmtree(self.fp32_dumped_tensor_path)
+        shutil.rmtree(self.quan_dumped_tensor_path)
         shutil.rmtree(self.workspace)
         # shutil.rmtree(os.path.join(os.getcwd(), 'save_path_test'))
 
@@ -181,7 +179,7 @@ class TestTensorflowInspectTensor(unittest.TestCase):
         import tensorflow.compat.v1 as tf
 
         from neural_compressor.experimental import Quantization, common
-        from neural_compressor.utils.utility import load_data_from_pkl
+        from neural_compressor.utils.tensor_store import load_tensor_store
 
         tf.disable_v2_behavior()
         quantizer = Quantization("fake_yaml.yaml")
@@ -229,8 +227,8 @@ class TestTensorflowInspectTensor(unittest.TestCase):
         )
         self.assertEqual(os.path.exists(self.quan_dumped_tensor_file_path), True)
 
-        fp32_data = load_data_from_pkl(self.fp32_dumped_tensor_path, "inspect_result.pkl")
-        quan_data = load_data_from_pkl(self.quan_dumped_tensor_path, "inspect_result.pkl")
+        fp32_data = load_tensor_store(self.fp32_dumped_tensor_file_path)
+        quan_data = load_tensor_store(self.quan_dumped_tensor_file_path)
         self.assertEqual(fp32_data.keys(), quan_data.keys())
         self.assertIn("activation", fp32_data)
         self.assertEqual(len(fp32_data["activation"]), len(quan_data["activation"]))  # have same itertaion index
@@ -254,8 +252,8 @@ class TestTensorflowInspectTensor(unittest.TestCase):
         quantizer.model = self.model
         quantizer.fit()
 
-        self.assertEqual(os.path.exists(os.path.join(self.workspace, "inspect_saved/fp32/inspect_result.pkl")), True)
-        self.assertEqual(os.path.exists(os.path.join(self.workspace, "inspect_saved/quan/inspect_result.pkl")), True)
+        self.assertEqual(os.path.exists(os.path.join(self.workspace, "inspect_saved/fp32/inspect_result")), True)
+        self.assertEqual(os.path.exists(os.path.join(self.workspace, "inspect_saved/quan/inspect_result")), True)
 
     def test_tensorflow_diagnosis2(self):
         import tensorflow.compat.v1 as tf
@@ -269,8 +267,8 @@ class TestTensorflowInspectTensor(unittest.TestCase):
         quantizer.eval_dataloader = common.DataLoader(dataset)
         quantizer.model = self.model
         quantizer.fit()
-        self.assertEqual(os.path.exists(os.path.join(self.workspace, "inspect_saved/fp32/inspect_result.pkl")), True)
-        self.assertEqual(os.path.exists(os.path.join(self.workspace, "inspect_saved/quan/inspect_result.pkl")), True)
+        self.assertEqual(os.path.exists(os.path.join(self.workspace, "inspect_saved/fp32/inspect_result")), True)
+        self.assertEqual(os.path.exists(os.path.join(self.workspace, "inspect_saved/quan/inspect_result")), True)
 
 
 if __name__ == "__main__":
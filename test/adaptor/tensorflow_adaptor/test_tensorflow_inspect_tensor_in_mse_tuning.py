@@ -9,9 +9,7 @@ Note:
     use '-s' to disable pytest capturing the sys.stderr which will be used in quantization process
 """
 
-import logging
 import os
-import pickle
 import platform
 import shutil
 import unittest
@@ -90,16 +88,6 @@ def build_fake_model():
     return graph
 
 
-def load_data_from_pkl(path, filename):
-    try:
-        file_path = os.path.join(path, filename)
-        with open(file_path, "rb") as fp:
-            data = pickle.load(fp)
-            return data
-    except FileExistsError:
-        logging.getLogger().info("Can not open %s." % path)
-
-
 class TestTensorflowInspectTensortinMSETuning(unittest.TestCase):
     @classmethod
     def setUpClass(self):
@@ -111,18 +99,18 @@ class TestTensorflowInspectTensortinMSETuning(unittest.TestCase):
             self.cfg_path = os.path.join(os.getcwd(), "nc_workspace\\")
             self.dumped_tensor_path = os.path.join(os.getcwd(), "nc_workspace\\")
         self.cfg_file_path = os.path.join(self.cfg_path, "cfg.pkl")
-        self.dumped_tensor_file_path = os.path.join(self.dumped_tensor_path, "inspect_result.pkl")
+        self.dumped_tensor_file_path = os.path.join(self.dumped_tensor_path, "inspect_result")
 
     @classmethod
     def tearDownClass(self):
         os.remove("fake_yaml.yaml")
-        os.remove(self.dumped_tensor_file_path)
         shutil.rmtree(self.dumped_tensor_path)
 
     def test_tensorflow_inspect_tensort_in_mse_tuning(self):
         import tensorflow.compat.v1 as tf
 
         from neural_compressor.experimental import Quantization, common
+        from neural_compressor.utils.tensor_store import load_tensor_store
 
         tf.disable_v2_behavior()
         model = build_fake_model()
@@ -133,7 +121,7 @@ class TestTensorflowInspectTensortinMSETuning(unittest.TestCase):
         quantizer.model = model
         quantizer.fit()
         self.assertEqual(os.path.exists(self.dumped_tensor_path), True)
-        data = load_data_from_pkl(self.dumped_tensor_path, "inspect_result.pkl")
+        data = load_tensor_store(self.dumped_tensor_file_path)
         self.assertEqual("activation" in data, True)
         self.assertEqual(set(data["activation"][0].keys()), set(["pool_1", "conv2d_2", "conv2d_1"]))
         self.assertEqual(len(data["activation"][0].keys()), 3)
@@ -137,7 +137,7 @@ class TestORTSq(unittest.TestCase):
     def test_sq(self):
         sq = ORTSmoothQuant(copy.deepcopy(self.zero_model), self.dataloader)
         model = sq.transform(calib_iter=5, scales_per_op=False)
-        self.assertFalse(np.isnan(numpy_helper.to_array(model.model.graph.initializer[5])[0][0]))
+        self.assertFalse(np.isnan(numpy_helper.to_array(model.get_initializer("G"))[0][0]))
 
         sq = ORTSmoothQuant(copy.deepcopy(self.model), self.dataloader)
         model = sq.transform(calib_iter=5, scales_per_op=False)
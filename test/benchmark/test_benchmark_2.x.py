@@ -11,8 +11,10 @@ import psutil
 import tensorflow as tf
 
 from neural_compressor.adaptor.tf_utils.util import write_graph
-from neural_compressor.benchmark import benchmark_with_raw_cmd
+from neural_compressor.benchmark import benchmark_in_process, benchmark_with_raw_cmd
 from neural_compressor.config import BenchmarkConfig
+from neural_compressor.data import Datasets
+from neural_compressor.data.dataloaders.dataloader import DataLoader
 
 
 def build_benchmark():
@@ -205,6 +207,25 @@ class TestObjective(unittest.TestCase):
                     throughput = re.search(r"Throughput:\s+(\d+(\.\d+)?) images/sec", line)
                 self.assertIsNotNone(throughput)
 
+    def test_benchmark_in_process(self):
+        dataset = Datasets("tensorflow")["dummy"]((100, 32, 32, 1), label=True)
+        b_dataloader = DataLoader(framework="tensorflow", dataset=dataset, batch_size=10)
+        conf = BenchmarkConfig(warmup=5, iteration=10, cores_per_instance=4, num_of_instance=2)
+        result = benchmark_in_process(self.graph_path, conf, b_dataloader)
+        self.assertEqual(result.num_of_instance, 2)
+        self.assertEqual([len(latency) for latency in result.latencies], [5, 5])
+        self.assertGreater(result.throughput, 0)
+        self.assertLessEqual(result.latency_p50, result.latency_p90)
+        self.assertLessEqual(result.latency_p90, result.latency_p99)
+
+    def test_benchmark_in_process_failed_instance(self):
+        dataset = Datasets("tensorflow")["dummy"]((100, 32, 32, 1), label=True)
+        b_dataloader = DataLoader(framework="tensorflow", dataset=dataset, batch_size=10)
+        conf = BenchmarkConfig(warmup=5, iteration=10, cores_per_instance=4, num_of_instance=2)
+        # the instances fail to load the model, the benchmark stops instead of waiting for them
+        with self.assertRaises(RuntimeError):
+            benchmark_in_process("./not_exist_model.pb", conf, b_dataloader, start_timeout=60)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1371,6 +1371,32 @@ class TestDataloader(unittest.TestCase):
         with self.assertRaises(AssertionError):
             dataset = datasets["dummy"](shape=[(4, 256, 256, 3), (4, 256, 256, 3)], dtype=["float32", "int8", "int8"])
 
+    def test_onnxrt_multi_worker_dataloader(self):
+        datasets = Datasets("onnxrt_qlinearops")
+        dataset = datasets["dummy"](shape=(11, 16, 16, 3))
+        for last_batch in ["rollover", "discard"]:
+            data_loader = DATALOADERS["onnxrt_qlinearops"](dataset, batch_size=2, last_batch=last_batch)
+            expected = list(data_loader)
+            data_loader = DATALOADERS["onnxrt_qlinearops"](dataset, batch_size=2, last_batch=last_batch, num_workers=4)
+            data = list(data_loader)
+            self.assertEqual(len(data), len(expected))
+            for (x1, y1), (x2, y2) in zip(data, expected):
+                np.testing.assert_array_equal(x1, x2)
+            # stop in the middle of an epoch.
+            for idx, _ in enumerate(data_loader):
+                if idx == 1:
+                    break
+
+        class iter_dataset(object):
+            def __iter__(self):
+                for i in range(7):
+                    yield np.full([2, 2], i)
+
+        data_loader = DATALOADERS["onnxrt_qlinearops"](iter_dataset(), batch_size=2, num_workers=2)
+        data = list(data_loader)
+        self.assertEqual([x.shape[0] for x in data], [2, 2, 2, 1])
+        np.testing.assert_array_equal(np.concatenate(data)[:, 0, 0], np.arange(7))
+
     def test_onnx_integer_dummy(self):
         datasets = Datasets("onnxrt_integerops")
         dataset = datasets["dummy"](shape=(4, 256, 256, 3))
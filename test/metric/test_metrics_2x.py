@@ -959,6 +959,67 @@ class TestMetrics(unittest.TestCase):
         acc_result = acc.result()
         self.assertEqual(acc_result, 0.5)
 
+    def test_streaming_accumulators(self):
+        metrics = METRICS("onnxrt_qlinearops")
+        rng = np.random.default_rng(0)
+        preds = [rng.random((8, 5)) for _ in range(10)]
+        labels = [rng.integers(0, 5, 8) for _ in range(10)]
+        acc = metrics["Accuracy"]()
+        top3 = metrics["topk"](k=3)
+        for pred, label in zip(preds, labels):
+            acc.update(pred, label)
+            top3.update(pred, label.tolist())
+        preds, labels = np.concatenate(preds), np.concatenate(labels)
+        self.assertEqual(acc.result(), np.mean(np.argmax(preds, axis=1) == labels))
+        self.assertEqual(top3.result(), np.mean(np.any(preds.argsort()[:, -3:] == labels[:, None], axis=1)))
+        # only the counts are kept
+        self.assertFalse(hasattr(acc, "pred_list"))
+
+        # binary predictions of shape (N, 1) are compared with labels of shape (N,) per sample
+        acc = metrics["Accuracy"]()
+        acc.update(np.array([[1], [0], [1]]), np.array([1, 1, 1]))
+        self.assertAlmostEqual(acc.result(), 2 / 3)
+
+        mse = metrics["MSE"]()
+        mae = metrics["MAE"]()
+        errors = []
+        for _ in range(10):
+            pred, label = list(rng.random((2, 3))), list(rng.random((2, 3)))
+            mse.update(pred, label)
+            mae.update(pred, label)
+            errors.append(np.array(label) - np.array(pred))
+        errors = np.concatenate(errors)
+        self.assertAlmostEqual(mse.result(), np.mean(errors**2))
+        self.assertAlmostEqual(mae.result(), np.mean(np.abs(errors)))
+
+    def test_metric_updater(self):
+        from neural_compressor.utils.utility import MetricUpdater
+
+        metrics = METRICS("onnxrt_qlinearops")
+        rng = np.random.default_rng(0)
+        preds = [rng.random((8, 5)) for _ in range(20)]
+        labels = [rng.integers(0, 5, 8) for _ in range(20)]
+        expected = metrics["Accuracy"]()
+        for pred, label in zip(preds, labels):
+            expected.update(pred, label)
+
+        acc = metrics["Accuracy"]()
+        mse = metrics["MSE"](compare_label=False)
+        calls = []
+        with MetricUpdater([acc, mse], lambda sample: (calls.append(1) or sample), max_pending=2) as updater:
+            for pred, label in zip(preds, labels):
+                updater.put(pred, label)
+        self.assertEqual(acc.result(), expected.result())
+        self.assertEqual(len(calls), 20)
+        # the metrics with compare_label=False are updated with the fp32 predictions later
+        self.assertEqual(mse.squares_size, 0)
+
+        # the error of the worker is raised in the evaluation loop
+        with self.assertRaises(ValueError):
+            with MetricUpdater([metrics["Accuracy"]()], max_pending=1) as updater:
+                for _ in range(10):
+                    updater.put(np.zeros((2, 5)), np.zeros(3))
+
     @unittest.skipIf(platform.system().lower() == "windows", "not support mxnet on windows now")
     def test_mse(self):
         predicts1 = [1, 0, 0, 1]
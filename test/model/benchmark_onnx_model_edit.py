@@ -0,0 +1,120 @@
+"""Compare the ONNXModel graph lookups and edits with the former linear searches.
+
+Usage:
+    python benchmark_onnx_model_edit.py --num_nodes 100000 --num_queries 1000
+"""
+
+import argparse
+import time
+
+import numpy as np
+from onnx import TensorProto, helper, numpy_helper
+
+from neural_compressor.model.onnx_model import ONNXModel
+
+
+def legacy_get_node(model, name):
+    """Find a node by a linear search, as ONNXModel.get_node used to."""
+    for node in model.nodes():
+        if node.name == name:
+            return node
+    return None
+
+
+def legacy_get_initializer(model, name):
+    """Find an initializer by a linear search, as ONNXModel.get_initializer used to."""
+    for tensor in model.initializer():
+        if tensor.name == name:
+            return tensor
+    return None
+
+
+def legacy_get_initializer_share_num(model, name):
+    """Count the consumers of an initializer by scanning all nodes."""
+    if legacy_get_initializer(model, name) is None:
+        return 0
+    return sum(1 for node in model.nodes() if name in node.input)
+
+
+def legacy_replace_input_of_all_nodes(model, old_input_name, new_input_name):
+    """Visit all nodes and rebuild the IO maps, as ONNXModel.replace_input_of_all_nodes used to."""
+    for node in model.nodes():
+        ONNXModel.replace_node_input(node, old_input_name, new_input_name)
+    model.update()
+
+
+def build_model(num_nodes, num_weights):
+    nodes = [
+        helper.make_node(
+            "Add",
+            ["tensor{}".format(i), "weight{}".format(i % num_weights)],
+            ["tensor{}".format(i + 1)],
+            "add{}".format(i),
+        )
+        for i in range(num_nodes)
+    ]
+    weights = [numpy_helper.from_array(np.ones([1], np.float32), "weight{}".format(i)) for i in range(num_weights)]
+    graph = helper.make_graph(
+        nodes,
+        "large_graph",
+        [helper.make_tensor_value_info("tensor0", TensorProto.FLOAT, [1])],
+        [helper.make_tensor_value_info("tensor{}".format(num_nodes), TensorProto.FLOAT, [1])],
+        weights,
+    )
+    return ONNXModel(helper.make_model(graph))
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_nodes", type=int, default=100000)
+    parser.add_argument("--num_weights", type=int, default=100)
+    parser.add_argument("--num_queries", type=int, default=1000)
+    parser.add_argument("--num_replaces", type=int, default=100)
+    args = parser.parse_args()
+
+    names = ["add{}".format(i) for i in range(0, args.num_nodes, max(args.num_nodes // args.num_queries, 1))]
+    weight_names = ["weight{}".format(int(name[3:]) % args.num_weights) for name in names]
+    replaced_nodes = ["add{}".format(i) for i in range(1, args.num_nodes, max(args.num_nodes // args.num_replaces, 1))]
+
+    def run_lookups(model, get_node, get_initializer, get_initializer_share_num):
+        return (
+            [get_node(model, name).name for name in names],
+            [get_initializer(model, name).name for name in weight_names],
+            [get_initializer_share_num(model, name) for name in weight_names],
+        )
+
+    def run_replace(model, replace_input_of_all_nodes):
+        for name in replaced_nodes:
+            tensor_name = model.get_node(name).input[0]
+            replace_input_of_all_nodes(model, tensor_name, tensor_name + "_renamed")
+        return [model.get_node(name).input[0] for name in replaced_nodes]
+
+    legacy_model, model = build_model(args.num_nodes, args.num_weights), build_model(args.num_nodes, args.num_weights)
+    legacy_lookups, legacy_lookup_time = timeit(
+        run_lookups, legacy_model, legacy_get_node, legacy_get_initializer, legacy_get_initializer_share_num
+    )
+    lookups, lookup_time = timeit(
+        run_lookups, model, ONNXModel.get_node, ONNXModel.get_initializer, ONNXModel.get_initializer_share_num
+    )
+    assert legacy_lookups == lookups, "Lookup results are mismatched."
+
+    legacy_inputs, legacy_replace_time = timeit(run_replace, legacy_model, legacy_replace_input_of_all_nodes)
+    inputs, replace_time = timeit(run_replace, model, ONNXModel.replace_input_of_all_nodes)
+    assert legacy_inputs == inputs, "Replaced inputs are mismatched."
+
+    print(f"{'stage':<10}{'legacy(s)':>12}{'indexed(s)':>14}{'speedup':>10}")
+    for stage, legacy, new in [
+        ("lookup", legacy_lookup_time, lookup_time),
+        ("replace", legacy_replace_time, replace_time),
+    ]:
+        print(f"{stage:<10}{legacy:>12.4f}{new:>14.4f}{legacy / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
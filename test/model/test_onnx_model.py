@@ -1,3 +1,4 @@
+import copy
 import os
 import shutil
 import subprocess
@@ -410,6 +411,179 @@ class TestOnnxModel(unittest.TestCase):
         self.model.remove_unused_nodes()
         self.assertEqual(len(self.model.nodes()), 6)
 
+    def test_name_index(self):
+        def check_index(model):
+            model._check_index()
+            fresh_model = ONNXModel(model.model)
+            self.assertEqual(model._name_to_node.keys(), fresh_model._name_to_node.keys())
+            self.assertEqual(model._name_to_initializer.keys(), fresh_model._name_to_initializer.keys())
+            self.assertEqual(
+                {name: sorted(id(node) for node in nodes) for name, nodes in model.input_name_to_nodes.items()},
+                {name: sorted(id(node) for node in nodes) for name, nodes in fresh_model.input_name_to_nodes.items()},
+            )
+            self.assertEqual(
+                {name: id(node) for name, node in model.output_name_to_node.items()},
+                {name: id(node) for name, node in fresh_model.output_name_to_node.items()},
+            )
+
+        self.model.add_node(onnx.helper.make_node("Relu", ["output"], ["output1"], name="added_relu"))
+        self.assertEqual(self.model.get_node("added_relu").op_type, "Relu")
+        self.assertEqual(self.model.get_children(self.model.get_node("Add"))[0].name, "added_relu")
+        check_index(self.model)
+
+        self.model.replace_input_of_all_nodes("X2", "X6", black_optype=["Relu"])
+        self.assertEqual(self.model.get_node("Relu2").input, ["X2"])
+        self.model.replace_input_of_all_nodes("X1", "X6", white_optype=["Conv"])
+        self.assertEqual(self.model.get_node("Conv1").input[0], "X6")
+        self.assertEqual(self.model.get_node("Conv3").input[0], "X6")
+        check_index(self.model)
+
+        self.model.replace_output_of_all_nodes("X1", "X6")
+        self.assertEqual(self.model.get_node("Relu1").output, ["X6"])
+        self.assertEqual(self.model.get_parent(self.model.get_node("Conv1"), 0).name, "Relu1")
+        check_index(self.model)
+
+        self.model.remove_nodes([self.model.get_node("added_relu"), self.model.get_node("Conv3")])
+        self.assertIsNone(self.model.get_node("added_relu"))
+        self.assertNotIn("output1", self.model.output_name_to_node)
+        check_index(self.model)
+
+        self.assertEqual(self.model.get_initializer_share_num("X5_weight"), 0)
+        self.model.remove_initializers([self.model.get_initializer("X5_weight"), self.model.get_initializer("X5_bias")])
+        self.assertIsNone(self.model.get_initializer("X5_weight"))
+        self.model.add_initializer(generate_input_initializer([2, 2], np.float32, "X5_weight"))
+        self.assertEqual(self.model.get_initializer("X5_weight").dims, [2, 2])
+        check_index(self.model)
+
+        # the indexes are updated by the setters, the nodes not in the model are only edited
+        self.model.set_node_input(self.model.get_node("Relu2"), 0, "X6")
+        self.assertIn(self.model.get_node("Relu2"), self.model.input_name_to_nodes["X6"])
+        self.assertNotIn("X2", self.model.input_name_to_nodes)
+        self.model.set_node_output(self.model.get_node("Relu2"), 0, "X8")
+        self.assertEqual(self.model.output_name_to_node["X8"].name, "Relu2")
+        new_node = onnx.helper.make_node("Relu", ["X8"], ["X9"], name="new_relu")
+        self.model.set_node_input(new_node, 0, "X6")
+        self.model.set_node_output(new_node, 0, "X10")
+        self.assertEqual(new_node.input, ["X6"])
+        self.assertNotIn(new_node, self.model.input_name_to_nodes["X6"])
+        self.assertNotIn("X10", self.model.output_name_to_node)
+        check_index(self.model)
+
+        # the indexes are rebuilt after the graph is edited directly
+        self.model.graph().node.extend([onnx.helper.make_node("Relu", ["X6"], ["X7"], name="direct_relu")])
+        self.assertEqual(self.model.get_node("direct_relu").op_type, "Relu")
+        self.model.graph().ClearField("initializer")
+        self.assertIsNone(self.model.get_initializer("X1_weight"))
+        check_index(self.model)
+
+    def test_set_initializers(self):
+        from neural_compressor.adaptor.ox_utils.util import find_by_name
+
+        weight = np.random.ranf([3, 3, 1, 1])
+        self.model.set_initializers({"X1_weight": weight, "X1_bias": np.arange(3)})
+        self.assertEqual(self.model.initializer()[0].name, "X1_weight")
+        self.assertEqual(len(self.model.get_initializer("X1_weight").float_data), 0)
+        self.assertTrue(
+            np.array_equal(numpy_helper.to_array(self.model.get_initializer("X1_weight")), weight.astype(np.float32))
+        )
+        self.assertTrue(np.array_equal(numpy_helper.to_array(self.model.get_initializer("X1_bias")), [0, 1, 2]))
+        with self.assertRaises(ValueError):
+            self.model.set_initializer("X1_bias", np.arange(4))
+
+        # the external initializers are kept in memory until the model is saved
+        os.makedirs("./external_model", exist_ok=True)
+        onnx.save_model(
+            self.model.model,
+            "./external_model/model.onnx",
+            save_as_external_data=True,
+            location="weights.pb",
+            size_threshold=0,
+        )
+        origin_size = os.path.getsize("./external_model/weights.pb")
+        model = ONNXModel("./external_model/model.onnx", load_external_data=False)
+        for i in range(3):
+            model.set_initializers({"X3_weight": np.full([3, 3, 1, 1], i), "X3_bias": np.full([3], i)})
+            self.assertEqual(model.get_initializer("X3_weight").data_location, onnx.TensorProto.DEFAULT)
+            self.assertTrue(np.all(numpy_helper.to_array(model.get_initializer("X3_bias")) == i))
+        self.assertEqual(model.get_initializer("X1_weight").data_location, onnx.TensorProto.EXTERNAL)
+        self.assertEqual(os.path.getsize("./external_model/weights.pb"), origin_size)
+        self.assertEqual(sorted(os.listdir("./external_model")), ["model.onnx", "weights.pb"])
+        # the copy doesn't change the original model
+        copied_model = copy.deepcopy(model)
+        copied_model.set_initializers({"X3_weight": np.full([3, 3, 1, 1], 3)})
+        self.assertTrue(np.all(numpy_helper.to_array(model.get_initializer("X3_weight")) == 2))
+        self.assertTrue(np.all(numpy_helper.to_array(copied_model.get_initializer("X3_weight")) == 3))
+        model.save("./external_model/updated_model.onnx")
+        updated_model = onnx.load("./external_model/updated_model.onnx")
+        self.assertTrue(np.all(numpy_helper.to_array(find_by_name("X3_weight", updated_model.graph.initializer)) == 2))
+        shutil.rmtree("./external_model", ignore_errors=True)
+
+    def test_large_graph_edit(self):
+        num_nodes = 1000
+        nodes = [
+            helper.make_node("Add", ["tensor{}".format(i), "weight{}".format(i % 100)], ["tensor{}".format(i + 1)])
+            for i in range(num_nodes)
+        ]
+        for i, node in enumerate(nodes):
+            node.name = "add{}".format(i)
+        weights = [generate_input_initializer([1], np.float32, "weight{}".format(i)) for i in range(100)]
+        graph = helper.make_graph(
+            nodes,
+            "large_graph",
+            [helper.make_tensor_value_info("tensor0", TensorProto.FLOAT, [1])],
+            [helper.make_tensor_value_info("tensor{}".format(num_nodes), TensorProto.FLOAT, [1])],
+            weights,
+        )
+        model = ONNXModel(helper.make_model(graph))
+
+        for i in range(0, num_nodes, 100):
+            self.assertEqual(model.get_node("add{}".format(i)).op_type, "Add")
+            self.assertEqual(model.get_initializer("weight{}".format(i % 100)).name, "weight{}".format(i % 100))
+        for i in range(0, num_nodes, 100):
+            node = model.get_node("add{}".format(i))
+            model.remove_node(node)
+            model.add_node(node)
+        self.assertEqual(len(model.nodes()), num_nodes)
+        self.assertEqual(model.get_children(model.get_node("add100"))[0].name, "add101")
+        model.remove_initializers(model.initializer()[:50])
+        self.assertEqual(len(model.initializer()), 50)
+
+        self.assertEqual(model.get_initializer_share_num("weight50"), num_nodes // 100)
+        model.replace_input_of_all_nodes("tensor100", "renamed_tensor100")
+        self.assertEqual(len(model.input_name_to_nodes["renamed_tensor100"]), 1)
+        self.assertEqual(model.get_node("add100").input[0], "renamed_tensor100")
+
+    def test_shared_weight(self):
+        from neural_compressor.adaptor.ox_utils.weight_only import rtn_quantize
+
+        nodes = [
+            helper.make_node("MatMul", ["input", "W"], ["output0"], name="matmul0"),
+            helper.make_node("MatMul", ["input", "W"], ["output1"], name="matmul1"),
+        ]
+        graph = helper.make_graph(
+            nodes,
+            "shared_weight_graph",
+            [helper.make_tensor_value_info("input", TensorProto.FLOAT, [1, 32])],
+            [
+                helper.make_tensor_value_info("output0", TensorProto.FLOAT, [1, 32]),
+                helper.make_tensor_value_info("output1", TensorProto.FLOAT, [1, 32]),
+            ],
+            [generate_input_initializer([32, 32], np.float32, "W")],
+        )
+        model = ONNXModel(helper.make_model(graph))
+        self.assertEqual(model.get_initializer_share_num("W"), 2)
+
+        # the inputs set by set_node_input are counted
+        model.set_node_input(model.get_node("matmul0"), 1, "W_copy")
+        self.assertEqual(model.get_initializer_share_num("W"), 1)
+        model.replace_input_of_all_nodes("W_copy", "W")
+        self.assertEqual(model.get_initializer_share_num("W"), 2)
+
+        # the shared weight is removed after all its consumers are quantized
+        q_model = rtn_quantize(model, num_bits=8)
+        self.assertEqual([tensor.name for tensor in q_model.initializer()], ["W_Q8G32"])
+        self.assertEqual([node.input[1] for node in q_model.nodes()], ["W_Q8G32", "W_Q8G32"])
+
     def test_check_large_model(self):
         import onnx
         import torch
@@ -97,8 +97,8 @@ class TestBasicTuningStrategy(unittest.TestCase):
         # tuning and accuracy criterion
         conf = PostTrainingQuantConfig(diagnosis=True)
         q_model = fit(model=self.constant_graph, conf=conf, calib_dataloader=dataloader, eval_func=lambda model: 1)
-        self.assertEqual(os.path.exists(os.path.join(self.workspace, "inspect_saved/fp32/inspect_result.pkl")), True)
-        self.assertEqual(os.path.exists(os.path.join(self.workspace, "inspect_saved/quan/inspect_result.pkl")), True)
+        self.assertEqual(os.path.exists(os.path.join(self.workspace, "inspect_saved/fp32/inspect_result")), True)
+        self.assertEqual(os.path.exists(os.path.join(self.workspace, "inspect_saved/quan/inspect_result")), True)
 
     def test_run_create_eval_from_metric_and_dataloader(self):
         from neural_compressor.config import PostTrainingQuantConfig
@@ -0,0 +1,95 @@
+"""Tests for tensor store."""
+
+import os
+import shutil
+import unittest
+
+import numpy as np
+
+from neural_compressor.utils.tensor_store import (
+    LazyTensorDict,
+    LazyTensorList,
+    dump_tensor_store,
+    is_tensor_store,
+    load_tensor_store,
+)
+
+
+class TestTensorStore(unittest.TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree("./saved_tensor_store", ignore_errors=True)
+
+    def test_tensor_store(self):
+        conv_weight = np.random.randn(4, 3, 3, 3).astype(np.float32)
+        data = {
+            "activation": [
+                {
+                    "conv": {"conv_out": np.random.randn(1, 4, 8, 8)},
+                    "gather": {"ids": np.arange(6).reshape(2, 3)[:, 1:]},
+                },
+                {
+                    "conv": {"conv_out": np.random.randn(1, 4, 8, 8)},
+                    "gather": {"ids": np.zeros((0, 2), dtype=np.int64)},
+                },
+            ],
+            "weight": {"conv": {"conv_weight": conv_weight, "scale": np.float32(0.5), "zero_point": None}},
+        }
+        store_path = dump_tensor_store(data, "./saved_tensor_store")
+        self.assertEqual(store_path, os.path.join("./saved_tensor_store", "inspect_result"))
+        self.assertTrue(is_tensor_store(store_path))
+        self.assertFalse(is_tensor_store("./saved_tensor_store"))
+
+        store = load_tensor_store(store_path)
+        self.assertIsInstance(store, LazyTensorDict)
+        self.assertIsInstance(store["activation"], LazyTensorList)
+        self.assertEqual(set(store.keys()), {"activation", "weight"})
+        self.assertEqual(len(store["activation"]), 2)
+        for iteration, expected in zip(store["activation"], data["activation"]):
+            for op_name, tensors in expected.items():
+                for tensor_name, tensor in tensors.items():
+                    np.testing.assert_array_equal(iteration[op_name][tensor_name], tensor)
+                    self.assertEqual(iteration[op_name][tensor_name].dtype, tensor.dtype)
+        # the tensors are read-only views of the store
+        weight = store["weight"]["conv"]["conv_weight"]
+        np.testing.assert_array_equal(weight, conv_weight)
+        self.assertFalse(weight.flags.writeable)
+        self.assertEqual(store["weight"]["conv"]["scale"], np.float32(0.5))
+        self.assertIsNone(store["weight"]["conv"]["zero_point"])
+
+        # dumping again replaces the store
+        dump_tensor_store({"weight": None}, "./saved_tensor_store")
+        self.assertEqual(dict(load_tensor_store(store_path)), {"weight": None})
+        # the store loaded before keeps reading the old tensors
+        np.testing.assert_array_equal(weight, conv_weight)
+        np.testing.assert_array_equal(store["weight"]["conv"]["conv_weight"], conv_weight)
+        self.assertEqual(sorted(os.listdir(store_path)), ["index.pkl", "tensors.bin"])
+
+    def test_tensors_info(self):
+        from neural_compressor.utils.utility import dump_data_to_local, get_tensors_info, get_weights_details
+
+        tensors = {
+            "activation": [{"conv": {"conv_out": np.random.randn(1, 4, 8, 8)}}],
+            "weight": {"conv": {"conv_weight": np.random.randn(4, 3, 3, 3)}},
+        }
+        # the workspaces dumped before the tensor store have the pickled tensors
+        for dump in [dump_tensor_store, dump_data_to_local]:
+            workload_location = os.path.join("./saved_tensor_store", dump.__name__)
+            for model_dir in ["fp32", "quan"]:
+                save_path = os.path.join(workload_location, "inspect_saved", model_dir)
+                if dump is dump_tensor_store:
+                    dump(tensors, save_path, "inspect_result")
+                else:
+                    dump(tensors, save_path, "inspect_result.pkl")
+            tensors_info = get_tensors_info(workload_location, model_type="optimized")
+            self.assertEqual(isinstance(tensors_info, LazyTensorDict), dump is dump_tensor_store)
+            np.testing.assert_array_equal(
+                tensors_info["activation"][0]["conv"]["conv_out"], tensors["activation"][0]["conv"]["conv_out"]
+            )
+            weights_details = get_weights_details(workload_location)
+            self.assertEqual(len(weights_details), 1)
+            self.assertEqual(weights_details[0].op_name, "conv")
+
+
+if __name__ == "__main__":
+    unittest.main()